@@ -24,17 +24,23 @@ class Config:
     """
 
     # Valid LLM providers
-    VALID_LLM_PROVIDERS = ["azure", "openai", "ollama", "deepseek", "anthropic"]
+    VALID_LLM_PROVIDERS = ["azure", "openai", "ollama", "deepseek", "zhipu", "anthropic"]
 
     # Valid embedding providers
     VALID_EMBEDDING_PROVIDERS = ["azure", "openai", "ollama"]
 
     # Valid vector store backends
-    VALID_VECTOR_STORE_BACKENDS = ["chroma", "qdrant", "milvus"]
+    VALID_VECTOR_STORE_BACKENDS = ["chroma", "qdrant", "milvus", "local"]
 
     # Valid rerank backends
     VALID_RERANK_BACKENDS = ["none", "cross_encoder", "llm"]
 
+    # Valid sparse retrieval backends
+    VALID_SPARSE_BACKENDS = ["none", "bm25"]
+
+    # Valid fusion algorithms for hybrid retrieval
+    VALID_FUSION_ALGORITHMS = ["rrf", "weighted_sum"]
+
     # Required top-level sections
     REQUIRED_SECTIONS = ["llm", "embedding", "vector_store", "retrieval"]
 
@@ -64,6 +70,7 @@ class Config:
         )
         self.retrieval = self._validate_retrieval(config_dict.get("retrieval", {}))
         self.evaluation = config_dict.get("evaluation", {"enabled": False})
+        self.ingestion = config_dict.get("ingestion", {})
         self.observability = config_dict.get(
             "observability",
             {"logging": {"level": "INFO", "format": "text"}},
@@ -155,11 +162,13 @@ class Config:
             Validated retrieval configuration.
 
         Raises:
-            ConfigError: If rerank_backend is invalid.
+            ConfigError: If rerank_backend, sparse_backend or fusion_algorithm
+                         is invalid.
         """
-        if "rerank_backend" not in retrieval_config:
-            retrieval_config = dict(retrieval_config)  # Make a copy
-            retrieval_config["rerank_backend"] = "none"
+        retrieval_config = dict(retrieval_config)  # Make a copy
+        retrieval_config.setdefault("rerank_backend", "none")
+        retrieval_config.setdefault("sparse_backend", "none")
+        retrieval_config.setdefault("fusion_algorithm", "rrf")
 
         rerank_backend = retrieval_config["rerank_backend"]
         if rerank_backend not in self.VALID_RERANK_BACKENDS:
@@ -168,6 +177,20 @@ class Config:
                 f"Valid options: {self.VALID_RERANK_BACKENDS}"
             )
 
+        sparse_backend = retrieval_config["sparse_backend"]
+        if sparse_backend not in self.VALID_SPARSE_BACKENDS:
+            raise ConfigError(
+                f"Invalid sparse backend: {sparse_backend}. "
+                f"Valid options: {self.VALID_SPARSE_BACKENDS}"
+            )
+
+        fusion_algorithm = retrieval_config["fusion_algorithm"]
+        if fusion_algorithm not in self.VALID_FUSION_ALGORITHMS:
+            raise ConfigError(
+                f"Invalid fusion algorithm: {fusion_algorithm}. "
+                f"Valid options: {self.VALID_FUSION_ALGORITHMS}"
+            )
+
         return retrieval_config
 
 
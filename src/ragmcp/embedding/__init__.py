@@ -1,5 +1,18 @@
 """Embedding module."""
 
 from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.embedding.batching import BatchingEmbeddingClient
+from ragmcp.embedding.cache import CachedEmbeddingClient
+from ragmcp.embedding.fallback import FallbackEmbeddingClient
+from ragmcp.embedding.quantization import EmbeddingMatrix, quantize
+from ragmcp.embedding.singleflight import SingleFlightEmbeddingClient
 
-__all__ = ["EmbeddingClient"]
+__all__ = [
+    "EmbeddingClient",
+    "BatchingEmbeddingClient",
+    "CachedEmbeddingClient",
+    "FallbackEmbeddingClient",
+    "EmbeddingMatrix",
+    "quantize",
+    "SingleFlightEmbeddingClient",
+]
@@ -1,9 +1,16 @@
 """Embedding client base abstractions."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 import numpy as np
 
+from ragmcp.embedding.quantization import EmbeddingMatrix, quantize
+
+if TYPE_CHECKING:
+    from ragmcp.pipeline.batch import ChunkBatch
+
 
 class EmbeddingClient(ABC):
     """Abstract base class for embedding clients.
@@ -24,3 +31,63 @@ class EmbeddingClient(ABC):
             be L2 normalized (unit length).
         """
         ...
+
+    async def aembed(self, texts: list[str]) -> list[np.ndarray]:
+        """Generate embeddings without blocking the event loop.
+
+        The default implementation runs :meth:`embed` in a worker thread.
+        Clients with an async transport should override it.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors (numpy arrays).
+        """
+        return await asyncio.to_thread(self.embed, texts)
+
+    def embed_matrix(self, texts: list[str], dtype: str = "float32") -> EmbeddingMatrix:
+        """Generate embeddings as one contiguous matrix in a compact dtype.
+
+        The default implementation stacks the vectors returned by
+        :meth:`embed`. Clients that produce a batch as one array should
+        override it to avoid the per-vector detour.
+
+        Args:
+            texts: List of text strings to embed.
+            dtype: Storage dtype: "float32", "float16" or "int8".
+
+        Returns:
+            An EmbeddingMatrix of shape ``(len(texts), D)``.
+        """
+        return quantize(_stack(self.embed(texts)), dtype)
+
+    async def aembed_matrix(self, texts: list[str], dtype: str = "float32") -> EmbeddingMatrix:
+        """Async variant of :meth:`embed_matrix` built on :meth:`aembed`."""
+        return quantize(_stack(await self.aembed(texts)), dtype)
+
+    def embed_batch(self, batch: "ChunkBatch", dtype: str = "float32") -> "ChunkBatch":
+        """Embed the texts of a columnar chunk batch.
+
+        Chunks with identical content (matched on the batch's content
+        hashes) are embedded once and their row is repeated.
+
+        Args:
+            batch: The chunks to embed.
+            dtype: Storage dtype of the embedding matrix.
+
+        Returns:
+            The batch with its embeddings attached.
+        """
+        first, inverse = batch.unique_texts()
+        if len(first) == len(batch):
+            return batch.with_embeddings(self.embed_matrix(batch.texts, dtype))
+        matrix = self.embed_matrix([batch.texts[i] for i in first], dtype)
+        return batch.with_embeddings(matrix.rows(inverse))
+
+
+def _stack(vectors: list[np.ndarray]) -> np.ndarray:
+    """Stack vectors into a float32 ``(N, D)`` array (``(0, 0)`` when empty)."""
+    if len(vectors) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.asarray(vectors, dtype=np.float32)
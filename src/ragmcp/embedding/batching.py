@@ -0,0 +1,208 @@
+"""Cross-caller micro-batching for embedding clients.
+
+Callers of :meth:`BatchingEmbeddingClient.embed` (threads) or
+:meth:`BatchingEmbeddingClient.aembed` (coroutines) only enqueue their
+texts. A collector thread drains the queue into batches of up to
+``batch_size`` texts, waiting at most ``max_wait_ms`` after the oldest
+queued text, and hands each batch to a small dispatch pool that makes one
+upstream call and scatters the vectors back to each caller's future.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from ragmcp.embedding.base import EmbeddingClient
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    """Texts of one caller and the future receiving their vectors."""
+
+    __slots__ = ("texts", "vectors", "remaining", "future", "enqueued")
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.vectors: list[np.ndarray | None] = [None] * len(texts)
+        self.remaining = len(texts)
+        self.future: Future[list[np.ndarray]] = Future()
+        self.enqueued = time.monotonic()
+
+
+class BatchingEmbeddingClient(EmbeddingClient):
+    """Embedding client coalescing concurrent calls into full batches.
+
+    A caller's texts may be split across consecutive batches; its future
+    completes once all of them are embedded. If an upstream call fails,
+    every caller with a text in that batch receives the exception.
+
+    Config keys:
+        batch_size: Maximum texts per upstream call (default 100).
+        max_wait_ms: Longest time the oldest queued text waits for a batch
+                     to fill (default 10).
+        max_inflight: Upstream calls allowed to run at once (default 4).
+                      While all are busy, queued texts keep accumulating
+                      into larger batches.
+    """
+
+    def __init__(self, client: EmbeddingClient, config: dict | None = None):
+        """Wrap an embedding client.
+
+        Args:
+            client: The upstream embedding client.
+            config: Batching configuration dictionary.
+
+        Raises:
+            ValueError: If batch_size or max_inflight is not positive, or
+                        max_wait_ms is negative.
+        """
+        config = config or {}
+        self.client = client
+        self.model = getattr(client, "model", "")
+        self.dimension = getattr(client, "dimension", None)
+        self.batch_size = int(config.get("batch_size", 100))
+        self.max_wait = float(config.get("max_wait_ms", 10)) / 1000.0
+        self.max_inflight = int(config.get("max_inflight", 4))
+        if self.batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {self.batch_size}")
+        if self.max_wait < 0:
+            raise ValueError(f"max_wait_ms must be non-negative, got {self.max_wait * 1000}")
+        if self.max_inflight <= 0:
+            raise ValueError(f"max_inflight must be positive, got {self.max_inflight}")
+
+        self._queue: deque[tuple[_Request, int]] = deque()
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(self.max_inflight)
+        self._closed = False
+        self._executor: ThreadPoolExecutor | None = None
+        self._collector: threading.Thread | None = None
+        self._stats = {"requests": 0, "texts": 0, "batches": 0}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters: caller requests, texts and upstream batches."""
+        with self._cond:
+            return dict(self._stats)
+
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed texts as part of a shared upstream batch.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+
+        Raises:
+            ValueError: If the client has been closed.
+        """
+        return self._submit(texts).result()
+
+    async def aembed(self, texts: list[str]) -> list[np.ndarray]:
+        """Async variant of :meth:`embed` that awaits the batch without blocking the loop.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+        """
+        return await asyncio.wrap_future(self._submit(texts))
+
+    def close(self) -> None:
+        """Flush queued texts, wait for in-flight batches and stop the worker threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            collector, executor = self._collector, self._executor
+        if collector is not None:
+            collector.join()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _submit(self, texts: list[str]) -> Future[list[np.ndarray]]:
+        """Queue a caller's texts and return the future of their vectors."""
+        request = _Request(list(texts))
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+
+        with self._cond:
+            if self._closed:
+                raise ValueError("BatchingEmbeddingClient is closed")
+            if self._collector is None:
+                self._start()
+            self._queue.extend((request, i) for i in range(len(request.texts)))
+            self._stats["requests"] += 1
+            self._stats["texts"] += len(request.texts)
+            self._cond.notify()
+        return request.future
+
+    def _start(self) -> None:
+        """Start the collector thread and dispatch pool (called with the lock held)."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_inflight, thread_name_prefix="embed-batch"
+        )
+        self._collector = threading.Thread(
+            target=self._collect, name="embed-batch-collector", daemon=True
+        )
+        self._collector.start()
+
+    def _collect(self) -> None:
+        """Form batches from the queue until closed and drained."""
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                deadline = self._queue[0][0].enqueued + self.max_wait
+                while len(self._queue) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            # Waiting for a free slot lets the next batch keep filling meanwhile.
+            self._slots.acquire()
+            with self._cond:
+                count = min(self.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                self._stats["batches"] += 1
+            assert self._executor is not None
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: list[tuple[_Request, int]]) -> None:
+        """Embed one batch upstream and scatter the vectors to their requests."""
+        try:
+            vectors = self.client.embed([request.texts[i] for request, i in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        except Exception as e:
+            logger.warning("Embedding batch of %d texts failed: %s", len(batch), e)
+            for request, _ in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        completed = []
+        with self._cond:
+            # A request split across batches may be completed by concurrent dispatches.
+            for (request, i), vector in zip(batch, vectors, strict=True):
+                request.vectors[i] = vector
+                request.remaining -= 1
+                if request.remaining == 0:
+                    completed.append(request)
+        for request in completed:
+            if not request.future.done():
+                # Every slot is filled once remaining reaches zero.
+                request.future.set_result([v for v in request.vectors if v is not None])
@@ -0,0 +1,241 @@
+"""Content-hash embedding cache.
+
+Wraps any :class:`EmbeddingClient` so that a text is embedded once per
+``(model, dimension, sha256(text))``. Lookups go through an in-memory LRU
+tier and, when a path is configured, a persistent SQLite tier; only the
+texts missing from both are sent upstream, in a single batched call.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from ragmcp.embedding.base import EmbeddingClient
+
+# Upper bound on SQL variables per statement (SQLite's historical default is 999).
+_SQL_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    dimension INTEGER NOT NULL,
+    text_hash BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, dimension, text_hash)
+) WITHOUT ROWID
+"""
+
+
+def content_hash(text: str) -> bytes:
+    """SHA-256 digest of a text, the content part of a cache key."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class CachedEmbeddingClient(EmbeddingClient):
+    """Embedding client that serves repeated texts from a cache.
+
+    Cached vectors are stored as read-only float32 arrays and returned as
+    is, so callers must copy a vector before modifying it.
+
+    Config keys:
+        model: Model name in the cache key (default: the wrapped client's
+               ``model`` attribute). Required from one of the two.
+        dimension: Embedding dimension in the cache key (default: the
+                   wrapped client's ``dimension`` attribute, else 0 for
+                   the model's native dimension).
+        max_entries: Capacity of the in-memory LRU tier (default 10000;
+                     0 disables it).
+        path: SQLite file of the persistent tier (default None, memory only).
+    """
+
+    def __init__(self, client: EmbeddingClient, config: dict | None = None):
+        """Wrap an embedding client.
+
+        Args:
+            client: The upstream embedding client.
+            config: Cache configuration dictionary.
+
+        Raises:
+            ValueError: If no model is configured or exposed by the client,
+                        or max_entries is negative.
+        """
+        config = config or {}
+        self.client = client
+        model = config.get("model") or getattr(client, "model", None)
+        if not model:
+            raise ValueError(
+                "CachedEmbeddingClient requires a model, in the config or on the wrapped client"
+            )
+        self.model = str(model)
+        self.dimension = int(config.get("dimension") or getattr(client, "dimension", 0) or 0)
+        self.max_entries = int(config.get("max_entries", 10000))
+        if self.max_entries < 0:
+            raise ValueError(f"max_entries must be non-negative, got {self.max_entries}")
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self.path = config.get("path")
+        self._db: sqlite3.Connection | None = None
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Lookup counters: memory_hits, disk_hits and misses (per unique text)."""
+        with self._lock:
+            return dict(self._stats)
+
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed texts, sending only uncached ones to the wrapped client.
+
+        Duplicate texts within a call are embedded once.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+        """
+        hashes = [content_hash(text) for text in texts]
+        unique = dict(zip(hashes, texts, strict=True))
+
+        found = self._get_memory(list(unique))
+        missing = [h for h in unique if h not in found]
+        if missing and self._db is not None:
+            found.update(self._from_disk(missing))
+            missing = [h for h in missing if h not in found]
+
+        if missing:
+            vectors = self.client.embed([unique[h] for h in missing])
+            found.update(self._record(missing, vectors))
+        return [found[h] for h in hashes]
+
+    async def aembed(self, texts: list[str]) -> list[np.ndarray]:
+        """Async variant of :meth:`embed`.
+
+        Memory hits are served on the event loop; SQLite access runs in a
+        worker thread and misses go to the wrapped client's ``aembed``.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+        """
+        hashes = [content_hash(text) for text in texts]
+        unique = dict(zip(hashes, texts, strict=True))
+
+        found = self._get_memory(list(unique))
+        missing = [h for h in unique if h not in found]
+        if missing and self._db is not None:
+            found.update(await asyncio.to_thread(self._from_disk, missing))
+            missing = [h for h in missing if h not in found]
+
+        if missing:
+            vectors = await self.client.aembed([unique[h] for h in missing])
+            found.update(await asyncio.to_thread(self._record, missing, vectors))
+        return [found[h] for h in hashes]
+
+    def clear(self) -> None:
+        """Drop every cached vector of this model and dimension from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE model = ? AND dimension = ?",
+                    (self.model, self.dimension),
+                )
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _from_disk(self, hashes: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up hashes in the SQLite tier and promote hits to memory."""
+        found = self._get_disk(hashes)
+        self._put_memory(found)
+        return found
+
+    def _record(self, hashes: list[bytes], vectors: list[np.ndarray]) -> dict[bytes, np.ndarray]:
+        """Count upstream results as misses and store them in both tiers."""
+        computed = {h: _frozen(vector) for h, vector in zip(hashes, vectors, strict=True)}
+        self._put_memory(computed)
+        self._put_disk(computed)
+        with self._lock:
+            self._stats["misses"] += len(computed)
+        return computed
+
+    def _get_memory(self, hashes: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up hashes in the LRU tier, refreshing their recency."""
+        found = {}
+        with self._lock:
+            for h in hashes:
+                vector = self._memory.get(h)
+                if vector is not None:
+                    self._memory.move_to_end(h)
+                    found[h] = vector
+            self._stats["memory_hits"] += len(found)
+        return found
+
+    def _put_memory(self, vectors: dict[bytes, np.ndarray]) -> None:
+        """Insert vectors into the LRU tier, evicting the least recently used."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            for h, vector in vectors.items():
+                self._memory[h] = vector
+                self._memory.move_to_end(h)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _get_disk(self, hashes: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up hashes in the SQLite tier with batched IN queries."""
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            if self._db is None:
+                return found
+            for start in range(0, len(hashes), _SQL_BATCH):
+                batch = hashes[start : start + _SQL_BATCH]
+                rows = self._db.execute(
+                    "SELECT text_hash, vector FROM embeddings "
+                    "WHERE model = ? AND dimension = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(batch))})",
+                    (self.model, self.dimension, *batch),
+                )
+                for h, blob in rows:
+                    found[h] = _frozen(np.frombuffer(blob, dtype=np.float32))
+            self._stats["disk_hits"] += len(found)
+        return found
+
+    def _put_disk(self, vectors: dict[bytes, np.ndarray]) -> None:
+        """Write vectors to the SQLite tier in one transaction."""
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(self.model, self.dimension, h, v.tobytes()) for h, v in vectors.items()],
+            )
+            self._db.commit()
+
+
+def _frozen(vector: np.ndarray) -> np.ndarray:
+    """Read-only float32 copy of a vector."""
+    vector = np.array(vector, dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
@@ -0,0 +1,74 @@
+"""Embedding client failing over between providers."""
+
+import functools
+
+import numpy as np
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.middleware.resilience import (
+    CircuitBreaker,
+    acall_with_failover,
+    call_with_failover,
+)
+
+
+class FallbackEmbeddingClient(EmbeddingClient):
+    """Embedding client trying a list of providers in order.
+
+    Vectors from different models are not comparable, so every provider must
+    serve the same model and dimension (e.g. the same model hosted on OpenAI
+    and on Azure). Providers whose circuit is open are skipped and transient
+    failures move on to the next provider.
+    """
+
+    def __init__(
+        self, clients: list[EmbeddingClient], breakers: list[CircuitBreaker] | None = None
+    ):
+        """Initialize the provider chain.
+
+        Args:
+            clients: Embedding clients in order of preference.
+            breakers: One circuit breaker per client. Defaults to a new
+                      breaker per client.
+
+        Raises:
+            ValueError: If clients is empty or breakers does not match it.
+        """
+        if not clients:
+            raise ValueError("FallbackEmbeddingClient requires at least one client")
+        if breakers is None:
+            breakers = [CircuitBreaker(f"embedding:{i}") for i in range(len(clients))]
+        if len(breakers) != len(clients):
+            raise ValueError(f"Expected {len(clients)} circuit breakers, got {len(breakers)}")
+        self.clients = list(clients)
+        self.breakers = list(breakers)
+        self.model = getattr(clients[0], "model", "")
+        self.dimension = getattr(clients[0], "dimension", None)
+
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed texts with the first available provider.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+
+        Raises:
+            CircuitOpenError: If every provider's circuit is open.
+        """
+        return call_with_failover(
+            [
+                (breaker, functools.partial(client.embed, texts))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
+
+    async def aembed(self, texts: list[str]) -> list[np.ndarray]:
+        """Async variant of :meth:`embed` using each provider's ``aembed``."""
+        return await acall_with_failover(
+            [
+                (breaker, functools.partial(client.aembed, texts))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
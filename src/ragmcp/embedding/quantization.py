@@ -0,0 +1,150 @@
+"""Compact, contiguous embedding matrices.
+
+An :class:`EmbeddingMatrix` holds ``N`` embeddings as one ``(N, D)`` array
+in float32, float16 or int8. int8 rows use symmetric scalar quantization
+with one float32 scale per row (``vector ~= values * scale``), so a row
+costs ``D + 4`` bytes instead of ``4 * D``.
+
+Scores are computed directly on the compact form, block by block, without
+widening the whole matrix; callers that need exact scores re-score a short
+list of candidates against the full-precision vectors.
+"""
+
+import numpy as np
+
+# Supported storage dtypes, from most to least precise
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+# Largest int8 magnitude used by symmetric quantization
+INT8_MAX = 127
+
+
+class EmbeddingMatrix:
+    """A batch of embeddings stored as one contiguous ``(N, D)`` array.
+
+    Behaves like an array of float32 vectors where NumPy expects one
+    (``np.asarray(matrix)`` dequantizes), so it can be passed to
+    :meth:`VectorStore.insert` as is.
+    """
+
+    def __init__(self, values: np.ndarray, scales: np.ndarray | None = None):
+        """Wrap quantized values.
+
+        Args:
+            values: Array of shape ``(N, D)`` in one of ``EMBEDDING_DTYPES``.
+            scales: Per-row float32 scales of shape ``(N,)``; required for
+                    int8 values and not allowed otherwise.
+
+        Raises:
+            ValueError: If the shape, dtype or scales are invalid.
+        """
+        values = np.ascontiguousarray(values)
+        if values.ndim != 2:
+            raise ValueError(f"values must have shape (N, D), got {values.shape}")
+        if values.dtype.name not in EMBEDDING_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding dtype: {values.dtype}. Supported: {list(EMBEDDING_DTYPES)}"
+            )
+        if (values.dtype == np.int8) != (scales is not None):
+            raise ValueError("scales are required for int8 values and only for them")
+        if scales is not None:
+            scales = np.ascontiguousarray(scales, dtype=np.float32)
+            if scales.shape != (values.shape[0],):
+                raise ValueError(f"Expected {values.shape[0]} scales, got shape {scales.shape}")
+
+        self.values = values
+        self.scales = scales
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self.dequantize()
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension."""
+        return int(self.values.shape[1])
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Storage dtype of the values."""
+        return self.values.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the values and scales."""
+        return self.values.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def rows(self, indices: np.ndarray | slice) -> "EmbeddingMatrix":
+        """Select rows, keeping the compact representation.
+
+        Args:
+            indices: Row indices or a slice.
+
+        Returns:
+            A matrix holding the selected rows.
+        """
+        scales = self.scales[indices] if self.scales is not None else None
+        return EmbeddingMatrix(self.values[indices], scales)
+
+    def dequantize(self) -> np.ndarray:
+        """Widen all rows to a float32 ``(N, D)`` array."""
+        values = self.values.astype(np.float32)
+        if self.scales is not None:
+            values *= self.scales[:, np.newaxis]
+        return values
+
+    def dot(self, queries: np.ndarray, block_rows: int = 65536) -> np.ndarray:
+        """Inner products between every row and one or more queries.
+
+        Rows are widened to float32 one block at a time, so temporary
+        memory is bounded by ``block_rows`` rows whatever the matrix size.
+
+        Args:
+            queries: Query vector ``(D,)`` or query matrix ``(D, Q)``.
+            block_rows: Rows widened per block.
+
+        Returns:
+            Scores of shape ``(N,)`` or ``(N, Q)``, as float32.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.values.dtype == np.float32:
+            products: np.ndarray = self.values @ queries
+            return products
+
+        scores = np.empty((len(self), *queries.shape[1:]), dtype=np.float32)
+        for start in range(0, len(self), block_rows):
+            block = self.values[start : start + block_rows].astype(np.float32)
+            scores[start : start + len(block)] = block @ queries
+        if self.scales is not None:
+            scores *= self.scales.reshape(-1, *([1] * (scores.ndim - 1)))
+        return scores
+
+
+def quantize(vectors: np.ndarray, dtype: str = "float32") -> EmbeddingMatrix:
+    """Store vectors in a compact dtype.
+
+    Args:
+        vectors: Array of shape ``(N, D)`` (or a list of ``(D,)`` vectors).
+        dtype: Target dtype, one of ``EMBEDDING_DTYPES``.
+
+    Returns:
+        The quantized matrix. float32 input is not copied.
+
+    Raises:
+        ValueError: If dtype is unsupported or vectors is not two-dimensional.
+    """
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unknown embedding dtype: {dtype}. Supported: {list(EMBEDDING_DTYPES)}")
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2:
+        raise ValueError(f"Expected vectors of shape (N, D), got {vectors.shape}")
+    if dtype != "int8":
+        return EmbeddingMatrix(vectors.astype(dtype, copy=False))
+
+    scales = np.abs(vectors).max(axis=1, initial=0.0) / INT8_MAX
+    scales[scales == 0] = 1.0
+    values = np.rint(vectors / scales[:, np.newaxis])
+    return EmbeddingMatrix(np.clip(values, -INT8_MAX, INT8_MAX).astype(np.int8), scales)
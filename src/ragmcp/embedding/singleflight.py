@@ -0,0 +1,47 @@
+"""Embedding client sharing identical concurrent requests."""
+
+import numpy as np
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.middleware.singleflight import SingleFlight, fingerprint
+
+
+class SingleFlightEmbeddingClient(EmbeddingClient):
+    """Embedding client deduplicating identical in-flight ``embed`` calls.
+
+    Concurrent calls (from threads or asyncio tasks) for exactly the same
+    texts make one upstream call and all receive its vectors. Each caller gets its own list; the arrays themselves are
+    shared and must not be modified.
+    """
+
+    def __init__(self, client: EmbeddingClient, flight: SingleFlight | None = None):
+        """Wrap an embedding client.
+
+        Args:
+            client: The upstream embedding client.
+            flight: Group to deduplicate in. Defaults to a group private to
+                    this wrapper.
+        """
+        self.client = client
+        self.model = getattr(client, "model", "")
+        self.dimension = getattr(client, "dimension", None)
+        self.flight = flight or SingleFlight(f"embedding:{self.model}")
+
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """Embed texts, joining an identical call that is already running.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of embedding vectors aligned with ``texts``.
+        """
+        return list(self.flight.do(self._key(texts), lambda: self.client.embed(texts)))
+
+    async def aembed(self, texts: list[str]) -> list[np.ndarray]:
+        """Async variant of :meth:`embed` using the upstream ``aembed``."""
+        return list(await self.flight.ado(self._key(texts), lambda: self.client.aembed(texts)))
+
+    def _key(self, texts: list[str]) -> str:
+        """Request fingerprint: model, dimension and texts."""
+        return fingerprint("embed", self.model, self.dimension, list(texts))
@@ -1,5 +1,6 @@
 """Evaluation module."""
 
 from ragmcp.evaluation.base import Evaluator
+from ragmcp.evaluation.recall import evaluate_vector_store_recall, recall_at_k
 
-__all__ = ["Evaluator"]
+__all__ = ["Evaluator", "recall_at_k", "evaluate_vector_store_recall"]
@@ -0,0 +1,74 @@
+"""Recall metrics for approximate vector search.
+
+Approximate indexes (HNSW, IVF-PQ, reduced-dimension search) trade recall
+for speed and memory. These helpers measure that trade-off by comparing a
+store against an exact reference store holding the same vectors.
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from ragmcp.vector_store.base import VectorStore
+
+
+def recall_at_k(retrieved_ids: Sequence[Any], relevant_ids: Sequence[Any], k: int) -> float:
+    """Compute recall@k.
+
+    Args:
+        retrieved_ids: Ids returned by the system under test, best first.
+        relevant_ids: Ground-truth ids, best first.
+        k: Cut-off rank.
+
+    Returns:
+        Fraction of the top-k relevant ids found in the top-k retrieved ids.
+        Returns 1.0 when there are no relevant ids.
+    """
+    relevant = set(list(relevant_ids)[:k])
+    if not relevant:
+        return 1.0
+    retrieved = set(list(retrieved_ids)[:k])
+    return len(retrieved & relevant) / len(relevant)
+
+
+def evaluate_vector_store_recall(
+    store: VectorStore,
+    reference: VectorStore,
+    queries: np.ndarray | Sequence[np.ndarray],
+    k: int = 10,
+) -> dict[str, float]:
+    """Measure recall@k and latency of a store against an exact reference.
+
+    Args:
+        store: Store under test (e.g. a LocalVectorStore with index_type ivf_pq).
+        reference: Store with the same vectors using exact search.
+        queries: Query vectors.
+        k: Number of results per query.
+
+    Returns:
+        Dictionary with ``recall@k``, ``latency_ms`` (mean per query for
+        ``store``) and ``reference_latency_ms``.
+    """
+    recalls = []
+    latency = 0.0
+    reference_latency = 0.0
+
+    for query in queries:
+        start = time.perf_counter()
+        results = store.query(query, k)
+        latency += time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = reference.query(query, k)
+        reference_latency += time.perf_counter() - start
+
+        recalls.append(recall_at_k([r["id"] for r in results], [r["id"] for r in expected], k))
+
+    count = max(len(recalls), 1)
+    return {
+        f"recall@{k}": float(np.mean(recalls)) if recalls else 0.0,
+        "latency_ms": latency * 1000 / count,
+        "reference_latency_ms": reference_latency * 1000 / count,
+    }
@@ -3,6 +3,7 @@
 from ragmcp.factory.embedding_factory import EmbeddingFactory
 from ragmcp.factory.llm_factory import LLMFactory
 from ragmcp.factory.reranker_factory import RerankerFactory
+from ragmcp.factory.sparse_retriever_factory import SparseRetrieverFactory
 from ragmcp.factory.vector_store_factory import VectorStoreFactory
 from ragmcp.factory.vision_llm_factory import VisionLLMFactory
 
@@ -12,4 +13,5 @@ __all__ = [
     "VisionLLMFactory",
     "VectorStoreFactory",
     "RerankerFactory",
+    "SparseRetrieverFactory",
 ]
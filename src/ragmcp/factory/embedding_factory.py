@@ -3,6 +3,13 @@
 import numpy as np
 
 from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.embedding.batching import BatchingEmbeddingClient
+from ragmcp.embedding.cache import CachedEmbeddingClient
+from ragmcp.embedding.fallback import FallbackEmbeddingClient
+from ragmcp.embedding.quantization import EmbeddingMatrix, quantize
+from ragmcp.embedding.singleflight import SingleFlightEmbeddingClient
+from ragmcp.middleware.resilience import get_circuit_breaker
+from ragmcp.middleware.singleflight import get_single_flight
 
 
 # Mock implementations for testing
@@ -16,17 +23,22 @@ class MockOpenAIEmbedding(EmbeddingClient):
         self.model = config.get("model", "text-embedding-3-small")
 
     def embed(self, texts: list[str]) -> list[np.ndarray]:
+        # Rows of one contiguous float32 matrix
+        return list(self._vectors(texts))
+
+    def embed_matrix(self, texts: list[str], dtype: str = "float32") -> EmbeddingMatrix:
+        return quantize(self._vectors(texts), dtype)
+
+    def _vectors(self, texts: list[str]) -> np.ndarray:
         # Return mock normalized vectors (deterministic for testing)
-        vectors = []
-        for text in texts:
-            # Create a deterministic vector based on text content
-            dim = 1536  # OpenAI embedding dimension
+        dim = 1536  # OpenAI embedding dimension
+        vectors = np.empty((len(texts), dim), dtype=np.float32)
+        for row, text in enumerate(texts):
             # Use hash of text to generate deterministic values
-            np.random.seed(hash(text) % (2**31))
-            vec = np.random.randn(dim)
-            # L2 normalize
-            vec = vec / np.linalg.norm(vec)
-            vectors.append(vec)
+            rng = np.random.default_rng(hash(text) % (2**31))
+            vectors[row] = rng.standard_normal(dim, dtype=np.float32)
+        # L2 normalize
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
         return vectors
 
 
@@ -36,6 +48,21 @@ class EmbeddingFactory:
     Supported providers:
         - openai: OpenAI Embedding API
 
+    When the config has a ``fallback`` list of provider configs, the client
+    is wrapped in a FallbackEmbeddingClient that fails over to them in
+    order behind shared circuit breakers (configured by the optional
+    ``circuit_breaker`` section). Fallbacks must use the same model and
+    dimension as the primary provider.
+
+    When the config has a ``batching`` section with ``enabled: true``, the
+    client is wrapped in a BatchingEmbeddingClient that coalesces calls up
+    to ``batch_size`` texts. When it has a ``cache`` section with
+    ``enabled: true``, the result is wrapped in a CachedEmbeddingClient
+    keyed by the configured model and dimension, so only cache misses are
+    batched. With a ``single_flight`` section with ``enabled: true``, the
+    outermost client is a SingleFlightEmbeddingClient, so identical
+    concurrent requests share one lookup and upstream call.
+
     Usage:
         config = {"provider": "openai", "api_key": "...", "model": "..."}
         embedder = EmbeddingFactory.get_embedding(config)
@@ -52,8 +79,52 @@ class EmbeddingFactory:
             An EmbeddingClient instance.
 
         Raises:
-            ValueError: If provider is missing or unknown.
+            ValueError: If provider is missing or unknown, or a fallback
+                        provider uses a different model or dimension.
         """
+        client = EmbeddingFactory._create(config)
+
+        fallback = config.get("fallback") or []
+        if fallback:
+            for fallback_config in fallback:
+                for key in ("model", "dimension"):
+                    expected, actual = config.get(key), fallback_config.get(key, config.get(key))
+                    if actual != expected:
+                        raise ValueError(
+                            f"Fallback provider '{fallback_config.get('provider')}' has "
+                            f"{key}={actual}, expected {expected}"
+                        )
+            breaker_config = config.get("circuit_breaker") or {}
+            breakers = [
+                get_circuit_breaker(f"embedding:{c.get('provider')}", **breaker_config)
+                for c in [config, *fallback]
+            ]
+            clients = [client, *(EmbeddingFactory._create(c) for c in fallback)]
+            client = FallbackEmbeddingClient(clients, breakers)
+
+        batching_config = config.get("batching") or {}
+        if batching_config.get("enabled", False):
+            batching_config = {"batch_size": config.get("batch_size", 100), **batching_config}
+            client = BatchingEmbeddingClient(client, batching_config)
+
+        cache_config = config.get("cache") or {}
+        if cache_config.get("enabled", False):
+            cache_config = {
+                "model": config.get("model"),
+                "dimension": config.get("dimension"),
+                **cache_config,
+            }
+            client = CachedEmbeddingClient(client, cache_config)
+
+        single_flight_config = config.get("single_flight") or {}
+        if single_flight_config.get("enabled", False):
+            name = f"embedding:{config.get('provider')}:{config.get('model', '')}"
+            return SingleFlightEmbeddingClient(client, get_single_flight(name))
+        return client
+
+    @staticmethod
+    def _create(config: dict) -> EmbeddingClient:
+        """Create the embedding client of a single provider config."""
         provider = config.get("provider")
 
         if not provider:
@@ -61,5 +132,4 @@ class EmbeddingFactory:
 
         if provider == "openai":
             return MockOpenAIEmbedding(config)
-        else:
-            raise ValueError(f"Unknown Embedding provider: {provider}")
+        raise ValueError(f"Unknown Embedding provider: {provider}")
@@ -1,32 +1,21 @@
 """LLM Factory for creating LLM instances based on configuration."""
 
-from ragmcp.llm.base import LLMClient, Message, Response
+from functools import partial
 
+from ragmcp.llm.azure_openai import AzureOpenAILLM
+from ragmcp.llm.base import LLMClient
+from ragmcp.llm.deepseek_llm import DeepSeekLLM
+from ragmcp.llm.fallback import FallbackLLM
+from ragmcp.llm.ollama_llm import OllamaLLM
+from ragmcp.llm.openai_llm import OpenAILLM
+from ragmcp.llm.singleflight import SingleFlightLLM
+from ragmcp.llm.zhipu_llm import ZhipuLLM
+from ragmcp.middleware.resilience import get_circuit_breaker
+from ragmcp.middleware.singleflight import get_single_flight
+from ragmcp.transport.pool import get_http_transport
 
-# Mock implementations for testing
-# Real implementations will be provided in future tasks
-class MockAzureOpenAILLM(LLMClient):
-    """Mock Azure OpenAI LLM implementation."""
-
-    def __init__(self, config: dict):
-        self.config = config
-        self.api_key = config.get("api_key", "")
-        self.endpoint = config.get("endpoint", "")
-
-    def chat(self, messages: list[Message]) -> Response:
-        return Response(content=f"Azure mock response to {len(messages)} messages")
-
-
-class MockOpenAILLM(LLMClient):
-    """Mock OpenAI LLM implementation."""
-
-    def __init__(self, config: dict):
-        self.config = config
-        self.api_key = config.get("api_key", "")
-        self.model = config.get("model", "gpt-4")
-
-    def chat(self, messages: list[Message]) -> Response:
-        return Response(content=f"OpenAI mock response using {self.model}")
+# Origin of the OpenAI API, used to pick its pooled client
+OPENAI_BASE_URL = "https://api.openai.com/v1"
 
 
 class LLMFactory:
@@ -35,9 +24,27 @@ class LLMFactory:
     Supported providers:
         - azure: Azure OpenAI Service
         - openai: OpenAI API
+        - deepseek: DeepSeek API
+        - zhipu: Zhipu AI (GLM) API
+        - ollama: Local Ollama server
+
+    Every provider is given pooled keep-alive clients from the shared
+    HTTPTransport, configured by the optional ``http`` section, so every
+    client talking to the same host reuses one connection pool. The async
+    client is passed as a factory and only built on first async use, since
+    an ``httpx.AsyncClient`` is bound to the event loop it first runs on.
+
+    When the config has a ``fallback`` list of provider configs, the client
+    is wrapped in a FallbackLLM that fails over to them in order. Every
+    provider gets a shared circuit breaker configured by the optional
+    ``circuit_breaker`` section (``failure_threshold``, ``recovery_timeout``).
+
+    When it has a ``single_flight`` section with ``enabled: true``, the
+    result is wrapped in a SingleFlightLLM, so identical concurrent chat
+    requests share one provider call.
 
     Usage:
-        config = {"provider": "azure", "api_key": "...", "endpoint": "..."}
+        config = {"provider": "azure", "api_key": "...", "api_base": "..."}
         llm = LLMFactory.get_llm(config)
     """
 
@@ -52,16 +59,82 @@ class LLMFactory:
             An LLMClient instance.
 
         Raises:
-            ValueError: If provider is missing or unknown.
+            ValueError: If provider is missing or unknown, or an Azure config
+                has no ``api_base``.
         """
+        client = LLMFactory._create(config)
+        fallback = config.get("fallback") or []
+        if fallback:
+            configs = [config, *fallback]
+            breaker_config = config.get("circuit_breaker") or {}
+            breakers = [
+                get_circuit_breaker(
+                    f"llm:{c.get('provider')}:{c.get('model', '')}", **breaker_config
+                )
+                for c in configs
+            ]
+            client = FallbackLLM([client, *(LLMFactory._create(c) for c in fallback)], breakers)
+
+        single_flight_config = config.get("single_flight") or {}
+        if single_flight_config.get("enabled", False):
+            name = f"llm:{config.get('provider')}:{config.get('model', '')}"
+            return SingleFlightLLM(client, get_single_flight(name))
+        return client
+
+    @staticmethod
+    def _create(config: dict) -> LLMClient:
+        """Create the LLM client of a single provider config."""
         provider = config.get("provider")
 
         if not provider:
             raise ValueError("Configuration must specify 'provider'")
 
+        transport = get_http_transport(config=config.get("http"))
+        temperature = config.get("temperature", 0.7)
+        max_tokens = config.get("max_tokens")
+
         if provider == "azure":
-            return MockAzureOpenAILLM(config)
+            base_url = config.get("api_base") or config.get("endpoint")
+            if not base_url:
+                raise ValueError("Azure configuration must specify 'api_base'")
+            return AzureOpenAILLM(
+                api_key=config.get("api_key", ""),
+                api_base=base_url,
+                api_version=config.get("api_version", "2024-02-15-preview"),
+                deployment_name=config.get("deployment_name") or config.get("model", "gpt-4"),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                http_client=transport.client(base_url),
+                async_http_client=partial(transport.async_client, base_url),
+            )
         elif provider == "openai":
-            return MockOpenAILLM(config)
+            return OpenAILLM(
+                api_key=config.get("api_key", ""),
+                model=config.get("model", "gpt-4"),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                http_client=transport.client(OPENAI_BASE_URL),
+                async_http_client=partial(transport.async_client, OPENAI_BASE_URL),
+            )
+        elif provider in ("deepseek", "zhipu"):
+            cls = DeepSeekLLM if provider == "deepseek" else ZhipuLLM
+            return cls(
+                api_key=config.get("api_key", ""),
+                model=config.get("model", cls.DEFAULT_MODEL),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                http_client=transport.client(cls.DEFAULT_BASE_URL),
+                async_http_client=partial(transport.async_client, cls.DEFAULT_BASE_URL),
+            )
+        elif provider == "ollama":
+            base_url = config.get("base_url") or OllamaLLM.DEFAULT_BASE_URL
+            return OllamaLLM(
+                model=config.get("model", "llama2"),
+                base_url=base_url,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                http_client=transport.client(base_url),
+                async_http_client=partial(transport.async_client, base_url),
+            )
         else:
             raise ValueError(f"Unknown LLM provider: {provider}")
@@ -0,0 +1,39 @@
+"""SparseRetriever Factory for creating keyword retriever instances based on configuration."""
+
+from ragmcp.retrieval.base import SparseRetriever
+from ragmcp.retrieval.bm25 import BM25Retriever
+
+
+class SparseRetrieverFactory:
+    """Factory for creating SparseRetriever instances based on configuration.
+
+    Supported backends:
+        - bm25: In-memory BM25 retriever
+
+    Usage:
+        config = {"backend": "bm25", "k1": 1.2, "b": 0.75}
+        retriever = SparseRetrieverFactory.get_sparse_retriever(config)
+    """
+
+    @staticmethod
+    def get_sparse_retriever(config: dict) -> SparseRetriever:
+        """Create a SparseRetriever instance based on the configuration.
+
+        Args:
+            config: Configuration dictionary with at least a "backend" key.
+
+        Returns:
+            A SparseRetriever instance.
+
+        Raises:
+            ValueError: If backend is missing or unknown.
+        """
+        backend = config.get("backend")
+
+        if not backend:
+            raise ValueError("Configuration must specify 'backend'")
+
+        if backend == "bm25":
+            return BM25Retriever(config)
+        else:
+            raise ValueError(f"Unknown SparseRetriever backend: {backend}. Supported: bm25")
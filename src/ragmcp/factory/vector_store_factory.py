@@ -3,6 +3,8 @@
 import numpy as np
 
 from ragmcp.vector_store.base import VectorStore
+from ragmcp.vector_store.filters import match_filter
+from ragmcp.vector_store.local_store import LocalVectorStore
 
 
 # Mock implementations for testing
@@ -20,14 +22,23 @@ class MockMilvusVectorStore(VectorStore):
         self._data.extend(zip(vectors, payloads))
         return len(vectors)
 
-    def query(self, query_vector: np.ndarray, top_k: int) -> list[dict]:
+    def query(
+        self, query_vector: np.ndarray, top_k: int, filter: dict | None = None
+    ) -> list[dict]:
+        data = [(v, p) for v, p in self._data if not filter or match_filter(p, filter)]
         return [
-            {"vector": v, "score": 0.9, "payload": p} for v, p in self._data[:top_k]
+            {"vector": v, "score": 0.9, "payload": p} for v, p in data[:top_k]
         ]
 
     def delete(self, ids: list) -> int:
         return len(ids)
 
+    def delete_by_filter(self, filter: dict) -> int:
+        kept = [(v, p) for v, p in self._data if not match_filter(p, filter)]
+        deleted = len(self._data) - len(kept)
+        self._data = kept
+        return deleted
+
     def upsert(self, vectors: list[np.ndarray], payloads: list[dict]) -> int:
         return len(vectors)
 
@@ -44,14 +55,23 @@ class MockChromaVectorStore(VectorStore):
         self._data.extend(zip(vectors, payloads))
         return len(vectors)
 
-    def query(self, query_vector: np.ndarray, top_k: int) -> list[dict]:
+    def query(
+        self, query_vector: np.ndarray, top_k: int, filter: dict | None = None
+    ) -> list[dict]:
+        data = [(v, p) for v, p in self._data if not filter or match_filter(p, filter)]
         return [
-            {"vector": v, "score": 0.85, "payload": p} for v, p in self._data[:top_k]
+            {"vector": v, "score": 0.85, "payload": p} for v, p in data[:top_k]
         ]
 
     def delete(self, ids: list) -> int:
         return len(ids)
 
+    def delete_by_filter(self, filter: dict) -> int:
+        kept = [(v, p) for v, p in self._data if not match_filter(p, filter)]
+        deleted = len(self._data) - len(kept)
+        self._data = kept
+        return deleted
+
     def upsert(self, vectors: list[np.ndarray], payloads: list[dict]) -> int:
         return len(vectors)
 
@@ -62,6 +82,8 @@ class VectorStoreFactory:
     Supported backends:
         - milvus: Milvus vector database
         - chroma: Chroma vector database
+        - local: In-process NumPy vector store (no external service); keys of
+          the nested ``local`` block override the top-level ones
 
     Usage:
         config = {"backend": "milvus", "host": "...", "port": ...}
@@ -90,5 +112,7 @@ class VectorStoreFactory:
             return MockMilvusVectorStore(config)
         elif backend == "chroma":
             return MockChromaVectorStore(config)
+        elif backend == "local":
+            return LocalVectorStore({**config, **(config.get("local") or {})})
         else:
             raise ValueError(f"Unknown VectorStore backend: {backend}")
@@ -1,11 +1,13 @@
 """LLM module."""
 
 from ragmcp.llm.azure_openai import AzureOpenAILLM
-from ragmcp.llm.base import LLMClient, Message, Response
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk, Usage, collect_stream
 from ragmcp.llm.claude_llm import ClaudeLLM
 from ragmcp.llm.deepseek_llm import DeepSeekLLM
+from ragmcp.llm.fallback import FallbackLLM
 from ragmcp.llm.ollama_llm import OllamaLLM
 from ragmcp.llm.openai_llm import OpenAILLM
+from ragmcp.llm.singleflight import SingleFlightLLM
 from ragmcp.llm.zhipu_llm import ZhipuLLM
 
-__all__ = ["LLMClient", "Message", "Response", "AzureOpenAILLM", "OpenAILLM", "OllamaLLM", "DeepSeekLLM", "ClaudeLLM", "ZhipuLLM"]
+__all__ = ["LLMClient", "Message", "Response", "StreamChunk", "Usage", "collect_stream", "AzureOpenAILLM", "OpenAILLM", "OllamaLLM", "DeepSeekLLM", "ClaudeLLM", "ZhipuLLM", "FallbackLLM", "SingleFlightLLM"]
@@ -1,11 +1,16 @@
 """Azure OpenAI LLM provider implementation."""
 
+from collections.abc import AsyncIterator, Iterator
 
-from ragmcp.llm.base import LLMClient, Message, Response
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk, collect_stream
+from ragmcp.llm.streaming import aiter_openai_stream, iter_openai_stream
+from ragmcp.transport.pool import AsyncClientSource, resolve_async_client
 
 try:
+    from openai import AsyncAzureOpenAI as AsyncAzureOpenAIClient
     from openai import AzureOpenAI as AzureOpenAIClient
 except ImportError:
+    AsyncAzureOpenAIClient = None  # type: ignore[assignment, misc]
     AzureOpenAIClient = None  # type: ignore[assignment, misc]
 
 
@@ -24,6 +29,7 @@ class AzureOpenAILLM(LLMClient):
         temperature: float = 0.7,
         max_tokens: int | None = None,
         http_client: object | None = None,
+        async_http_client: AsyncClientSource | None = None,
     ):
         """Initialize Azure OpenAI LLM client.
 
@@ -35,6 +41,8 @@ class AzureOpenAILLM(LLMClient):
             temperature: Sampling temperature for generation.
             max_tokens: Maximum tokens to generate.
             http_client: Optional HTTP client for testing.
+            async_http_client: Optional async HTTP client (e.g. httpx.AsyncClient)
+                used by achat(), or a zero-arg callable returning one on first use.
         """
         if AzureOpenAIClient is None:
             raise ImportError(
@@ -55,6 +63,14 @@ class AzureOpenAILLM(LLMClient):
         self._temperature = temperature
         self._max_tokens = max_tokens
 
+        # The async client is created on first use of achat()
+        self._async_client_kwargs = {
+            k: v for k, v in client_kwargs.items() if k != "http_client"
+        }
+        if async_http_client is not None:
+            self._async_client_kwargs["http_client"] = async_http_client
+        self._async_client: AsyncAzureOpenAIClient | None = None
+
     def chat(
         self,
         messages: list[Message],
@@ -70,7 +86,8 @@ class AzureOpenAILLM(LLMClient):
             temperature: Override default temperature.
             max_tokens: Override default max_tokens.
             stop: Stop sequences.
-            stream: Whether to stream responses (not yet supported).
+            stream: Receive the completion incrementally via :meth:`stream`
+                and join it.
 
         Returns:
             Response containing generated text.
@@ -78,6 +95,120 @@ class AzureOpenAILLM(LLMClient):
         Raises:
             Exception: If API call fails.
         """
+        if stream:
+            return collect_stream(
+                self.stream(messages, temperature=temperature, max_tokens=max_tokens, stop=stop)
+            )
+
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Azure OpenAI API
+        completion = self._client.chat.completions.create(**request_params)
+
+        # Extract response content
+        content = completion.choices[0].message.content
+
+        return Response(content=content or "")
+
+    async def achat(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        stream: bool = False,
+    ) -> Response:
+        """Generate chat completion using Azure OpenAI without blocking the event loop.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+            stream: Receive the completion incrementally via :meth:`stream`
+                and join it.
+
+        Returns:
+            Response containing generated text.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        if stream:
+            chunks = [
+                chunk
+                async for chunk in self.astream(
+                    messages, temperature=temperature, max_tokens=max_tokens, stop=stop
+                )
+            ]
+            return collect_stream(chunks)
+
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Azure OpenAI API asynchronously
+        completion = await self.async_client.chat.completions.create(**request_params)
+
+        # Extract response content
+        content = completion.choices[0].message.content
+
+        return Response(content=content or "")
+
+    def stream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream chat completion deltas from Azure OpenAI.
+
+        Usage is only reported by API versions that support
+        ``stream_options``, so the final chunk's usage may be None.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with usage and finish reason.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Azure OpenAI API with streaming
+        chunks = self._client.chat.completions.create(**request_params, stream=True)
+        yield from iter_openai_stream(chunks)
+
+    async def astream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Azure OpenAI API asynchronously with streaming
+        chunks = await self.async_client.chat.completions.create(**request_params, stream=True)
+        async for chunk in aiter_openai_stream(chunks):
+            yield chunk
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        temperature: float | None,
+        max_tokens: int | None,
+        stop: list[str] | None,
+    ) -> dict:
+        """Build Azure OpenAI request parameters from messages and overrides."""
         # Convert Message format to Azure format
         azure_messages = [
             {"role": msg.role, "content": msg.content} for msg in messages
@@ -100,15 +231,28 @@ class AzureOpenAILLM(LLMClient):
         if stop is not None:
             request_params["stop"] = stop
 
-        # Call Azure OpenAI API
-        completion = self._client.chat.completions.create(**request_params)
-
-        # Extract response content
-        content = completion.choices[0].message.content
+        return request_params
 
-        return Response(content=content or "")
+    @property
+    def model(self) -> str:
+        """Name of the deployment requests are sent to."""
+        return self._deployment_name
 
     @property
     def client(self):
         """Expose the underlying Azure OpenAI client for testing."""
         return self._client
+
+    @property
+    def async_client(self):
+        """Expose the underlying async client, created on first use."""
+        if self._async_client is None:
+            if AsyncAzureOpenAIClient is None:
+                raise ImportError(
+                    "openai package is required. Install with: pip install openai"
+                )
+            kwargs = dict(self._async_client_kwargs)
+            if "http_client" in kwargs:
+                kwargs["http_client"] = resolve_async_client(kwargs["http_client"])
+            self._async_client = AsyncAzureOpenAIClient(**kwargs)
+        return self._async_client
@@ -1,7 +1,10 @@
 """LLM client base abstractions."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable, Iterator
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -12,11 +15,65 @@ class Message:
     content: str
 
 
+@dataclass
+class Usage:
+    """Token usage of one completion."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Prompt and completion tokens together."""
+        return self.prompt_tokens + self.completion_tokens
+
+
 @dataclass
 class Response:
     """A response from an LLM."""
 
     content: str
+    usage: Usage | None = None
+
+
+@dataclass
+class StreamChunk:
+    """An increment of a streamed response.
+
+    Text arrives in ``delta``. The last chunk of a stream has an empty
+    delta and carries the ``usage`` record (when the provider reports it)
+    and the ``finish_reason``.
+    """
+
+    delta: str = ""
+    usage: Usage | None = None
+    finish_reason: str | None = None
+
+
+def collect_stream(chunks: Iterable[StreamChunk]) -> Response:
+    """Join streamed chunks into a single Response.
+
+    Args:
+        chunks: Chunks from :meth:`LLMClient.stream`.
+
+    Returns:
+        Response with the concatenated text and the final usage record.
+    """
+    parts = []
+    usage = None
+    for chunk in chunks:
+        parts.append(chunk.delta)
+        if chunk.usage is not None:
+            usage = chunk.usage
+    return Response(content="".join(parts), usage=usage)
+
+
+def _overrides(
+    temperature: float | None, max_tokens: int | None, stop: list[str] | None
+) -> dict[str, Any]:
+    """The request overrides that are set, as keyword arguments for ``chat``."""
+    overrides = {"temperature": temperature, "max_tokens": max_tokens, "stop": stop}
+    return {key: value for key, value in overrides.items() if value is not None}
 
 
 class LLMClient(ABC):
@@ -33,3 +90,87 @@ class LLMClient(ABC):
             Response from the LLM.
         """
         ...
+
+    async def achat(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Response:
+        """Send a chat request without blocking the event loop.
+
+        The default implementation runs :meth:`chat` in a worker thread,
+        passing on the overrides that are set. Providers with an async SDK
+        or HTTP client should override it.
+
+        Args:
+            messages: List of messages in the conversation.
+            temperature: Override the default temperature.
+            max_tokens: Override the default max_tokens.
+            stop: Stop sequences.
+
+        Returns:
+            Response from the LLM.
+        """
+        overrides = _overrides(temperature, max_tokens, stop)
+        return await asyncio.to_thread(self.chat, messages, **overrides)
+
+    def stream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream a chat response as text deltas.
+
+        The request is sent when iteration starts. The default
+        implementation yields the whole :meth:`chat` response as one delta;
+        providers with a streaming API override it so the first tokens
+        arrive as soon as they are generated.
+
+        Args:
+            messages: List of messages in the conversation.
+            temperature: Override the default temperature.
+            max_tokens: Override the default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with the usage record.
+        """
+        response = self.chat(messages, **_overrides(temperature, max_tokens, stop))
+        if response.content:
+            yield StreamChunk(delta=response.content)
+        yield StreamChunk(usage=response.usage, finish_reason="stop")
+
+    async def astream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`.
+
+        The default implementation yields the whole :meth:`achat` response
+        as one delta.
+
+        Args:
+            messages: List of messages in the conversation.
+            temperature: Override the default temperature.
+            max_tokens: Override the default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with the usage record.
+        """
+        response = await self.achat(
+            messages, temperature=temperature, max_tokens=max_tokens, stop=stop
+        )
+        if response.content:
+            yield StreamChunk(delta=response.content)
+        yield StreamChunk(usage=response.usage, finish_reason="stop")
@@ -1,11 +1,16 @@
 """Anthropic Claude LLM provider implementation."""
 
-from ragmcp.llm.base import LLMClient, Message, Response
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk, Usage
+from ragmcp.transport.pool import AsyncClientSource, resolve_async_client
 
 try:
-    from anthropic import Anthropic
+    from anthropic import Anthropic, AsyncAnthropic
 except ImportError:
-    Anthropic = None  # type: ignore[misc]
+    Anthropic = None  # type: ignore[assignment, misc]
+    AsyncAnthropic = None  # type: ignore[assignment, misc]
 
 
 class ClaudeLLM(LLMClient):
@@ -23,6 +28,7 @@ class ClaudeLLM(LLMClient):
         temperature: float = 0.7,
         max_tokens: int | None = None,
         http_client: object | None = None,
+        async_http_client: AsyncClientSource | None = None,
     ):
         """Initialize Claude LLM client.
 
@@ -32,6 +38,8 @@ class ClaudeLLM(LLMClient):
             temperature: Sampling temperature for generation.
             max_tokens: Maximum tokens to generate.
             http_client: Optional HTTP client for testing.
+            async_http_client: Optional async HTTP client (e.g. httpx.AsyncClient)
+                used by achat(), or a zero-arg callable returning one on first use.
         """
         if Anthropic is None:
             raise ImportError(
@@ -48,11 +56,20 @@ class ClaudeLLM(LLMClient):
         self._temperature = temperature
         self._max_tokens = max_tokens
 
+        # The async client is created on first use of achat()
+        self._async_client_kwargs = {
+            k: v for k, v in client_kwargs.items() if k != "http_client"
+        }
+        if async_http_client is not None:
+            self._async_client_kwargs["http_client"] = async_http_client
+        self._async_client: AsyncAnthropic | None = None
+
     def chat(
         self,
         messages: list[Message],
         temperature: float | None = None,
         max_tokens: int | None = None,
+        stop: list[str] | None = None,
     ) -> Response:
         """Generate chat completion using Claude.
 
@@ -60,6 +77,7 @@ class ClaudeLLM(LLMClient):
             messages: List of chat messages.
             temperature: Override default temperature.
             max_tokens: Override default max_tokens.
+            stop: Stop sequences.
 
         Returns:
             Response containing generated text.
@@ -67,6 +85,109 @@ class ClaudeLLM(LLMClient):
         Raises:
             Exception: If API call fails.
         """
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Claude API
+        completion = self._client.messages.create(**request_params)
+
+        # Extract response content
+        content = completion.content[0].text if completion.content else ""
+
+        return Response(content=content)
+
+    async def achat(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Response:
+        """Generate chat completion using Claude without blocking the event loop.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Returns:
+            Response containing generated text.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Claude API asynchronously
+        completion = await self.async_client.messages.create(**request_params)
+
+        # Extract response content
+        content = completion.content[0].text if completion.content else ""
+
+        return Response(content=content)
+
+    def stream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream chat completion deltas from Claude.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with usage and stop reason.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Claude API with streaming
+        events = self._client.messages.create(**request_params, stream=True)
+        state = _ClaudeStreamState()
+        for event in events:
+            delta = state.delta(event)
+            if delta:
+                yield StreamChunk(delta=delta)
+        yield state.final()
+
+    async def astream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call Claude API asynchronously with streaming
+        events = await self.async_client.messages.create(**request_params, stream=True)
+        state = _ClaudeStreamState()
+        async for event in events:
+            delta = state.delta(event)
+            if delta:
+                yield StreamChunk(delta=delta)
+        yield state.final()
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        temperature: float | None,
+        max_tokens: int | None,
+        stop: list[str] | None,
+    ) -> dict:
+        """Build Claude request parameters from messages and overrides."""
         # Separate system message from other messages
         system_message = None
         claude_messages = []
@@ -94,15 +215,63 @@ class ClaudeLLM(LLMClient):
         elif self._max_tokens is not None:
             request_params["max_tokens"] = self._max_tokens
 
-        # Call Claude API
-        completion = self._client.messages.create(**request_params)
+        if stop is not None:
+            request_params["stop_sequences"] = stop
 
-        # Extract response content
-        content = completion.content[0].text if completion.content else ""
+        return request_params
 
-        return Response(content=content)
+    @property
+    def model(self) -> str:
+        """Name of the model requests are sent to."""
+        return self._model
 
     @property
     def client(self):
         """Expose the underlying client for testing."""
         return self._client
+
+    @property
+    def async_client(self):
+        """Expose the underlying async client, created on first use."""
+        if self._async_client is None:
+            if AsyncAnthropic is None:
+                raise ImportError(
+                    "anthropic package is required. Install with: pip install anthropic"
+                )
+            kwargs = dict(self._async_client_kwargs)
+            if "http_client" in kwargs:
+                kwargs["http_client"] = resolve_async_client(kwargs["http_client"])
+            self._async_client = AsyncAnthropic(**kwargs)
+        return self._async_client
+
+
+class _ClaudeStreamState:
+    """Usage and stop reason accumulated from Messages API stream events."""
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.stop_reason: str | None = None
+
+    def delta(self, event: Any) -> str:
+        """Record the metadata of a stream event and return its text delta."""
+        if event.type == "message_start":
+            usage = getattr(event.message, "usage", None)
+            self.input_tokens = getattr(usage, "input_tokens", 0) or 0
+            self.output_tokens = getattr(usage, "output_tokens", 0) or 0
+        elif event.type == "content_block_delta":
+            if getattr(event.delta, "type", None) == "text_delta":
+                return str(event.delta.text)
+        elif event.type == "message_delta":
+            self.stop_reason = getattr(event.delta, "stop_reason", None)
+            usage = getattr(event, "usage", None)
+            if usage is not None:
+                self.output_tokens = getattr(usage, "output_tokens", 0) or 0
+        return ""
+
+    def final(self) -> StreamChunk:
+        """The closing chunk carrying usage and stop reason."""
+        return StreamChunk(
+            usage=Usage(prompt_tokens=self.input_tokens, completion_tokens=self.output_tokens),
+            finish_reason=self.stop_reason,
+        )
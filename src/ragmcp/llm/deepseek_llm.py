@@ -1,10 +1,16 @@
 """DeepSeek LLM provider implementation."""
 
-from ragmcp.llm.base import LLMClient, Message, Response
+from collections.abc import AsyncIterator, Iterator
+
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk, collect_stream
+from ragmcp.llm.streaming import INCLUDE_USAGE, aiter_openai_stream, iter_openai_stream
+from ragmcp.transport.pool import AsyncClientSource, resolve_async_client
 
 try:
+    from openai import AsyncOpenAI as AsyncOpenAIClient
     from openai import OpenAI as OpenAIClient
 except ImportError:
+    AsyncOpenAIClient = None  # type: ignore[assignment, misc]
     OpenAIClient = None  # type: ignore[assignment, misc]
 
 
@@ -24,6 +30,7 @@ class DeepSeekLLM(LLMClient):
         temperature: float = 0.7,
         max_tokens: int | None = None,
         http_client: object | None = None,
+        async_http_client: AsyncClientSource | None = None,
     ):
         """Initialize DeepSeek LLM client.
 
@@ -33,6 +40,8 @@ class DeepSeekLLM(LLMClient):
             temperature: Sampling temperature for generation.
             max_tokens: Maximum tokens to generate.
             http_client: Optional HTTP client for testing.
+            async_http_client: Optional async HTTP client (e.g. httpx.AsyncClient)
+                used by achat(), or a zero-arg callable returning one on first use.
         """
         if OpenAIClient is None:
             raise ImportError(
@@ -52,6 +61,14 @@ class DeepSeekLLM(LLMClient):
         self._temperature = temperature
         self._max_tokens = max_tokens
 
+        # The async client is created on first use of achat()
+        self._async_client_kwargs = {
+            k: v for k, v in client_kwargs.items() if k != "http_client"
+        }
+        if async_http_client is not None:
+            self._async_client_kwargs["http_client"] = async_http_client
+        self._async_client: AsyncOpenAIClient | None = None
+
     def chat(
         self,
         messages: list[Message],
@@ -67,7 +84,48 @@ class DeepSeekLLM(LLMClient):
             temperature: Override default temperature.
             max_tokens: Override default max_tokens.
             stop: Stop sequences.
-            stream: Whether to stream responses (not yet supported).
+            stream: Receive the completion incrementally via :meth:`stream`
+                and join it.
+
+        Returns:
+            Response containing generated text.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        if stream:
+            return collect_stream(
+                self.stream(messages, temperature=temperature, max_tokens=max_tokens, stop=stop)
+            )
+
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call DeepSeek API
+        completion = self._client.chat.completions.create(**request_params)
+
+        # Extract response content
+        content = completion.choices[0].message.content
+
+        return Response(content=content or "")
+
+    async def achat(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+        stream: bool = False,
+    ) -> Response:
+        """Generate chat completion using DeepSeek without blocking the event loop.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+            stream: Receive the completion incrementally via :meth:`stream`
+                and join it.
 
         Returns:
             Response containing generated text.
@@ -75,6 +133,81 @@ class DeepSeekLLM(LLMClient):
         Raises:
             Exception: If API call fails.
         """
+        if stream:
+            chunks = [
+                chunk
+                async for chunk in self.astream(
+                    messages, temperature=temperature, max_tokens=max_tokens, stop=stop
+                )
+            ]
+            return collect_stream(chunks)
+
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Call DeepSeek API asynchronously
+        completion = await self.async_client.chat.completions.create(**request_params)
+
+        # Extract response content
+        content = completion.choices[0].message.content
+
+        return Response(content=content or "")
+
+    def stream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream chat completion deltas from DeepSeek.
+
+        The final chunk carries the token usage reported by the API.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with usage and finish reason.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+        request_params.update(stream=True, stream_options=INCLUDE_USAGE)
+
+        # Call DeepSeek API with streaming
+        chunks = self._client.chat.completions.create(**request_params)
+        yield from iter_openai_stream(chunks)
+
+    async def astream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        request_params = self._build_request(messages, temperature, max_tokens, stop)
+        request_params.update(stream=True, stream_options=INCLUDE_USAGE)
+
+        # Call DeepSeek API asynchronously with streaming
+        chunks = await self.async_client.chat.completions.create(**request_params)
+        async for chunk in aiter_openai_stream(chunks):
+            yield chunk
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        temperature: float | None,
+        max_tokens: int | None,
+        stop: list[str] | None,
+    ) -> dict:
+        """Build DeepSeek request parameters from messages and overrides."""
         # Convert Message format to DeepSeek format (OpenAI-compatible)
         deepseek_messages = [
             {"role": msg.role, "content": msg.content} for msg in messages
@@ -97,15 +230,28 @@ class DeepSeekLLM(LLMClient):
         if stop is not None:
             request_params["stop"] = stop
 
-        # Call DeepSeek API
-        completion = self._client.chat.completions.create(**request_params)
-
-        # Extract response content
-        content = completion.choices[0].message.content
+        return request_params
 
-        return Response(content=content or "")
+    @property
+    def model(self) -> str:
+        """Name of the model requests are sent to."""
+        return self._model
 
     @property
     def client(self):
         """Expose the underlying client for testing."""
         return self._client
+
+    @property
+    def async_client(self):
+        """Expose the underlying async client, created on first use."""
+        if self._async_client is None:
+            if AsyncOpenAIClient is None:
+                raise ImportError(
+                    "openai package is required. Install with: pip install openai"
+                )
+            kwargs = dict(self._async_client_kwargs)
+            if "http_client" in kwargs:
+                kwargs["http_client"] = resolve_async_client(kwargs["http_client"])
+            self._async_client = AsyncOpenAIClient(**kwargs)
+        return self._async_client
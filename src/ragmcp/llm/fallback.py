@@ -0,0 +1,94 @@
+"""LLM client failing over between providers."""
+
+import functools
+from collections.abc import AsyncIterator, Iterator
+
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk
+from ragmcp.middleware.resilience import (
+    CircuitBreaker,
+    acall_with_failover,
+    astream_with_failover,
+    call_with_failover,
+    stream_with_failover,
+)
+
+
+class FallbackLLM(LLMClient):
+    """LLM client trying a list of providers in order.
+
+    Each provider has a circuit breaker; providers whose circuit is open are
+    skipped without being called, and transient failures (network errors,
+    429 and 5xx responses) move on to the next provider. Errors that are not
+    transient, such as an invalid request, are raised as is.
+    """
+
+    def __init__(self, clients: list[LLMClient], breakers: list[CircuitBreaker] | None = None):
+        """Initialize the provider chain.
+
+        Args:
+            clients: LLM clients in order of preference.
+            breakers: One circuit breaker per client. Defaults to a new
+                      breaker per client.
+
+        Raises:
+            ValueError: If clients is empty or breakers does not match it.
+        """
+        if not clients:
+            raise ValueError("FallbackLLM requires at least one client")
+        if breakers is None:
+            breakers = [CircuitBreaker(f"llm:{i}") for i in range(len(clients))]
+        if len(breakers) != len(clients):
+            raise ValueError(f"Expected {len(clients)} circuit breakers, got {len(breakers)}")
+        self.clients = list(clients)
+        self.breakers = list(breakers)
+
+    def chat(self, messages: list[Message], **kwargs) -> Response:
+        """Send a chat request to the first available provider.
+
+        Args:
+            messages: List of messages in the conversation.
+            **kwargs: Options forwarded to the provider's ``chat``.
+
+        Returns:
+            Response from the first provider that succeeds.
+
+        Raises:
+            CircuitOpenError: If every provider's circuit is open.
+        """
+        return call_with_failover(
+            [
+                (breaker, functools.partial(client.chat, messages, **kwargs))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
+
+    async def achat(self, messages: list[Message], **kwargs) -> Response:
+        """Async variant of :meth:`chat` using each provider's ``achat``."""
+        return await acall_with_failover(
+            [
+                (breaker, functools.partial(client.achat, messages, **kwargs))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
+
+    def stream(self, messages: list[Message], **kwargs) -> Iterator[StreamChunk]:
+        """Stream from the first provider that starts streaming successfully.
+
+        Failover only happens before the first chunk; a provider failing
+        mid-stream raises its error.
+        """
+        return stream_with_failover(
+            [
+                (breaker, functools.partial(client.stream, messages, **kwargs))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
+
+    def astream(self, messages: list[Message], **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        return astream_with_failover(
+            [
+                (breaker, functools.partial(client.astream, messages, **kwargs))
+                for client, breaker in zip(self.clients, self.breakers, strict=True)
+            ]
+        )
@@ -1,8 +1,13 @@
 """Ollama LLM provider implementation."""
 
+import json
+import threading
+from collections.abc import AsyncIterator, Iterator
+
 import httpx
 
-from ragmcp.llm.base import LLMClient, Message, Response
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk, Usage
+from ragmcp.transport.pool import AsyncClientSource, resolve_async_client
 
 
 class OllamaLLM(LLMClient):
@@ -19,6 +24,8 @@ class OllamaLLM(LLMClient):
         base_url: str | None = None,
         temperature: float = 0.7,
         max_tokens: int | None = None,
+        http_client: httpx.Client | None = None,
+        async_http_client: AsyncClientSource | None = None,
     ):
         """Initialize Ollama LLM client.
 
@@ -27,17 +34,32 @@ class OllamaLLM(LLMClient):
             base_url: Ollama API base URL (default: http://localhost:11434).
             temperature: Sampling temperature for generation.
             max_tokens: Maximum tokens to generate.
+            http_client: Optional shared pooled client used by chat(), e.g.
+                from :class:`ragmcp.transport.HTTPTransport`. It is not
+                closed by this client.
+            async_http_client: Optional shared pooled client used by achat(),
+                or a zero-arg callable returning one on first use.
         """
         self._model = model
         self._base_url = base_url or self.DEFAULT_BASE_URL
         self._temperature = temperature
         self._max_tokens = max_tokens
 
+        # Injected clients are shared; otherwise one keep-alive client is
+        # created on first use and reused by every request.
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_client_source = async_http_client
+        self._owns_async_client = async_http_client is None
+        self._client_lock = threading.Lock()
+
     def chat(
         self,
         messages: list[Message],
         temperature: float | None = None,
         max_tokens: int | None = None,
+        stop: list[str] | None = None,
     ) -> Response:
         """Generate chat completion using Ollama.
 
@@ -45,6 +67,7 @@ class OllamaLLM(LLMClient):
             messages: List of chat messages.
             temperature: Override default temperature.
             max_tokens: Override default max_tokens.
+            stop: Stop sequences.
 
         Returns:
             Response containing generated text.
@@ -52,6 +75,184 @@ class OllamaLLM(LLMClient):
         Raises:
             Exception: If API call fails.
         """
+        request_body = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Make HTTP request to Ollama API
+        response = self._http_client().post(
+            f"{self._base_url}/api/chat",
+            json=request_body,
+        )
+
+        if response.status_code != 200:
+            error_msg = response.json().get("error", "Unknown error")
+            raise Exception(f"Ollama API error: {error_msg}")
+
+        result = response.json()
+
+        # Extract response content
+        content = result.get("message", {}).get("content", "")
+
+        return Response(content=content)
+
+    async def achat(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Response:
+        """Generate chat completion using Ollama without blocking the event loop.
+
+        Requests share one pooled ``httpx.AsyncClient``; call :meth:`aclose`
+        to release its connections unless it was injected.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Returns:
+            Response containing generated text.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_body = self._build_request(messages, temperature, max_tokens, stop)
+
+        # Make async HTTP request to Ollama API
+        response = await self._async_http_client().post(
+            f"{self._base_url}/api/chat",
+            json=request_body,
+        )
+
+        if response.status_code != 200:
+            error_msg = response.json().get("error", "Unknown error")
+            raise Exception(f"Ollama API error: {error_msg}")
+
+        result = response.json()
+
+        # Extract response content
+        content = result.get("message", {}).get("content", "")
+
+        return Response(content=content)
+
+    def stream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> Iterator[StreamChunk]:
+        """Stream chat completion deltas from Ollama.
+
+        Ollama streams one JSON object per line; the last one (``done``)
+        carries the prompt and completion token counts.
+
+        Args:
+            messages: List of chat messages.
+            temperature: Override default temperature.
+            max_tokens: Override default max_tokens.
+            stop: Stop sequences.
+
+        Yields:
+            Text deltas, then a final chunk with usage and finish reason.
+
+        Raises:
+            Exception: If API call fails.
+        """
+        request_body = self._build_request(messages, temperature, max_tokens, stop)
+        request_body["stream"] = True
+
+        # Make streaming HTTP request to Ollama API
+        with self._http_client().stream(
+            "POST",
+            f"{self._base_url}/api/chat",
+            json=request_body,
+        ) as response:
+            if response.status_code != 200:
+                response.read()
+                error_msg = response.json().get("error", "Unknown error")
+                raise Exception(f"Ollama API error: {error_msg}")
+
+            for line in response.iter_lines():
+                chunk = _parse_line(line)
+                if chunk is not None:
+                    yield chunk
+
+    async def astream(
+        self,
+        messages: list[Message],
+        *,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        stop: list[str] | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        request_body = self._build_request(messages, temperature, max_tokens, stop)
+        request_body["stream"] = True
+
+        # Make async streaming HTTP request to Ollama API
+        async with self._async_http_client().stream(
+            "POST",
+            f"{self._base_url}/api/chat",
+            json=request_body,
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                error_msg = response.json().get("error", "Unknown error")
+                raise Exception(f"Ollama API error: {error_msg}")
+
+            async for line in response.aiter_lines():
+                chunk = _parse_line(line)
+                if chunk is not None:
+                    yield chunk
+
+    @property
+    def model(self) -> str:
+        """Name of the model requests are sent to."""
+        return self._model
+
+    def _http_client(self) -> httpx.Client:
+        """Return the sync client, creating it once even under concurrent calls."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client()
+        return self._client
+
+    def _async_http_client(self) -> httpx.AsyncClient:
+        """Return the async client, creating it once even under concurrent calls."""
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    client = resolve_async_client(self._async_client_source)
+                    self._async_client = client if client is not None else httpx.AsyncClient()
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the HTTP client used by chat() if this client created it."""
+        if self._owns_client and self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the HTTP clients created by this client."""
+        self.close()
+        if self._owns_async_client and self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _build_request(
+        self,
+        messages: list[Message],
+        temperature: float | None,
+        max_tokens: int | None,
+        stop: list[str] | None,
+    ) -> dict:
+        """Build the Ollama request body from messages and overrides."""
         # Convert Message format to Ollama format
         ollama_messages = [
             {"role": msg.role, "content": msg.content} for msg in messages
@@ -74,20 +275,26 @@ class OllamaLLM(LLMClient):
         elif self._max_tokens is not None:
             request_body["options"]["num_predict"] = self._max_tokens
 
-        # Make HTTP request to Ollama API
-        with httpx.Client() as client:
-            response = client.post(
-                f"{self._base_url}/api/chat",
-                json=request_body,
-            )
-
-            if response.status_code != 200:
-                error_msg = response.json().get("error", "Unknown error")
-                raise Exception(f"Ollama API error: {error_msg}")
+        if stop is not None:
+            request_body["options"]["stop"] = stop
 
-            result = response.json()
+        return request_body
 
-        # Extract response content
-        content = result.get("message", {}).get("content", "")
 
-        return Response(content=content)
+def _parse_line(line: str) -> StreamChunk | None:
+    """Convert one line of an Ollama chat stream into a chunk."""
+    if not line.strip():
+        return None
+    data = json.loads(line)
+    if data.get("error"):
+        raise Exception(f"Ollama API error: {data['error']}")
+    if data.get("done"):
+        return StreamChunk(
+            usage=Usage(
+                prompt_tokens=data.get("prompt_eval_count", 0),
+                completion_tokens=data.get("eval_count", 0),
+            ),
+            finish_reason=data.get("done_reason", "stop"),
+        )
+    content = data.get("message", {}).get("content", "")
+    return StreamChunk(delta=content) if content else None
@@ -0,0 +1,61 @@
+"""LLM client sharing identical concurrent chat requests."""
+
+from collections.abc import AsyncIterator, Iterator
+
+from ragmcp.llm.base import LLMClient, Message, Response, StreamChunk
+from ragmcp.middleware.singleflight import SingleFlight, fingerprint
+
+
+class SingleFlightLLM(LLMClient):
+    """LLM client deduplicating identical in-flight ``chat`` calls.
+
+    Concurrent calls (from threads or asyncio tasks) with the same model,
+    messages and options make one provider call and all receive the same
+    Response. Streams are passed through: they cannot be shared between
+    consumers.
+    """
+
+    def __init__(self, client: LLMClient, flight: SingleFlight | None = None):
+        """Wrap an LLM client.
+
+        Args:
+            client: The upstream LLM client.
+            flight: Group to deduplicate in. Defaults to a group private to
+                    this wrapper.
+        """
+        self.client = client
+        self.model = getattr(client, "model", "")
+        self.flight = flight or SingleFlight(f"llm:{self.model}")
+
+    def chat(self, messages: list[Message], **kwargs) -> Response:
+        """Send a chat request, joining an identical one that is already running.
+
+        Args:
+            messages: List of messages in the conversation.
+            **kwargs: Options forwarded to the client's ``chat``; they are
+                      part of the request fingerprint.
+
+        Returns:
+            The shared Response.
+        """
+        return self.flight.do(
+            self._key(messages, kwargs), lambda: self.client.chat(messages, **kwargs)
+        )
+
+    async def achat(self, messages: list[Message], **kwargs) -> Response:
+        """Async variant of :meth:`chat` using the client's ``achat``."""
+        return await self.flight.ado(
+            self._key(messages, kwargs), lambda: self.client.achat(messages, **kwargs)
+        )
+
+    def stream(self, messages: list[Message], **kwargs) -> Iterator[StreamChunk]:
+        """Stream from the client without deduplication."""
+        return self.client.stream(messages, **kwargs)
+
+    def astream(self, messages: list[Message], **kwargs) -> AsyncIterator[StreamChunk]:
+        """Async variant of :meth:`stream`."""
+        return self.client.astream(messages, **kwargs)
+
+    def _key(self, messages: list[Message], kwargs: dict) -> str:
+        """Request fingerprint: model, messages and options."""
+        return fingerprint("chat", self.model, list(messages), kwargs)
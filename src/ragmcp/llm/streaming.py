@@ -0,0 +1,69 @@
+"""Conversion of OpenAI-compatible chat completion streams into StreamChunks.
+
+Shared by the providers built on the ``openai`` SDK (OpenAI, Azure OpenAI,
+DeepSeek and ZhipuAI). Each SDK chunk carries a ``choices[0].delta``; when
+``stream_options={"include_usage": True}`` is sent, a last chunk without
+choices carries the token usage.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any
+
+from ragmcp.llm.base import StreamChunk, Usage
+
+# Request options asking OpenAI-compatible APIs for a final usage chunk
+INCLUDE_USAGE = {"include_usage": True}
+
+
+class _StreamState:
+    """Finish reason and usage seen so far in one stream."""
+
+    def __init__(self):
+        self.finish_reason: str | None = None
+        self.usage: Usage | None = None
+
+    def delta(self, chunk: Any) -> str:
+        """Record the metadata of an SDK chunk and return its text delta."""
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self.usage = Usage(
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            )
+        if not chunk.choices:
+            return ""
+        choice = chunk.choices[0]
+        if choice.finish_reason is not None:
+            self.finish_reason = choice.finish_reason
+        return getattr(choice.delta, "content", None) or ""
+
+    def final(self) -> StreamChunk:
+        """The closing chunk carrying usage and finish reason."""
+        return StreamChunk(usage=self.usage, finish_reason=self.finish_reason)
+
+
+def iter_openai_stream(chunks: Iterable[Any]) -> Iterator[StreamChunk]:
+    """Convert an ``openai`` SDK chat completion stream.
+
+    Args:
+        chunks: The SDK stream returned by ``chat.completions.create(stream=True)``.
+
+    Yields:
+        One chunk per non-empty text delta, then a final chunk with usage.
+    """
+    state = _StreamState()
+    for chunk in chunks:
+        delta = state.delta(chunk)
+        if delta:
+            yield StreamChunk(delta=delta)
+    yield state.final()
+
+
+async def aiter_openai_stream(chunks: AsyncIterable[Any]) -> AsyncIterator[StreamChunk]:
+    """Async variant of :func:`iter_openai_stream`."""
+    state = _StreamState()
+    async for chunk in chunks:
+        delta = state.delta(chunk)
+        if delta:
+            yield StreamChunk(delta=delta)
+    yield state.final()
@@ -4,19 +4,57 @@ This module provides middleware decorators for LLM/Embedding calls,
 including retry logic, rate limiting, and logging.
 """
 
+import asyncio
 import functools
+import inspect
 import logging
+import random
 import threading
 import time
-from collections import defaultdict, deque
+from collections import deque
 from collections.abc import Callable
-from typing import Any, TypeVar
+from typing import Any, TypeVar, overload
+
+from ragmcp.middleware.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+    token_bucket,
+)
+from ragmcp.middleware.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    acall_with_failover,
+    astream_with_failover,
+    call_with_failover,
+    get_circuit_breaker,
+    get_retry_budget,
+    is_retryable,
+    retry_after,
+    stream_with_failover,
+)
+from ragmcp.middleware.singleflight import (
+    SingleFlight,
+    fingerprint,
+    get_single_flight,
+    single_flight,
+)
+from ragmcp.middleware.structured_logging import (
+    JsonFormatter,
+    configure_logging,
+    get_sample_rate,
+    is_structured,
+    shutdown_logging,
+    summarize,
+)
 
 T = TypeVar("T")
 
-# Thread-safe storage for rate limiting state
-_rate_limit_state = defaultdict(deque)  # type: defaultdict[str, deque[float]]
-_rate_limit_lock = threading.Lock()
+# Sliding windows of rate_limit decorators created with a name
+_named_windows: dict[str, "_SlidingWindow"] = {}
+_named_windows_lock = threading.Lock()
 
 # Module logger
 logger = logging.getLogger(__name__)
@@ -29,9 +67,20 @@ def retry(
         ConnectionError,
         TimeoutError,
     ),
+    retry_if: Callable[[Exception], bool] | None = None,
+    jitter: bool = False,
+    max_delay: float = 60.0,
+    budget: RetryBudget | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to retry a function on specific exceptions.
 
+    Works on sync functions, coroutine functions (which sleep with
+    ``asyncio.sleep``) and sync or async generator functions such as
+    ``LLMClient.stream``. A stream is retried only if it fails before
+    yielding its first item; errors after that propagate, because items
+    already delivered cannot be taken back.
+
     Args:
         max_attempts: Maximum number of attempts (including initial call).
                       Default is 3.
@@ -40,6 +89,18 @@ def retry(
                         Set to 0 for immediate retries.
         exceptions: Tuple of exception types to catch and retry on.
                     Default is (ConnectionError, TimeoutError).
+        retry_if: Optional predicate marking further exceptions as retryable,
+                  e.g. :func:`is_retryable` for provider SDK 429/5xx errors.
+        jitter: Use decorrelated jitter instead of plain exponential backoff:
+                each delay is drawn from [backoff_factor, 3 * previous delay].
+        max_delay: Upper bound of a single delay in seconds. A server
+                   ``Retry-After`` hint is honoured when it is longer than the
+                   computed delay; a hint above max_delay stops retrying.
+        budget: Optional shared RetryBudget; when it is exhausted the error
+                is raised instead of retried.
+        circuit_breaker: Optional shared CircuitBreaker; retryable failures
+                         are reported to it and calls fail fast with
+                         CircuitOpenError while it is open.
 
     Returns:
         Decorated function that will retry on specified exceptions.
@@ -54,45 +115,250 @@ def retry(
             return api_call()
     """
 
+    def policy() -> _RetryPolicy:
+        return _RetryPolicy(
+            max_attempts,
+            backoff_factor,
+            exceptions,
+            retry_if,
+            jitter,
+            max_delay,
+            budget,
+            circuit_breaker,
+        )
+
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                state = policy()
+                for attempt in range(max_attempts):
+                    state.before_attempt(attempt)
+                    items = func(*args, **kwargs)
+                    try:
+                        first = next(items)
+                    except StopIteration:
+                        state.on_success()
+                        return
+                    except Exception as e:
+                        delay = state.on_error(e, attempt)
+                        if delay > 0:
+                            time.sleep(delay)
+                        continue
+                    except BaseException:
+                        state.on_abort()
+                        raise
+                    state.on_success()
+                    yield first
+                    yield from items
+                    return
+
+            return stream_wrapper
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                state = policy()
+                for attempt in range(max_attempts):
+                    state.before_attempt(attempt)
+                    items = func(*args, **kwargs)
+                    try:
+                        first = await anext(items)
+                    except StopAsyncIteration:
+                        state.on_success()
+                        return
+                    except Exception as e:
+                        delay = state.on_error(e, attempt)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        continue
+                    except BaseException:
+                        state.on_abort()
+                        raise
+                    state.on_success()
+                    yield first
+                    try:
+                        async for item in items:
+                            yield item
+                    finally:
+                        await items.aclose()
+                    return
+
+            return async_stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                state = policy()
+                for attempt in range(max_attempts):
+                    state.before_attempt(attempt)
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = state.on_error(e, attempt)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        continue
+                    except BaseException:
+                        state.on_abort()
+                        raise
+                    state.on_success()
+                    return result
+                raise AssertionError("unreachable")
+
+            return async_wrapper  # type: ignore[return-value]
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception: Exception | None = None
-
+            state = policy()
             for attempt in range(max_attempts):
+                state.before_attempt(attempt)
                 try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-
-                    # Don't sleep after the last attempt
-                    if attempt < max_attempts - 1:
-                        # Calculate exponential backoff delay
-                        delay = backoff_factor * (2**attempt)
-                        if delay > 0:
-                            time.sleep(delay)
-
-            # If we get here, all attempts failed
-            assert last_exception is not None
-            raise last_exception
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    delay = state.on_error(e, attempt)
+                    if delay > 0:
+                        time.sleep(delay)
+                    continue
+                except BaseException:
+                    state.on_abort()
+                    raise
+                state.on_success()
+                return result
+            raise AssertionError("unreachable")
 
         return wrapper
 
     return decorator
 
 
+class _RetryPolicy:
+    """Retry decisions and delays for one decorated call."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        backoff_factor: float,
+        exceptions: tuple[type[Exception], ...],
+        retry_if: Callable[[Exception], bool] | None,
+        jitter: bool,
+        max_delay: float,
+        budget: RetryBudget | None,
+        circuit_breaker: CircuitBreaker | None,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.exceptions = exceptions
+        self.retry_if = retry_if
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.budget = budget
+        self.circuit_breaker = circuit_breaker
+        self._previous_delay = backoff_factor
+        self._last_error: Exception | None = None
+
+    def before_attempt(self, attempt: int) -> None:
+        """Charge the budget and consult the circuit breaker."""
+        if attempt == 0 and self.budget is not None:
+            self.budget.record_call()
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(
+                f"Circuit for '{self.circuit_breaker.name}' is open; failing fast"
+            ) from self._last_error
+
+    def on_success(self) -> None:
+        """Report a successful call to the circuit breaker."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def on_abort(self) -> None:
+        """Free the breaker's probe slot when a call is cancelled mid-flight."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release_probe()
+
+    def on_error(self, error: Exception, attempt: int) -> float:
+        """Return the delay before the next attempt, or re-raise the error."""
+        retryable = isinstance(error, self.exceptions) or (
+            self.retry_if is not None and self.retry_if(error)
+        )
+        if self.circuit_breaker is not None:
+            # Non-retryable errors (e.g. HTTP 400) still prove the provider is up.
+            if retryable:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+        if not retryable or attempt >= self.max_attempts - 1:
+            raise error
+        if self.budget is not None and not self.budget.try_spend():
+            logger.warning("Retry budget exhausted; not retrying %s", type(error).__name__)
+            raise error
+
+        if self.jitter:
+            delay = random.uniform(self.backoff_factor, self._previous_delay * 3)
+        else:
+            delay = self.backoff_factor * (2**attempt)
+        delay = min(delay, self.max_delay)
+        self._previous_delay = max(delay, self.backoff_factor)
+
+        hint = retry_after(error)
+        if hint is not None:
+            if hint > self.max_delay:
+                logger.warning("Retry-After of %.1fs exceeds max_delay; not retrying", hint)
+                raise error
+            delay = max(delay, hint)
+        self._last_error = error
+        return delay
+
+
+class _SlidingWindow:
+    """At most ``max_requests`` call slots in any ``time_window`` seconds."""
+
+    def __init__(self, max_requests: int, time_window: float):
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self._slots: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Book the earliest free slot and return the seconds until it starts."""
+        with self._lock:
+            now = time.monotonic()
+            while self._slots and self._slots[0] <= now - self.time_window:
+                self._slots.popleft()
+            slot = now
+            if len(self._slots) >= self.max_requests:
+                # The call may start once the max_requests-th latest slot leaves the window.
+                slot = max(now, self._slots[-self.max_requests] + self.time_window)
+            self._slots.append(slot)
+            return slot - now
+
+
 def rate_limit(
     max_requests: int = 10,
     time_window: float = 1.0,
+    name: str | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to rate limit function calls.
 
     Limits the number of calls to a function within a sliding time window.
-    Uses the token bucket algorithm with sliding window tracking.
+    Each call books a slot under a short per-window lock and then sleeps
+    outside it, so waiting callers never block unrelated functions.
+    Generator functions (streams) book their slot when iteration starts.
+    Coroutine functions and async generators wait with ``asyncio.sleep``,
+    so they never block the event loop.
+
+    For per-minute request and token quotas shared between clients, use
+    :func:`token_bucket` instead.
 
     Args:
         max_requests: Maximum number of requests allowed within time_window.
         time_window: Time window in seconds for rate limiting.
+        name: Optional key sharing one window between every function
+              decorated with the same name. By default each decorated
+              function has its own window.
 
     Returns:
         Decorated function that will wait if rate limit is exceeded.
@@ -105,40 +371,52 @@ def rate_limit(
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        # Use function's qualified name as key for rate limiting
-        func_key = f"{func.__qualname__}_{id(func)}"
+        if name is None:
+            window = _SlidingWindow(max_requests, time_window)
+        else:
+            with _named_windows_lock:
+                window = _named_windows.setdefault(name, _SlidingWindow(max_requests, time_window))
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                # The slot is taken when iteration starts, i.e. when the request is sent.
+                wait_time = window.reserve()
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                yield from func(*args, **kwargs)
+
+            return stream_wrapper
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                wait_time = window.reserve()
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                async for item in func(*args, **kwargs):
+                    yield item
+
+            return async_stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                wait_time = window.reserve()
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
 
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            with _rate_limit_lock:
-                call_history = _rate_limit_state[func_key]
-                now = time.time()
-
-                # Remove calls outside the time window
-                while call_history and call_history[0] < now - time_window:
-                    call_history.popleft()
-
-                # If at limit, calculate wait time
-                if len(call_history) >= max_requests:
-                    oldest_call = call_history[0]
-                    wait_time = time_window - (now - oldest_call)
-
-                    if wait_time > 0:
-                        # Release lock while waiting
-                        _rate_limit_lock.release()
-                        try:
-                            time.sleep(wait_time)
-                            now = time.time()  # Update time after sleep
-                        finally:
-                            _rate_limit_lock.acquire()
-
-                        # Clean up old calls again after waiting
-                        while call_history and call_history[0] < now - time_window:
-                            call_history.popleft()
-
-                # Record this call
-                call_history.append(now)
-
+            wait_time = window.reserve()
+            if wait_time > 0:
+                time.sleep(wait_time)
             return func(*args, **kwargs)
 
         return wrapper
@@ -146,13 +424,45 @@ def rate_limit(
     return decorator
 
 
+@overload
+def log_call(
+    level_or_func: Callable[..., T],
+    logger_name: str | None = None,
+    *,
+    structured: bool | None = None,
+    sample_rate: float | None = None,
+) -> Callable[..., T]: ...
+
+
+@overload
+def log_call(
+    level_or_func: int | None = None,
+    logger_name: str | None = None,
+    *,
+    structured: bool | None = None,
+    sample_rate: float | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]: ...
+
+
 def log_call(
     level_or_func: int | Callable[..., T] | None = None,
     logger_name: str | None = None,
-) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    *,
+    structured: bool | None = None,
+    sample_rate: float | None = None,
+) -> Callable[..., T] | Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to log function calls with input, output, and duration.
 
     Logs function name, arguments, return value, and execution time.
+    Nothing is formatted when the logger is not enabled for ``level``.
+    Generator functions (streams) are logged when the stream ends, with the
+    number of items and the time to the first one instead of the result.
+
+    In structured mode a single record per call carries a ``fields``
+    attribute (function, status, duration_ms, args, kwargs, result) in
+    which large payloads such as embedding arrays are summarized by shape,
+    length or hash instead of ``repr``; see
+    :mod:`ragmcp.middleware.structured_logging`.
 
     Can be used with or without arguments:
         @log_call
@@ -165,26 +475,39 @@ def log_call(
         level_or_func: Logging level to use, or the function to decorate if called
                        without arguments. Default is logging.INFO.
         logger_name: Name of logger to use. If None, uses module logger.
+        structured: Emit structured records. None follows
+                    ``observability.logging.format`` as applied by
+                    :func:`configure_logging`.
+        sample_rate: Fraction of successful calls to log; errors are always
+                     logged. None uses the configured rate for the
+                     function's ``__qualname__`` (default 1.0).
 
     Returns:
         Decorated function that logs each call.
 
+    Raises:
+        ValueError: If sample_rate is outside [0, 1].
+
     Example:
         @log_call(level=logging.DEBUG)
         def process_data(data):
             return transform(data)
     """
+    if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+        raise ValueError(f"sample_rate must be in [0, 1], got {sample_rate}")
+
     # Handle @log_call without parentheses
     if callable(level_or_func):
         # Called as @log_call
-        func = level_or_func
-        return _create_log_wrapper(func, logging.INFO, logger_name)
+        return _create_log_wrapper(
+            level_or_func, logging.INFO, logger_name, structured, sample_rate
+        )
 
     # Called as @log_call(...) with arguments
     level = level_or_func if level_or_func is not None else logging.INFO
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        return _create_log_wrapper(func, level, logger_name)
+        return _create_log_wrapper(func, level, logger_name, structured, sample_rate)
 
     return decorator
 
@@ -193,6 +516,8 @@ def _create_log_wrapper(
     func: Callable[..., T],
     level: int,
     logger_name: str | None,
+    structured: bool | None = None,
+    sample_rate: float | None = None,
 ) -> Callable[..., T]:
     """Create a logging wrapper for a function.
 
@@ -200,46 +525,308 @@ def _create_log_wrapper(
         func: The function to wrap.
         level: Logging level to use.
         logger_name: Name of logger to use.
+        structured: Structured mode, or None to follow the configuration.
+        sample_rate: Success sampling rate, or None to follow the configuration.
 
     Returns:
         Wrapped function that logs each call.
     """
+    if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        return _create_stream_log_wrapper(func, level, logger_name, structured, sample_rate)
+
     # Use provided logger or module logger
     func_logger = logging.getLogger(logger_name) if logger_name else logger
+    func_name = func.__name__
+    qualname = func.__qualname__
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> T:
-        func_name = func.__name__
+    def begin(args: tuple, kwargs: dict) -> tuple[bool, bool, float]:
+        """Decide sampling and format, log the input and start the timer."""
+        enabled = func_logger.isEnabledFor(level)
+        if enabled:
+            rate = sample_rate if sample_rate is not None else get_sample_rate(qualname)
+            enabled = rate >= 1.0 or random.random() < rate
+        as_fields = structured if structured is not None else is_structured()
 
         # Log input
-        func_logger.log(
-            level,
-            f"Calling {func_name} with input: args={args}, kwargs={kwargs}",
-        )
-
-        # Execute and time
-        start_time = time.time()
-        try:
-            result = func(*args, **kwargs)
-            duration_ms = (time.time() - start_time) * 1000
+        if enabled and not as_fields:
+            func_logger.log(
+                level,
+                "Calling %s with input: args=%r, kwargs=%r",
+                func_name,
+                args,
+                kwargs,
+            )
+        return enabled, as_fields, time.perf_counter()
+
+    def failed(
+        error: Exception, as_fields: bool, start_time: float, args: tuple, kwargs: dict
+    ) -> None:
+        """Log an error and the duration (always, regardless of sampling)."""
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if as_fields:
+            func_logger.error(
+                "%s error: %s",
+                func_name,
+                type(error).__name__,
+                extra={
+                    "fields": _call_fields(qualname, "error", duration_ms, args, kwargs)
+                    | {"error": f"{type(error).__name__}: {error}"}
+                },
+            )
+        else:
+            func_logger.error(
+                "%s error: %s: %s, duration: %.2fms",
+                func_name,
+                type(error).__name__,
+                error,
+                duration_ms,
+            )
 
-            # Log output and duration
+    def done(result: Any, as_fields: bool, start_time: float, args: tuple, kwargs: dict) -> None:
+        """Log the output and the duration of a sampled call."""
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if as_fields:
+            fields = _call_fields(qualname, "ok", duration_ms, args, kwargs)
+            fields["result"] = summarize(result)
+            func_logger.log(
+                level,
+                "%s ok in %.2fms",
+                func_name,
+                duration_ms,
+                extra={"fields": fields},
+            )
+        else:
             func_logger.log(
                 level,
-                f"{func_name} output: {result!r}, duration: {duration_ms:.2f}ms",
+                "%s output: %r, duration: %.2fms",
+                func_name,
+                result,
+                duration_ms,
             )
 
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            enabled, as_fields, start_time = begin(args, kwargs)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                failed(e, as_fields, start_time, args, kwargs)
+                raise
+            if enabled:
+                done(result, as_fields, start_time, args, kwargs)
             return result
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        enabled, as_fields, start_time = begin(args, kwargs)
+        try:
+            result = func(*args, **kwargs)
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            failed(e, as_fields, start_time, args, kwargs)
+            raise
+        if enabled:
+            done(result, as_fields, start_time, args, kwargs)
+        return result
 
-            # Log error and duration
-            func_logger.error(
-                f"{func_name} error: {type(e).__name__}: {e}, duration: {duration_ms:.2f}ms"
+    return wrapper
+
+
+class _StreamLog:
+    """Timing and logging of one streamed call."""
+
+    def __init__(
+        self,
+        func_logger: logging.Logger,
+        level: int,
+        func: Callable[..., Any],
+        as_fields: bool,
+        enabled: bool,
+        args: tuple,
+        kwargs: dict,
+    ):
+        self.logger = func_logger
+        self.level = level
+        self.name = func.__name__
+        self.qualname = func.__qualname__
+        self.as_fields = as_fields
+        self.enabled = enabled
+        self.args = args
+        self.kwargs = kwargs
+        self.items = 0
+        self.first_item_ms: float | None = None
+        self.start = time.perf_counter()
+        if enabled and not as_fields:
+            func_logger.log(
+                level, "Streaming %s with input: args=%r, kwargs=%r", self.name, args, kwargs
             )
+
+    def item(self) -> None:
+        """Count a yielded item, timing the first one."""
+        if self.items == 0:
+            self.first_item_ms = (time.perf_counter() - self.start) * 1000
+        self.items += 1
+
+    def done(self) -> None:
+        """Log a completed stream."""
+        if not self.enabled:
+            return
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        if self.as_fields:
+            fields = self._fields("ok", duration_ms)
+            self.logger.log(
+                self.level,
+                "%s streamed %d items in %.2fms",
+                self.name,
+                self.items,
+                duration_ms,
+                extra={"fields": fields},
+            )
+        else:
+            self.logger.log(
+                self.level,
+                "%s streamed %d items, first item: %sms, duration: %.2fms",
+                self.name,
+                self.items,
+                "-" if self.first_item_ms is None else f"{self.first_item_ms:.2f}",
+                duration_ms,
+            )
+
+    def failed(self, error: Exception) -> None:
+        """Log a stream that raised (always, regardless of sampling)."""
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        if self.as_fields:
+            fields = self._fields("error", duration_ms)
+            fields["error"] = f"{type(error).__name__}: {error}"
+            self.logger.error(
+                "%s error: %s", self.name, type(error).__name__, extra={"fields": fields}
+            )
+        else:
+            self.logger.error(
+                "%s error after %d items: %s: %s, duration: %.2fms",
+                self.name,
+                self.items,
+                type(error).__name__,
+                error,
+                duration_ms,
+            )
+
+    def _fields(self, status: str, duration_ms: float) -> dict[str, Any]:
+        """Structured fields of the stream."""
+        fields = _call_fields(self.qualname, status, duration_ms, self.args, self.kwargs)
+        fields["items"] = self.items
+        fields["first_item_ms"] = (
+            None if self.first_item_ms is None else round(self.first_item_ms, 3)
+        )
+        return fields
+
+
+def _create_stream_log_wrapper(
+    func: Callable[..., Any],
+    level: int,
+    logger_name: str | None,
+    structured: bool | None,
+    sample_rate: float | None,
+) -> Callable[..., Any]:
+    """Create a logging wrapper for a sync or async generator function.
+
+    The wrapper passes items through untouched and logs once the stream is
+    exhausted, including the time to the first item (e.g. first token).
+    A stream closed early by the consumer is logged as completed.
+    """
+    func_logger = logging.getLogger(logger_name) if logger_name else logger
+
+    def start(args: tuple, kwargs: dict) -> _StreamLog:
+        enabled = func_logger.isEnabledFor(level)
+        if enabled:
+            rate = sample_rate if sample_rate is not None else get_sample_rate(func.__qualname__)
+            enabled = rate >= 1.0 or random.random() < rate
+        as_fields = structured if structured is not None else is_structured()
+        return _StreamLog(func_logger, level, func, as_fields, enabled, args, kwargs)
+
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log = start(args, kwargs)
+            items = func(*args, **kwargs)
+            try:
+                async for item in items:
+                    log.item()
+                    yield item
+            except GeneratorExit:
+                log.done()
+                raise
+            except Exception as e:
+                log.failed(e)
+                raise
+            finally:
+                await items.aclose()
+            log.done()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        log = start(args, kwargs)
+        try:
+            for item in func(*args, **kwargs):
+                log.item()
+                yield item
+        except GeneratorExit:
+            log.done()
+            raise
+        except Exception as e:
+            log.failed(e)
             raise
+        log.done()
 
     return wrapper
 
 
-__all__ = ["retry", "rate_limit", "log_call"]
+def _call_fields(
+    qualname: str, status: str, duration_ms: float, args: tuple, kwargs: dict
+) -> dict[str, Any]:
+    """Structured fields describing one call."""
+    return {
+        "event": "call",
+        "function": qualname,
+        "status": status,
+        "duration_ms": round(duration_ms, 3),
+        "args": summarize(args),
+        "kwargs": summarize(kwargs),
+    }
+
+
+__all__ = [
+    "retry",
+    "rate_limit",
+    "log_call",
+    "TokenBucket",
+    "RateLimiter",
+    "get_rate_limiter",
+    "token_bucket",
+    "estimate_tokens",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryBudget",
+    "call_with_failover",
+    "acall_with_failover",
+    "stream_with_failover",
+    "astream_with_failover",
+    "get_circuit_breaker",
+    "get_retry_budget",
+    "is_retryable",
+    "retry_after",
+    "SingleFlight",
+    "fingerprint",
+    "get_single_flight",
+    "single_flight",
+    "JsonFormatter",
+    "configure_logging",
+    "shutdown_logging",
+    "summarize",
+]
@@ -0,0 +1,347 @@
+"""Token-bucket rate limiting with named, shared buckets.
+
+A :class:`TokenBucket` refills continuously at ``rate`` tokens per second
+up to ``capacity``. Acquisition reserves tokens immediately under a short
+per-bucket lock, letting the balance go negative, and then sleeps outside
+the lock until the debt is repaid. Callers are therefore served in arrival
+order, no lock is held while waiting, and :meth:`TokenBucket.aacquire`
+awaits ``asyncio.sleep`` instead of blocking a thread.
+
+Provider quotas are usually stated per minute for both requests and
+tokens; :class:`RateLimiter` combines one bucket of each and is shared by
+name through :func:`get_rate_limiter`, so every client instance talking to
+the same provider draws from the same quota.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Named limiters shared across client instances
+_limiters: dict[str, "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket with blocking and async acquisition."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum tokens held, i.e. the allowed burst. Defaults
+                      to ``rate`` (one second of tokens).
+
+        Raises:
+            ValueError: If rate or capacity is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        capacity = rate if capacity is None else capacity
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "tokens": 0.0,
+            "waited": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative while callers are waiting)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Counters: acquired calls, tokens, calls that waited, total and max wait (s)."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reserve(self, cost: float = 1.0, max_wait: float | None = None) -> float | None:
+        """Reserve tokens and return how long the caller must wait before using them.
+
+        Args:
+            cost: Tokens to take.
+            max_wait: Longest acceptable wait in seconds; None accepts any.
+
+        Returns:
+            Seconds to wait, or None if the wait would exceed max_wait (in
+            which case nothing is reserved).
+
+        Raises:
+            ValueError: If cost is negative.
+        """
+        if cost < 0:
+            raise ValueError(f"cost must be non-negative, got {cost}")
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (cost - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= cost
+            self._record(cost, wait)
+            return wait
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take tokens only if they are available right now."""
+        return self.reserve(cost, max_wait=0.0) is not None
+
+    def acquire(self, cost: float = 1.0, timeout: float | None = None) -> float:
+        """Take tokens, sleeping until they are available.
+
+        Args:
+            cost: Tokens to take.
+            timeout: Longest acceptable wait in seconds; None waits as needed.
+
+        Returns:
+            Seconds waited.
+
+        Raises:
+            TimeoutError: If the wait would exceed timeout (nothing is taken).
+        """
+        wait = self.reserve(cost, max_wait=timeout)
+        if wait is None:
+            raise TimeoutError(f"Rate limit wait exceeds timeout of {timeout}s")
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, cost: float = 1.0, timeout: float | None = None) -> float:
+        """Async variant of :meth:`acquire` that awaits instead of sleeping."""
+        wait = self.reserve(cost, max_wait=timeout)
+        if wait is None:
+            raise TimeoutError(f"Rate limit wait exceeds timeout of {timeout}s")
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _refill(self, now: float) -> None:
+        """Add tokens earned since the last update (called with the lock held)."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _record(self, cost: float, wait: float) -> None:
+        """Update counters (called with the lock held)."""
+        stats = self._stats
+        stats["acquired"] += 1
+        stats["tokens"] += cost
+        if wait > 0:
+            stats["waited"] += 1
+            stats["total_wait"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute quota of one provider.
+
+    Each limit is a :class:`TokenBucket` holding one minute of budget, so a
+    fresh limiter allows a full minute's quota as a burst. A call takes one
+    request and its estimated token cost; it waits for whichever bucket
+    needs longer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ):
+        """Initialize the quota buckets.
+
+        Args:
+            name: Name of the quota (used in the shared registry).
+            requests_per_minute: Request quota; None means unlimited.
+            tokens_per_minute: Token quota; None means unlimited.
+
+        Raises:
+            ValueError: If a quota is not positive.
+        """
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = (
+            TokenBucket(requests_per_minute / 60.0, requests_per_minute)
+            if requests_per_minute is not None
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute)
+            if tokens_per_minute is not None
+            else None
+        )
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Stats of each configured bucket, keyed by ``requests`` and ``tokens``."""
+        stats = {}
+        if self.requests is not None:
+            stats["requests"] = self.requests.stats
+        if self.tokens is not None:
+            stats["tokens"] = self.tokens.stats
+        return stats
+
+    def acquire(self, tokens: float = 0.0) -> float:
+        """Take one request and ``tokens`` tokens, sleeping as needed.
+
+        Returns:
+            Seconds waited.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: float = 0.0) -> float:
+        """Async variant of :meth:`acquire`."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self, tokens: float) -> float:
+        """Reserve from both buckets and return the longer wait."""
+        # Without max_wait, reserve() always reserves and never returns None.
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1.0) or 0.0)
+        if self.tokens is not None and tokens > 0:
+            wait = max(wait, self.tokens.reserve(tokens) or 0.0)
+        return wait
+
+
+def get_rate_limiter(
+    name: str,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+) -> RateLimiter:
+    """Return the shared limiter called ``name``, creating it on first use.
+
+    Args:
+        name: Quota name, e.g. ``"openai:gpt-4o"``.
+        requests_per_minute: Request quota for a new limiter.
+        tokens_per_minute: Token quota for a new limiter.
+
+    Returns:
+        The RateLimiter registered under ``name``.
+
+    Raises:
+        ValueError: If the limiter exists with different quotas.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(name, requests_per_minute, tokens_per_minute)
+            _limiters[name] = limiter
+        elif (limiter.requests_per_minute, limiter.tokens_per_minute) != (
+            requests_per_minute,
+            tokens_per_minute,
+        ):
+            raise ValueError(
+                f"Rate limiter '{name}' already exists with requests_per_minute="
+                f"{limiter.requests_per_minute}, tokens_per_minute={limiter.tokens_per_minute}"
+            )
+        return limiter
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text for quota accounting.
+
+    Counts about four ASCII characters per token and one token per other
+    character (CJK text is close to one token per character).
+    """
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return max(1, (ascii_chars + 3) // 4 + len(text) - ascii_chars)
+
+
+def token_bucket(
+    name: str,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+    cost: Callable[..., float] | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator drawing each call from a shared, named quota.
+
+    Works on sync functions (blocking wait), coroutine functions (awaited
+    wait) and sync or async generator functions, which wait when iteration
+    starts. All functions decorated with the same ``name`` share one
+    :class:`RateLimiter`.
+
+    Args:
+        name: Quota name passed to :func:`get_rate_limiter`.
+        requests_per_minute: Request quota.
+        tokens_per_minute: Token quota.
+        cost: Optional function receiving the call's arguments and returning
+              its estimated token cost.
+
+    Returns:
+        Decorated function that waits for quota before each call.
+
+    Example:
+        @token_bucket(
+            "openai",
+            requests_per_minute=500,
+            tokens_per_minute=150_000,
+            cost=lambda self, messages, **kw: sum(estimate_tokens(m.content) for m in messages),
+        )
+        def chat(self, messages, **kwargs): ...
+    """
+    limiter = get_rate_limiter(name, requests_per_minute, tokens_per_minute)
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                limiter.acquire(cost(*args, **kwargs) if cost else 0.0)
+                yield from func(*args, **kwargs)
+
+            return stream_wrapper
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_stream_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await limiter.aacquire(cost(*args, **kwargs) if cost else 0.0)
+                items = func(*args, **kwargs)
+                try:
+                    async for item in items:
+                        yield item
+                finally:
+                    await items.aclose()
+
+            return async_stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await limiter.aacquire(cost(*args, **kwargs) if cost else 0.0)
+                return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            limiter.acquire(cost(*args, **kwargs) if cost else 0.0)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,440 @@
+"""Failure handling primitives: error classification, retry budgets and circuit breakers.
+
+These are SDK-agnostic: provider errors are recognised by duck typing
+(``status_code`` attributes, ``response.headers``) rather than by importing
+the OpenAI, Anthropic or httpx exception classes.
+"""
+
+import email.utils
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+
+# HTTP statuses worth retrying: timeouts, conflicts, throttling and server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# Exception class names of provider SDKs that signal transient failures
+_RETRYABLE_ERROR_NAMES = frozenset(
+    {
+        "APIConnectionError",
+        "APITimeoutError",
+        "RateLimitError",
+        "InternalServerError",
+        "ServiceUnavailableError",
+        "ConnectError",
+        "ReadTimeout",
+        "ConnectTimeout",
+        "RemoteProtocolError",
+    }
+)
+
+# Named breakers and budgets shared by every client of a provider
+_breakers: dict[str, "CircuitBreaker"] = {}
+_budgets: dict[str, "RetryBudget"] = {}
+_registry_lock = threading.Lock()
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+    pass
+
+
+def status_code(error: BaseException) -> int | None:
+    """HTTP status carried by an SDK or httpx exception, if any."""
+    code = getattr(error, "status_code", None)
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient and the call may succeed if repeated.
+
+    Network errors, timeouts, HTTP 408/409/425/429/5xx responses and the
+    equivalent provider SDK exceptions are retryable; client errors such as
+    400 or 401 are not.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, ConnectionError | TimeoutError):
+        return True
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Server-requested delay in seconds attached to an error, if any.
+
+    Reads a ``retry_after`` attribute, or the ``retry-after-ms`` and
+    ``retry-after`` headers of ``error.response`` (seconds or an HTTP date).
+    """
+    hint = getattr(error, "retry_after", None)
+    if isinstance(hint, int | float):
+        return max(0.0, float(hint))
+
+    headers: Any = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    millis = headers.get("retry-after-ms")
+    if millis is not None:
+        try:
+            return max(0.0, float(millis) / 1000.0)
+        except (TypeError, ValueError):
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent calls.
+
+    Every call deposits ``ratio`` tokens and every retry withdraws one, so
+    during an outage at most about ``ratio`` extra requests are sent per
+    call instead of ``max_attempts - 1``. ``min_per_second`` tokens are
+    added over time so that low-traffic callers can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 10.0):
+        """Initialize a full budget.
+
+        Args:
+            ratio: Retry tokens earned per call.
+            min_per_second: Retry tokens earned per second regardless of traffic.
+            capacity: Maximum banked retry tokens.
+
+        Raises:
+            ValueError: If a parameter is negative or capacity is below 1.
+        """
+        if ratio < 0 or min_per_second < 0:
+            raise ValueError("ratio and min_per_second must be non-negative")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        """Credit the budget for one call."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry if the budget allows it."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def _refill(self) -> None:
+        """Add time-based tokens (called with the lock held)."""
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.min_per_second)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one provider.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with :class:`CircuitOpenError`. Once
+    ``recovery_timeout`` seconds have passed it turns half-open and lets
+    up to ``half_open_max_calls`` probe calls through; a successful probe
+    closes the circuit and a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "",
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """Initialize a closed circuit.
+
+        Args:
+            name: Provider name used in error messages.
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds the circuit stays open before probing.
+            half_open_max_calls: Concurrent probe calls allowed when half-open.
+
+        Raises:
+            ValueError: If failure_threshold or half_open_max_calls is below 1.
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("failure_threshold and half_open_max_calls must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through now (counts half-open probes)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit for '{self.name}' is open; failing fast")
+
+    def record_success(self) -> None:
+        """Report a successful call, closing the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        """Report a failed call, opening the circuit at the threshold or on a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot whose call ended without an outcome.
+
+        Called when a probe is cancelled (e.g. ``asyncio.CancelledError``) so
+        that the next caller can probe the provider instead of the circuit
+        staying half-open with no slot left.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _maybe_half_open(self) -> None:
+        """Move from open to half-open after the recovery timeout (lock held)."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+
+def get_circuit_breaker(name: str, **kwargs: Any) -> CircuitBreaker:
+    """Return the shared circuit breaker of a provider, creating it on first use.
+
+    Args:
+        name: Provider name, e.g. ``"llm:openai"``.
+        **kwargs: CircuitBreaker parameters used when creating it.
+
+    Returns:
+        The CircuitBreaker registered under ``name``.
+    """
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **kwargs)
+        return breaker
+
+
+def get_retry_budget(name: str, **kwargs: Any) -> RetryBudget:
+    """Return the shared retry budget of a provider, creating it on first use.
+
+    Args:
+        name: Provider name.
+        **kwargs: RetryBudget parameters used when creating it.
+
+    Returns:
+        The RetryBudget registered under ``name``.
+    """
+    with _registry_lock:
+        budget = _budgets.get(name)
+        if budget is None:
+            budget = _budgets[name] = RetryBudget(**kwargs)
+        return budget
+
+
+def call_with_failover[T](targets: list[tuple[CircuitBreaker, Callable[[], T]]]) -> T:
+    """Call the first provider that is available and succeeds.
+
+    Providers whose breaker is open are skipped. A retryable error is
+    recorded on the provider's breaker and the next provider is tried; any
+    other error is raised immediately, since another provider would most
+    likely reject the same request.
+
+    Args:
+        targets: ``(breaker, call)`` pairs in order of preference.
+
+    Returns:
+        The result of the first successful call.
+
+    Raises:
+        CircuitOpenError: If every breaker is open.
+        Exception: The last retryable error if every available provider failed.
+    """
+    last_error: Exception | None = None
+    for breaker, call in targets:
+        if not breaker.allow_request():
+            continue
+        try:
+            result = call()
+        except Exception as e:
+            last_error = _record_error(breaker, e)
+            continue
+        except BaseException:
+            # Cancelled: no outcome to record, but free the probe slot.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return result
+    if last_error is not None:
+        raise last_error
+    raise CircuitOpenError("Every provider's circuit is open")
+
+
+async def acall_with_failover[T](
+    targets: list[tuple[CircuitBreaker, Callable[[], Awaitable[T]]]],
+) -> T:
+    """Async variant of :func:`call_with_failover`."""
+    last_error: Exception | None = None
+    for breaker, call in targets:
+        if not breaker.allow_request():
+            continue
+        try:
+            result = await call()
+        except Exception as e:
+            last_error = _record_error(breaker, e)
+            continue
+        except BaseException:
+            # Cancelled: no outcome to record, but free the probe slot.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return result
+    if last_error is not None:
+        raise last_error
+    raise CircuitOpenError("Every provider's circuit is open")
+
+
+def stream_with_failover[T](
+    targets: list[tuple[CircuitBreaker, Callable[[], Iterator[T]]]],
+) -> Iterator[T]:
+    """Streaming variant of :func:`call_with_failover`.
+
+    A provider is abandoned only if it fails before producing its first
+    item; once items have been yielded, later errors propagate since the
+    output cannot be replayed from another provider.
+
+    Args:
+        targets: ``(breaker, open_stream)`` pairs in order of preference.
+
+    Yields:
+        The items of the first stream that starts successfully.
+
+    Raises:
+        CircuitOpenError: If every breaker is open.
+        Exception: The last retryable error if every available provider failed.
+    """
+    last_error: Exception | None = None
+    for breaker, open_stream in targets:
+        if not breaker.allow_request():
+            continue
+        items = open_stream()
+        try:
+            first = next(items)
+        except StopIteration:
+            breaker.record_success()
+            return
+        except Exception as e:
+            last_error = _record_error(breaker, e)
+            continue
+        except BaseException:
+            # Cancelled: no outcome to record, but free the probe slot.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        yield first
+        yield from items
+        return
+    if last_error is not None:
+        raise last_error
+    raise CircuitOpenError("Every provider's circuit is open")
+
+
+async def astream_with_failover[T](
+    targets: list[tuple[CircuitBreaker, Callable[[], AsyncIterator[T]]]],
+) -> AsyncIterator[T]:
+    """Async variant of :func:`stream_with_failover`."""
+    last_error: Exception | None = None
+    for breaker, open_stream in targets:
+        if not breaker.allow_request():
+            continue
+        items = open_stream()
+        try:
+            first = await anext(items)
+        except StopAsyncIteration:
+            breaker.record_success()
+            return
+        except Exception as e:
+            last_error = _record_error(breaker, e)
+            continue
+        except BaseException:
+            # Cancelled: no outcome to record, but free the probe slot.
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        yield first
+        async for item in items:
+            yield item
+        return
+    if last_error is not None:
+        raise last_error
+    raise CircuitOpenError("Every provider's circuit is open")
+
+
+def _record_error(breaker: CircuitBreaker, error: Exception) -> Exception:
+    """Record a failed provider call, re-raising errors that are not worth failing over."""
+    if not is_retryable(error):
+        # The provider answered, so the circuit stays closed.
+        breaker.record_success()
+        raise error
+    breaker.record_failure()
+    logger.warning("Provider '%s' failed (%s); trying next", breaker.name, type(error).__name__)
+    return error
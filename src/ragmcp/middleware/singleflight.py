@@ -0,0 +1,278 @@
+"""Single-flight deduplication of identical concurrent calls.
+
+When several callers ask for the same thing at the same time, only the
+first one (the *leader*) runs the computation; the others wait for it and
+receive the same result or exception. Nothing is cached: once the leader
+finishes, the next call with the same key runs again.
+
+Calls are matched on a :func:`fingerprint` of their arguments; callers
+whose keys are free-form queries normalize them with :func:`normalize_text`
+first.
+Leaders and waiters may be threads or asyncio tasks in any mix, since every
+in-flight call is tracked with a thread-safe ``concurrent.futures.Future``.
+"""
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import re
+import threading
+import unicodedata
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# Named groups shared across wrappers
+_flights: dict[str, "SingleFlight"] = {}
+_flights_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize query text for request matching.
+
+    Applies Unicode NFC, collapses runs of whitespace into one space and
+    strips both ends, so queries differing only in spacing share a key.
+    Only use it where such queries are equivalent (e.g. search queries):
+    chat messages and texts to embed differ when their whitespace does.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash identifying a request.
+
+    Strings are hashed exactly, containers and dataclasses (e.g.
+    :class:`~ragmcp.llm.base.Message`) are walked, arrays are hashed by
+    content, and any other object is identified by its type and ``id()``,
+    so two requests only match through the same instance.
+
+    Args:
+        *parts: Values making up the request (text, options, ...).
+
+    Returns:
+        A hex digest.
+    """
+    encoded = json.dumps(_canonical(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-serializable, order-stable form of a value."""
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return {"bytes": hashlib.blake2b(value, digest_size=16).hexdigest()}
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16)
+        return {"ndarray": [str(value.dtype), list(value.shape), digest.hexdigest()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {f.name: _canonical(getattr(value, f.name)) for f in dataclasses.fields(value)}
+        return {"type": type(value).__qualname__, "fields": fields}
+    if isinstance(value, list | tuple):
+        return [_canonical(item) for item in value]
+    if isinstance(value, set | frozenset):
+        return sorted((_canonical(item) for item in value), key=repr)
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    return f"{type(value).__qualname__}@{id(value):x}"
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared future when an async leader was cancelled."""
+
+
+class SingleFlight:
+    """Group of in-flight calls deduplicated by key.
+
+    Usage:
+        flight = SingleFlight()
+        result = flight.do(fingerprint(query, top_k), lambda: search(query, top_k))
+    """
+
+    def __init__(self, name: str = "default"):
+        """Initialize an empty group.
+
+        Args:
+            name: Group name, used in statistics and logs.
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Any, Future] = {}
+        self._executed = 0
+        self._shared = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        """Counters: ``executed`` computations and ``shared`` waits on one."""
+        with self._lock:
+            return {"executed": self._executed, "shared": self._shared}
+
+    def do(self, key: Any, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless a call with the same key is already running.
+
+        Args:
+            key: Hashable request key, typically a :func:`fingerprint`.
+            fn: Computation to run when this caller is the leader.
+
+        Returns:
+            The leader's result.
+
+        Raises:
+            Exception: The leader's exception, re-raised in every caller.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                return self._lead(key, future, fn)
+            try:
+                result: T = future.result()
+            except _LeaderCancelled:
+                continue
+            return result
+
+    async def ado(self, key: Any, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of :meth:`do`.
+
+        Waiting does not block the event loop. Cancelling a waiter does not
+        affect the leader; if the leader task is cancelled, waiters elect a
+        new leader and run the computation again.
+
+        Args:
+            key: Hashable request key.
+            fn: Coroutine function to await when this caller is the leader.
+
+        Returns:
+            The leader's result.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = await fn()
+                except asyncio.CancelledError:
+                    self._finish(key, future, error=_LeaderCancelled())
+                    raise
+                except BaseException as e:
+                    self._finish(key, future, error=e)
+                    raise
+                self._finish(key, future, result=result)
+                return result
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                continue
+
+    def _join(self, key: Any) -> tuple[Future, bool]:
+        """Return the in-flight future of a key and whether the caller leads."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self._executed += 1
+            return future, True
+
+    def _lead(self, key: Any, future: Future, fn: Callable[[], T]) -> T:
+        """Run a sync computation and publish its outcome."""
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def _finish(
+        self, key: Any, future: Future, result: Any = None, error: BaseException | None = None
+    ) -> None:
+        """Forget the key, then wake the waiters."""
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the shared group called ``name``, creating it on first use.
+
+    Args:
+        name: Group name; wrappers sharing a name deduplicate together.
+
+    Returns:
+        The SingleFlight registered under ``name``.
+    """
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+
+def single_flight(
+    name: str | None = None,
+    key: Callable[..., Any] | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator sharing one execution between identical concurrent calls.
+
+    Works on sync functions and coroutine functions. Generator functions
+    are not supported: a stream cannot be consumed by several callers.
+
+    Args:
+        name: Group passed to :func:`get_single_flight`; defaults to the
+              function's qualified name.
+        key: Optional function receiving the call's arguments and returning
+             its key. Defaults to a :func:`fingerprint` of all arguments
+             (for methods this includes ``self``, so instances do not share
+             calls).
+
+    Returns:
+        Decorated function.
+
+    Raises:
+        ValueError: If applied to a generator function.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            raise ValueError(f"single_flight cannot wrap generator function {func.__qualname__}")
+        flight = get_single_flight(name or func.__qualname__)
+
+        def make_key(args: tuple, kwargs: dict) -> Any:
+            return key(*args, **kwargs) if key else fingerprint(args, kwargs)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await flight.ado(make_key(args, kwargs), lambda: func(*args, **kwargs))
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return flight.do(make_key(args, kwargs), lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
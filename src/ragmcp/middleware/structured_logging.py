@@ -0,0 +1,215 @@
+"""Structured, sampled call logging with a non-blocking sink.
+
+In structured mode :func:`ragmcp.middleware.log_call` emits one record per
+call whose ``fields`` attribute holds the function name, status, duration
+and *summaries* of the arguments and result: arrays are reduced to their
+shape and dtype, long strings to their length and a short hash, and long
+sequences to their length and a summary of the first item. Nothing is
+summarized unless the record will actually be emitted.
+
+:func:`configure_logging` applies the ``observability.logging`` section:
+records go through a :class:`logging.handlers.QueueHandler` to a
+:class:`logging.handlers.QueueListener` thread that owns the file or stream
+handler, so a logging call never waits on disk I/O.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Strings and reprs longer than this are summarized instead of logged.
+MAX_INLINE_LENGTH = 200
+
+# Sequences and mappings with more items than this are summarized.
+MAX_INLINE_ITEMS = 16
+
+# Process-wide settings applied by configure_logging
+_settings: dict[str, Any] = {"structured": False, "sample_rates": {}}
+_listener: logging.handlers.QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+def summarize(value: Any, depth: int = 0) -> Any:
+    """JSON-serializable summary of a value for logging.
+
+    Small scalars and short strings are returned as is; arrays, long
+    strings, large containers and arbitrary objects are replaced by a
+    compact description, so the cost does not grow with payload size.
+
+    Args:
+        value: Value to summarize.
+        depth: Current nesting depth (containers below depth 2 are not expanded).
+
+    Returns:
+        A value suitable for ``json.dumps``.
+    """
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str):
+        if len(value) <= MAX_INLINE_LENGTH:
+            return value
+        digest = hashlib.blake2b(value.encode("utf-8", "replace"), digest_size=6).hexdigest()
+        return {"type": "str", "len": len(value), "hash": digest}
+    if isinstance(value, np.ndarray):
+        return {"type": "ndarray", "shape": list(value.shape), "dtype": str(value.dtype)}
+    if isinstance(value, list | tuple | set | frozenset):
+        items = list(value) if not isinstance(value, list | tuple) else value
+        if len(items) <= MAX_INLINE_ITEMS and depth < 2 and not _has_array(items):
+            return [summarize(item, depth + 1) for item in items]
+        summary = {"type": type(value).__name__, "len": len(items)}
+        if items:
+            summary["first"] = summarize(items[0], depth + 1)
+        return summary
+    if isinstance(value, dict):
+        if len(value) <= MAX_INLINE_ITEMS and depth < 2:
+            return {str(k): summarize(v, depth + 1) for k, v in value.items()}
+        return {"type": "dict", "len": len(value)}
+    text = repr(value)
+    if len(text) <= MAX_INLINE_LENGTH:
+        return text
+    return {"type": type(value).__name__, "repr": text[:MAX_INLINE_LENGTH] + "..."}
+
+
+def _has_array(items: list | tuple) -> bool:
+    """Whether a sequence directly holds NumPy arrays."""
+    return any(isinstance(item, np.ndarray) for item in items)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line.
+
+    The object holds ``time``, ``level``, ``logger`` and ``message`` plus
+    every key of the record's ``fields`` attribute, if present.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as JSON."""
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def is_structured() -> bool:
+    """Whether log_call defaults to structured records."""
+    return bool(_settings["structured"])
+
+
+def get_sample_rate(name: str) -> float:
+    """Configured sampling rate of a function's successful calls (default 1.0)."""
+    return float(_settings["sample_rates"].get(name, 1.0))
+
+
+def configure_logging(config: dict | None = None, logger_name: str = "ragmcp") -> None:
+    """Apply an ``observability.logging`` section.
+
+    Config keys:
+        level: Level of the ``ragmcp`` logger (default INFO).
+        format: ``json`` for structured records, ``text`` otherwise.
+        file: Log file path; records go to stderr when unset.
+        sampling: Mapping of function ``__qualname__`` to the fraction of
+                  successful calls log_call records (errors are always
+                  recorded).
+
+    Calling it again replaces the previous sink.
+
+    Args:
+        config: The ``observability.logging`` configuration dictionary.
+        logger_name: Logger receiving the queue handler.
+
+    Raises:
+        ValueError: If a sampling rate is outside [0, 1].
+    """
+    config = config or {}
+    rates = {str(name): float(rate) for name, rate in (config.get("sampling") or {}).items()}
+    for name, rate in rates.items():
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sampling rate for '{name}' must be in [0, 1], got {rate}")
+
+    structured = config.get("format", "text") == "json"
+    path = config.get("file")
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        target: logging.Handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        target = logging.StreamHandler()
+    target.setFormatter(
+        JsonFormatter()
+        if structured
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    shutdown_logging(logger_name)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    target_logger = logging.getLogger(logger_name)
+    target_logger.addHandler(_QueueHandler(log_queue))
+    target_logger.setLevel(config.get("level", "INFO"))
+
+    global _listener
+    with _listener_lock:
+        _listener = listener
+        _settings["structured"] = structured
+        _settings["sample_rates"] = rates
+    listener.start()
+
+
+def shutdown_logging(logger_name: str = "ragmcp") -> None:
+    """Undo configure_logging: flush queued records and stop the sink thread."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+        _settings["structured"] = False
+        _settings["sample_rates"] = {}
+    target_logger = logging.getLogger(logger_name)
+    for handler in list(target_logger.handlers):
+        if isinstance(handler, _QueueHandler):
+            target_logger.removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler leaving the layout to the sink's formatter.
+
+    The base class bakes its own formatter's output into ``msg``; this one
+    only resolves the message arguments and the traceback text, which may
+    reference objects that change after the call returns.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy a record so it can be formatted on the sink thread."""
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+atexit.register(shutdown_logging)
@@ -1,5 +1,34 @@
 """RAG Pipeline components module."""
 
-from ragmcp.pipeline.base import Chunk, Document, Loader, Splitter, Transform
+from ragmcp.pipeline.base import (
+    Chunk,
+    ChunkView,
+    Document,
+    Loader,
+    PagedLoader,
+    Splitter,
+    Transform,
+)
+from ragmcp.pipeline.batch import ChunkBatch
+from ragmcp.pipeline.history import FileState, IngestionHistory, ScanResult, calculate_file_hash
+from ragmcp.pipeline.ingestion import IngestionPipeline, IngestionStats
+from ragmcp.pipeline.parallel_loader import ParallelLoader, WorkerCrashedError
 
-__all__ = ["Document", "Chunk", "Loader", "Splitter", "Transform"]
+__all__ = [
+    "Document",
+    "Chunk",
+    "Loader",
+    "Splitter",
+    "Transform",
+    "PagedLoader",
+    "ChunkView",
+    "ChunkBatch",
+    "IngestionPipeline",
+    "IngestionStats",
+    "ParallelLoader",
+    "WorkerCrashedError",
+    "IngestionHistory",
+    "FileState",
+    "ScanResult",
+    "calculate_file_hash",
+]
@@ -1,8 +1,13 @@
 """RAG Pipeline component base abstractions."""
 
 from abc import ABC, abstractmethod
+from collections import ChainMap
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ragmcp.pipeline.batch import ChunkBatch
 
 
 @dataclass
@@ -31,6 +36,101 @@ class Chunk:
     metadata: dict[str, Any]
 
 
+class ChunkView:
+    """A chunk that references its parent Document instead of copying it.
+
+    Holds only the ``[start_offset, end_offset)`` range of the document and
+    its position; ``text`` is sliced from the document on access and never
+    stored. All views of a document share its metadata dict: ``metadata``
+    layers the chunk's position (``chunk_index``, ``start_offset``,
+    ``end_offset``) and its own entries over it, and writes only touch the
+    chunk's own entries.
+
+    With overlapping chunks, a Chunk per window stores every character more
+    than once plus a metadata dict; a view costs a fixed ~80 bytes. It can
+    be used wherever a Chunk is read (``text`` and ``metadata``), and
+    :meth:`materialize` turns it into a standalone Chunk.
+    """
+
+    __slots__ = ("document", "start_offset", "end_offset", "chunk_index", "_own")
+
+    def __init__(
+        self,
+        document: Document,
+        start_offset: int,
+        end_offset: int,
+        chunk_index: int = 0,
+    ):
+        """Initialize a view.
+
+        Args:
+            document: The parent document.
+            start_offset: Offset of the first character in ``document.text``.
+            end_offset: Offset after the last character.
+            chunk_index: Position of the chunk within the document.
+
+        Raises:
+            ValueError: If the range is not within the document.
+        """
+        if not 0 <= start_offset <= end_offset <= len(document.text):
+            raise ValueError(
+                f"Invalid chunk range [{start_offset}, {end_offset}) "
+                f"for a document of length {len(document.text)}"
+            )
+        self.document = document
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.chunk_index = chunk_index
+        self._own: dict[str, Any] | None = None
+
+    @classmethod
+    def from_spans(
+        cls, document: Document, spans: Iterable[tuple[int, int]]
+    ) -> Iterator["ChunkView"]:
+        """Yield a view per ``(start, end)`` span, numbered in order.
+
+        Args:
+            document: The parent document.
+            spans: Character ranges of the chunks.
+
+        Yields:
+            ChunkView objects.
+        """
+        for index, (start, end) in enumerate(spans):
+            yield cls(document, start, end, index)
+
+    @property
+    def text(self) -> str:
+        """The chunk text, sliced from the document."""
+        return self.document.text[self.start_offset : self.end_offset]
+
+    @property
+    def metadata(self) -> ChainMap:
+        """Chunk entries and position layered over the shared document metadata."""
+        if self._own is None:
+            self._own = {}
+        position = {
+            "chunk_index": self.chunk_index,
+            "start_offset": self.start_offset,
+            "end_offset": self.end_offset,
+        }
+        return ChainMap(self._own, position, self.document.metadata)
+
+    def __len__(self) -> int:
+        """Length of the chunk text."""
+        return self.end_offset - self.start_offset
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkView(chunk_index={self.chunk_index}, "
+            f"start_offset={self.start_offset}, end_offset={self.end_offset})"
+        )
+
+    def materialize(self) -> Chunk:
+        """Copy the view into a standalone Chunk with a plain metadata dict."""
+        return Chunk(text=self.text, metadata=dict(self.metadata))
+
+
 class Loader(ABC):
     """Abstract base class for document loader implementations.
 
@@ -51,6 +151,44 @@ class Loader(ABC):
         ...
 
 
+class PagedLoader(Loader):
+    """Loader for paginated formats (e.g. PDF) that can parse a page range.
+
+    Lets :class:`~ragmcp.pipeline.parallel_loader.ParallelLoader` split a
+    very large file into page ranges parsed by different workers.
+    """
+
+    @abstractmethod
+    def page_count(self, file_path: str) -> int:
+        """Return the number of pages of a file.
+
+        Args:
+            file_path: Path to the document file.
+
+        Returns:
+            Number of pages.
+        """
+        ...
+
+    @abstractmethod
+    def load_pages(self, file_path: str, start: int, end: int) -> Document:
+        """Load and parse the pages ``[start, end)`` of a file.
+
+        Args:
+            file_path: Path to the document file.
+            start: First page (0-based).
+            end: Page after the last one.
+
+        Returns:
+            A Document holding the text of those pages.
+        """
+        ...
+
+    def load(self, file_path: str) -> Document:
+        """Load every page of the file."""
+        return self.load_pages(file_path, 0, self.page_count(file_path))
+
+
 class Splitter(ABC):
     """Abstract base class for document splitter implementations.
 
@@ -70,6 +208,63 @@ class Splitter(ABC):
         """
         ...
 
+    def iter_split(self, document: Document) -> Iterator[Chunk]:
+        """Yield the chunks of a document one at a time.
+
+        Used by the streaming ingestion pipeline. The default
+        implementation iterates over :meth:`split`; splitters that can emit
+        chunks incrementally should override it so that the chunks of a
+        large document are never all held at once. Offset-based splitters
+        may yield :class:`ChunkView` objects instead of copying the text.
+
+        Args:
+            document: The Document to split.
+
+        Yields:
+            Chunk objects in document order.
+        """
+        yield from self.split(document)
+
+    def iter_split_batches(self, document: Document, batch_size: int) -> Iterator["ChunkBatch"]:
+        """Yield the chunks of a document as columnar batches.
+
+        The default implementation groups :meth:`iter_split`; splitters that
+        compute chunk boundaries in bulk can build the batches directly.
+
+        Args:
+            document: The Document to split.
+            batch_size: Maximum chunks per batch.
+
+        Yields:
+            ChunkBatch objects in document order, numbered from 0.
+        """
+        from ragmcp.pipeline.batch import ChunkBatch
+
+        source = document.metadata.get("source")
+        group: list[Chunk] = []
+        first_index = 0
+        for chunk in self.iter_split(document):
+            group.append(chunk)
+            if len(group) >= batch_size:
+                yield ChunkBatch.from_chunks(group, source, first_index)
+                first_index += len(group)
+                group = []
+        if group:
+            yield ChunkBatch.from_chunks(group, source, first_index)
+
+    def split_batch(self, document: Document) -> "ChunkBatch":
+        """Split a document into a single columnar batch.
+
+        Args:
+            document: The Document to split.
+
+        Returns:
+            A ChunkBatch holding every chunk.
+        """
+        from ragmcp.pipeline.batch import ChunkBatch
+
+        return ChunkBatch.from_chunks(self.iter_split(document), document.metadata.get("source"))
+
 
 class Transform(ABC):
     """Abstract base class for chunk transformation implementations.
@@ -89,3 +284,18 @@ class Transform(ABC):
             An enhanced Chunk with additional metadata or modified content.
         """
         ...
+
+    def transform_batch(self, batch: "ChunkBatch") -> "ChunkBatch":
+        """Transform every chunk of a columnar batch.
+
+        The default implementation applies :meth:`transform` row by row.
+        Transforms that can work on whole columns (e.g. a vectorized text
+        cleanup or a batched LLM call) should override it.
+
+        Args:
+            batch: The chunks to transform.
+
+        Returns:
+            A batch with one transformed chunk per input chunk.
+        """
+        return batch.with_chunks([self.transform(chunk) for chunk in batch.to_chunks()])
@@ -0,0 +1,280 @@
+"""Columnar batches of chunks.
+
+A :class:`ChunkBatch` stores the chunks handed between pipeline stages as
+columns instead of a ``list[Chunk]``: texts and metadata as lists, chunk
+indices and character offsets as NumPy arrays, ids and content hashes as
+fixed-width byte arrays, and the embeddings as one matrix once computed.
+Id generation, deduplication, selection and concatenation then work on
+whole columns instead of looping over Python objects.
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping, Sequence, Sized
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from ragmcp.embedding.quantization import EmbeddingMatrix
+from ragmcp.pipeline.base import Chunk
+
+# Bytes of the blake2b content hash of a chunk
+HASH_SIZE = 16
+
+# Offset column value for chunks without a known position
+NO_OFFSET = -1
+
+
+def hash_texts(texts: Sequence[str]) -> np.ndarray:
+    """Blake2b content hashes of texts as an ``S16`` array."""
+    digests = b"".join(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=HASH_SIZE).digest() for text in texts
+    )
+    return np.frombuffer(digests, dtype=f"S{HASH_SIZE}").copy()
+
+
+def make_ids(sources: Sequence[str], chunk_indices: np.ndarray) -> np.ndarray:
+    """Default chunk ids ``b"<source>#<chunk_index>"`` as a byte array."""
+    if len(sources) == 0:
+        return np.empty(0, dtype="S1")
+    prefixes = np.char.add(np.char.encode(np.asarray(sources, dtype=str), "utf-8"), b"#")
+    return np.char.add(prefixes, np.asarray(chunk_indices).astype("S20"))
+
+
+@dataclass
+class ChunkBatch:
+    """Columnar container for the chunks of one pipeline batch.
+
+    Attributes:
+        texts: Chunk texts.
+        metadata: Per-chunk metadata mappings (may be shared between chunks).
+        sources: Source path of every chunk.
+        ids: Chunk ids, UTF-8 encoded in a fixed-width byte array.
+        hashes: Blake2b content hashes of the texts (``S16``).
+        chunk_indices: Position of every chunk within its document.
+        start_offsets: Offset of every chunk in its document (-1 if unknown).
+        end_offsets: Offset after every chunk (-1 if unknown).
+        embeddings: Embedding matrix of the texts once computed, else None.
+    """
+
+    texts: list[str]
+    metadata: list[Mapping[str, Any]]
+    sources: list[str]
+    ids: np.ndarray
+    hashes: np.ndarray
+    chunk_indices: np.ndarray
+    start_offsets: np.ndarray
+    end_offsets: np.ndarray
+    embeddings: EmbeddingMatrix | None = None
+
+    def __post_init__(self):
+        """Check that every column has one entry per chunk.
+
+        Raises:
+            ValueError: If the column lengths differ.
+        """
+        size = len(self.texts)
+        columns: dict[str, Sized] = {
+            "metadata": self.metadata,
+            "sources": self.sources,
+            "ids": self.ids,
+            "hashes": self.hashes,
+            "chunk_indices": self.chunk_indices,
+            "start_offsets": self.start_offsets,
+            "end_offsets": self.end_offsets,
+        }
+        if self.embeddings is not None:
+            columns["embeddings"] = self.embeddings
+        for name, column in columns.items():
+            if len(column) != size:
+                raise ValueError(
+                    f"ChunkBatch column {name} has {len(column)} rows, expected {size}"
+                )
+
+    def __len__(self) -> int:
+        """Number of chunks."""
+        return len(self.texts)
+
+    @classmethod
+    def empty(cls) -> "ChunkBatch":
+        """A batch without chunks."""
+        return cls.from_chunks([])
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[Any],
+        source: str | None = None,
+        first_index: int = 0,
+    ) -> "ChunkBatch":
+        """Build a batch from Chunk or ChunkView objects.
+
+        A chunk's ``chunk_id`` metadata becomes its id; chunks without one get
+        ``"<source>#<chunk_index>"``.
+
+        Args:
+            chunks: Chunks of one document, in order.
+            source: Source of chunks whose metadata has none.
+            first_index: Chunk index of the first chunk within its document.
+
+        Returns:
+            The batch.
+        """
+        texts: list[str] = []
+        metadata: list[Mapping[str, Any]] = []
+        sources: list[str] = []
+        explicit: list[bytes] = []
+        starts: list[int] = []
+        ends: list[int] = []
+        for chunk in chunks:
+            meta = chunk.metadata
+            texts.append(chunk.text)
+            metadata.append(meta)
+            sources.append(str(meta.get("source", source or "")))
+            chunk_id = meta.get("chunk_id")
+            explicit.append(b"" if chunk_id is None else str(chunk_id).encode("utf-8"))
+            starts.append(meta.get("start_offset", NO_OFFSET))
+            ends.append(meta.get("end_offset", NO_OFFSET))
+
+        chunk_indices = np.arange(first_index, first_index + len(texts), dtype=np.int64)
+        ids = make_ids(sources, chunk_indices)
+        if any(explicit):
+            given = np.asarray(explicit)
+            ids = np.where(given != b"", given, ids)
+        return cls(
+            texts=texts,
+            metadata=metadata,
+            sources=sources,
+            ids=ids,
+            hashes=hash_texts(texts),
+            chunk_indices=chunk_indices,
+            start_offsets=np.asarray(starts, dtype=np.int64),
+            end_offsets=np.asarray(ends, dtype=np.int64),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["ChunkBatch"]) -> "ChunkBatch":
+        """Concatenate batches; embeddings are kept only if every batch has them.
+
+        Args:
+            batches: Batches to join, in order.
+
+        Returns:
+            One batch holding every chunk.
+        """
+        if len(batches) == 1:
+            return batches[0]
+        if not batches:
+            return cls.empty()
+        embeddings = None
+        matrices = [batch.embeddings for batch in batches if batch.embeddings is not None]
+        if len(matrices) == len(batches):
+            embeddings = _concat_matrices(matrices)
+        return cls(
+            texts=[text for batch in batches for text in batch.texts],
+            metadata=[meta for batch in batches for meta in batch.metadata],
+            sources=[source for batch in batches for source in batch.sources],
+            ids=np.concatenate([batch.ids for batch in batches]),
+            hashes=np.concatenate([batch.hashes for batch in batches]),
+            chunk_indices=np.concatenate([batch.chunk_indices for batch in batches]),
+            start_offsets=np.concatenate([batch.start_offsets for batch in batches]),
+            end_offsets=np.concatenate([batch.end_offsets for batch in batches]),
+            embeddings=embeddings,
+        )
+
+    def take(self, indices: np.ndarray | slice) -> "ChunkBatch":
+        """Select chunks by position (an index array, boolean mask or slice)."""
+        positions: Sequence[int]
+        if isinstance(indices, slice):
+            positions = range(len(self))[indices]
+        else:
+            indices = np.asarray(indices)
+            if indices.dtype == bool:
+                indices = np.flatnonzero(indices)
+            positions = indices.tolist()
+        return ChunkBatch(
+            texts=[self.texts[i] for i in positions],
+            metadata=[self.metadata[i] for i in positions],
+            sources=[self.sources[i] for i in positions],
+            ids=self.ids[indices],
+            hashes=self.hashes[indices],
+            chunk_indices=self.chunk_indices[indices],
+            start_offsets=self.start_offsets[indices],
+            end_offsets=self.end_offsets[indices],
+            embeddings=self.embeddings.rows(indices) if self.embeddings is not None else None,
+        )
+
+    def split(self, size: int) -> list["ChunkBatch"]:
+        """Cut the batch into consecutive batches of at most ``size`` chunks."""
+        if len(self) <= size:
+            return [self]
+        return [self.take(slice(start, start + size)) for start in range(0, len(self), size)]
+
+    def unique_texts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Positions of the first chunk of every distinct text, and the inverse.
+
+        Returns:
+            ``(first, inverse)`` such that ``texts[first[inverse[i]]] == texts[i]``.
+        """
+        _, first, inverse = np.unique(self.hashes, return_index=True, return_inverse=True)
+        return first, inverse.reshape(-1)
+
+    def with_chunks(self, chunks: Sequence[Any]) -> "ChunkBatch":
+        """A copy with new texts and metadata, one chunk per existing row.
+
+        Ids, sources, indices and offsets are kept; hashes are recomputed
+        and embeddings dropped. Used to apply row-wise transforms.
+
+        Raises:
+            ValueError: If the number of chunks differs from the batch size.
+        """
+        texts = [chunk.text for chunk in chunks]
+        return replace(
+            self,
+            texts=texts,
+            metadata=[chunk.metadata for chunk in chunks],
+            hashes=hash_texts(texts),
+            embeddings=None,
+        )
+
+    def with_embeddings(self, embeddings: EmbeddingMatrix) -> "ChunkBatch":
+        """A copy of the batch with its embedding matrix attached.
+
+        Raises:
+            ValueError: If the matrix does not have one row per chunk.
+        """
+        return replace(self, embeddings=embeddings)
+
+    def id_strings(self) -> list[str]:
+        """Chunk ids decoded to strings."""
+        return [chunk_id.decode("utf-8") for chunk_id in self.ids.tolist()]
+
+    def payloads(self, id_field: str = "id") -> list[dict]:
+        """Vector store payloads: id, text, metadata, source and chunk_id."""
+        payloads = []
+        for chunk_id, text, meta, source in zip(
+            self.id_strings(), self.texts, self.metadata, self.sources, strict=True
+        ):
+            payload = {id_field: chunk_id, "text": text, **meta}
+            payload.setdefault("source", source)
+            payload.setdefault("chunk_id", chunk_id)
+            payloads.append(payload)
+        return payloads
+
+    def to_chunks(self) -> list[Chunk]:
+        """Row-wise Chunks with a plain metadata dict each."""
+        chunks = []
+        for position, (text, meta) in enumerate(zip(self.texts, self.metadata, strict=True)):
+            chunk_metadata = dict(meta)
+            chunk_metadata.setdefault("source", self.sources[position])
+            chunk_metadata.setdefault("chunk_id", self.ids[position].decode("utf-8"))
+            chunks.append(Chunk(text=text, metadata=chunk_metadata))
+        return chunks
+
+
+def _concat_matrices(matrices: list[EmbeddingMatrix]) -> EmbeddingMatrix:
+    """Stack embedding matrices of the same dtype."""
+    values = np.concatenate([matrix.values for matrix in matrices])
+    if matrices[0].scales is None:
+        return EmbeddingMatrix(values)
+    return EmbeddingMatrix(values, np.concatenate([matrix.scales for matrix in matrices]))
@@ -0,0 +1,393 @@
+"""Ingestion history: skip files that were already ingested.
+
+Every ingested file is recorded in an SQLite ``ingestion_history`` table
+keyed by path, with its size, modification time, sha256 and status. Before
+a run, :meth:`IngestionHistory.scan` sorts the input files into changed and
+unchanged ones in two tiers:
+
+1. A file whose ``(size, mtime)`` matches its successful record is
+   unchanged, without reading it. A rescan of an untouched corpus costs
+   one ``stat`` per file and a few indexed lookups per thousand files.
+2. Any other file is hashed. Hashing runs in a thread pool (``hashlib``
+   releases the GIL) with large buffered reads, or ``mmap`` for big files.
+   A file whose content matches a successful record, under its own path
+   (e.g. it was only touched) or another one (a copy), is still unchanged.
+
+The database runs in WAL mode, so readers are never blocked by a writer.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+# Statuses of an ingestion_history record
+STATUS_SUCCESS = "success"
+STATUS_DUPLICATE = "duplicate"
+STATUS_FAILED = "failed"
+
+# Statuses meaning a file's content is already in the vector store
+_DONE = (STATUS_SUCCESS, STATUS_DUPLICATE)
+
+# Paths per lookup query, below SQLite's host parameter limit
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_history (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ingestion_history_sha256 ON ingestion_history (sha256, status);
+"""
+
+
+def calculate_file_hash(
+    file_path: str,
+    buffer_size: int = 1 << 20,
+    mmap_threshold: int = 8 << 20,
+) -> str:
+    """Compute the sha256 of a file's content.
+
+    Args:
+        file_path: Path to the file.
+        buffer_size: Bytes per read for files below ``mmap_threshold``.
+        mmap_threshold: Files at least this large are hashed through
+                        ``mmap`` in one call instead of buffered reads.
+
+    Returns:
+        The 64-character hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size and size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while read := f.readinto(buffer):
+                digest.update(view[:read])
+    return digest.hexdigest()
+
+
+@dataclass
+class FileState:
+    """Size, modification time and content hash of a file on disk.
+
+    Attributes:
+        path: File path as given to the scan.
+        size: Size in bytes.
+        mtime_ns: Modification time in nanoseconds.
+        sha256: Content hash, or None when it was not computed.
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+
+
+@dataclass
+class ScanResult:
+    """Files of a scan sorted by whether they need ingesting.
+
+    Attributes:
+        changed: Files that are new or whose content changed, hashed.
+        unchanged: Paths of files whose content is already ingested.
+        missing: ``(path, error message)`` of files that could not be read.
+    """
+
+    changed: list[FileState]
+    unchanged: list[str]
+    missing: list[tuple[str, str]]
+
+
+class IngestionHistory:
+    """SQLite-backed record of ingested files.
+
+    The connection may be shared between threads; calls are serialized.
+
+    Config keys:
+        path: SQLite database file (default ":memory:").
+        hash_workers: Threads hashing files (default 8).
+        buffer_size: Read size when hashing small files (default 1 MiB).
+        mmap_threshold: Files at least this large are hashed through mmap
+                        (default 8 MiB).
+        scan_batch_size: Files stat-ed, looked up and hashed together by
+                         :meth:`iter_scan` (default 1024).
+
+    Usage:
+        history = IngestionHistory({"path": "data/db/ingestion_history.db"})
+        result = history.scan(paths)
+        ...  # ingest result.changed
+        history.record_many(result.changed)
+    """
+
+    def __init__(self, config: dict | None = None):
+        """Open (or create) the history database.
+
+        Args:
+            config: Ingestion history configuration dictionary.
+
+        Raises:
+            ValueError: If hash_workers or scan_batch_size is not positive.
+        """
+        config = config or {}
+        self.path = str(config.get("path", ":memory:"))
+        self.hash_workers = int(config.get("hash_workers", 8))
+        self.buffer_size = int(config.get("buffer_size", 1 << 20))
+        self.mmap_threshold = int(config.get("mmap_threshold", 8 << 20))
+        self.scan_batch_size = int(config.get("scan_batch_size", 1024))
+        if self.hash_workers <= 0:
+            raise ValueError(f"hash_workers must be positive, got {self.hash_workers}")
+        if self.scan_batch_size <= 0:
+            raise ValueError(f"scan_batch_size must be positive, got {self.scan_batch_size}")
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        """Number of recorded files."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM ingestion_history").fetchone()[0])
+
+    @property
+    def journal_mode(self) -> str:
+        """SQLite journal mode of the database ("wal" for files)."""
+        with self._lock:
+            return str(self._conn.execute("PRAGMA journal_mode").fetchone()[0])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, path: str) -> dict | None:
+        """Record of a file, or None if it was never recorded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, mtime_ns, sha256, status, error, updated_at"
+                " FROM ingestion_history WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("path", "size", "mtime_ns", "sha256", "status", "error", "updated_at")
+        return dict(zip(keys, row, strict=True))
+
+    def should_skip(self, sha256: str) -> bool:
+        """Whether content with this hash was already ingested successfully."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM ingestion_history WHERE sha256 = ? AND status = ? LIMIT 1",
+                (sha256, STATUS_SUCCESS),
+            ).fetchone()
+        return row is not None
+
+    def record(
+        self, state: FileState, status: str = STATUS_SUCCESS, error: str | None = None
+    ) -> None:
+        """Record the outcome of ingesting one file.
+
+        Args:
+            state: The file's state when it was scanned.
+            status: "success", "duplicate" or "failed".
+            error: Error message of a failed file.
+        """
+        self.record_many([state], status, error)
+
+    def record_many(
+        self,
+        states: Iterable[FileState],
+        status: str = STATUS_SUCCESS,
+        error: str | None = None,
+    ) -> None:
+        """Record the outcome of several files in one transaction.
+
+        Args:
+            states: Hashed file states.
+            status: Status stored for every file.
+            error: Error message stored for every file.
+
+        Raises:
+            ValueError: If a state has no sha256.
+        """
+        now = time.time()
+        rows = []
+        for state in states:
+            if state.sha256 is None:
+                raise ValueError(f"Cannot record {state.path} without its sha256")
+            rows.append((state.path, state.size, state.mtime_ns, state.sha256, status, error, now))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ingestion_history"
+                " (path, size, mtime_ns, sha256, status, error, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def scan(self, paths: Iterable[str]) -> ScanResult:
+        """Sort files into changed and unchanged ones.
+
+        Args:
+            paths: File paths to check.
+
+        Returns:
+            The changed files (hashed), unchanged paths and unreadable files.
+        """
+        result = ScanResult([], [], [])
+        for batch in self._iter_batches(paths):
+            changed, unchanged, missing = self._scan_batch(batch)
+            result.changed.extend(changed)
+            result.unchanged.extend(unchanged)
+            result.missing.extend(missing)
+        return result
+
+    def iter_scan(self, paths: Iterable[str]) -> Iterator[ScanResult]:
+        """Scan ``paths`` lazily, one result per ``scan_batch_size`` files."""
+        for batch in self._iter_batches(paths):
+            yield ScanResult(*self._scan_batch(batch))
+
+    def _iter_batches(self, paths: Iterable[str]) -> Iterator[list[str]]:
+        """Group paths into scan batches."""
+        batch: list[str] = []
+        for path in paths:
+            batch.append(str(path))
+            if len(batch) >= self.scan_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _scan_batch(
+        self, paths: list[str]
+    ) -> tuple[list[FileState], list[str], list[tuple[str, str]]]:
+        """Stat, look up and (when needed) hash one batch of files."""
+        states: list[FileState] = []
+        missing: list[tuple[str, str]] = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                missing.append((path, str(e)))
+                continue
+            states.append(FileState(path, stat.st_size, stat.st_mtime_ns))
+
+        records = self._lookup([state.path for state in states])
+        unchanged: list[str] = []
+        to_hash: list[FileState] = []
+        for state in states:
+            record = records.get(state.path)
+            if (
+                record is not None
+                and record[3] in _DONE
+                and (record[0], record[1]) == (state.size, state.mtime_ns)
+            ):
+                unchanged.append(state.path)
+            else:
+                to_hash.append(state)
+
+        hashed, errors = self._hash(to_hash)
+        missing.extend(errors)
+        known = self._successful_hashes({state.sha256 for state in hashed})
+        changed: list[FileState] = []
+        touched: list[FileState] = []
+        copies: list[FileState] = []
+        for state in hashed:
+            record = records.get(state.path)
+            if state.sha256 not in known:
+                changed.append(state)
+            elif record is not None and record[2:] == (state.sha256, STATUS_SUCCESS):
+                touched.append(state)
+            else:
+                copies.append(state)
+
+        # Remember the new stat results so the next scan skips hashing.
+        if touched:
+            self.record_many(touched, STATUS_SUCCESS)
+        if copies:
+            self.record_many(copies, STATUS_DUPLICATE)
+        unchanged.extend(state.path for state in touched + copies)
+        return changed, unchanged, missing
+
+    def _lookup(self, paths: list[str]) -> dict[str, tuple[int, int, str, str]]:
+        """Recorded ``(size, mtime_ns, sha256, status)`` of the given paths."""
+        records: dict[str, tuple[int, int, str, str]] = {}
+        with self._lock:
+            for start in range(0, len(paths), _LOOKUP_BATCH):
+                batch = paths[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for path, *record in self._conn.execute(
+                    "SELECT path, size, mtime_ns, sha256, status FROM ingestion_history"
+                    f" WHERE path IN ({placeholders})",
+                    batch,
+                ):
+                    records[path] = tuple(record)
+        return records
+
+    def _successful_hashes(self, hashes: set[str | None]) -> set[str]:
+        """The hashes among ``hashes`` that were already ingested successfully."""
+        digests = [digest for digest in hashes if digest is not None]
+        known: set[str] = set()
+        with self._lock:
+            for start in range(0, len(digests), _LOOKUP_BATCH):
+                batch = digests[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                known.update(
+                    digest
+                    for (digest,) in self._conn.execute(
+                        "SELECT DISTINCT sha256 FROM ingestion_history"
+                        f" WHERE status = ? AND sha256 IN ({placeholders})",
+                        [STATUS_SUCCESS, *batch],
+                    )
+                )
+        return known
+
+    def _hash(self, states: list[FileState]) -> tuple[list[FileState], list[tuple[str, str]]]:
+        """Hash files in parallel, filling in their sha256."""
+        if not states:
+            return [], []
+
+        def hash_one(state: FileState) -> str | OSError:
+            try:
+                return calculate_file_hash(state.path, self.buffer_size, self.mmap_threshold)
+            except OSError as e:
+                return e
+
+        hashed: list[FileState] = []
+        errors: list[tuple[str, str]] = []
+        workers = min(self.hash_workers, len(states))
+        digests: Iterable[str | OSError]
+        if workers == 1:
+            digests = map(hash_one, states)
+        else:
+            with ThreadPoolExecutor(workers, thread_name_prefix="ingest-hash") as pool:
+                digests = list(pool.map(hash_one, states))
+        for state, digest in zip(states, digests, strict=True):
+            if isinstance(digest, OSError):
+                errors.append((state.path, str(digest)))
+            else:
+                state.sha256 = digest
+                hashed.append(state)
+        return hashed, errors
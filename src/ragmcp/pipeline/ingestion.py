@@ -0,0 +1,475 @@
+"""Streaming ingestion: Loader -> Splitter -> Transform -> embed -> upsert.
+
+Each stage runs in its own pool of worker threads and hands items to the
+next stage through a bounded queue. A slow stage fills its input queue and
+blocks the stages before it (backpressure), so memory stays constant in
+the size of the corpus: at any time only ``queue_size`` items per stage,
+the documents being split and the batches being embedded or upserted are
+held. Chunks travel between stages as columnar
+:class:`~ragmcp.pipeline.batch.ChunkBatch` objects, regrouped to the
+embedding and upsert batch sizes at those boundaries.
+
+A file that fails to load, split or transform is logged, recorded in the
+stats and skipped; an embedding or vector store error stops the run and is
+re-raised by :meth:`IngestionPipeline.run`.
+
+With an :class:`~ragmcp.pipeline.history.IngestionHistory`, files that were
+already ingested are filtered out before loading, and the outcome of every
+file is recorded once the run completes.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.pipeline.base import Document, Loader, Splitter, Transform
+from ragmcp.pipeline.batch import ChunkBatch
+from ragmcp.pipeline.history import STATUS_FAILED, FileState, IngestionHistory
+from ragmcp.pipeline.parallel_loader import ParallelLoader
+from ragmcp.vector_store.base import VectorStore
+
+if TYPE_CHECKING:
+    from ragmcp.retrieval.base import SparseRetriever
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the stop flag while blocked on a queue
+_POLL_INTERVAL = 0.1
+
+# End-of-stream marker passed between stages
+_END = object()
+
+
+class _Stopped(Exception):
+    """Raised inside a worker when the run is being aborted."""
+
+
+@dataclass
+class IngestionStats:
+    """Outcome of an ingestion run.
+
+    Attributes:
+        documents: Documents loaded.
+        chunks: Chunks produced by the splitter (after transforms).
+        upserted: Vectors written to the vector store.
+        skipped: Files skipped as already ingested.
+        failed: ``(path, error message)`` of every skipped file.
+        duration: Wall-clock seconds of the run.
+    """
+
+    documents: int = 0
+    chunks: int = 0
+    upserted: int = 0
+    skipped: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    duration: float = 0.0
+
+
+class _Channel:
+    """Bounded queue between two stages, closed by its last producer."""
+
+    def __init__(self, maxsize: int, producers: int, stop: threading.Event):
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._producers = producers
+        self._lock = threading.Lock()
+        self._stop = stop
+
+    def put(self, item: Any) -> None:
+        """Block until there is room for ``item`` (or the run stops)."""
+        while True:
+            if self._stop.is_set():
+                raise _Stopped
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Next item, ``_END`` once closed, or None after ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._stop.is_set():
+                raise _Stopped
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                continue
+            if item is _END:
+                # Leave the marker for the other consumers.
+                self._queue.put_nowait(_END)
+            return item
+
+    def gather(self, size: int, max_wait: float) -> Iterator[ChunkBatch]:
+        """Regroup incoming chunk batches into batches of about ``size`` chunks.
+
+        A batch is released once it holds ``size`` chunks or no input came
+        for ``max_wait`` seconds; it may exceed ``size`` by less than one
+        input batch.
+
+        Yields:
+            Concatenated batches until the channel is closed and drained.
+        """
+        pending: list[ChunkBatch] = []
+        rows = 0
+        while True:
+            item = self.get(timeout=max_wait if pending else None)
+            if item is not None and item is not _END:
+                pending.append(item)
+                rows += len(item)
+            if pending and (item is None or item is _END or rows >= size):
+                yield ChunkBatch.concat(pending)
+                pending, rows = [], 0
+            if item is _END:
+                return
+
+    def close(self) -> None:
+        """Signal that one producer is done; the last one ends the stream."""
+        with self._lock:
+            self._producers -= 1
+            last = self._producers == 0
+        if last:
+            self.put(_END)
+
+
+class IngestionPipeline:
+    """Backpressured, multi-threaded ingestion runner.
+
+    Config keys (the ``ingestion`` section):
+        queue_size: Capacity of each queue between stages (default 256).
+        load_workers: Threads calling ``Loader.load`` (default 2).
+        process_workers: When set, load files in this many worker processes
+            through a ParallelLoader instead of threads (default 0). The
+            loader must then be picklable.
+        load_timeout: Seconds allowed per file with process_workers
+            (default 300).
+        split_pages_over: With process_workers and a PagedLoader, split
+            files with more pages than this across workers (default 0).
+        pages_per_task: Pages per range when splitting (default 50).
+        split_workers: Threads splitting documents (default 2).
+        transform_workers: Threads applying the transforms (default 2).
+        embed_workers: Threads calling the embedding client (default 2).
+        upsert_workers: Threads writing to the vector store (default 1).
+        embed_batch_size: Chunks per embedding call, and the largest batch
+                          produced by the splitter (default 64).
+        upsert_batch_size: Vectors per ``upsert`` call (default 256).
+        batch_wait_ms: Longest wait for a batch to fill before it is sent
+                       partially (default 50).
+        id_field: Payload key holding the chunk id (default "id").
+        history: IngestionHistory config; set ``enabled: true`` to skip
+                 files that were already ingested (default disabled).
+
+    Every chunk is stored with a payload holding its ``text`` and metadata.
+    Its id is the ``chunk_id`` metadata value, or ``"<source>#<n>"`` (n-th
+    chunk of the file) when the splitter does not set one. Before the first
+    chunk of a document is queued, the chunks stored for its ``source`` are
+    deleted with :meth:`VectorStore.delete_by_filter`, so re-ingesting a
+    file replaces its chunks even when it now has fewer. Stores without
+    delete_by_filter keep the stale chunks (a warning is logged once).
+
+    With a sparse retriever, every upserted chunk is also indexed for
+    keyword search, and the chunks of a re-ingested source are removed
+    from it the same way.
+
+    Usage:
+        pipeline = IngestionPipeline(loader, splitter, embedder, store, config=config)
+        stats = pipeline.run(paths)
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        splitter: Splitter,
+        embedding_client: EmbeddingClient,
+        vector_store: VectorStore,
+        transforms: list[Transform] | None = None,
+        config: dict | None = None,
+        history: IngestionHistory | None = None,
+        sparse_retriever: "SparseRetriever | None" = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            loader: Loader parsing each input file.
+            splitter: Splitter cutting documents into chunks.
+            embedding_client: Client embedding chunk texts.
+            vector_store: Store receiving the vectors.
+            transforms: Transforms applied to every chunk, in order.
+            config: Ingestion configuration dictionary.
+            history: Ingestion history to use instead of the one described
+                     by the ``history`` config key.
+            sparse_retriever: Keyword index receiving the upserted chunks.
+
+        Raises:
+            ValueError: If a size or worker count is not positive.
+        """
+        config = config or {}
+        self.loader = loader
+        self.splitter = splitter
+        self.embedding_client = embedding_client
+        self.vector_store = vector_store
+        self.transforms = list(transforms or [])
+
+        self.queue_size = int(config.get("queue_size", 256))
+        self.load_workers = int(config.get("load_workers", 2))
+        self.process_workers = int(config.get("process_workers") or 0)
+        self.parallel_loader = (
+            ParallelLoader(
+                loader,
+                {
+                    "max_workers": self.process_workers,
+                    "timeout": config.get("load_timeout", 300.0),
+                    "split_pages_over": config.get("split_pages_over", 0),
+                    "pages_per_task": config.get("pages_per_task", 50),
+                },
+            )
+            if self.process_workers
+            else None
+        )
+        self.split_workers = int(config.get("split_workers", 2))
+        self.transform_workers = int(config.get("transform_workers", 2))
+        self.embed_workers = int(config.get("embed_workers", 2))
+        self.upsert_workers = int(config.get("upsert_workers", 1))
+        self.embed_batch_size = int(config.get("embed_batch_size", 64))
+        self.upsert_batch_size = int(config.get("upsert_batch_size", 256))
+        self.batch_wait = float(config.get("batch_wait_ms", 50)) / 1000.0
+        self.id_field = config.get("id_field", "id")
+        history_config = config.get("history") or {}
+        if history is None and history_config.get("enabled", False):
+            history = IngestionHistory(history_config)
+        self.history = history
+        self.sparse_retriever = sparse_retriever
+        for key in (
+            "queue_size",
+            "load_workers",
+            "split_workers",
+            "transform_workers",
+            "embed_workers",
+            "upsert_workers",
+            "embed_batch_size",
+            "upsert_batch_size",
+        ):
+            if getattr(self, key) <= 0:
+                raise ValueError(f"{key} must be positive, got {getattr(self, key)}")
+
+    def run(self, paths: Iterable[str]) -> IngestionStats:
+        """Ingest files, consuming ``paths`` lazily.
+
+        With a history, unchanged files are skipped, and every file is
+        recorded as succeeded or failed when the run completes (nothing is
+        recorded if the run raises, so the files are retried next time).
+
+        Args:
+            paths: File paths to load (may be a generator).
+
+        Returns:
+            Counters of the run, including the files that were skipped.
+
+        Raises:
+            Exception: The first embedding or vector store error.
+        """
+        started = time.monotonic()
+        stop = threading.Event()
+        stats = IngestionStats()
+        stats_lock = threading.Lock()
+        errors: list[BaseException] = []
+        scanned: list[FileState] = []
+        failed_paths: dict[str, str] = {}
+        path_of_source: dict[str, str] = {}
+        cleared_sources: set[str] = set()
+        clear_lock = threading.Lock()
+        cannot_clear = threading.Event()
+
+        def channel(producers: int) -> _Channel:
+            return _Channel(self.queue_size, producers, stop)
+
+        files = channel(1)
+        documents = channel(1 if self.parallel_loader else self.load_workers)
+        chunks = channel(self.split_workers)
+        transformed = channel(self.transform_workers)
+        embedded = channel(self.embed_workers)
+
+        def count(key: str, amount: int = 1) -> None:
+            with stats_lock:
+                setattr(stats, key, getattr(stats, key) + amount)
+
+        def fail(path: str, error: Exception, source: str | None = None) -> None:
+            logger.warning("Skipping %s: %s", path, error)
+            with stats_lock:
+                stats.failed.append((path, str(error)))
+                # Key failures by the scanned path, which a loader may not use as source.
+                key = path_of_source.get(source, source) if source is not None else path
+                failed_paths.setdefault(key, str(error))
+
+        def loaded(path: str, document: Document) -> None:
+            document.metadata.setdefault("source", path)
+            with stats_lock:
+                path_of_source[str(document.metadata["source"])] = path
+            count("documents")
+            documents.put(document)
+
+        def clear(source: str) -> None:
+            with clear_lock:
+                if source in cleared_sources:
+                    return
+                cleared_sources.add(source)
+                if self.sparse_retriever is not None:
+                    self.sparse_retriever.delete_by_filter({"source": source})
+                if cannot_clear.is_set():
+                    return
+                try:
+                    self.vector_store.delete_by_filter({"source": source})
+                except NotImplementedError as e:
+                    logger.warning("%s; stale chunks of re-ingested files are kept", e)
+                    cannot_clear.set()
+
+        def changed(paths: Iterable[str]) -> Iterable[str]:
+            assert self.history is not None
+            for result in self.history.iter_scan(paths):
+                count("skipped", len(result.unchanged))
+                for path, error in result.missing:
+                    fail(path, OSError(error))
+                for state in result.changed:
+                    scanned.append(state)
+                    yield state.path
+
+        if self.history is not None:
+            paths = changed(paths)
+
+        def feed() -> None:
+            for path in paths:
+                files.put(str(path))
+            files.close()
+
+        def load() -> None:
+            while (path := files.get()) is not _END:
+                try:
+                    document = self.loader.load(path)
+                except Exception as e:
+                    fail(path, e)
+                    continue
+                loaded(path, document)
+            documents.close()
+
+        def load_parallel() -> None:
+            assert self.parallel_loader is not None
+            for path, document in self.parallel_loader.iter_load_with_paths(paths, on_error=fail):
+                loaded(path, document)
+            documents.close()
+
+        def split() -> None:
+            while (document := documents.get()) is not _END:
+                source = str(document.metadata["source"])
+                clear(source)
+                try:
+                    for batch in self.splitter.iter_split_batches(document, self.embed_batch_size):
+                        chunks.put(batch)
+                except _Stopped:
+                    raise
+                except Exception as e:
+                    fail(source, e, source)
+            chunks.close()
+
+        def transform() -> None:
+            while (batch := chunks.get()) is not _END:
+                batch = self._transform(batch, fail)
+                if len(batch):
+                    count("chunks", len(batch))
+                    transformed.put(batch)
+            transformed.close()
+
+        def embed() -> None:
+            for batch in transformed.gather(self.embed_batch_size, self.batch_wait):
+                for part in batch.split(self.embed_batch_size):
+                    embedded.put(self.embedding_client.embed_batch(part))
+            embedded.close()
+
+        def upsert() -> None:
+            for batch in embedded.gather(self.upsert_batch_size, self.batch_wait):
+                count("upserted", self.vector_store.upsert_batch(batch, self.id_field))
+                if self.sparse_retriever is not None:
+                    self.sparse_retriever.add(batch.to_chunks())
+
+        def worker(target: Callable[[], None]) -> Callable[[], None]:
+            def run_stage() -> None:
+                try:
+                    target()
+                except _Stopped:
+                    pass
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+
+            return run_stage
+
+        loading = (
+            [(load_parallel, 1)] if self.parallel_loader else [(feed, 1), (load, self.load_workers)]
+        )
+        stages = [
+            *loading,
+            (split, self.split_workers),
+            (transform, self.transform_workers),
+            (embed, self.embed_workers),
+            (upsert, self.upsert_workers),
+        ]
+        threads = [
+            threading.Thread(
+                target=worker(target), name=f"ingest-{target.__name__}-{i}", daemon=True
+            )
+            for target, workers in stages
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats.duration = time.monotonic() - started
+        if errors:
+            raise errors[0]
+        if self.history is not None:
+            self._record(scanned, failed_paths)
+        return stats
+
+    def _record(self, scanned: list[FileState], failed: dict[str, str]) -> None:
+        """Record the outcome of every scanned file in the history."""
+        assert self.history is not None
+        self.history.record_many(state for state in scanned if state.path not in failed)
+        for state in scanned:
+            if state.path in failed:
+                self.history.record(state, STATUS_FAILED, failed[state.path])
+
+    def _transform(
+        self, batch: ChunkBatch, fail: Callable[[str, Exception, str | None], None]
+    ) -> ChunkBatch:
+        """Apply the transforms to a batch, dropping the chunks that fail.
+
+        When a transform raises on a batch, its chunks are transformed one
+        by one so that only the failing ones are skipped.
+        """
+        try:
+            result = batch
+            for step in self.transforms:
+                result = step.transform_batch(result)
+            return result
+        except Exception as e:
+            if len(batch) == 1:
+                fail(batch.id_strings()[0], e, batch.sources[0])
+                return batch.take(slice(0, 0))
+        return ChunkBatch.concat(
+            [
+                self._transform(batch.take(slice(position, position + 1)), fail)
+                for position in range(len(batch))
+            ]
+        )
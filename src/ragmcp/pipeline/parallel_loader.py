@@ -0,0 +1,346 @@
+"""Process-pool document loading for CPU-bound parsers.
+
+Parsing PDFs to markdown is CPU-bound and holds the GIL, so threads do not
+help. :class:`ParallelLoader` runs ``Loader.load`` in a pool of worker
+processes and yields Documents in completion order.
+
+Every file is isolated from the others:
+
+- A file that raises is reported and skipped.
+- A file that runs longer than ``timeout`` is reported, and the pool is
+  restarted to stop it; the other files that were running are resubmitted.
+- A file that kills its worker process (e.g. a parser crash on a malformed
+  PDF) breaks the whole pool. The files that were running are then retried
+  one at a time, so only the culprit is reported.
+
+With a :class:`~ragmcp.pipeline.base.PagedLoader`, files with more than
+``split_pages_over`` pages are cut into ranges of ``pages_per_task`` pages
+that are parsed in parallel and joined back into one Document.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from ragmcp.pipeline.base import Document, Loader, PagedLoader
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+# Loader of the current worker process, set by the pool initializer
+_worker_loader: Loader | None = None
+
+
+def _init_worker(loader: Loader) -> None:
+    """Install the loader in a new worker process."""
+    global _worker_loader
+    _worker_loader = loader
+
+
+def _load(path: str, pages: tuple[int, int] | None) -> Document:
+    """Load a file, or a page range of it, in a worker process."""
+    assert _worker_loader is not None
+    if pages is None:
+        return _worker_loader.load(path)
+    assert isinstance(_worker_loader, PagedLoader)
+    return _worker_loader.load_pages(path, *pages)
+
+
+class WorkerCrashedError(Exception):
+    """Raised for a file whose parsing killed its worker process."""
+
+
+@dataclass
+class _Assembly:
+    """Page-range parts of one file waiting to be joined."""
+
+    parts: list[Document | None]
+    remaining: int
+    failed: bool = False
+
+
+@dataclass
+class _Task:
+    """One unit of work: a whole file or a page range of it."""
+
+    path: str
+    pages: tuple[int, int] | None = None
+    assembly: _Assembly | None = None
+    part: int = 0
+    suspect: bool = False
+
+
+class ParallelLoader:
+    """Fans ``Loader.load`` calls out to a process pool.
+
+    The loader is sent to every worker process once, so it must be
+    picklable. At most ``max_workers`` tasks are submitted at a time, so a
+    task starts running when it is submitted and its timeout is measured
+    from then.
+
+    Config keys:
+        max_workers: Worker processes (default: CPU count).
+        timeout: Seconds allowed per file or page range; None disables it
+                 (default 300).
+        split_pages_over: Page count above which a PagedLoader's file is
+                          split across workers (default 0: never split).
+        pages_per_task: Pages per range when splitting (default 50).
+        start_method: multiprocessing start method (default: the platform's).
+    """
+
+    def __init__(self, loader: Loader, config: dict | None = None):
+        """Initialize the loader.
+
+        Args:
+            loader: Picklable loader run in the worker processes.
+            config: Parallel loading configuration dictionary.
+
+        Raises:
+            ValueError: If max_workers, timeout or pages_per_task is not positive.
+        """
+        config = config or {}
+        self.loader = loader
+        self.max_workers = int(config.get("max_workers") or os.cpu_count() or 1)
+        timeout = config.get("timeout", 300.0)
+        self.timeout = float(timeout) if timeout is not None else None
+        self.split_pages_over = int(config.get("split_pages_over", 0))
+        self.pages_per_task = int(config.get("pages_per_task", 50))
+        self.start_method = config.get("start_method")
+        if self.max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {self.max_workers}")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {self.timeout}")
+        if self.pages_per_task <= 0:
+            raise ValueError(f"pages_per_task must be positive, got {self.pages_per_task}")
+
+    def iter_load(
+        self,
+        paths: Iterable[str],
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> Iterator[Document]:
+        """Load files in worker processes, yielding Documents as they finish.
+
+        ``paths`` is consumed lazily. Each Document's metadata gets a
+        ``source`` entry with its path unless the loader set one.
+
+        Args:
+            paths: File paths to load.
+            on_error: Called with the path and error of every file that
+                      fails, times out or crashes its worker. Such files are
+                      logged and skipped when it is not given.
+
+        Yields:
+            Documents in completion order.
+        """
+        for _, document in self.iter_load_with_paths(paths, on_error):
+            yield document
+
+    def iter_load_with_paths(
+        self,
+        paths: Iterable[str],
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> Iterator[tuple[str, Document]]:
+        """Like :meth:`iter_load`, but yield each Document with its input path.
+
+        The path identifies the file even when the loader sets its own
+        ``source``.
+
+        Yields:
+            ``(path, document)`` pairs in completion order.
+        """
+        tasks = self._tasks(paths)
+        retry: deque[_Task] = deque()
+        suspects: deque[_Task] = deque()
+        running: dict[Future, tuple[_Task, float]] = {}
+        pool = self._new_pool()
+        try:
+            while True:
+                self._fill(pool, tasks, retry, suspects, running)
+                if not running:
+                    break
+
+                done, _ = wait(
+                    running, timeout=self._wait_time(running), return_when=FIRST_COMPLETED
+                )
+                broken = False
+                for future in done:
+                    task, _ = running.pop(future)
+                    try:
+                        document = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        self._crashed(task, suspects, on_error)
+                    except Exception as e:
+                        self._failed(task, e, on_error)
+                    else:
+                        for completed in self._completed(task, document):
+                            yield task.path, completed
+
+                if broken:
+                    for task, _ in running.values():
+                        self._crashed(task, suspects, on_error)
+                    running.clear()
+                    pool = self._restart(pool)
+                    continue
+
+                now = time.monotonic()
+                expired = [
+                    f for f, (_, deadline) in running.items() if deadline <= now and not f.done()
+                ]
+                if expired:
+                    for future in expired:
+                        task, _ = running.pop(future)
+                        self._failed(
+                            task,
+                            TimeoutError(f"Loading took longer than {self.timeout}s"),
+                            on_error,
+                        )
+                    retry.extendleft(task for task, _ in running.values())
+                    running.clear()
+                    pool = self._restart(pool)
+        finally:
+            self._kill(pool)
+
+    def _tasks(self, paths: Iterable[str]) -> Iterator[_Task]:
+        """Expand paths into tasks, splitting large paged files."""
+        for path in paths:
+            path = str(path)
+            pages = self._page_count(path)
+            if pages is None or pages <= self.split_pages_over:
+                yield _Task(path)
+                continue
+            ranges = [
+                (start, min(start + self.pages_per_task, pages))
+                for start in range(0, pages, self.pages_per_task)
+            ]
+            assembly = _Assembly([None] * len(ranges), len(ranges))
+            for part, page_range in enumerate(ranges):
+                yield _Task(path, page_range, assembly, part)
+
+    def _page_count(self, path: str) -> int | None:
+        """Page count of a file when it may be split, else None."""
+        if not self.split_pages_over or not isinstance(self.loader, PagedLoader):
+            return None
+        try:
+            return self.loader.page_count(path)
+        except Exception as e:
+            # Let the worker load it whole and report the error in isolation.
+            logger.debug("Could not count pages of %s: %s", path, e)
+            return None
+
+    def _fill(
+        self,
+        pool: ProcessPoolExecutor,
+        tasks: Iterator[_Task],
+        retry: deque[_Task],
+        suspects: deque[_Task],
+        running: dict[Future, tuple[_Task, float]],
+    ) -> None:
+        """Submit tasks until every worker is busy; suspects run alone."""
+        while len(running) < self.max_workers:
+            if any(task.suspect for task, _ in running.values()):
+                break
+            task: _Task | None
+            if suspects:
+                if running:
+                    break
+                task = suspects.popleft()
+            elif retry:
+                task = retry.popleft()
+            else:
+                task = next(tasks, None)
+            if task is None:
+                break
+            if task.assembly is not None and task.assembly.failed:
+                continue
+            deadline = time.monotonic() + self.timeout if self.timeout else float("inf")
+            running[pool.submit(_load, task.path, task.pages)] = (task, deadline)
+
+    def _wait_time(self, running: dict[Future, tuple[_Task, float]]) -> float | None:
+        """Seconds until the earliest deadline of the running tasks."""
+        if self.timeout is None:
+            return None
+        return max(0.0, min(deadline for _, deadline in running.values()) - time.monotonic())
+
+    def _completed(self, task: _Task, document: Document) -> Iterator[Document]:
+        """Yield a finished Document, joining page ranges once all are in."""
+        assembly = task.assembly
+        if assembly is None:
+            document.metadata.setdefault("source", task.path)
+            yield document
+            return
+        if assembly.failed:
+            return
+
+        assembly.parts[task.part] = document
+        assembly.remaining -= 1
+        if assembly.remaining == 0:
+            parts = [part for part in assembly.parts if part is not None]
+            metadata = {**parts[0].metadata}
+            metadata.setdefault("source", task.path)
+            assembly.parts = []
+            yield Document(text="\n\n".join(part.text for part in parts), metadata=metadata)
+
+    def _failed(
+        self,
+        task: _Task,
+        error: Exception,
+        on_error: Callable[[str, Exception], None] | None,
+    ) -> None:
+        """Report a failed file once, dropping its other page ranges."""
+        if task.assembly is not None:
+            if task.assembly.failed:
+                return
+            task.assembly.failed = True
+            task.assembly.parts = []
+        if on_error is None:
+            logger.warning("Failed to load %s: %s", task.path, error)
+        else:
+            on_error(task.path, error)
+
+    def _crashed(
+        self,
+        task: _Task,
+        suspects: deque[_Task],
+        on_error: Callable[[str, Exception], None] | None,
+    ) -> None:
+        """Handle a task lost to a broken pool: retry it alone, or give up."""
+        if task.suspect:
+            self._failed(
+                task, WorkerCrashedError(f"Worker process crashed on {task.path}"), on_error
+            )
+        else:
+            task.suspect = True
+            suspects.append(task)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Start a process pool with the loader installed in every worker."""
+        context = multiprocessing.get_context(self.start_method) if self.start_method else None
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.loader,),
+        )
+
+    def _restart(self, pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Kill a pool (stopping stuck tasks) and start a new one."""
+        self._kill(pool)
+        return self._new_pool()
+
+    @staticmethod
+    def _kill(pool: ProcessPoolExecutor) -> None:
+        """Terminate the worker processes of a pool without waiting for tasks."""
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=5)
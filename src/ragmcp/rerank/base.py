@@ -1,5 +1,6 @@
 """Reranker base abstractions."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any
@@ -43,3 +44,24 @@ class Reranker(ABC):
             List of RankedChunk objects sorted by relevance (highest first).
         """
         ...
+
+    async def arerank(
+        self,
+        query: str,
+        chunks: list[Any],
+        top_k: int | None = None,
+    ) -> list[RankedChunk]:
+        """Rerank chunks without blocking the event loop.
+
+        The default implementation runs :meth:`rerank` in a worker thread.
+        Rerankers calling a remote model should override it.
+
+        Args:
+            query: The search query.
+            chunks: List of chunks to rerank.
+            top_k: Maximum number of results to return. None returns all.
+
+        Returns:
+            List of RankedChunk objects sorted by relevance (highest first).
+        """
+        return await asyncio.to_thread(self.rerank, query, chunks, top_k)
@@ -0,0 +1,16 @@
+"""Retrieval module."""
+
+from ragmcp.retrieval.base import SparseRetriever
+from ragmcp.retrieval.bm25 import BM25Retriever
+from ragmcp.retrieval.fusion import reciprocal_rank_fusion, weighted_sum_fusion
+from ragmcp.retrieval.hybrid import HybridRetriever
+from ragmcp.retrieval.tokenizer import tokenize
+
+__all__ = [
+    "SparseRetriever",
+    "BM25Retriever",
+    "HybridRetriever",
+    "reciprocal_rank_fusion",
+    "weighted_sum_fusion",
+    "tokenize",
+]
@@ -0,0 +1,72 @@
+"""Retriever base abstractions."""
+
+from abc import ABC, abstractmethod
+
+from ragmcp.pipeline.base import Chunk
+from ragmcp.rerank.base import RankedChunk
+
+
+class SparseRetriever(ABC):
+    """Abstract base class for keyword (sparse) retrieval implementations.
+
+    Provides a unified interface for indexing chunk text and retrieving the
+    chunks that best match a keyword query.
+    """
+
+    @abstractmethod
+    def add(self, chunks: list[Chunk]) -> int:
+        """Index chunks.
+
+        Args:
+            chunks: Chunks whose text should be searchable.
+
+        Returns:
+            Number of chunks indexed.
+        """
+        ...
+
+    def delete(self, chunk_ids: list[str]) -> int:
+        """Remove chunks by their ``chunk_id`` metadata value.
+
+        Retrievers that can remove chunks should override it; the default
+        implementation raises NotImplementedError.
+
+        Args:
+            chunk_ids: Ids of the chunks to remove.
+
+        Returns:
+            Number of chunks removed.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support delete")
+
+    def delete_by_filter(self, filter: dict) -> int:
+        """Remove every chunk whose metadata matches a filter.
+
+        Retrievers that can select chunks by metadata should override it;
+        the default implementation raises NotImplementedError.
+
+        Args:
+            filter: Non-empty metadata filter, e.g. ``{"source": "a.pdf"}``.
+
+        Returns:
+            Number of chunks removed.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support delete_by_filter")
+
+    @abstractmethod
+    def search(self, query: str, top_k: int) -> list[RankedChunk]:
+        """Retrieve the chunks that best match a query.
+
+        Args:
+            query: Keyword query.
+            top_k: Maximum number of results to return.
+
+        Returns:
+            List of RankedChunk objects sorted by score (highest first).
+        """
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of indexed chunks."""
+        ...
@@ -0,0 +1,378 @@
+"""BM25 keyword retrieval over a compressed in-memory inverted index.
+
+Each term maps to a :class:`PostingList` of delta-encoded document ids and
+term frequencies held in compact ``array`` buffers. Document-length norms
+are precomputed once per index change, and top-k queries use MaxScore
+early termination: once the k-th best partial score exceeds what the
+remaining terms could add, those terms are only probed for existing
+candidates, decoding just the skip blocks that may contain them.
+
+Deleted chunks are tombstoned and purged by rebuilding the postings before
+the next search, so scores always reflect the live chunks only.
+"""
+
+import math
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from ragmcp.pipeline.base import Chunk
+from ragmcp.rerank.base import RankedChunk
+from ragmcp.retrieval.base import SparseRetriever
+from ragmcp.retrieval.tokenizer import tokenize
+from ragmcp.vector_store.filters import match_filter, validate_filter
+from ragmcp.vector_store.index import select_top_k
+
+# Postings per skip block.
+BLOCK_SIZE = 128
+
+_WIDER = {"B": "H", "H": "I"}
+_LIMITS = {"B": 0xFF, "H": 0xFFFF, "I": 0xFFFFFFFF}
+_DTYPES = {"B": np.uint8, "H": np.uint16, "I": np.uint32}
+
+
+def _append(values: array, value: int) -> array:
+    """Append to an unsigned array, widening its typecode when the value does not fit."""
+    while value > _LIMITS[values.typecode]:
+        values = array(_WIDER[values.typecode], values)
+    values.append(value)
+    return values
+
+
+def _view(values: array) -> np.ndarray:
+    """Zero-copy NumPy view of an unsigned array."""
+    return np.frombuffer(values, dtype=_DTYPES[values.typecode])
+
+
+class PostingList:
+    """Postings of one term.
+
+    Document ids are stored as gaps from the previous id and frequencies as
+    plain counts, each in the narrowest unsigned ``array`` type that fits,
+    so frequent terms usually cost two bytes per posting. The id of every
+    ``BLOCK_SIZE``-th posting is kept in a skip table.
+    """
+
+    __slots__ = ("deltas", "tfs", "block_first", "last_doc", "max_tf")
+
+    def __init__(self):
+        """Initialize an empty posting list."""
+        self.deltas = array("B")
+        self.tfs = array("B")
+        self.block_first = array("I")
+        self.last_doc = 0
+        self.max_tf = 0
+
+    def __len__(self) -> int:
+        """Document frequency of the term."""
+        return len(self.deltas)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the encoded postings and skip table."""
+        return sum(a.itemsize * len(a) for a in (self.deltas, self.tfs, self.block_first))
+
+    def append(self, doc: int, tf: int) -> None:
+        """Add a posting; ``doc`` must be greater than every previous id."""
+        if len(self.deltas) % BLOCK_SIZE == 0:
+            self.block_first.append(doc)
+        self.deltas = _append(self.deltas, doc - self.last_doc)
+        self.tfs = _append(self.tfs, tf)
+        self.last_doc = doc
+        self.max_tf = max(self.max_tf, tf)
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray]:
+        """Decode all postings into document ids and frequencies."""
+        docs = np.cumsum(_view(self.deltas), dtype=np.int64)
+        return docs, _view(self.tfs).astype(np.float32)
+
+    def lookup(self, docs: np.ndarray) -> np.ndarray:
+        """Return the frequency of each document in ``docs`` (0 if absent).
+
+        Only the skip blocks that may contain the documents are decoded.
+
+        Args:
+            docs: Sorted document ids.
+
+        Returns:
+            Float array of frequencies aligned with ``docs``.
+        """
+        first = _view(self.block_first)
+        blocks = np.searchsorted(first, docs, side="right") - 1
+        needed = np.unique(blocks[blocks >= 0])
+        if len(needed) == 0:
+            return np.zeros(len(docs), dtype=np.float32)
+
+        if 2 * len(needed) >= len(first):
+            block_docs, block_tfs = self.decode()
+        else:
+            deltas = _view(self.deltas)
+            positions = needed[:, np.newaxis] * BLOCK_SIZE + np.arange(BLOCK_SIZE)
+            valid = positions < len(deltas)
+            positions = np.minimum(positions, len(deltas) - 1)
+            gaps = np.where(valid, deltas[positions], 0).astype(np.int64)
+            base = first[needed].astype(np.int64) - deltas[needed * BLOCK_SIZE]
+            # Padding repeats the last id of the final block with frequency 0.
+            block_docs = (base[:, np.newaxis] + np.cumsum(gaps, axis=1)).ravel()
+            block_tfs = np.where(valid, _view(self.tfs)[positions], 0).ravel()
+
+        index = np.minimum(np.searchsorted(block_docs, docs), len(block_docs) - 1)
+        found = block_docs[index] == docs
+        return np.where(found, block_tfs[index], 0).astype(np.float32)
+
+
+class BM25Retriever(SparseRetriever):
+    """Okapi BM25 retriever over chunk text.
+
+    Scores use ``idf * (k1 + 1) * tf / (tf + k1 * (1 - b + b * dl / avgdl))``
+    with the non-negative idf ``log(1 + (N - df + 0.5) / (df + 0.5))``.
+    Each query term counts once.
+
+    Chunks are identified by their ``chunk_id`` metadata value: adding a
+    chunk whose id is already indexed replaces the old one, and
+    :meth:`delete` removes chunks by id.
+
+    Config keys:
+        k1: Term frequency saturation (default 1.2, must be positive).
+        b: Length normalization strength in [0, 1] (default 0.75).
+    """
+
+    def __init__(
+        self,
+        config: dict | None = None,
+        tokenizer: Callable[[str], list[str]] = tokenize,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            config: BM25 configuration dictionary.
+            tokenizer: Function splitting text into terms.
+
+        Raises:
+            ValueError: If k1 or b is out of range.
+        """
+        config = config or {}
+        self.k1 = float(config.get("k1", 1.2))
+        self.b = float(config.get("b", 0.75))
+        if self.k1 <= 0:
+            raise ValueError(f"k1 must be positive, got {self.k1}")
+        if not 0.0 <= self.b <= 1.0:
+            raise ValueError(f"b must be in [0, 1], got {self.b}")
+
+        self._tokenize = tokenizer
+        self._lock = threading.RLock()
+        self._chunks: list[Chunk] = []
+        self._postings: dict[str, PostingList] = {}
+        self._doc_lengths = array("I")
+        self._total_length = 0
+        self._norms: np.ndarray | None = None
+        self._ids: dict[str, int] = {}
+        self._deleted: set[int] = set()
+
+    def __len__(self) -> int:
+        """Number of indexed chunks."""
+        return len(self._chunks) - len(self._deleted)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct terms."""
+        return len(self._postings)
+
+    @property
+    def postings_nbytes(self) -> int:
+        """Bytes used by all posting lists."""
+        return sum(postings.nbytes for postings in self._postings.values())
+
+    def add(self, chunks: list[Chunk]) -> int:
+        """Tokenize and index chunks, replacing indexed chunks with the same id.
+
+        Args:
+            chunks: Chunks to index.
+
+        Returns:
+            Number of chunks indexed.
+        """
+        with self._lock:
+            for chunk in chunks:
+                doc = len(self._chunks)
+                counts = Counter(self._tokenize(chunk.text))
+                for term, tf in counts.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = PostingList()
+                    postings.append(doc, tf)
+
+                length = sum(counts.values())
+                self._doc_lengths.append(length)
+                self._total_length += length
+                self._chunks.append(chunk)
+
+                chunk_id = chunk.metadata.get("chunk_id")
+                if chunk_id is not None:
+                    replaced = self._ids.get(str(chunk_id))
+                    if replaced is not None:
+                        self._deleted.add(replaced)
+                    self._ids[str(chunk_id)] = doc
+            self._norms = None
+        return len(chunks)
+
+    def delete(self, chunk_ids: list[str]) -> int:
+        """Remove chunks by their ``chunk_id`` metadata value.
+
+        Removed chunks are tombstoned; their postings are purged before the
+        next search.
+
+        Args:
+            chunk_ids: Ids of the chunks to remove; unknown ids are ignored.
+
+        Returns:
+            Number of chunks removed.
+        """
+        with self._lock:
+            removed = 0
+            for chunk_id in chunk_ids:
+                doc = self._ids.pop(str(chunk_id), None)
+                if doc is not None:
+                    self._deleted.add(doc)
+                    removed += 1
+            return removed
+
+    def delete_by_filter(self, filter: dict[str, Any]) -> int:
+        """Remove every chunk whose metadata matches a filter.
+
+        Args:
+            filter: Non-empty metadata filter, e.g. ``{"source": "a.pdf"}``.
+
+        Returns:
+            Number of chunks removed.
+
+        Raises:
+            ValueError: If the filter is empty or malformed.
+        """
+        if not filter:
+            raise ValueError("delete_by_filter() requires a non-empty filter")
+        validate_filter(filter)
+
+        with self._lock:
+            matched = [
+                chunk_id
+                for chunk_id, doc in self._ids.items()
+                if match_filter(self._chunks[doc].metadata, filter)
+            ]
+            return self.delete(matched)
+
+    def search(self, query: str, top_k: int) -> list[RankedChunk]:
+        """Return the ``top_k`` chunks with the highest BM25 score.
+
+        Chunks that share no term with the query are never returned.
+
+        Args:
+            query: Keyword query.
+            top_k: Maximum number of results to return.
+
+        Returns:
+            List of RankedChunk objects sorted by score (highest first).
+        """
+        terms = dict.fromkeys(self._tokenize(query))
+        with self._lock:
+            self._purge()
+            lists = [self._postings[term] for term in terms if term in self._postings]
+            if top_k <= 0 or not lists:
+                return []
+            docs, scores = self._max_score(lists, top_k)
+            return [
+                RankedChunk(chunk=self._chunks[doc], score=score)
+                for doc, score in zip(docs.tolist(), scores.tolist(), strict=True)
+            ]
+
+    def _purge(self) -> None:
+        """Rebuild the postings without the tombstoned chunks (lock held)."""
+        if not self._deleted:
+            return
+        alive = np.ones(len(self._chunks), dtype=bool)
+        alive[list(self._deleted)] = False
+        renumbered = np.cumsum(alive) - 1
+
+        postings: dict[str, PostingList] = {}
+        for term, old in self._postings.items():
+            docs, tfs = old.decode()
+            keep = alive[docs]
+            if not keep.any():
+                continue
+            rebuilt = postings[term] = PostingList()
+            for doc, tf in zip(renumbered[docs[keep]].tolist(), tfs[keep].tolist(), strict=True):
+                rebuilt.append(doc, int(tf))
+
+        lengths = _view(self._doc_lengths)[alive]
+        self._postings = postings
+        self._chunks = [chunk for chunk, live in zip(self._chunks, alive, strict=True) if live]
+        self._doc_lengths = array("I", lengths.tolist())
+        self._total_length = int(lengths.sum())
+        self._ids = {chunk_id: int(renumbered[doc]) for chunk_id, doc in self._ids.items()}
+        self._deleted.clear()
+        self._norms = None
+
+    def _document_norms(self) -> np.ndarray:
+        """Per-document ``k1 * (1 - b + b * dl / avgdl)``, cached until the next add."""
+        if self._norms is None:
+            lengths = _view(self._doc_lengths).astype(np.float32)
+            average = self._total_length / len(lengths) if self._total_length else 1.0
+            self._norms = self.k1 * (1.0 - self.b + self.b * lengths / average)
+        return self._norms
+
+    def _max_score(self, lists: list[PostingList], top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        """MaxScore top-k evaluation over the query's posting lists."""
+        norms = self._document_norms()
+        min_norm = float(norms.min())
+        count = len(self._chunks)
+
+        weights = [
+            math.log(1.0 + (count - len(p) + 0.5) / (len(p) + 0.5)) * (self.k1 + 1.0) for p in lists
+        ]
+        # Upper bound of each term's contribution: highest tf in the shortest document.
+        bounds = [w * p.max_tf / (p.max_tf + min_norm) for w, p in zip(weights, lists, strict=True)]
+        order = sorted(range(len(lists)), key=bounds.__getitem__, reverse=True)
+
+        docs = np.empty(0, dtype=np.int64)
+        scores = np.empty(0, dtype=np.float64)
+        essential = True
+        for position, i in enumerate(order):
+            postings, weight = lists[i], weights[i]
+            # Summed afresh so that the bound is exactly 0 after the last term.
+            remaining = sum(bounds[j] for j in order[position + 1 :])
+
+            if essential:
+                term_docs, tfs = postings.decode()
+                term_scores = weight * tfs / (tfs + norms[term_docs])
+                docs, scores = _merge_scores(docs, scores, term_docs, term_scores)
+            else:
+                tfs = postings.lookup(docs)
+                scores = scores + weight * tfs / (tfs + norms[docs])
+
+            if len(docs) >= top_k:
+                threshold = float(np.partition(scores, len(scores) - top_k)[len(scores) - top_k])
+                if remaining <= threshold:
+                    # Documents not seen yet cannot reach the top-k any more.
+                    essential = False
+                    keep = scores + remaining >= threshold
+                    docs, scores = docs[keep], scores[keep]
+
+        best = select_top_k(scores, top_k)
+        return docs[best], scores[best]
+
+
+def _merge_scores(
+    docs: np.ndarray, scores: np.ndarray, new_docs: np.ndarray, new_scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sum two sparse score vectors given as sorted document ids and scores."""
+    if len(docs) == 0:
+        return new_docs, new_scores.astype(np.float64)
+    merged, inverse = np.unique(np.concatenate([docs, new_docs]), return_inverse=True)
+    summed = np.bincount(
+        inverse, weights=np.concatenate([scores, new_scores]), minlength=len(merged)
+    )
+    return merged, summed
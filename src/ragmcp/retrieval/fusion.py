@@ -0,0 +1,97 @@
+"""Rank fusion of result lists from several retrieval routes.
+
+Each route's results are a ranked list of :class:`RankedChunk`. Chunks
+returned by more than one route are identified by a key function so their
+contributions can be summed.
+"""
+
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from ragmcp.rerank.base import RankedChunk
+
+# Rank offset of reciprocal rank fusion (Cormack et al., 2009).
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[RankedChunk]],
+    key: Callable[[Any], Hashable],
+    k: int = DEFAULT_RRF_K,
+    weights: list[float] | None = None,
+) -> list[RankedChunk]:
+    """Fuse rankings with (weighted) reciprocal rank fusion.
+
+    A chunk at 1-based rank ``r`` in a ranking contributes
+    ``weight / (k + r)``; raw route scores are ignored.
+
+    Args:
+        rankings: Ranked result lists, best first.
+        key: Function mapping a chunk to its identity across rankings.
+        k: Rank offset damping the influence of top positions.
+        weights: Optional weight per ranking (default 1.0 each).
+
+    Returns:
+        Fused RankedChunk list sorted by fused score (highest first).
+    """
+    weights = _weights(rankings, weights)
+    fused: dict[Hashable, RankedChunk] = {}
+    for ranking, weight in zip(rankings, weights, strict=True):
+        for rank, result in enumerate(ranking, start=1):
+            _accumulate(fused, key(result.chunk), result.chunk, weight / (k + rank))
+    return _sorted(fused)
+
+
+def weighted_sum_fusion(
+    rankings: list[list[RankedChunk]],
+    key: Callable[[Any], Hashable],
+    weights: list[float] | None = None,
+) -> list[RankedChunk]:
+    """Fuse rankings by a weighted sum of min-max normalized scores.
+
+    Scores of each ranking are scaled to [0, 1] first so that routes with
+    different score ranges (cosine similarity, BM25) are comparable. A
+    ranking whose scores are all equal maps them to 1.0.
+
+    Args:
+        rankings: Ranked result lists, best first.
+        key: Function mapping a chunk to its identity across rankings.
+        weights: Optional weight per ranking (default 1.0 each).
+
+    Returns:
+        Fused RankedChunk list sorted by fused score (highest first).
+    """
+    weights = _weights(rankings, weights)
+    fused: dict[Hashable, RankedChunk] = {}
+    for ranking, weight in zip(rankings, weights, strict=True):
+        if not ranking:
+            continue
+        scores = [result.score for result in ranking]
+        low, span = min(scores), max(scores) - min(scores)
+        for result in ranking:
+            normalized = (result.score - low) / span if span > 0 else 1.0
+            _accumulate(fused, key(result.chunk), result.chunk, weight * normalized)
+    return _sorted(fused)
+
+
+def _weights(rankings: list[list[RankedChunk]], weights: list[float] | None) -> list[float]:
+    """Validate per-ranking weights, defaulting to 1.0."""
+    if weights is None:
+        return [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError(f"Expected {len(rankings)} weights, got {len(weights)}")
+    return list(weights)
+
+
+def _accumulate(fused: dict[Hashable, RankedChunk], key: Hashable, chunk: Any, score: float):
+    """Add a score to the fused entry of a chunk, keeping the first chunk seen."""
+    entry = fused.get(key)
+    if entry is None:
+        fused[key] = RankedChunk(chunk=chunk, score=score)
+    else:
+        entry.score += score
+
+
+def _sorted(fused: dict[Hashable, RankedChunk]) -> list[RankedChunk]:
+    """Sort fused entries by score; ties keep first-seen order."""
+    return sorted(fused.values(), key=lambda result: result.score, reverse=True)
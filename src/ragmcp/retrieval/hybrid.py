@@ -0,0 +1,255 @@
+"""Hybrid retrieval: parallel dense and sparse routes, rank fusion and reranking.
+
+The dense route embeds the query and searches a :class:`VectorStore`; the
+sparse route runs a keyword search on a :class:`SparseRetriever`. Both run
+concurrently, each on its own bounded thread pool and under its own timeout,
+so a slow or failing route degrades the answer to the other route instead of
+stalling the request.
+
+A route call that times out cannot be interrupted and keeps its worker until
+it returns. Such abandoned calls count against their route's pool only:
+once every worker of a route is busy, further queries skip that route at
+once rather than queue behind stuck calls, and the other route keeps serving.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.factory.reranker_factory import RerankerFactory
+from ragmcp.middleware.singleflight import SingleFlight, fingerprint, normalize_text
+from ragmcp.pipeline.base import Chunk
+from ragmcp.rerank.base import RankedChunk
+from ragmcp.retrieval.base import SparseRetriever
+from ragmcp.retrieval.fusion import DEFAULT_RRF_K, reciprocal_rank_fusion, weighted_sum_fusion
+from ragmcp.vector_store.base import VectorStore
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+FUSION_ALGORITHMS = ("rrf", "weighted_sum")
+
+
+class HybridRetriever:
+    """Retriever fusing dense (vector) and sparse (keyword) results.
+
+    Dense results are turned into :class:`Chunk` objects from their payload:
+    the ``text`` field becomes the chunk text and the other fields its
+    metadata. Chunks found by both routes are matched on the metadata field
+    named by ``id_field``, or on their text when that field is absent.
+
+    Config keys (the ``retrieval`` section):
+        top_k: Fused results returned, or handed to the reranker (default 10).
+        route_top_k: Candidates requested from each route (default 50).
+        fusion_algorithm: ``rrf`` or ``weighted_sum`` (default ``rrf``).
+        rrf_k: Rank offset for RRF (default 60).
+        dense_weight: Weight of the dense route in fusion (default 1.0).
+        sparse_weight: Weight of the sparse route in fusion (default 1.0).
+        dense_timeout: Seconds to wait for the dense route; None waits
+                       forever (default 2.0).
+        sparse_timeout: Seconds to wait for the sparse route (default 1.0).
+        id_field: Metadata field identifying a chunk (default ``chunk_id``).
+        max_workers: Threads of each route's pool, and so the most calls of
+                     one route in flight, counting timed-out calls still
+                     running; a saturated route is skipped (default 4).
+        rerank_backend: Reranker backend for RerankerFactory (default
+                        ``none``, which keeps the fused order).
+        rerank_top_k: Results kept after reranking (default 5).
+        single_flight: Share one search between identical concurrent
+                       queries (same normalized text and top_k) on this
+                       retriever (default false).
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        embedding_client: EmbeddingClient | None = None,
+        vector_store: VectorStore | None = None,
+        sparse_retriever: SparseRetriever | None = None,
+    ):
+        """Initialize the hybrid retriever.
+
+        Args:
+            config: Retrieval configuration dictionary.
+            embedding_client: Client embedding queries for the dense route.
+            vector_store: Store searched by the dense route.
+            sparse_retriever: Keyword retriever for the sparse route.
+
+        Raises:
+            ValueError: If no route is configured, the dense route is only
+                        partially configured, or a config value is invalid.
+        """
+        if (embedding_client is None) != (vector_store is None):
+            raise ValueError("Dense route requires both embedding_client and vector_store")
+        if vector_store is None and sparse_retriever is None:
+            raise ValueError("HybridRetriever requires a dense or a sparse route")
+
+        self.embedding_client = embedding_client
+        self.vector_store = vector_store
+        self.sparse_retriever = sparse_retriever
+
+        self.top_k = int(config.get("top_k", 10))
+        self.route_top_k = int(config.get("route_top_k", 50))
+        self.fusion_algorithm = config.get("fusion_algorithm", "rrf")
+        if self.fusion_algorithm not in FUSION_ALGORITHMS:
+            raise ValueError(
+                f"Unknown fusion_algorithm: {self.fusion_algorithm}. "
+                f"Supported: {', '.join(FUSION_ALGORITHMS)}"
+            )
+        self.rrf_k = int(config.get("rrf_k", DEFAULT_RRF_K))
+        self.dense_weight = float(config.get("dense_weight", 1.0))
+        self.sparse_weight = float(config.get("sparse_weight", 1.0))
+        self.dense_timeout = config.get("dense_timeout", 2.0)
+        self.sparse_timeout = config.get("sparse_timeout", 1.0)
+        self.id_field = config.get("id_field", "chunk_id")
+
+        rerank_backend = config.get("rerank_backend", "none")
+        self.reranker = (
+            RerankerFactory.get_reranker({**config, "backend": rerank_backend})
+            if rerank_backend != "none"
+            else None
+        )
+        self.rerank_top_k = int(config.get("rerank_top_k", 5))
+
+        self._flight = SingleFlight("retrieval") if config.get("single_flight", False) else None
+
+        max_workers = int(config.get("max_workers", 4))
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hybrid-{name}")
+            for name in ("dense", "sparse")
+        }
+        self._slots = {
+            name: threading.BoundedSemaphore(max_workers) for name in ("dense", "sparse")
+        }
+
+    def search(self, query: str, top_k: int | None = None) -> list[RankedChunk]:
+        """Retrieve chunks for a query from all routes and fuse them.
+
+        Args:
+            query: The search query.
+            top_k: Fused candidates to keep; defaults to the configured top_k.
+                   With a reranker, at most rerank_top_k results are returned.
+
+        Returns:
+            List of RankedChunk objects sorted by relevance (highest first).
+
+        Raises:
+            Exception: The error of the first route when every route failed
+                       or timed out.
+        """
+        top_k = self.top_k if top_k is None else top_k
+        if self._flight is None:
+            return self._search(query, top_k)
+        return list(
+            self._flight.do(
+                fingerprint("search", normalize_text(query), top_k),
+                lambda: self._search(query, top_k),
+            )
+        )
+
+    def close(self) -> None:
+        """Shut down the route thread pools without waiting for stuck routes."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search(self, query: str, top_k: int) -> list[RankedChunk]:
+        """Run the routes, fuse their rankings and rerank."""
+        routes: list[tuple[str, Callable[[], list[RankedChunk]], float | None, float]] = []
+        if self.vector_store is not None:
+            routes.append(
+                ("dense", lambda: self._dense(query), self.dense_timeout, self.dense_weight)
+            )
+        if self.sparse_retriever is not None:
+            routes.append(
+                ("sparse", lambda: self._sparse(query), self.sparse_timeout, self.sparse_weight)
+            )
+
+        started = time.monotonic()
+        futures = [self._submit(name, route) for name, route, _, _ in routes]
+        rankings: list[list[RankedChunk]] = []
+        weights: list[float] = []
+        errors: list[Exception] = []
+        for (name, _, timeout, weight), future in zip(routes, futures, strict=True):
+            try:
+                if future is None:
+                    raise TimeoutError(f"{name} route saturated by calls still running")
+                rankings.append(self._wait(future, started, timeout))
+                weights.append(weight)
+            except TimeoutError as e:
+                if future is None:
+                    logger.warning("%s route saturated; continuing without it", name)
+                else:
+                    logger.warning(
+                        "%s route timed out after %ss; continuing without it", name, timeout
+                    )
+                errors.append(e)
+            except Exception as e:
+                logger.warning("%s route failed: %s; continuing without it", name, e)
+                errors.append(e)
+
+        if not rankings:
+            raise errors[0]
+
+        if self.fusion_algorithm == "rrf":
+            fused = reciprocal_rank_fusion(rankings, self._key, k=self.rrf_k, weights=weights)
+        else:
+            fused = weighted_sum_fusion(rankings, self._key, weights=weights)
+        candidates = fused[:top_k]
+
+        if self.reranker is None or not candidates:
+            return candidates
+        return self.reranker.rerank(
+            query, [result.chunk for result in candidates], top_k=self.rerank_top_k
+        )
+
+    def _submit(self, name: str, route: Callable[[], list[RankedChunk]]) -> Future | None:
+        """Start a route call on its pool, or return None if the route is saturated."""
+        slots = self._slots[name]
+        if not slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executors[name].submit(route)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _dense(self, query: str) -> list[RankedChunk]:
+        """Embed the query and search the vector store."""
+        assert self.embedding_client is not None and self.vector_store is not None
+        query_vector = self.embedding_client.embed([query])[0]
+        results = self.vector_store.query(query_vector, self.route_top_k)
+        return [
+            RankedChunk(chunk=_payload_to_chunk(result["payload"]), score=float(result["score"]))
+            for result in results
+        ]
+
+    def _sparse(self, query: str) -> list[RankedChunk]:
+        """Run the keyword search."""
+        assert self.sparse_retriever is not None
+        return self.sparse_retriever.search(query, self.route_top_k)
+
+    def _key(self, chunk: Chunk) -> Hashable:
+        """Identity of a chunk across routes."""
+        value = chunk.metadata.get(self.id_field)
+        return ("id", value) if value is not None else ("text", chunk.text)
+
+    @staticmethod
+    def _wait(future: Future, started: float, timeout: float | None) -> Any:
+        """Wait for a route until its deadline measured from the request start."""
+        if timeout is None:
+            return future.result()
+        return future.result(timeout=max(0.0, started + timeout - time.monotonic()))
+
+
+def _payload_to_chunk(payload: dict) -> Chunk:
+    """Build a Chunk from a vector store payload."""
+    metadata = {key: value for key, value in payload.items() if key != "text"}
+    return Chunk(text=payload.get("text", ""), metadata=metadata)
@@ -0,0 +1,42 @@
+"""Dictionary-free tokenizer for mixed CJK and Latin text.
+
+Latin, Cyrillic and other space-delimited scripts are split into
+lowercased alphanumeric words. CJK text has no word delimiters, so runs of
+CJK characters are split into overlapping character bigrams (an isolated
+character becomes a unigram), as in Lucene's CJK analyzer. Queries and
+documents go through the same function, so a two-character query word
+matches the bigram indexed for it.
+"""
+
+import re
+import unicodedata
+
+# Han (incl. extension A and compatibility ideographs), kana and hangul.
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into index terms.
+
+    Text is NFKC-normalized (full-width forms become ASCII) and casefolded
+    before splitting.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        Terms in order of appearance, with repeats.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    tokens: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        token = match.group()
+        if not _CJK_RUN.match(token):
+            tokens.append(token)
+        elif len(token) == 1:
+            tokens.append(token)
+        else:
+            tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+    return tokens
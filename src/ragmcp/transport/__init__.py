@@ -0,0 +1,10 @@
+"""Transport module."""
+
+from ragmcp.transport.pool import (
+    AsyncClientSource,
+    HTTPTransport,
+    get_http_transport,
+    resolve_async_client,
+)
+
+__all__ = ["AsyncClientSource", "HTTPTransport", "get_http_transport", "resolve_async_client"]
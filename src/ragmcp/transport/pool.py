@@ -0,0 +1,286 @@
+"""Pooled, keep-alive HTTP clients shared by provider clients.
+
+An :class:`HTTPTransport` owns one ``httpx.Client`` (and, on demand, one
+``httpx.AsyncClient``) per base URL. Provider clients receive these instead
+of building their own, so every request to the same host reuses warm
+keep-alive connections from one bounded pool.
+"""
+
+import importlib.util
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+# An async client, or a zero-arg callable returning one on first use
+AsyncClientSource = httpx.AsyncClient | Callable[[], httpx.AsyncClient]
+
+# Named transports shared across factories
+_transports: dict[str, "HTTPTransport"] = {}
+_transports_lock = threading.Lock()
+
+
+def _origin(base_url: str) -> str:
+    """Normalize a base URL to ``scheme://host:port`` (the unit of pooling)."""
+    parts = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+    scheme = (parts.scheme or "http").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+class HTTPTransport:
+    """Per-origin pooled HTTP clients with shared limits and request statistics.
+
+    Clients are created lazily on first use of an origin and live until
+    :meth:`close` / :meth:`aclose`, after which the transport is closed and
+    hands out no more clients. Async clients are bound to the event loop
+    they are first used on.
+
+    Config keys:
+        max_connections: Connections per origin, in use or idle (default 100).
+        max_keepalive_connections: Idle connections kept per origin (default 20).
+        keepalive_expiry: Seconds an idle connection is kept (default 30).
+        timeout: Read/write/pool timeout in seconds (default 60).
+        connect_timeout: Connect timeout in seconds (default 5).
+        http2: Negotiate HTTP/2 where the server supports it (default false;
+               requires the ``h2`` package, otherwise HTTP/1.1 is used).
+    """
+
+    def __init__(self, config: dict | None = None):
+        """Initialize the transport.
+
+        Args:
+            config: Transport configuration dictionary.
+
+        Raises:
+            ValueError: If a limit or timeout is not positive.
+        """
+        config = config or {}
+        self.config = dict(config)
+        self.max_connections = int(config.get("max_connections", 100))
+        self.max_keepalive_connections = int(config.get("max_keepalive_connections", 20))
+        self.keepalive_expiry = float(config.get("keepalive_expiry", 30.0))
+        self.timeout = float(config.get("timeout", 60.0))
+        self.connect_timeout = float(config.get("connect_timeout", 5.0))
+        for key in ("max_connections", "timeout", "connect_timeout"):
+            if getattr(self, key) <= 0:
+                raise ValueError(f"{key} must be positive, got {getattr(self, key)}")
+        if self.max_keepalive_connections < 0 or self.keepalive_expiry < 0:
+            raise ValueError("max_keepalive_connections and keepalive_expiry must be non-negative")
+
+        self.http2 = bool(config.get("http2", False))
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("http2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            self.http2 = False
+
+        self._lock = threading.Lock()
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+        self._pools: dict[str, dict[str, Any]] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` or :meth:`aclose` was called."""
+        return self._closed
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Connection limits applied to every pool."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeouts(self) -> httpx.Timeout:
+        """Timeouts applied to every client."""
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+    def client(self, base_url: str) -> httpx.Client:
+        """Return the pooled sync client of a base URL's origin.
+
+        Args:
+            base_url: Base URL of the API, e.g. ``http://localhost:11434``.
+
+        Returns:
+            An ``httpx.Client`` shared by every caller of the same origin.
+
+        Raises:
+            ValueError: If the transport is closed.
+        """
+        origin = _origin(base_url)
+        with self._lock:
+            self._check_open()
+            client = self._clients.get(origin)
+            if client is None:
+                transport = httpx.HTTPTransport(limits=self.limits, http2=self.http2)
+                client = httpx.Client(
+                    transport=transport,
+                    timeout=self.timeouts,
+                    event_hooks={"request": [self._hook(origin, "requests")]},
+                )
+                self._register(origin, "sync", transport)
+                self._clients[origin] = client
+            return client
+
+    def async_client(self, base_url: str) -> httpx.AsyncClient:
+        """Return the pooled async client of a base URL's origin.
+
+        Args:
+            base_url: Base URL of the API.
+
+        Returns:
+            An ``httpx.AsyncClient`` shared by every caller of the same origin.
+
+        Raises:
+            ValueError: If the transport is closed.
+        """
+        origin = _origin(base_url)
+        with self._lock:
+            self._check_open()
+            client = self._async_clients.get(origin)
+            if client is None:
+                transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+                client = httpx.AsyncClient(
+                    transport=transport,
+                    timeout=self.timeouts,
+                    event_hooks={"request": [self._async_hook(origin, "requests")]},
+                )
+                self._register(origin, "async", transport)
+                self._async_clients[origin] = client
+            return client
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Per-origin counters and pool state.
+
+        Returns:
+            For each origin: ``requests`` sent, and ``connections``,
+            ``idle`` and ``active`` connections currently in its pools.
+        """
+        with self._lock:
+            result = {}
+            for origin, counters in self._counters.items():
+                pools = self._pools.get(origin, {}).values()
+                connections = [c for pool in pools for c in _connections(pool)]
+                idle = sum(1 for c in connections if c.is_idle())
+                result[origin] = {
+                    **counters,
+                    "connections": len(connections),
+                    "idle": idle,
+                    "active": len(connections) - idle,
+                }
+            return result
+
+    def close(self) -> None:
+        """Close the transport and every sync client and its connections.
+
+        Async clients can only be closed from their event loop; use
+        :meth:`aclose` there to close them as well.
+        """
+        with self._lock:
+            self._closed = True
+            clients, self._clients = list(self._clients.values()), {}
+            for pools in self._pools.values():
+                pools.pop("sync", None)
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the transport and every client, async ones included."""
+        self.close()
+        with self._lock:
+            clients, self._async_clients = list(self._async_clients.values()), {}
+            self._pools.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _check_open(self) -> None:
+        """Raise ValueError once the transport is closed (lock held)."""
+        if self._closed:
+            raise ValueError("HTTPTransport is closed")
+
+    def _register(self, origin: str, kind: str, transport: Any) -> None:
+        """Track a new pool for statistics (called with the lock held)."""
+        self._pools.setdefault(origin, {})[kind] = getattr(transport, "_pool", None)
+        self._counters.setdefault(origin, {"requests": 0})
+
+    def _count(self, origin: str, key: str) -> None:
+        """Increment a per-origin counter."""
+        with self._lock:
+            self._counters[origin][key] += 1
+
+    def _hook(self, origin: str, key: str):
+        """Sync event hook counting under ``key``."""
+
+        def hook(_: httpx.Request) -> None:
+            self._count(origin, key)
+
+        return hook
+
+    def _async_hook(self, origin: str, key: str):
+        """Async event hook counting under ``key``."""
+
+        async def hook(_: httpx.Request) -> None:
+            self._count(origin, key)
+
+        return hook
+
+
+def _connections(pool: Any) -> list[Any]:
+    """Connections of an httpcore pool (empty if the pool is not introspectable)."""
+    return list(getattr(pool, "connections", None) or [])
+
+
+def resolve_async_client(source: AsyncClientSource | None) -> httpx.AsyncClient | None:
+    """Return the async client of ``source``, calling it if it is a factory.
+
+    Factories let a client be handed out before any event loop runs; the
+    ``httpx.AsyncClient`` is only built by the first async request, on the
+    loop that will use it.
+
+    Args:
+        source: An async client, a zero-arg callable returning one, or None.
+
+    Returns:
+        The async client, or None if ``source`` is None.
+    """
+    if source is None or isinstance(source, httpx.AsyncClient):
+        return source
+    return source()
+
+
+def get_http_transport(name: str = "default", config: dict | None = None) -> HTTPTransport:
+    """Return the shared transport called ``name``, creating it on first use.
+
+    A closed transport is replaced by a new one. The configuration only
+    applies when the transport is created; a different configuration for an
+    existing name is logged and ignored.
+
+    Args:
+        name: Transport name; providers sharing a name share connection pools.
+        config: Transport configuration used when creating it.
+
+    Returns:
+        The HTTPTransport registered under ``name``.
+    """
+    with _transports_lock:
+        transport = _transports.get(name)
+        if transport is None or transport.closed:
+            transport = _transports[name] = HTTPTransport(config)
+        elif config is not None and dict(config) != transport.config:
+            logger.warning(
+                "HTTP transport '%s' already exists with config %s; ignoring %s",
+                name,
+                transport.config,
+                config,
+            )
+        return transport
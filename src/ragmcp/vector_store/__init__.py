@@ -1,5 +1,6 @@
 """VectorStore module."""
 
 from ragmcp.vector_store.base import VectorStore
+from ragmcp.vector_store.local_store import LocalVectorStore
 
-__all__ = ["VectorStore"]
+__all__ = ["VectorStore", "LocalVectorStore"]
@@ -1,10 +1,13 @@
 """VectorStore base abstractions."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from ragmcp.pipeline.batch import ChunkBatch
+
 
 class VectorStore(ABC):
     """Abstract base class for vector storage implementations.
@@ -27,18 +30,48 @@ class VectorStore(ABC):
         ...
 
     @abstractmethod
-    def query(self, query_vector: np.ndarray, top_k: int) -> list[dict]:
+    def query(self, query_vector: np.ndarray, top_k: int, filter: dict | None = None) -> list[dict]:
         """Query the vector store for similar vectors.
 
         Args:
             query_vector: The query vector to search for.
             top_k: Maximum number of results to return.
+            filter: Optional metadata filter on the payloads, e.g.
+                    ``{"source": "a.pdf", "page": {"$gte": 3}}``. See
+                    :mod:`ragmcp.vector_store.filters` for the syntax.
 
         Returns:
             List of results, each containing vector, score, and payload.
         """
         ...
 
+    def query_batch(
+        self, query_matrix: np.ndarray, top_k: int, filter: dict | None = None
+    ) -> list[list[dict]]:
+        """Query the vector store with several query vectors at once.
+
+        The default implementation runs :meth:`query` once per row.
+        Backends that can score a whole query matrix in one call (native
+        batch search, one matrix product) should override it.
+
+        Args:
+            query_matrix: Query vectors of shape ``(Q, D)``.
+            top_k: Maximum number of results per query.
+            filter: Optional metadata filter shared by all queries.
+
+        Returns:
+            One result list per query row, in the same order as the rows.
+
+        Raises:
+            ValueError: If query_matrix is not two-dimensional.
+        """
+        query_matrix = np.asarray(query_matrix)
+        if query_matrix.ndim != 2:
+            raise ValueError(f"query_matrix must have shape (Q, D), got {query_matrix.shape}")
+        if filter is None:
+            return [self.query(query_vector, top_k) for query_vector in query_matrix]
+        return [self.query(query_vector, top_k, filter=filter) for query_vector in query_matrix]
+
     @abstractmethod
     def delete(self, ids: list[Any]) -> int:
         """Delete vectors by their IDs.
@@ -51,6 +84,20 @@ class VectorStore(ABC):
         """
         ...
 
+    def delete_by_filter(self, filter: dict) -> int:
+        """Delete every vector whose payload matches a metadata filter.
+
+        Backends that can select vectors by payload should override it; the
+        default implementation raises NotImplementedError.
+
+        Args:
+            filter: Non-empty metadata filter, e.g. ``{"source": "a.pdf"}``.
+
+        Returns:
+            Number of vectors deleted.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support delete_by_filter")
+
     @abstractmethod
     def upsert(self, vectors: list[np.ndarray], payloads: list[dict]) -> int:
         """Update existing vectors or insert new ones (insert-or-update).
@@ -63,3 +110,24 @@ class VectorStore(ABC):
             Number of vectors upserted.
         """
         ...
+
+    def upsert_batch(self, batch: "ChunkBatch", id_field: str = "id") -> int:
+        """Upsert an embedded columnar chunk batch.
+
+        Each chunk is stored with its embedding and a payload holding its
+        id (under ``id_field``), text and metadata. The default
+        implementation calls :meth:`upsert` with the rows of the whole matrix.
+
+        Args:
+            batch: Chunks with embeddings attached.
+            id_field: Payload key holding the chunk id.
+
+        Returns:
+            Number of vectors upserted.
+
+        Raises:
+            ValueError: If the batch has no embeddings.
+        """
+        if batch.embeddings is None:
+            raise ValueError("ChunkBatch has no embeddings to upsert")
+        return self.upsert(list(np.asarray(batch.embeddings)), batch.payloads(id_field))
@@ -0,0 +1,228 @@
+"""Metadata filter expressions and payload indexes for vector stores.
+
+Filters are dictionaries in the style used by Chroma and MongoDB::
+
+    {"source": "guide.pdf"}                                 # equality
+    {"page": {"$gte": 3, "$lt": 10}}                        # comparison
+    {"doc_type": {"$in": ["pdf", "md"]}}                    # membership
+    {"$or": [{"source": "a.pdf"}, {"page": {"$ne": 1}}]}    # boolean logic
+
+Several keys in one dictionary are combined with AND. A payload that lacks
+a field never matches a positive condition ($eq, $in, comparisons) on it.
+"""
+
+import operator
+from array import array
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+FIELD_OPERATORS = {"$eq", "$ne", "$in", "$nin", *_COMPARISONS}
+LOGICAL_OPERATORS = {"$and", "$or"}
+
+_MISSING = object()
+
+
+def validate_filter(filter: dict[str, Any]) -> None:
+    """Check that a filter expression is well formed.
+
+    Args:
+        filter: Filter expression.
+
+    Raises:
+        ValueError: If the expression uses an unknown operator or has the
+                    wrong shape.
+    """
+    if not isinstance(filter, dict):
+        raise ValueError(f"Filter must be a dict, got {type(filter).__name__}")
+
+    for key, value in filter.items():
+        if key in LOGICAL_OPERATORS:
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"{key} expects a non-empty list of filters")
+            for clause in value:
+                validate_filter(clause)
+        elif key.startswith("$"):
+            raise ValueError(f"Unknown filter operator: {key}")
+        elif isinstance(value, dict):
+            for op, operand in value.items():
+                if op not in FIELD_OPERATORS:
+                    raise ValueError(f"Unknown filter operator: {op}")
+                if op in ("$in", "$nin") and not isinstance(operand, list | tuple | set):
+                    raise ValueError(f"{op} expects a list of values")
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    """Match one field value against a literal or an operator dictionary."""
+    if not isinstance(condition, dict):
+        return value is not _MISSING and value == condition
+
+    for op, operand in condition.items():
+        if op == "$eq":
+            matched = value is not _MISSING and value == operand
+        elif op == "$ne":
+            matched = value is _MISSING or value != operand
+        elif op == "$in":
+            matched = value is not _MISSING and value in operand
+        elif op == "$nin":
+            matched = value is _MISSING or value not in operand
+        else:
+            try:
+                matched = value is not _MISSING and _COMPARISONS[op](value, operand)
+            except TypeError:
+                matched = False
+        if not matched:
+            return False
+    return True
+
+
+def match_filter(payload: dict[str, Any], filter: dict[str, Any]) -> bool:
+    """Evaluate a filter expression against a single payload.
+
+    Args:
+        payload: Payload dictionary.
+        filter: Filter expression.
+
+    Returns:
+        True if the payload satisfies the filter.
+    """
+    for key, condition in filter.items():
+        if key == "$and":
+            matched = all(match_filter(payload, clause) for clause in condition)
+        elif key == "$or":
+            matched = any(match_filter(payload, clause) for clause in condition)
+        else:
+            matched = _match_condition(payload.get(key, _MISSING), condition)
+        if not matched:
+            return False
+    return True
+
+
+class PayloadIndex:
+    """Per-field inverted indexes over payload values.
+
+    For every indexed field, each distinct value maps to a posting list of
+    row numbers stored in a compact ``array("q")``. Filters over indexed
+    fields are resolved into a boolean row bitmap before any vector is
+    scored; clauses on other fields are returned as a residual filter to be
+    applied after scoring.
+
+    A field whose values turn out to be unhashable (lists, dicts) is dropped
+    from the index and falls back to post-filtering.
+    """
+
+    def __init__(self, fields: list[str] | None = None):
+        """Initialize empty indexes.
+
+        Args:
+            fields: Payload fields to index.
+        """
+        self._postings: dict[str, dict[Any, array]] = {field: {} for field in fields or []}
+
+    @property
+    def fields(self) -> list[str]:
+        """Fields that are currently indexed."""
+        return list(self._postings)
+
+    def add(self, rows: list[int], payloads: list[dict[str, Any]]) -> None:
+        """Index the payloads of newly appended rows.
+
+        Args:
+            rows: Row numbers of the payloads.
+            payloads: Payload dictionaries.
+        """
+        for field in list(self._postings):
+            postings = self._postings[field]
+            for row, payload in zip(rows, payloads, strict=True):
+                if field not in payload:
+                    continue
+                try:
+                    posting = postings.get(payload[field])
+                except TypeError:
+                    del self._postings[field]
+                    break
+                if posting is None:
+                    posting = postings[payload[field]] = array("q")
+                posting.append(row)
+
+    def resolve(
+        self, filter: dict[str, Any], size: int
+    ) -> tuple[np.ndarray | None, dict[str, Any] | None]:
+        """Split a filter into an indexed bitmap and a residual filter.
+
+        Args:
+            filter: Filter expression.
+            size: Number of rows the bitmap must cover.
+
+        Returns:
+            Tuple ``(mask, residual)``. ``mask`` is a boolean array of
+            candidate rows (None when no clause is indexable); ``residual``
+            holds the clauses that still have to be checked per payload
+            (None when the mask is exact).
+        """
+        masks: list[np.ndarray] = []
+        residual: dict[str, Any] = {}
+
+        for key, condition in filter.items():
+            if key == "$and":
+                for clause in condition:
+                    mask, rest = self.resolve(clause, size)
+                    if mask is not None:
+                        masks.append(mask)
+                    if rest is not None:
+                        residual.setdefault("$and", []).append(rest)
+            elif key == "$or":
+                branches = [self.resolve(clause, size) for clause in condition]
+                exact = [mask for mask, rest in branches if mask is not None and rest is None]
+                if len(exact) == len(branches):
+                    masks.append(np.logical_or.reduce(exact))
+                else:
+                    residual["$or"] = condition
+            elif key in self._postings and self._indexable(condition):
+                masks.append(self._field_mask(key, condition, size))
+            else:
+                residual[key] = condition
+
+        mask = np.logical_and.reduce(masks) if masks else None
+        return mask, residual or None
+
+    @staticmethod
+    def _indexable(condition: Any) -> bool:
+        """Whether a field condition can be answered from postings."""
+        operators = condition if isinstance(condition, dict) else {"$eq": condition}
+        # Negations must also match rows that lack the field, which are not
+        # in any posting list, so they are left to post-filtering.
+        return not ({"$ne", "$nin"} & operators.keys())
+
+    def _field_mask(self, field: str, condition: Any, size: int) -> np.ndarray:
+        """Bitmap of rows whose indexed field satisfies the condition."""
+        postings = self._postings[field]
+        mask = np.zeros(size, dtype=bool)
+
+        if not isinstance(condition, dict):
+            values = [condition]
+        elif set(condition) <= {"$eq", "$in"}:
+            candidates = [condition["$eq"]] if "$eq" in condition else None
+            if "$in" in condition:
+                allowed = list(condition["$in"])
+                candidates = [v for v in candidates if v in allowed] if candidates else allowed
+            values = candidates or []
+        else:
+            values = [v for v in postings if _match_condition(v, condition)]
+
+        for value in values:
+            try:
+                posting = postings.get(value)
+            except TypeError:
+                continue
+            if posting:
+                rows = np.frombuffer(posting, dtype=np.int64)
+                mask[rows[rows < size]] = True
+        return mask
@@ -0,0 +1,327 @@
+"""Hierarchical Navigable Small World (HNSW) index in Python/NumPy.
+
+Implements the graph index described by Malkov & Yashunin. Each node keeps
+neighbour lists per layer; similarities of a node's whole neighbour list are
+computed with one NumPy product. Deleted rows stay in the graph as routing
+nodes and are only filtered out of results (tombstones).
+
+Inserts are serialized by a lock taken once per row; searches take no lock.
+A node's links are fully built before it is published, and published
+neighbour lists are replaced rather than modified, so a concurrent search
+sees each list either before or after an insert and never follows a link
+to a node that is still being wired in.
+"""
+
+import heapq
+import math
+import threading
+
+import numpy as np
+
+from ragmcp.vector_store.index import VectorIndex, select_top_k
+from ragmcp.vector_store.matrix import VectorMatrix
+
+
+class HNSWIndex(VectorIndex):
+    """Approximate nearest-neighbour index based on an HNSW graph.
+
+    Tuning knobs:
+        M: Neighbours kept per node on upper layers (``2 * M`` on layer 0).
+           Larger values raise recall and memory use.
+        ef_construction: Beam width while inserting. Larger values build a
+            better graph at the cost of insert time.
+        ef_search: Beam width while querying (raised to ``top_k`` if smaller).
+            Can be changed at any time to trade latency for recall.
+        brute_force_ratio: When a search mask leaves at most this fraction
+            of rows eligible (e.g. a selective metadata filter), the eligible
+            rows are scored exactly instead of walking the graph.
+    """
+
+    def __init__(
+        self,
+        matrix: VectorMatrix,
+        metric: str = "cosine",
+        M: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        brute_force_ratio: float = 0.05,
+        seed: int | None = None,
+    ):
+        """Initialize an empty HNSW graph.
+
+        Args:
+            matrix: Matrix holding the indexed vectors.
+            metric: Similarity metric ("cosine" or "ip").
+            M: Maximum neighbours per node on layers above 0.
+            ef_construction: Candidate list size used while inserting.
+            ef_search: Candidate list size used while searching.
+            brute_force_ratio: Eligible-row fraction below which masked
+                searches fall back to exact scoring.
+            seed: Seed for the random level generator.
+
+        Raises:
+            ValueError: If M or the ef parameters are not positive.
+        """
+        super().__init__(matrix, metric)
+        if M < 2:
+            raise ValueError(f"M must be at least 2, got {M}")
+        if ef_construction < 1 or ef_search < 1:
+            raise ValueError("ef_construction and ef_search must be positive")
+
+        self.M = M
+        self.max_neighbors0 = 2 * M
+        self.ef_construction = max(ef_construction, M)
+        self.ef_search = ef_search
+        self.brute_force_ratio = brute_force_ratio
+        self._level_mult = 1.0 / math.log(M)
+        self._rng = np.random.default_rng(seed)
+
+        # _links[row][layer] is the neighbour list of ``row`` on ``layer``.
+        self._links: list[list[list[int]]] = []
+        # (entry point, max level), published together; None while empty
+        self._entry: tuple[int, int] | None = None
+        # Serializes writers only
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of nodes in the graph (including tombstoned rows)."""
+        return len(self._links)
+
+    def add(self, rows: np.ndarray) -> None:
+        """Insert rows into the graph one by one.
+
+        The lock is taken per row, so concurrent writers interleave and
+        searches see each row as soon as it is inserted.
+        """
+        for row in rows.tolist():
+            with self._lock:
+                self._insert(row, self.matrix.data)
+
+    def get_state(self) -> dict[str, np.ndarray]:
+        """The graph as flat arrays: layers per node, link counts and links."""
+        with self._lock:
+            layers = [len(node) for node in self._links]
+            counts = [len(links) for node in self._links for links in node]
+            neighbors = [n for node in self._links for links in node for n in links]
+            entry_point, max_level = self._entry if self._entry is not None else (-1, -1)
+            return {
+                "layers": np.asarray(layers, dtype=np.int32),
+                "counts": np.asarray(counts, dtype=np.int32),
+                "neighbors": np.asarray(neighbors, dtype=np.int64),
+                "entry_point": np.asarray(entry_point),
+                "max_level": np.asarray(max_level),
+            }
+
+    def set_state(self, state: dict[str, np.ndarray]) -> None:
+        """Restore the graph saved by :meth:`get_state`."""
+        counts = state["counts"].tolist()
+        bounds = np.concatenate(([0], np.cumsum(counts, dtype=np.int64))).tolist()
+        neighbors = state["neighbors"].tolist()
+        links: list[list[list[int]]] = []
+        position = 0
+        for layers in state["layers"].tolist():
+            node = []
+            for slot in range(position, position + layers):
+                node.append(neighbors[bounds[slot] : bounds[slot + 1]])
+            links.append(node)
+            position += layers
+
+        entry_point = int(state["entry_point"])
+        with self._lock:
+            self._links = links
+            self._entry = None if entry_point < 0 else (entry_point, int(state["max_level"]))
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Walk the graph from the entry point and return the best rows.
+
+        Runs without the lock. Rows inserted after the walk starts are not
+        visited.
+        """
+        # The entry is read first: its node is always within the links read next.
+        top = self._entry
+        data = self.matrix.data[: len(self._links)]
+        if top is None or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = query.astype(data.dtype, copy=False)
+        if size is not None and size < len(data):
+            # Nodes inserted after the caller's snapshot route but never match.
+            bounded = np.zeros(len(data), dtype=bool)
+            bounded[:size] = True if mask is None else mask[:size]
+            mask = bounded
+        if mask is not None:
+            mask = mask[: len(data)]
+            eligible = np.flatnonzero(mask)
+            if len(eligible) <= self.brute_force_ratio * len(data):
+                return self._exact_search(query, top_k, data, eligible)
+
+        entry, max_level = top
+        for layer in range(max_level, 0, -1):
+            entry = self._search_layer(query, [entry], 1, layer, data)[0][1]
+
+        found = self._search_layer(query, [entry], max(self.ef_search, top_k), 0, data, mask)
+        found = found[:top_k]
+        rows = np.fromiter((row for _, row in found), dtype=np.int64, count=len(found))
+        scores = np.fromiter((score for score, _ in found), dtype=np.float32, count=len(found))
+        return rows, scores
+
+    def _exact_search(
+        self, query: np.ndarray, top_k: int, data: np.ndarray, eligible: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score only the eligible rows exactly."""
+        scores = data[eligible] @ query
+        best = select_top_k(scores, top_k)
+        return eligible[best], scores[best]
+
+    def _random_level(self) -> int:
+        """Draw a node level from the exponentially decaying distribution."""
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _insert(self, row: int, data: np.ndarray) -> None:
+        """Insert a single row into the graph; called with the lock held.
+
+        The row's own links are built first and published in one
+        assignment, then each neighbour's list is replaced by a new list
+        including the row.
+        """
+        level = self._random_level()
+        while len(self._links) <= row:
+            self._links.append([])
+
+        if self._entry is None:
+            self._links[row] = [[] for _ in range(level + 1)]
+            self._entry = (row, level)
+            return
+
+        vector = data[row]
+        entry, max_level = self._entry
+        for layer in range(max_level, level, -1):
+            entry = self._search_layer(vector, [entry], 1, layer, data)[0][1]
+
+        node: list[list[int]] = [[] for _ in range(level + 1)]
+        entries = [entry]
+        for layer in range(min(level, max_level), -1, -1):
+            candidates = self._search_layer(vector, entries, self.ef_construction, layer, data)
+            node[layer] = self._select_neighbors(candidates, self.M, data)
+            entries = [candidate for _, candidate in candidates]
+        self._links[row] = node
+
+        for layer in range(min(level, max_level), -1, -1):
+            max_neighbors = self.max_neighbors0 if layer == 0 else self.M
+            for neighbor in node[layer]:
+                links = [*self._links[neighbor][layer], row]
+                if len(links) > max_neighbors:
+                    links = self._shrink(neighbor, links, max_neighbors, data)
+                self._links[neighbor][layer] = links
+
+        if level > max_level:
+            self._entry = (row, level)
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entries: list[int],
+        ef: int,
+        layer: int,
+        data: np.ndarray,
+        mask: np.ndarray | None = None,
+    ) -> list[tuple[float, int]]:
+        """Beam search on one layer.
+
+        Rows excluded by ``mask`` are still expanded so the walk can pass
+        through them, but they never enter the result set.
+
+        Returns:
+            List of ``(score, row)`` pairs sorted by descending score.
+        """
+        heappush, heappop = heapq.heappush, heapq.heappop
+        graph = self._links
+        count = len(data)
+        entry_scores = (data[entries] @ query).tolist()
+        visited = set(entries)
+        candidates = [(-score, row) for score, row in zip(entry_scores, entries, strict=True)]
+        heapq.heapify(candidates)
+        results = [
+            (score, row)
+            for score, row in zip(entry_scores, entries, strict=True)
+            if mask is None or mask[row]
+        ]
+        results = heapq.nlargest(ef, results)
+        heapq.heapify(results)
+        worst = results[0][0] if len(results) >= ef else -math.inf
+
+        while candidates:
+            neg_score, current = heappop(candidates)
+            if -neg_score < worst:
+                break
+
+            links = graph[current]
+            if layer >= len(links):
+                continue
+            # Links to rows newer than ``data`` appear while searches run concurrently.
+            neighbors = [n for n in links[layer] if n < count and n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            scores = data[neighbors] @ query
+            for position in np.flatnonzero(scores > worst).tolist():
+                score = float(scores[position])
+                if score <= worst:
+                    continue
+                neighbor = neighbors[position]
+                heappush(candidates, (-score, neighbor))
+                if mask is None or mask[neighbor]:
+                    heappush(results, (score, neighbor))
+                    if len(results) > ef:
+                        heappop(results)
+                    if len(results) >= ef:
+                        worst = results[0][0]
+
+        results.sort(reverse=True)
+        return results
+
+    def _select_neighbors(
+        self, candidates: list[tuple[float, int]], limit: int, data: np.ndarray
+    ) -> list[int]:
+        """Pick diverse neighbours with the HNSW selection heuristic.
+
+        A candidate is kept only if it is more similar to the base vector
+        than to every neighbour already selected. Remaining slots are filled
+        with the best discarded candidates.
+        """
+        if len(candidates) <= limit:
+            return [candidate for _, candidate in candidates]
+
+        vectors = data[[candidate for _, candidate in candidates]]
+        kept = np.empty((limit, vectors.shape[1]), dtype=vectors.dtype)
+        selected: list[int] = []
+        discarded: list[int] = []
+        for position, (score, candidate) in enumerate(candidates):
+            count = len(selected)
+            if count >= limit:
+                break
+            vector = vectors[position]
+            if count and (kept[:count] @ vector).max() > score:
+                discarded.append(candidate)
+            else:
+                kept[count] = vector
+                selected.append(candidate)
+
+        for candidate in discarded:
+            if len(selected) >= limit:
+                break
+            selected.append(candidate)
+        return selected
+
+    def _shrink(self, node: int, links: list[int], limit: int, data: np.ndarray) -> list[int]:
+        """Reduce an overfull neighbour list back to ``limit`` entries."""
+        scores = (data[links] @ data[node]).tolist()
+        candidates = sorted(zip(scores, links, strict=True), reverse=True)
+        return self._select_neighbors(candidates, limit, data)
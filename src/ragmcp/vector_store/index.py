@@ -0,0 +1,276 @@
+"""Search indexes used by the in-process vector store.
+
+An index answers nearest-neighbour queries over the rows of a
+:class:`~ragmcp.vector_store.matrix.VectorMatrix` owned by the store. Rows
+are identified by their position in the matrix; liveness (deleted rows) is
+passed in by the store as a boolean mask, and the number of rows a query may
+see as ``size``, so rows appended by a concurrent write after the store took
+its snapshot are never read.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from ragmcp.vector_store.matrix import VectorMatrix
+
+# Supported similarity metrics. Scores are always "higher is better".
+VALID_METRICS = ("cosine", "ip")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2 normalize vectors along the last axis.
+
+    Zero vectors are returned unchanged instead of producing NaNs.
+
+    Args:
+        vectors: Array of shape ``(D,)`` or ``(N, D)``.
+
+    Returns:
+        Array of the same shape with unit-length rows.
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normalized: np.ndarray = vectors / norms
+    return normalized
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the ``k`` largest scores, best first.
+
+    Uses ``np.argpartition`` so that only the selected ``k`` entries are
+    fully sorted.
+
+    Args:
+        scores: One-dimensional score array.
+        k: Number of indices to return.
+
+    Returns:
+        Indices into ``scores`` sorted by descending score.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def select_top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Row-wise :func:`select_top_k` for a ``(Q, N)`` score matrix.
+
+    Args:
+        scores: Two-dimensional score array, one row per query.
+        k: Number of indices to return per row.
+
+    Returns:
+        Array of shape ``(Q, min(k, N))`` with column indices sorted by
+        descending score within each row.
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k == n:
+        return np.argsort(-scores, axis=1, kind="stable")
+
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class VectorIndex(ABC):
+    """Abstract base class for nearest-neighbour indexes over a VectorMatrix.
+
+    Vectors are appended to the shared matrix by the store first and then
+    announced to the index through :meth:`add`.
+    """
+
+    def __init__(self, matrix: VectorMatrix, metric: str = "cosine"):
+        """Initialize the index.
+
+        Args:
+            matrix: Matrix holding the indexed vectors.
+            metric: Similarity metric ("cosine" or "ip").
+
+        Raises:
+            ValueError: If the metric is not supported.
+        """
+        if metric not in VALID_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Supported: {list(VALID_METRICS)}")
+        self.matrix = matrix
+        self.metric = metric
+
+    @abstractmethod
+    def add(self, rows: np.ndarray) -> None:
+        """Index rows that were just appended to the matrix.
+
+        Args:
+            rows: Row indices of the new vectors.
+        """
+        ...
+
+    @abstractmethod
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the rows most similar to the query.
+
+        Args:
+            query: Query vector, already normalized for the cosine metric.
+            top_k: Maximum number of rows to return.
+            mask: Optional boolean array over the matrix rows; only rows
+                  whose entry is True may be returned.
+            size: Only the first ``size`` rows are searched (default: all
+                  indexed rows).
+
+        Returns:
+            Tuple of ``(rows, scores)`` sorted by descending score.
+        """
+        ...
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Search for several queries at once.
+
+        The default implementation calls :meth:`search` per query; indexes
+        that can score all queries together should override it.
+
+        Args:
+            queries: Query matrix of shape ``(Q, D)``.
+            top_k: Maximum number of rows to return per query.
+            mask: Optional boolean row mask shared by all queries.
+            size: Only the first ``size`` rows are searched.
+
+        Returns:
+            One ``(rows, scores)`` tuple per query.
+        """
+        return [self.search(query, top_k, mask, size) for query in queries]
+
+    def get_state(self) -> dict[str, np.ndarray] | None:
+        """Arrays from which :meth:`set_state` restores the index, if it can be saved.
+
+        Indexes that read the matrix directly have nothing to save and
+        return None.
+        """
+        return None
+
+    def set_state(self, state: dict[str, np.ndarray]) -> None:
+        """Restore an index over the same rows from :meth:`get_state` arrays.
+
+        Args:
+            state: Arrays returned by :meth:`get_state`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be restored from saved state")
+
+    def remove(self, rows: np.ndarray) -> None:  # noqa: B027
+        """Notify the index that rows were deleted.
+
+        Deleted rows are always excluded through the search mask, so indexes
+        only need to override this to release per-row state.
+
+        Args:
+            rows: Row indices that are no longer live.
+        """
+
+
+class FlatIndex(VectorIndex):
+    """Exact brute-force index.
+
+    Scores every row with one matrix-vector product and selects the top-k
+    with ``np.argpartition``. When a mask leaves at most ``gather_ratio`` of
+    the rows eligible (e.g. a selective metadata filter), only those rows
+    are gathered and scored.
+    """
+
+    gather_ratio = 0.25
+
+    def add(self, rows: np.ndarray) -> None:
+        """Nothing to do: the flat index reads the matrix directly."""
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score all rows exactly and return the best ``top_k``."""
+        data = self.matrix.data[:size]
+        eligible = self._eligible_rows(mask, len(data))
+        if eligible is not None:
+            scores = data[eligible] @ query.astype(data.dtype, copy=False)
+            best = select_top_k(scores, top_k)
+            return eligible[best], scores[best]
+
+        scores = data @ query.astype(data.dtype, copy=False)
+
+        if mask is not None:
+            scores = np.where(mask[: len(scores)], scores, -np.inf)
+
+        rows = select_top_k(scores, top_k)
+        rows = rows[np.isfinite(scores[rows])]
+        return rows, scores[rows]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+        block_elements: int = 1 << 25,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Score a block of queries with one matrix product per block.
+
+        Args:
+            queries: Query matrix of shape ``(Q, D)``.
+            top_k: Maximum number of rows to return per query.
+            mask: Optional boolean row mask shared by all queries.
+            size: Only the first ``size`` rows are searched.
+            block_elements: Upper bound on the size of each ``(q, N)``
+                score block, to bound temporary memory.
+
+        Returns:
+            One ``(rows, scores)`` tuple per query.
+        """
+        data = self.matrix.data[:size]
+        queries = queries.astype(data.dtype, copy=False)
+        live = mask[: len(data)] if mask is not None else None
+        eligible = self._eligible_rows(mask, len(data))
+        if eligible is not None:
+            data, live = data[eligible], None
+        block_rows = max(1, block_elements // max(len(data), 1))
+
+        results: list[tuple[np.ndarray, np.ndarray]] = []
+        for start in range(0, len(queries), block_rows):
+            scores = queries[start : start + block_rows] @ data.T
+            if live is not None:
+                scores = np.where(live, scores, -np.inf)
+
+            best = select_top_k_rows(scores, top_k)
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            if eligible is not None:
+                best = eligible[best]
+            for rows, row_scores in zip(best, best_scores, strict=True):
+                finite = np.isfinite(row_scores)
+                results.append((rows[finite], row_scores[finite]))
+        return results
+
+    def _eligible_rows(self, mask: np.ndarray | None, size: int) -> np.ndarray | None:
+        """Rows allowed by a selective mask, or None to scan all rows."""
+        if mask is None:
+            return None
+        eligible = np.flatnonzero(mask[:size])
+        return eligible if len(eligible) <= self.gather_ratio * size else None
@@ -0,0 +1,409 @@
+"""Inverted-file index with product quantization (IVF-PQ).
+
+Vectors are assigned to the nearest of ``nlist`` coarse centroids and the
+residual to that centroid is compressed into ``m`` one-byte codes, one per
+sub-space. Queries probe the ``nprobe`` closest lists, score their codes
+with per-query lookup tables (asymmetric distance computation) and re-score
+a shortlist exactly against the full vectors. Encoding and searches are
+serialized by a lock because the inverted lists are mutable; training fits
+its codebooks outside that lock.
+"""
+
+import threading
+
+import numpy as np
+
+from ragmcp.vector_store.index import VectorIndex, select_top_k
+from ragmcp.vector_store.matrix import VectorMatrix
+
+# Number of centroids per PQ sub-space; codes are stored as uint8.
+PQ_CENTROIDS = 256
+
+
+def assign_nearest(data: np.ndarray, centroids: np.ndarray, block_size: int = 8192) -> np.ndarray:
+    """Return the index of the nearest centroid (L2) for every row.
+
+    Args:
+        data: Array of shape ``(N, D)``.
+        centroids: Array of shape ``(K, D)``.
+        block_size: Rows processed per distance block to bound memory use.
+
+    Returns:
+        Integer array of shape ``(N,)``.
+    """
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignment = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), block_size):
+        block = data[start : start + block_size]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 does not affect argmin.
+        distances = centroid_norms - 2.0 * (block @ centroids.T)
+        assignment[start : start + len(block)] = np.argmin(distances, axis=1)
+    return assignment
+
+
+def train_kmeans(
+    data: np.ndarray,
+    k: int,
+    iterations: int = 20,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Train k-means centroids with Lloyd's algorithm.
+
+    Empty clusters are re-seeded from random training points.
+
+    Args:
+        data: Training vectors of shape ``(N, D)``.
+        k: Number of centroids (capped at ``N``).
+        iterations: Number of Lloyd iterations.
+        rng: Random generator used for initialization.
+
+    Returns:
+        Centroids of shape ``(min(k, N), D)`` as float32.
+    """
+    rng = rng or np.random.default_rng()
+    data = np.asarray(data, dtype=np.float32)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = assign_nearest(data, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=k)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.add.reduceat(data[order], starts, axis=0)
+        centroids[filled] = sums / counts[filled, np.newaxis]
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+
+    return centroids
+
+
+class IVFPQIndex(VectorIndex):
+    """Compressed approximate index based on IVF and product quantization.
+
+    Each vector costs ``m`` bytes of codes plus one list id, instead of
+    ``4 * D`` bytes of float32, so ``m = D / 4`` to ``m = D / 16`` makes the
+    data a query scans 16x to 64x smaller (the default is ``D / 16``). The
+    index does not replace the full vectors: they stay in the matrix for
+    the exact re-score of the shortlist. For the in-memory tail of the store
+    that matrix is float32 in RAM; only rows in persisted segments are
+    memory-mapped, so there the codes are what must stay resident.
+
+    Once ``training_size`` rows have been added the index reports
+    :attr:`needs_training`; the store then calls :meth:`train` from its
+    maintenance thread, which fits the codebooks on a random sample without
+    blocking writes. Until then queries are answered exactly.
+
+    Tuning knobs:
+        nlist: Number of coarse clusters (inverted lists).
+        m: Number of PQ sub-spaces (bytes per vector); must divide D.
+        nprobe: Lists scanned per query.
+        rerank_k: Shortlist size re-scored with full vectors (0 disables).
+    """
+
+    def __init__(
+        self,
+        matrix: VectorMatrix,
+        metric: str = "cosine",
+        nlist: int = 256,
+        m: int | None = None,
+        nprobe: int = 8,
+        rerank_k: int = 100,
+        training_size: int = 20000,
+        kmeans_iterations: int = 20,
+        seed: int | None = None,
+    ):
+        """Initialize an untrained IVF-PQ index.
+
+        Args:
+            matrix: Matrix holding the full vectors.
+            metric: Similarity metric ("cosine" or "ip").
+            nlist: Number of inverted lists.
+            m: Number of sub-quantizers (default: D / 16).
+            nprobe: Number of lists probed per query.
+            rerank_k: Number of candidates re-scored exactly.
+            training_size: Rows needed before training, and the size of
+                the training sample.
+            kmeans_iterations: Lloyd iterations used for training.
+            seed: Seed for sampling and k-means initialization.
+
+        Raises:
+            ValueError: If m does not divide the vector dimension.
+        """
+        super().__init__(matrix, metric)
+        dimension = matrix.dimension
+        m = m or max(1, dimension // 16)
+        if dimension % m != 0:
+            raise ValueError(f"m={m} must divide the vector dimension {dimension}")
+
+        self.nlist = nlist
+        self.m = m
+        self.nprobe = nprobe
+        self.rerank_k = rerank_k
+        self.training_size = training_size
+        self.kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+
+        self._centroids: np.ndarray | None = None
+        self._codebooks: np.ndarray | None = None  # (m, PQ_CENTROIDS, D / m)
+        self._codes = np.empty((0, m), dtype=np.uint8)
+        self._list_ids = np.empty(0, dtype=np.int32)
+        self._list_members: list[list[int]] = []
+        self._list_rows: list[np.ndarray | None] = []
+        self._pending: list[int] = []
+        # Rows added while train() fits codebooks outside the lock
+        self._added_during_training: list[int] | None = None
+        self._lock = threading.Lock()
+        self._training = threading.Lock()
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether coarse centroids and PQ codebooks have been trained."""
+        return self._centroids is not None
+
+    @property
+    def needs_training(self) -> bool:
+        """Whether enough rows were added to train the untrained index."""
+        return not self.is_trained and len(self._pending) >= self.training_size
+
+    @property
+    def code_nbytes(self) -> int:
+        """Bytes used by the per-vector codes and list ids."""
+        return self._codes.nbytes + self._list_ids.nbytes
+
+    @property
+    def compression_ratio(self) -> float:
+        """Raw float32 vector size divided by the per-vector code size."""
+        return (4 * self.matrix.dimension) / (self.m + self._list_ids.itemsize)
+
+    def train(self, sample: np.ndarray | None = None) -> None:
+        """Train centroids and codebooks, then encode all indexed rows.
+
+        k-means and the encoding of the rows indexed so far run without the
+        index lock, so concurrent searches (answered as before) and inserts
+        are not blocked; rows added meanwhile are encoded once the new
+        codebooks are installed.
+
+        Args:
+            sample: Training vectors. Defaults to a random sample of up to
+                    ``training_size`` indexed rows.
+        """
+        with self._training:
+            with self._lock:
+                data = self.matrix.data
+                if self.is_trained:
+                    rows = np.flatnonzero(self._list_ids >= 0)
+                else:
+                    rows = np.asarray(self._pending, dtype=np.int64)
+                if sample is None:
+                    size = min(self.training_size, len(rows))
+                    sample = data[np.sort(self._rng.choice(rows, size, replace=False))]
+                self._added_during_training = []
+            try:
+                centroids, codebooks = self._fit(np.asarray(sample, dtype=np.float32))
+                list_ids, codes = self._quantize(data, rows, centroids, codebooks)
+            except BaseException:
+                with self._lock:
+                    self._added_during_training = None
+                raise
+
+            with self._lock:
+                late = np.asarray(self._added_during_training, dtype=np.int64)
+                self._added_during_training = None
+                self._centroids, self._codebooks = centroids, codebooks
+                self.nlist = len(centroids)
+                self._list_members = [[] for _ in range(self.nlist)]
+                self._list_rows = [None] * self.nlist
+                self._codes = np.empty((0, self.m), dtype=np.uint8)
+                self._list_ids = np.empty(0, dtype=np.int32)
+                self._pending = []
+                self._store(rows, list_ids, codes)
+                self._encode(late)
+
+    def add(self, rows: np.ndarray) -> None:
+        """Encode new rows, or keep them for training while untrained."""
+        with self._lock:
+            if self._added_during_training is not None:
+                self._added_during_training.extend(rows.tolist())
+            if self.is_trained:
+                self._encode(rows)
+            else:
+                self._pending.extend(rows.tolist())
+
+    def get_state(self) -> dict[str, np.ndarray]:
+        """Centroids, codebooks, codes and list ids, or the pending rows if untrained."""
+        with self._lock:
+            if not self.is_trained:
+                return {"pending": np.asarray(self._pending, dtype=np.int64)}
+            assert self._centroids is not None and self._codebooks is not None
+            return {
+                "centroids": self._centroids,
+                "codebooks": self._codebooks,
+                "codes": self._codes,
+                "list_ids": self._list_ids,
+            }
+
+    def set_state(self, state: dict[str, np.ndarray]) -> None:
+        """Restore codebooks and inverted lists saved by :meth:`get_state`."""
+        with self._lock:
+            if "centroids" not in state:
+                self._pending = state["pending"].tolist()
+                return
+            self._centroids = np.asarray(state["centroids"], dtype=np.float32)
+            self._codebooks = np.asarray(state["codebooks"], dtype=np.float32)
+            self.nlist = len(self._centroids)
+            self._list_members = [[] for _ in range(self.nlist)]
+            self._list_rows = [None] * self.nlist
+            self._codes = np.empty((0, self.m), dtype=np.uint8)
+            self._list_ids = np.empty(0, dtype=np.int32)
+            self._pending = []
+            list_ids = state["list_ids"]
+            rows = np.flatnonzero(list_ids >= 0)
+            self._store(rows, list_ids[rows], state["codes"][rows])
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Probe the closest lists, score codes via lookup tables, re-score."""
+        with self._lock:
+            return self._search(query, top_k, mask, size)
+
+    def _search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None,
+        size: int | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Body of :meth:`search`; called with the lock held."""
+        data = self.matrix.data[:size]
+        query = query.astype(np.float32, copy=False)
+        if not self.is_trained:
+            pending = np.asarray(self._pending, dtype=np.int64)
+            return self._exact_search(query, top_k, data, pending[pending < len(data)], mask)
+
+        assert self._centroids is not None
+        coarse = self._centroids @ query
+        probed = select_top_k(coarse, min(self.nprobe, self.nlist))
+
+        rows_per_list = [self._rows_of(int(lst)) for lst in probed]
+        candidates = np.concatenate(rows_per_list) if rows_per_list else np.empty(0, np.int64)
+        candidates = candidates[candidates < len(data)]
+        if mask is not None and len(candidates):
+            candidates = candidates[mask[candidates]]
+        if len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        approx = coarse[self._list_ids[candidates]] + self._adc_scores(query, candidates)
+        order = select_top_k(approx, max(self.rerank_k, top_k))
+        if self.rerank_k <= 0:
+            best = order[:top_k]
+            return candidates[best], approx[best].astype(np.float32)
+
+        return self._exact_search(query, top_k, data, candidates[order], None)
+
+    def _adc_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Approximate residual scores from per-query lookup tables."""
+        assert self._codebooks is not None
+        sub_queries = query.reshape(self.m, -1)
+        # lookup[j, c] = <query_j, codebook_j[c]>, computed once per query.
+        lookup = np.einsum("jd,jcd->jc", sub_queries, self._codebooks)
+        codes = self._codes[rows]
+        scores: np.ndarray = lookup[np.arange(self.m), codes].sum(axis=1)
+        return scores
+
+    def _exact_search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        data: np.ndarray,
+        rows: np.ndarray,
+        mask: np.ndarray | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score the given rows with full vectors."""
+        rows = rows.astype(np.int64, copy=False)
+        if mask is not None and len(rows):
+            rows = rows[mask[rows]]
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = data[rows] @ query
+        best = select_top_k(scores, top_k)
+        return rows[best], scores[best]
+
+    def _fit(self, sample: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Train coarse centroids and PQ codebooks on a sample."""
+        centroids = train_kmeans(sample, self.nlist, self.kmeans_iterations, self._rng)
+        residuals = sample - centroids[assign_nearest(sample, centroids)]
+
+        sub_dim = self.matrix.dimension // self.m
+        codebooks = np.zeros((self.m, PQ_CENTROIDS, sub_dim), dtype=np.float32)
+        for j in range(self.m):
+            sub = residuals[:, j * sub_dim : (j + 1) * sub_dim]
+            trained = train_kmeans(sub, PQ_CENTROIDS, self.kmeans_iterations, self._rng)
+            codebooks[j, : len(trained)] = trained
+            # Unused slots (tiny samples) repeat a real centroid so they never win.
+            codebooks[j, len(trained) :] = trained[0]
+        return centroids, codebooks
+
+    def _quantize(
+        self,
+        data: np.ndarray,
+        rows: np.ndarray,
+        centroids: np.ndarray,
+        codebooks: np.ndarray,
+        block_size: int = 8192,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """List ids and PQ codes of ``data[rows]``, computed block by block."""
+        list_ids = np.empty(len(rows), dtype=np.int32)
+        codes = np.empty((len(rows), self.m), dtype=np.uint8)
+        sub_dim = self.matrix.dimension // self.m
+        for start in range(0, len(rows), block_size):
+            vectors = data[rows[start : start + block_size]]
+            assigned = assign_nearest(vectors, centroids)
+            residuals = vectors - centroids[assigned]
+            list_ids[start : start + len(vectors)] = assigned
+            for j in range(self.m):
+                sub = residuals[:, j * sub_dim : (j + 1) * sub_dim]
+                codes[start : start + len(vectors), j] = assign_nearest(sub, codebooks[j])
+        return list_ids, codes
+
+    def _encode(self, rows: np.ndarray) -> None:
+        """Assign rows to lists and store their PQ codes."""
+        assert self._centroids is not None and self._codebooks is not None
+        if len(rows) == 0:
+            return
+        self._store(rows, *self._quantize(self.matrix.data, rows, self._centroids, self._codebooks))
+
+    def _store(self, rows: np.ndarray, list_ids: np.ndarray, codes: np.ndarray) -> None:
+        """Write codes and list memberships of rows, growing the buffers."""
+        if len(rows) == 0:
+            return
+        end = int(rows.max()) + 1
+        if end > len(self._codes):
+            capacity = max(end, 2 * len(self._codes))
+            grown_codes = np.zeros((capacity, self.m), dtype=np.uint8)
+            grown_codes[: len(self._codes)] = self._codes
+            grown_ids = np.full(capacity, -1, dtype=np.int32)
+            grown_ids[: len(self._list_ids)] = self._list_ids
+            self._codes, self._list_ids = grown_codes, grown_ids
+
+        self._codes[rows] = codes
+        self._list_ids[rows] = list_ids
+        for row, list_id in zip(rows.tolist(), list_ids.tolist(), strict=True):
+            self._list_members[list_id].append(row)
+            self._list_rows[list_id] = None
+
+    def _rows_of(self, list_id: int) -> np.ndarray:
+        """Rows of an inverted list as a cached array."""
+        rows = self._list_rows[list_id]
+        if rows is None:
+            rows = np.asarray(self._list_members[list_id], dtype=np.int64)
+            self._list_rows[list_id] = rows
+        return rows
@@ -0,0 +1,1062 @@
+"""In-process vector store backed by a contiguous NumPy matrix."""
+
+import heapq
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Callable
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from ragmcp.embedding.quantization import EmbeddingMatrix
+from ragmcp.vector_store.base import VectorStore
+from ragmcp.vector_store.filters import PayloadIndex, match_filter, validate_filter
+from ragmcp.vector_store.hnsw import HNSWIndex
+from ragmcp.vector_store.index import VALID_METRICS, FlatIndex, VectorIndex, normalize
+from ragmcp.vector_store.ivf_pq import IVFPQIndex
+from ragmcp.vector_store.matrix import VectorMatrix
+from ragmcp.vector_store.matryoshka import MatryoshkaIndex
+from ragmcp.vector_store.quantized import ScalarQuantizedIndex
+from ragmcp.vector_store.segment import SEGMENT_DTYPES, Segment, write_segment
+
+if TYPE_CHECKING:
+    from ragmcp.pipeline.batch import ChunkBatch
+
+MANIFEST_FILE = "manifest.json"
+
+# Module logger
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorStore(VectorStore):
+    """Local VectorStore that needs no external service.
+
+    Vectors live in a preallocated, growable float32 matrix and payloads in
+    a parallel list. Each payload is identified by its ``id_field`` value
+    (an integer id is assigned when the field is missing). Deleted and
+    replaced rows are tombstoned and reclaimed by :meth:`compact`.
+
+    Queries accept a metadata ``filter``. Clauses on ``indexed_fields`` are
+    resolved through inverted indexes into a row bitmap before any vector
+    is scored; clauses on other fields are checked on the payloads of an
+    over-fetched candidate list.
+
+    Writes follow an LSM layout: new rows go to a mutable in-memory
+    memtable, which is sealed into an immutable segment once it holds
+    ``memtable_size`` rows. Deletes and upserts of sealed rows only add
+    tombstones; those of upserts are saved only once the replacing rows are
+    on disk, so a restart never loses a flushed row. A background thread
+    persists sealed segments, merges small segments, rewrites segments full
+    of tombstones and builds an ANN index per large segment, swapping
+    results in without blocking queries, which fan out over the memtable
+    and every live segment and merge their top-k.
+
+    With ``persist_directory`` set, segments are written as immutable files
+    that later processes open with ``np.memmap``, so startup cost does not
+    grow with the index size; segment indexes are saved with them and
+    restored by the first maintenance round instead of being rebuilt.
+    :meth:`flush` makes all rows durable.
+
+    Config keys:
+        dimension: Vector dimension (inferred from the first insert if absent).
+        metric_type: "cosine" (default) or "ip".
+        id_field: Payload key holding the vector id (default "id").
+        index_type: Search index to use: "flat" (exact, default), "hnsw",
+            "ivf_pq", "sq" (scalar-quantized scan with exact re-scoring) or
+            "matryoshka" (truncated-prefix scan with full-dimension
+            re-scoring).
+        hnsw: HNSW parameters (``M``, ``ef_construction``, ``ef_search``,
+            ``brute_force_ratio``, ``seed``) used when index_type is "hnsw".
+        ivf_pq: IVF-PQ parameters (``nlist``, ``m``, ``nprobe``,
+            ``rerank_k``, ``training_size``, ``seed``) used when index_type
+            is "ivf_pq".
+        sq: Scalar quantization parameters (``dtype``: "int8" or
+            "float16", ``rescore_k``) used when index_type is "sq".
+        matryoshka: Prefix search parameters (``prefix_dim``,
+            ``rescore_k``) used when index_type is "matryoshka".
+        indexed_fields: Payload fields with an inverted index for
+            pre-filtering (default none).
+        post_filter_oversample: Initial over-fetch factor for clauses that
+            must be post-filtered (default 4).
+        initial_capacity: Rows to preallocate (default 1024).
+        compaction_threshold: Fraction of dead rows that triggers an
+            automatic compaction (default 0.5).
+        persist_directory: Directory holding the manifest and segment files
+            (default: in-memory only).
+        segment_dtype: On-disk vector dtype, "float32" (default) or
+            "float16" (half the size, slightly lower score precision).
+        memtable_size: Live memtable rows that trigger sealing it into a
+            segment (default 0: only :meth:`flush` seals).
+        max_segments: Segment count above which the smallest segments are
+            merged (default 8).
+        segment_index_min_rows: Minimum live rows for a segment to get its
+            own ``index_type`` index; smaller ones are scanned exactly
+            (default 10000).
+        background_compaction: Run segment maintenance in a background
+            thread (default True); otherwise call :meth:`compact_segments`.
+    """
+
+    VALID_INDEX_TYPES = ["flat", "hnsw", "ivf_pq", "sq", "matryoshka"]
+
+    def __init__(self, config: dict):
+        """Initialize an empty local vector store.
+
+        Args:
+            config: Vector store configuration dictionary.
+
+        Raises:
+            ValueError: If metric_type, index_type or segment_dtype is
+                        unknown, or the persisted manifest does not match
+                        the configuration.
+        """
+        self.config = config
+        self.dimension: int | None = config.get("dimension")
+        self.metric = str(config.get("metric_type", "cosine")).lower()
+        self.index_type = str(config.get("index_type", "flat")).lower()
+        self.id_field = config.get("id_field", "id")
+        self._initial_capacity = int(config.get("initial_capacity", 1024))
+        self._compaction_threshold = float(config.get("compaction_threshold", 0.5))
+        self._indexed_fields = list(config.get("indexed_fields") or [])
+        self._oversample = max(2, int(config.get("post_filter_oversample", 4)))
+        self._segment_dtype = str(config.get("segment_dtype", "float32")).lower()
+        persist_directory = config.get("persist_directory")
+        self.persist_directory = Path(persist_directory) if persist_directory else None
+        self._memtable_size = int(config.get("memtable_size") or 0)
+        self._max_segments = max(1, int(config.get("max_segments", 8)))
+        self._segment_index_min_rows = int(config.get("segment_index_min_rows", 10000))
+        self._background = bool(config.get("background_compaction", True))
+
+        if self.metric not in VALID_METRICS:
+            raise ValueError(
+                f"Unknown metric_type: {self.metric}. Supported: {list(VALID_METRICS)}"
+            )
+        if self.index_type not in self.VALID_INDEX_TYPES:
+            raise ValueError(
+                f"Unknown index_type: {self.index_type}. Supported: {self.VALID_INDEX_TYPES}"
+            )
+        if self._segment_dtype not in SEGMENT_DTYPES:
+            raise ValueError(
+                f"Unknown segment_dtype: {self._segment_dtype}. Supported: {list(SEGMENT_DTYPES)}"
+            )
+
+        self._lock = threading.RLock()
+        self._matrix: VectorMatrix | None = None
+        self._index: VectorIndex | None = None
+        self._ids: list[Any] = []
+        self._payloads: list[dict] = []
+        self._payload_index = PayloadIndex(self._indexed_fields)
+        self._id_to_row: dict[Any, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._dead_count = 0
+        self._next_auto_id = 0
+        self._segments: list[Segment] = []
+        self._next_segment = 0
+        self._maintenance_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._compactor: threading.Thread | None = None
+
+        if self.persist_directory is not None:
+            self._open_segments()
+        if self.dimension is not None:
+            self._init_storage(int(self.dimension))
+        if self._segments:
+            self._schedule_maintenance()
+
+    def __len__(self) -> int:
+        """Number of live vectors."""
+        return len(self._id_to_row) + sum(segment.live_count for segment in self._segments)
+
+    @property
+    def index(self) -> VectorIndex | None:
+        """The search index of the in-memory tail (None until the dimension is known)."""
+        return self._index
+
+    @property
+    def segments(self) -> list[Segment]:
+        """Sealed segments (on disk or in memory), oldest first."""
+        return list(self._segments)
+
+    def insert(self, vectors: list[np.ndarray], payloads: list[dict]) -> int:
+        """Insert vectors with their associated payloads.
+
+        Args:
+            vectors: List of embedding vectors (or an ``(N, D)`` array or
+                     EmbeddingMatrix).
+            payloads: List of payload dictionaries, one per vector.
+
+        Returns:
+            Number of vectors inserted.
+
+        Raises:
+            ValueError: If lengths differ or an id already exists.
+        """
+        with self._lock:
+            matrix, ids, codes = self._prepare(vectors, payloads)
+            duplicates = [i for i in ids if self._contains(i)]
+            if duplicates or len(set(ids)) != len(ids):
+                raise ValueError(
+                    f"Duplicate ids in insert: {duplicates or ids}. Use upsert() instead."
+                )
+            self._append(matrix, ids, payloads, codes)
+            self._maybe_seal()
+            return len(ids)
+
+    def upsert(
+        self, vectors: list[np.ndarray] | np.ndarray | EmbeddingMatrix, payloads: list[dict]
+    ) -> int:
+        """Insert new vectors and replace existing ones with the same id.
+
+        Replaced rows are tombstoned; when an id appears more than once in
+        the batch the last occurrence wins.
+
+        Args:
+            vectors: List of embedding vectors (or an ``(N, D)`` array or
+                     EmbeddingMatrix).
+            payloads: List of payload dictionaries, one per vector.
+
+        Returns:
+            Number of vectors upserted.
+        """
+        with self._lock:
+            matrix, ids, codes = self._prepare(vectors, payloads)
+
+            last_position = {vector_id: pos for pos, vector_id in enumerate(ids)}
+            keep = sorted(last_position.values())
+            if len(keep) != len(ids):
+                matrix = matrix[keep]
+                codes = codes.rows(np.asarray(keep)) if codes is not None else None
+                ids = [ids[pos] for pos in keep]
+                payloads = [payloads[pos] for pos in keep]
+
+            self._tombstone([self._id_to_row[i] for i in ids if i in self._id_to_row])
+            # Saved once the new rows are on disk; see _save_deletes().
+            self._delete_from_segments(ids, save=False)
+            self._append(matrix, ids, payloads, codes)
+            self._maybe_compact()
+            self._maybe_seal()
+            return len(ids)
+
+    def upsert_batch(self, batch: "ChunkBatch", id_field: str = "id") -> int:
+        """Upsert an embedded chunk batch, keeping compact embeddings compact.
+
+        The batch's EmbeddingMatrix is handed to :meth:`upsert` as is, so
+        with the ``sq`` index int8 or float16 embeddings are stored without
+        being re-quantized.
+
+        Raises:
+            ValueError: If the batch has no embeddings.
+        """
+        if batch.embeddings is None:
+            raise ValueError("ChunkBatch has no embeddings to upsert")
+        return self.upsert(batch.embeddings, batch.payloads(id_field))
+
+    def delete(self, ids: list[Any]) -> int:
+        """Delete vectors by their ids.
+
+        Args:
+            ids: List of vector ids to delete. Unknown ids are ignored.
+
+        Returns:
+            Number of vectors deleted.
+        """
+        with self._lock:
+            ids = list(dict.fromkeys(ids))
+            rows = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+            on_disk = [i for i in ids if i not in self._id_to_row]
+            self._tombstone(rows)
+            deleted = self._delete_from_segments(on_disk)
+            self._save_deletes(set(ids))
+            self._maybe_compact()
+            return len(rows) + deleted
+
+    def delete_by_filter(self, filter: dict) -> int:
+        """Delete every live vector whose payload matches a metadata filter.
+
+        Indexed clauses are resolved through the inverted indexes; other
+        clauses are checked on the payloads of the remaining rows.
+
+        Args:
+            filter: Non-empty metadata filter.
+
+        Returns:
+            Number of vectors deleted.
+
+        Raises:
+            ValueError: If the filter is empty or malformed.
+        """
+        if not filter:
+            raise ValueError("delete_by_filter() requires a non-empty filter")
+        validate_filter(filter)
+
+        with self._lock:
+            ids: list[Any] = []
+            if self._matrix is not None:
+                size = len(self._matrix)
+                mask, residual = self._payload_index.resolve(filter, size)
+                alive = self._alive[:size]
+                rows = np.flatnonzero(alive if mask is None else alive & mask)
+                ids.extend(
+                    self._ids[row]
+                    for row in rows.tolist()
+                    if residual is None or match_filter(self._payloads[row], residual)
+                )
+            for segment in self._segments:
+                if not segment.live_count:
+                    continue
+                mask, residual = segment.mask(filter)
+                segment_rows = (
+                    range(len(segment)) if mask is None else np.flatnonzero(mask).tolist()
+                )
+                for row in segment_rows:
+                    vector_id, payload = segment.record(row)
+                    if residual is None or match_filter(payload, residual):
+                        ids.append(vector_id)
+            return self.delete(ids)
+
+    def query(self, query_vector: np.ndarray, top_k: int, filter: dict | None = None) -> list[dict]:
+        """Return the ``top_k`` most similar live vectors.
+
+        Args:
+            query_vector: The query vector.
+            top_k: Maximum number of results to return.
+            filter: Optional metadata filter on the payloads.
+
+        Returns:
+            List of results sorted by descending score, each containing
+            ``id``, ``score``, ``payload`` and ``vector``.
+
+        Raises:
+            ValueError: If the query dimension does not match the store or
+                        the filter is malformed.
+        """
+        query = self._prepare_queries(np.asarray(query_vector).reshape(1, -1))[0]
+        snapshot, residual, segment_views = self._snapshot(top_k, filter)
+        if snapshot is None:
+            return []
+
+        index, mask, _, payloads, size = snapshot
+        rows, scores = self._search(
+            partial(index.search, size=size),
+            payloads.__getitem__,
+            mask,
+            size,
+            residual,
+            query,
+            top_k,
+        )
+        results = self._build_results(snapshot, rows, scores)
+        if not segment_views:
+            return results
+
+        per_segment = [
+            segment.build_results(
+                *self._search(
+                    segment.search,
+                    segment.payload,
+                    segment_mask,
+                    len(segment),
+                    segment_residual,
+                    query,
+                    top_k,
+                )
+            )
+            for segment, segment_mask, segment_residual in segment_views
+        ]
+        return _merge_results([results, *per_segment], top_k)
+
+    def query_batch(
+        self, query_matrix: np.ndarray, top_k: int, filter: dict | None = None
+    ) -> list[list[dict]]:
+        """Query with a whole ``(Q, D)`` matrix in one index call.
+
+        With the flat index every block of queries is scored by a single
+        matrix product followed by a row-wise top-k.
+
+        Args:
+            query_matrix: Query vectors of shape ``(Q, D)``.
+            top_k: Maximum number of results per query.
+            filter: Optional metadata filter shared by all queries.
+
+        Returns:
+            One result list per query row.
+
+        Raises:
+            ValueError: If the query shape does not match the store or the
+                        filter is malformed.
+        """
+        queries = self._prepare_queries(query_matrix)
+        snapshot, residual, segment_views = self._snapshot(top_k, filter)
+        if snapshot is None:
+            return [[] for _ in range(len(queries))]
+
+        index, mask, _, payloads, size = snapshot
+        results = [
+            self._build_results(snapshot, rows, scores)
+            for rows, scores in self._search_batch(
+                partial(index.search, size=size),
+                partial(index.search_batch, size=size),
+                payloads.__getitem__,
+                mask,
+                size,
+                residual,
+                queries,
+                top_k,
+            )
+        ]
+        if not segment_views:
+            return results
+
+        for segment, segment_mask, segment_residual in segment_views:
+            hits = self._search_batch(
+                segment.search,
+                segment.search_batch,
+                segment.payload,
+                segment_mask,
+                len(segment),
+                segment_residual,
+                queries,
+                top_k,
+            )
+            results = [
+                _merge_results([merged, segment.build_results(rows, scores)], top_k)
+                for merged, (rows, scores) in zip(results, hits, strict=True)
+            ]
+        return results
+
+    def flush(self) -> int:
+        """Seal the memtable and write every in-memory segment to disk.
+
+        Returns:
+            Number of rows written.
+
+        Raises:
+            ValueError: If no persist_directory is configured.
+        """
+        if self.persist_directory is None:
+            raise ValueError("flush() requires persist_directory to be configured")
+
+        with self._maintenance_lock:
+            with self._lock:
+                self._seal()
+                pending = [segment for segment in self._segments if not segment.is_persisted]
+            written = sum(segment.live_count for segment in pending)
+            for segment in pending:
+                self._rewrite_segments([segment])
+            return written
+
+    def compact_segments(self) -> None:
+        """Run one round of segment maintenance in the calling thread.
+
+        Restores the saved indexes and builds the lookups of segments
+        opened from disk, trains IVF-PQ indexes that reached their
+        ``training_size``, writes sealed in-memory segments to disk (when
+        persisting), rewrites segments whose share of tombstones exceeds
+        ``compaction_threshold``, merges the smallest segments while there
+        are more than ``max_segments``, and builds indexes for large
+        segments. The background thread runs the same routine.
+        """
+        with self._maintenance_lock:
+            for segment in self._segments:
+                # Segments opened from disk: restore their saved index and
+                # build their lookups here rather than on the first request.
+                if segment.index is None and self.index_type != "flat":
+                    segment.load_index(self._create_index)
+                segment.warm()
+            with self._lock:
+                owners: list[tuple[Segment | None, VectorIndex | None]] = [
+                    (None, self._index),
+                    *((s, s.index) for s in self._segments),
+                ]
+            for owner, index in owners:
+                # Trained without the store lock; writes and queries continue.
+                if isinstance(index, IVFPQIndex) and index.needs_training:
+                    index.train()
+                    if owner is not None:
+                        owner.save_index()
+            if self.persist_directory is not None:
+                for segment in [s for s in self._segments if not s.is_persisted]:
+                    self._rewrite_segments([segment])
+            while plan := self._plan_merge():
+                self._rewrite_segments(plan)
+            for segment in self._segments:
+                if self._needs_index(segment):
+                    self._build_segment_index(segment)
+
+    def close(self) -> None:
+        """Stop the background maintenance thread.
+
+        A round that is already running is allowed to finish. Rows that were
+        not flushed stay in memory only, and flushed rows they replaced are
+        kept on disk.
+        """
+        self._closed = True
+        self._wakeup.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def compact(self) -> None:
+        """Drop tombstoned memtable rows and rebuild the memtable index."""
+        with self._lock:
+            if self._matrix is None or self._dead_count == 0:
+                return
+
+            live_rows = np.flatnonzero(self._alive[: len(self._matrix)])
+            vectors = self._matrix.data[live_rows]
+            ids = [self._ids[row] for row in live_rows]
+            payloads = [self._payloads[row] for row in live_rows]
+            codes = None
+            if isinstance(self._index, ScalarQuantizedIndex):
+                codes = self._index.codes.rows(live_rows)
+
+            self._init_storage(self._matrix.dimension, max(len(live_rows), 1))
+            self._append(vectors, ids, payloads, codes)
+
+    def _init_storage(self, dimension: int, capacity: int | None = None) -> None:
+        """Create an empty matrix, index and row bookkeeping."""
+        self.dimension = dimension
+        self._matrix = VectorMatrix(dimension, np.float32, capacity or self._initial_capacity)
+        self._index = self._create_index(self._matrix)
+        self._ids = []
+        self._payloads = []
+        self._payload_index = PayloadIndex(self._indexed_fields)
+        self._id_to_row = {}
+        self._alive = np.zeros(self._matrix.capacity, dtype=bool)
+        self._dead_count = 0
+
+    def _create_index(self, matrix: VectorMatrix) -> VectorIndex:
+        """Create the search index configured by ``index_type``."""
+        if self.index_type == "hnsw":
+            return HNSWIndex(matrix, self.metric, **self.config.get("hnsw", {}))
+        if self.index_type == "ivf_pq":
+            return IVFPQIndex(matrix, self.metric, **self.config.get("ivf_pq", {}))
+        if self.index_type == "sq":
+            return ScalarQuantizedIndex(matrix, self.metric, **self.config.get("sq", {}))
+        if self.index_type == "matryoshka":
+            return MatryoshkaIndex(matrix, self.metric, **self.config.get("matryoshka", {}))
+        return FlatIndex(matrix, self.metric)
+
+    def _prepare(
+        self, vectors: list[np.ndarray] | np.ndarray | EmbeddingMatrix, payloads: list[dict]
+    ) -> tuple[np.ndarray, list[Any], EmbeddingMatrix | None]:
+        """Validate a write batch and return its float32 matrix, ids and codes.
+
+        ``codes`` keeps the compact values of an EmbeddingMatrix input (None
+        otherwise) for the ``sq`` index, scaled like the float32 matrix.
+        """
+        if len(vectors) != len(payloads):
+            raise ValueError(f"Got {len(vectors)} vectors but {len(payloads)} payloads")
+
+        if len(payloads) == 0:
+            return np.empty((0, self.dimension or 0), dtype=np.float32), [], None
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError(f"Expected a batch of vectors, got shape {matrix.shape}")
+        if self._matrix is None:
+            self._init_storage(matrix.shape[1])
+        codes = vectors if isinstance(vectors, EmbeddingMatrix) else None
+        if self.metric == "cosine":
+            if codes is not None:
+                codes = _normalize_codes(codes, np.linalg.norm(matrix, axis=1))
+            matrix = normalize(matrix)
+
+        ids = [self._resolve_id(payload) for payload in payloads]
+        return matrix, ids, codes
+
+    def _prepare_queries(self, query_matrix: np.ndarray) -> np.ndarray:
+        """Convert queries to a normalized float32 ``(Q, D)`` matrix."""
+        queries = np.asarray(query_matrix, dtype=np.float32)
+        if queries.ndim != 2:
+            raise ValueError(f"query_matrix must have shape (Q, D), got {queries.shape}")
+        if self.dimension is not None and queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match store dimension {self.dimension}"
+            )
+        if self.metric == "cosine":
+            queries = normalize(queries)
+        return queries
+
+    def _snapshot(
+        self, top_k: int, filter: dict | None = None
+    ) -> tuple[
+        tuple[VectorIndex, np.ndarray | None, list, list, int] | None,
+        dict | None,
+        list[tuple[Segment, np.ndarray | None, dict | None]],
+    ]:
+        """Capture the index, row mask, ids, payloads and row count for a query.
+
+        The mask combines liveness with the indexed part of the filter. The
+        memtable keeps growing while the query runs outside the lock, so
+        searches and results are bounded to the rows counted here.
+
+        Returns:
+            Tuple ``(snapshot, residual, segment_views)``: the snapshot is
+            None when there is nothing to search; ``residual`` holds the
+            filter clauses that must be checked on payloads after scoring;
+            ``segment_views`` lists each segment with its mask and residual.
+        """
+        if filter is not None:
+            validate_filter(filter)
+
+        with self._lock:
+            if self._index is None or top_k <= 0:
+                return None, None, []
+
+            size = len(self._index.matrix)
+            mask = self._alive[:size] if self._dead_count else None
+            residual = None
+            if filter:
+                filter_mask, residual = self._payload_index.resolve(filter, size)
+                if filter_mask is not None:
+                    mask = filter_mask if mask is None else filter_mask & mask
+            segment_views = [
+                (segment, *segment.mask(filter)) for segment in self._segments if segment.live_count
+            ]
+            snapshot = (self._index, mask, self._ids, self._payloads, size)
+            return snapshot, residual, segment_views
+
+    def _search(
+        self,
+        search: Callable[..., tuple[np.ndarray, np.ndarray]],
+        payload_of: Callable[[int], dict],
+        mask: np.ndarray | None,
+        size: int,
+        residual: dict | None,
+        query: np.ndarray,
+        top_k: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Search one source, post-filtering payloads against ``residual``.
+
+        Post-filtering over-fetches candidates and widens the search until
+        ``top_k`` matches are found or the eligible rows are exhausted.
+        """
+        if residual is None:
+            return search(query, top_k, mask)
+
+        limit = int(mask.sum()) if mask is not None else size
+        fetch = min(top_k * self._oversample, limit)
+        while True:
+            rows, scores = search(query, fetch, mask)
+            keep = [
+                pos
+                for pos, row in enumerate(rows.tolist())
+                if match_filter(payload_of(row), residual)
+            ]
+            if len(keep) >= top_k or len(rows) < fetch or fetch >= limit:
+                keep = keep[:top_k]
+                return rows[keep], scores[keep]
+            fetch = min(fetch * self._oversample, limit)
+
+    def _search_batch(
+        self,
+        search: Callable[..., tuple[np.ndarray, np.ndarray]],
+        search_batch: Callable[..., list[tuple[np.ndarray, np.ndarray]]],
+        payload_of: Callable[[int], dict],
+        mask: np.ndarray | None,
+        size: int,
+        residual: dict | None,
+        queries: np.ndarray,
+        top_k: int,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Batched :meth:`_search`; post-filtering falls back to per-query search."""
+        if residual is None:
+            return search_batch(queries, top_k, mask)
+        return [
+            self._search(search, payload_of, mask, size, residual, query, top_k)
+            for query in queries
+        ]
+
+    def _build_results(
+        self,
+        snapshot: tuple[VectorIndex, np.ndarray | None, list, list, int],
+        rows: np.ndarray,
+        scores: np.ndarray,
+    ) -> list[dict]:
+        """Turn index rows and scores into result dictionaries."""
+        index, _, ids, payloads, size = snapshot
+        data = index.matrix.data[:size]
+        return [
+            {
+                "id": ids[row],
+                "score": float(score),
+                "payload": payloads[row],
+                "vector": data[row],
+            }
+            for row, score in zip(rows.tolist(), scores.tolist(), strict=True)
+        ]
+
+    def _resolve_id(self, payload: dict) -> Any:
+        """Return the payload id, assigning an integer id if it has none."""
+        if self.id_field in payload:
+            return payload[self.id_field]
+        while self._contains(self._next_auto_id):
+            self._next_auto_id += 1
+        auto_id = self._next_auto_id
+        self._next_auto_id += 1
+        return auto_id
+
+    def _append(
+        self,
+        matrix: np.ndarray,
+        ids: list[Any],
+        payloads: list[dict],
+        codes: EmbeddingMatrix | None = None,
+    ) -> None:
+        """Append prepared rows to storage and index them.
+
+        The ``sq`` index stores ``codes``, when given, instead of quantizing
+        the new rows again.
+        """
+        if not ids:
+            return
+        assert self._matrix is not None and self._index is not None
+
+        rows = self._matrix.append(matrix)
+        if self._alive.shape[0] < self._matrix.capacity:
+            alive = np.zeros(self._matrix.capacity, dtype=bool)
+            alive[: self._alive.shape[0]] = self._alive
+            self._alive = alive
+
+        self._alive[rows] = True
+        self._ids.extend(ids)
+        self._payloads.extend(dict(payload) for payload in payloads)
+        self._payload_index.add(rows.tolist(), payloads)
+        self._id_to_row.update(zip(ids, rows.tolist(), strict=True))
+        if codes is not None and isinstance(self._index, ScalarQuantizedIndex):
+            self._index.add_codes(rows, codes)
+        else:
+            self._index.add(rows)
+        if isinstance(self._index, IVFPQIndex) and self._index.needs_training:
+            self._schedule_maintenance()
+
+    def _tombstone(self, rows: list[int]) -> None:
+        """Mark rows as deleted."""
+        if not rows:
+            return
+        assert self._index is not None
+
+        row_array = np.asarray(rows, dtype=np.int64)
+        self._alive[row_array] = False
+        self._dead_count += len(rows)
+        for row in rows:
+            del self._id_to_row[self._ids[row]]
+        self._index.remove(row_array)
+
+    def _maybe_compact(self) -> None:
+        """Compact when the share of dead rows exceeds the threshold."""
+        if self._matrix is None or self._dead_count == 0:
+            return
+        if self._dead_count / len(self._matrix) > self._compaction_threshold:
+            self.compact()
+
+    def _contains(self, vector_id: Any) -> bool:
+        """Whether a live vector with this id exists in memory or on disk."""
+        if vector_id in self._id_to_row:
+            return True
+        return any(segment.find(vector_id) is not None for segment in self._segments)
+
+    def _delete_from_segments(self, ids: list[Any], save: bool = True) -> int:
+        """Tombstone ids held by segments and return how many were found.
+
+        Args:
+            ids: Ids to delete.
+            save: Write the tombstones of persisted segments now, rather
+                  than leaving them to :meth:`_save_deletes`.
+        """
+        deleted = 0
+        for segment in self._segments:
+            if not ids or not segment.live_count:
+                continue
+            rows = [row for row in map(segment.find, ids) if row is not None]
+            segment.delete(rows, save)
+            deleted += len(rows)
+            if rows and segment.dead_ratio > self._compaction_threshold:
+                self._schedule_maintenance()
+        return deleted
+
+    def _save_deletes(self, ids: set[Any] | None = None) -> None:
+        """Write the segment tombstones left unsaved by upserts, where safe.
+
+        An upsert hides the replaced segment row at once but keeps its
+        tombstone off disk while the new row is only in memory, so that a
+        restart falls back to the flushed row rather than losing both. Must
+        be called with the store lock held.
+
+        Args:
+            ids: Ids that were just deleted, whose tombstones can be saved
+                 now. By default, every tombstone whose id no longer has a
+                 row in memory (the memtable or unwritten segments) is saved.
+        """
+        segments = [segment for segment in self._segments if segment.has_unsaved_deletes]
+        if not segments:
+            return
+        if ids is not None:
+            for segment in segments:
+                segment.save_deletes(lambda vector_id: vector_id not in ids)
+            return
+
+        in_memory = [segment for segment in self._segments if not segment.is_persisted]
+
+        def in_memory_only(vector_id: Any) -> bool:
+            return vector_id in self._id_to_row or any(
+                segment.find(vector_id) is not None for segment in in_memory
+            )
+
+        for segment in segments:
+            segment.save_deletes(in_memory_only)
+
+    def _maybe_seal(self) -> None:
+        """Seal the memtable once it reaches ``memtable_size`` live rows."""
+        if self._memtable_size and len(self._id_to_row) >= self._memtable_size:
+            self._seal()
+            self._schedule_maintenance()
+
+    def _seal(self) -> Segment | None:
+        """Turn the live memtable rows into an in-memory segment.
+
+        Must be called with the store lock held. A memtable without deleted
+        rows hands over its vectors and index as they are.
+        """
+        if self._matrix is None or not self._id_to_row:
+            return None
+
+        if self._dead_count == 0:
+            index = self._index if self.index_type != "flat" else None
+            segment = Segment.from_arrays(
+                self._matrix.data, self._ids, self._payloads, self._indexed_fields, index
+            )
+        else:
+            live_rows = np.flatnonzero(self._alive[: len(self._matrix)])
+            segment = Segment.from_arrays(
+                self._matrix.data[live_rows],
+                [self._ids[row] for row in live_rows],
+                [self._payloads[row] for row in live_rows],
+                self._indexed_fields,
+            )
+        self._segments = [*self._segments, segment]
+        self._init_storage(self._matrix.dimension)
+        return segment
+
+    def _schedule_maintenance(self) -> None:
+        """Wake the background maintenance thread, starting it if needed."""
+        if not self._background or self._closed:
+            return
+        if self._compactor is None:
+            self._compactor = threading.Thread(
+                target=self._maintenance_loop, name="LocalVectorStore-compactor", daemon=True
+            )
+            self._compactor.start()
+        self._wakeup.set()
+
+    def _maintenance_loop(self) -> None:
+        """Run :meth:`compact_segments` whenever maintenance is scheduled."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                return
+            try:
+                self.compact_segments()
+            except Exception:
+                logger.exception("Background segment maintenance failed")
+
+    def _plan_merge(self) -> list[Segment] | None:
+        """Pick the segments to rewrite next, or None when nothing is due."""
+        with self._lock:
+            segments = self._segments
+        for segment in segments:
+            if segment.dead_ratio > self._compaction_threshold:
+                return [segment]
+        if len(segments) > self._max_segments:
+            count = max(2, len(segments) - self._max_segments + 1)
+            return sorted(segments, key=lambda segment: segment.live_count)[:count]
+        return None
+
+    def _rewrite_segments(self, old: list[Segment]) -> None:
+        """Merge the live rows of ``old`` into one new segment and swap it in.
+
+        The new segment is built without holding the store lock; deletes
+        that hit ``old`` in the meantime are replayed onto it during the
+        swap.
+        """
+        with self._lock:
+            # Rows with unsaved tombstones are copied and deleted again on swap.
+            alive_before = [segment.alive_snapshot(saved=True) for segment in old]
+
+        parts: list[np.ndarray] = []
+        ids: list[Any] = []
+        payloads: list[dict] = []
+        row_maps: list[np.ndarray] = []
+        offset = 0
+        for segment, alive in zip(old, alive_before, strict=True):
+            if alive is None:
+                live_rows = np.arange(len(segment), dtype=np.int64)
+                parts.append(segment.vectors)
+            else:
+                live_rows = np.flatnonzero(alive)
+                parts.append(segment.vectors[live_rows])
+            row_map = np.full(len(segment), -1, dtype=np.int64)
+            row_map[live_rows] = np.arange(offset, offset + len(live_rows))
+            row_maps.append(row_map)
+            offset += len(live_rows)
+            for row in live_rows.tolist():
+                vector_id, payload = segment.record(row)
+                ids.append(vector_id)
+                payloads.append(payload)
+
+        new: Segment | None = None
+        if offset:
+            vectors = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            if self.persist_directory is not None:
+                new = write_segment(
+                    self._new_segment_path(),
+                    vectors,
+                    ids,
+                    payloads,
+                    self._segment_dtype,
+                    self._indexed_fields,
+                )
+            else:
+                new = Segment.from_arrays(np.asarray(vectors), ids, payloads, self._indexed_fields)
+
+            reusable = old[0].index if len(old) == 1 and alive_before[0] is None else None
+            if reusable is not None:
+                new.attach_index(reusable)
+                new.save_index()
+            elif self._needs_index(new):
+                self._build_segment_index(new)
+
+        self._swap_segments(old, alive_before, row_maps, new)
+
+    def _swap_segments(
+        self,
+        old: list[Segment],
+        alive_before: list[np.ndarray | None],
+        row_maps: list[np.ndarray],
+        new: Segment | None,
+    ) -> None:
+        """Replace ``old`` by ``new`` in the segment list and the manifest."""
+        with self._lock:
+            if new is not None:
+                stale: list[int] = []
+                unsaved: list[int] = []
+                for segment, before, row_map in zip(old, alive_before, row_maps, strict=True):
+                    alive = segment.alive_snapshot()
+                    if alive is None:
+                        continue
+                    dead = ~alive if before is None else before & ~alive
+                    deferred = segment.unsaved_snapshot()
+                    rows = row_map[dead & ~deferred]
+                    stale.extend(rows[rows >= 0].tolist())
+                    rows = row_map[dead & deferred]
+                    unsaved.extend(rows[rows >= 0].tolist())
+                new.delete(stale)
+                new.delete(unsaved, save=False)
+
+            position = min(self._segments.index(segment) for segment in old)
+            segments = [s for s in self._segments if all(s is not o for o in old)]
+            if new is not None and new.live_count:
+                segments.insert(min(position, len(segments)), new)
+            self._segments = segments
+            if self.persist_directory is not None:
+                self._write_manifest()
+                self._save_deletes()
+
+        dropped = [*old, new] if new is not None and not new.live_count else old
+        for segment in dropped:
+            if segment is not None and segment.path is not None:
+                shutil.rmtree(segment.path, ignore_errors=True)
+
+    def _needs_index(self, segment: Segment) -> bool:
+        """Whether a segment is large enough to get its own ANN index."""
+        return (
+            self.index_type != "flat"
+            and segment.index is None
+            and segment.live_count >= self._segment_index_min_rows
+        )
+
+    def _build_segment_index(self, segment: Segment) -> None:
+        """Build an ``index_type`` index over all rows of a segment."""
+        index = self._create_index(VectorMatrix.from_array(segment.vectors))
+        index.add(np.arange(len(segment), dtype=np.int64))
+        if isinstance(index, IVFPQIndex) and not index.is_trained:
+            index.train()
+        segment.index = index
+        segment.save_index()
+
+    def _new_segment_path(self) -> Path:
+        """Reserve the directory name of the next segment."""
+        assert self.persist_directory is not None
+        with self._lock:
+            name = f"segment-{self._next_segment:06d}"
+            self._next_segment += 1
+        return self.persist_directory / "segments" / name
+
+    def _open_segments(self) -> None:
+        """Load the manifest and map the segments listed in it."""
+        assert self.persist_directory is not None
+        manifest_path = self.persist_directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            return
+
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["metric_type"] != self.metric:
+            raise ValueError(
+                f"Persisted metric_type {manifest['metric_type']} does not match {self.metric}"
+            )
+        if self.dimension is not None and manifest["dimension"] != int(self.dimension):
+            raise ValueError(
+                f"Persisted dimension {manifest['dimension']} does not match {self.dimension}"
+            )
+
+        self.dimension = manifest["dimension"]
+        self._next_auto_id = manifest["next_auto_id"]
+        self._next_segment = manifest["next_segment"]
+        self._segments = [
+            Segment(self.persist_directory / "segments" / name, self._indexed_fields)
+            for name in manifest["segments"]
+        ]
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest with the current segment list."""
+        assert self.persist_directory is not None
+        manifest = {
+            "version": 1,
+            "dimension": self.dimension,
+            "metric_type": self.metric,
+            "next_auto_id": self._next_auto_id,
+            "next_segment": self._next_segment,
+            "segments": [
+                segment.path.name for segment in self._segments if segment.path is not None
+            ],
+        }
+        manifest_path = self.persist_directory / MANIFEST_FILE
+        tmp = manifest_path.with_name(MANIFEST_FILE + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, manifest_path)
+
+
+def _merge_results(result_lists: list[list[dict]], top_k: int) -> list[dict]:
+    """Merge per-source result lists into one top-k list by score."""
+    return heapq.nlargest(top_k, chain.from_iterable(result_lists), key=lambda r: r["score"])
+
+
+def _normalize_codes(codes: EmbeddingMatrix, norms: np.ndarray) -> EmbeddingMatrix:
+    """Scale compact embeddings to unit length like :func:`normalize`.
+
+    int8 rows only need their scale divided by the norm, so the quantized
+    values are kept exactly; float16 rows are divided and rounded again.
+    """
+    norms = np.where(norms == 0, 1.0, norms).astype(np.float32)
+    if codes.scales is not None:
+        return EmbeddingMatrix(codes.values, codes.scales / norms)
+    values = np.asarray(codes.values, dtype=np.float32) / norms[:, np.newaxis]
+    return EmbeddingMatrix(values.astype(codes.dtype))
@@ -0,0 +1,119 @@
+"""Growable contiguous vector storage for in-process vector stores."""
+
+import numpy as np
+
+
+class VectorMatrix:
+    """A preallocated, growable ``(N, D)`` matrix of vectors.
+
+    Rows are appended into one contiguous buffer whose capacity doubles when
+    it fills up, so scoring can always run as a single matrix product over
+    :attr:`data` instead of iterating over per-vector arrays.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        dtype: np.dtype | type = np.float32,
+        initial_capacity: int = 1024,
+    ):
+        """Initialize an empty matrix.
+
+        Args:
+            dimension: Number of columns (vector dimension).
+            dtype: Element type of the stored vectors.
+            initial_capacity: Number of rows to preallocate.
+
+        Raises:
+            ValueError: If dimension is not positive.
+        """
+        if dimension <= 0:
+            raise ValueError(f"dimension must be positive, got {dimension}")
+
+        self._dimension = dimension
+        self._dtype = np.dtype(dtype)
+        self._buffer = np.empty((max(initial_capacity, 1), dimension), dtype=self._dtype)
+        self._size = 0
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "VectorMatrix":
+        """Wrap an existing ``(N, D)`` array without copying it.
+
+        Used to index immutable data such as a memory-mapped segment; the
+        array may be read-only, in which case :meth:`append` fails.
+
+        Args:
+            array: Two-dimensional array of vectors.
+
+        Returns:
+            A full matrix whose :attr:`data` is ``array``.
+        """
+        matrix = cls(array.shape[1], array.dtype, initial_capacity=1)
+        matrix._buffer = array
+        matrix._size = array.shape[0]
+        return matrix
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension."""
+        return self._dimension
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Element type of the stored vectors."""
+        return self._dtype
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows that fit before the buffer is reallocated."""
+        return int(self._buffer.shape[0])
+
+    @property
+    def data(self) -> np.ndarray:
+        """View of the filled rows, shape ``(len(self), dimension)``."""
+        return self._buffer[: self._size]
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the buffer so that it holds at least ``capacity`` rows.
+
+        Args:
+            capacity: Minimum number of rows required.
+        """
+        if capacity <= self.capacity:
+            return
+
+        new_capacity = max(capacity, self.capacity * 2)
+        buffer = np.empty((new_capacity, self._dimension), dtype=self._dtype)
+        buffer[: self._size] = self._buffer[: self._size]
+        # Views handed out earlier keep the old buffer alive and stay valid.
+        self._buffer = buffer
+
+    def append(self, vectors: np.ndarray) -> np.ndarray:
+        """Append vectors as new rows.
+
+        Args:
+            vectors: Array of shape ``(n, dimension)`` or a single vector.
+
+        Returns:
+            Row indices assigned to the appended vectors.
+
+        Raises:
+            ValueError: If the vector dimension does not match.
+        """
+        vectors = np.asarray(vectors)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if vectors.ndim != 2 or vectors.shape[1] != self._dimension:
+            raise ValueError(
+                f"Expected vectors of dimension {self._dimension}, got shape {vectors.shape}"
+            )
+
+        count = vectors.shape[0]
+        start = self._size
+        self.reserve(start + count)
+        self._buffer[start : start + count] = vectors
+        self._size += count
+        return np.arange(start, start + count, dtype=np.int64)
@@ -0,0 +1,169 @@
+"""Two-stage prefix index for Matryoshka embeddings.
+
+Matryoshka-trained models (e.g. ``text-embedding-3-large``) pack most of
+the signal into the leading dimensions, so a vector truncated to its first
+``prefix_dim`` components (and re-normalized) is itself a usable embedding.
+The index keeps such a truncated shadow matrix next to the full vectors,
+scans the shadow for a shortlist of ``rescore_k`` candidates per query and
+re-scores only those at full dimension. With 256 of 3072 dimensions the
+scan reads 12x less memory.
+"""
+
+import numpy as np
+
+from ragmcp.vector_store.index import VectorIndex, normalize, select_top_k, select_top_k_rows
+from ragmcp.vector_store.matrix import VectorMatrix
+
+
+class MatryoshkaIndex(VectorIndex):
+    """Approximate index scoring a truncated prefix of every vector.
+
+    For the cosine metric the prefixes of both rows and queries are
+    re-normalized; for inner product they are used as they are. Returned
+    scores are always full-dimension scores.
+
+    Tuning knobs:
+        prefix_dim: Leading dimensions scanned in the first stage.
+        rescore_k: Candidates per query re-scored at full dimension.
+    """
+
+    gather_ratio = 0.25
+
+    def __init__(
+        self,
+        matrix: VectorMatrix,
+        metric: str = "cosine",
+        prefix_dim: int = 256,
+        rescore_k: int = 300,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            matrix: Matrix holding the full vectors.
+            metric: Similarity metric ("cosine" or "ip").
+            prefix_dim: Number of leading dimensions kept in the shadow
+                        matrix (capped at the vector dimension).
+            rescore_k: Number of candidates re-scored at full dimension.
+
+        Raises:
+            ValueError: If prefix_dim or rescore_k is not positive.
+        """
+        super().__init__(matrix, metric)
+        if prefix_dim <= 0:
+            raise ValueError(f"prefix_dim must be positive, got {prefix_dim}")
+        if rescore_k <= 0:
+            raise ValueError(f"rescore_k must be positive, got {rescore_k}")
+
+        self.prefix_dim = min(prefix_dim, matrix.dimension)
+        self.rescore_k = rescore_k
+        self.shadow = VectorMatrix(self.prefix_dim, np.float32, max(matrix.capacity, 1))
+
+    @property
+    def scan_ratio(self) -> float:
+        """Fraction of the full-dimension work done by the first stage."""
+        return self.prefix_dim / self.matrix.dimension
+
+    def add(self, rows: np.ndarray) -> None:
+        """Append the truncated prefixes of new rows to the shadow matrix."""
+        if len(rows) == 0:
+            return
+
+        prefixes = self._truncate(self.matrix.data[rows])
+        end = int(rows.max()) + 1
+        size = len(self.shadow)
+        if end > size:
+            self.shadow.append(np.zeros((end - size, self.prefix_dim), dtype=np.float32))
+        self.shadow.data[rows] = prefixes
+
+    def get_state(self) -> dict[str, np.ndarray]:
+        """The shadow matrix of truncated prefixes."""
+        return {"shadow": self.shadow.data}
+
+    def set_state(self, state: dict[str, np.ndarray]) -> None:
+        """Restore the shadow matrix saved by :meth:`get_state`.
+
+        Raises:
+            ValueError: If the saved prefixes are not ``prefix_dim`` wide.
+        """
+        shadow = np.asarray(state["shadow"], dtype=np.float32)
+        if shadow.shape[1] != self.prefix_dim:
+            raise ValueError(
+                f"Saved prefixes have {shadow.shape[1]} dimensions, expected {self.prefix_dim}"
+            )
+        self.shadow = VectorMatrix.from_array(shadow)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Scan the prefixes, then re-score the shortlist at full dimension."""
+        return self.search_batch(query[np.newaxis], top_k, mask, size)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+        block_elements: int = 1 << 25,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Scan the prefixes for a block of queries with one matrix product.
+
+        Args:
+            queries: Query matrix of shape ``(Q, D)``.
+            top_k: Maximum number of rows to return per query.
+            mask: Optional boolean row mask shared by all queries.
+            size: Only the first ``size`` rows are searched.
+            block_elements: Upper bound on the size of each ``(q, N)``
+                score block, to bound temporary memory.
+
+        Returns:
+            One ``(rows, scores)`` tuple per query.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        prefixes = self._truncate(queries)
+        shadow = self.shadow.data[:size]
+        live = mask[: len(shadow)] if mask is not None else None
+        eligible = None
+        if live is not None:
+            eligible = np.flatnonzero(live)
+            if len(eligible) <= self.gather_ratio * len(shadow):
+                shadow, live = shadow[eligible], None
+            else:
+                eligible = None
+
+        shortlist = max(self.rescore_k, top_k)
+        block_rows = max(1, block_elements // max(len(shadow), 1))
+        results: list[tuple[np.ndarray, np.ndarray]] = []
+        for start in range(0, len(queries), block_rows):
+            scores = prefixes[start : start + block_rows] @ shadow.T
+            if live is not None:
+                scores[:, ~live] = -np.inf
+
+            best = select_top_k_rows(scores, shortlist)
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            if eligible is not None:
+                best = eligible[best]
+            for query, rows, row_scores in zip(
+                queries[start : start + block_rows], best, best_scores, strict=True
+            ):
+                results.append(self._rescore(query, rows[np.isfinite(row_scores)], top_k))
+        return results
+
+    def _truncate(self, vectors: np.ndarray) -> np.ndarray:
+        """Leading ``prefix_dim`` components, re-normalized for cosine."""
+        prefixes = np.asarray(vectors[..., : self.prefix_dim], dtype=np.float32)
+        return normalize(prefixes) if self.metric == "cosine" else prefixes
+
+    def _rescore(
+        self, query: np.ndarray, rows: np.ndarray, top_k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Re-rank shortlisted rows by their full-dimension scores."""
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+        exact = np.asarray(self.matrix.data[rows], dtype=np.float32) @ query
+        best = select_top_k(exact, top_k)
+        return rows[best], exact[best]
@@ -0,0 +1,214 @@
+"""Scalar-quantized index with exact re-scoring.
+
+The index keeps a compact copy of every row (int8 with a per-row scale, or
+float16) and answers queries with one vectorized product over that copy.
+Only a shortlist of ``rescore_k`` candidates per query is re-scored against
+the full-precision vectors of the matrix, which may be a memory-mapped
+segment on disk.
+"""
+
+import numpy as np
+
+from ragmcp.embedding.quantization import EmbeddingMatrix, quantize
+from ragmcp.vector_store.index import VectorIndex, select_top_k, select_top_k_rows
+from ragmcp.vector_store.matrix import VectorMatrix
+
+# Dtypes the quantized copy can use
+QUANTIZED_DTYPES = ("int8", "float16")
+
+
+class ScalarQuantizedIndex(VectorIndex):
+    """Approximate brute-force index over scalar-quantized vectors.
+
+    An int8 row costs ``D + 4`` bytes (values plus scale) instead of
+    ``4 * D``, and scoring reads 4x less memory than the flat index. With
+    ``rescore_k`` at least ``top_k`` the returned scores are exact; only the
+    candidate selection is approximate.
+
+    Tuning knobs:
+        dtype: "int8" (default) or "float16".
+        rescore_k: Candidates per query re-scored with full vectors
+            (0 returns the quantized scores).
+    """
+
+    gather_ratio = 0.25
+
+    def __init__(
+        self,
+        matrix: VectorMatrix,
+        metric: str = "cosine",
+        dtype: str = "int8",
+        rescore_k: int = 100,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            matrix: Matrix holding the full-precision vectors.
+            metric: Similarity metric ("cosine" or "ip").
+            dtype: Dtype of the quantized copy.
+            rescore_k: Number of candidates re-scored exactly.
+
+        Raises:
+            ValueError: If dtype is not supported.
+        """
+        super().__init__(matrix, metric)
+        if dtype not in QUANTIZED_DTYPES:
+            raise ValueError(f"Unknown dtype: {dtype}. Supported: {list(QUANTIZED_DTYPES)}")
+
+        self.dtype = dtype
+        self.rescore_k = rescore_k
+        self._values = np.empty((0, matrix.dimension), dtype=dtype)
+        self._scales = np.empty(0, dtype=np.float32) if dtype == "int8" else None
+        self._size = 0
+
+    @property
+    def codes(self) -> EmbeddingMatrix:
+        """Quantized copy of the indexed rows."""
+        return self._codes(self._size)
+
+    def _codes(self, size: int) -> EmbeddingMatrix:
+        """Quantized copy of the first ``size`` rows."""
+        values, scales = self._values, self._scales
+        return EmbeddingMatrix(values[:size], scales[:size] if scales is not None else None)
+
+    @property
+    def code_nbytes(self) -> int:
+        """Bytes used by the quantized copy."""
+        return self.codes.nbytes
+
+    @property
+    def compression_ratio(self) -> float:
+        """Raw float32 vector size divided by the quantized row size."""
+        row_bytes = self._values.itemsize * self.matrix.dimension
+        if self._scales is not None:
+            row_bytes += self._scales.itemsize
+        return (4 * self.matrix.dimension) / row_bytes
+
+    def add(self, rows: np.ndarray) -> None:
+        """Quantize rows that were just appended to the matrix."""
+        if len(rows) == 0:
+            return
+        self._store(rows, quantize(self.matrix.data[rows], self.dtype))
+
+    def add_codes(self, rows: np.ndarray, codes: EmbeddingMatrix) -> None:
+        """Index new rows from an already quantized copy of their vectors.
+
+        Codes in the index dtype are stored as they are; others are ignored
+        and the rows are quantized from the matrix by :meth:`add`.
+
+        Args:
+            rows: Row indices of the new vectors.
+            codes: Quantized vectors, one per row.
+        """
+        if codes.dtype != np.dtype(self.dtype):
+            self.add(rows)
+        elif len(rows):
+            self._store(rows, codes)
+
+    def _store(self, rows: np.ndarray, encoded: EmbeddingMatrix) -> None:
+        """Write quantized rows, growing the buffers as needed."""
+        end = int(rows.max()) + 1
+        if end > len(self._values):
+            capacity = max(end, 2 * len(self._values))
+            values = np.zeros((capacity, self.matrix.dimension), dtype=self.dtype)
+            values[: self._size] = self._values[: self._size]
+            self._values = values
+            if self._scales is not None:
+                scales = np.ones(capacity, dtype=np.float32)
+                scales[: self._size] = self._scales[: self._size]
+                self._scales = scales
+
+        self._values[rows] = encoded.values
+        if self._scales is not None:
+            self._scales[rows] = encoded.scales
+        self._size = max(self._size, end)
+
+    def get_state(self) -> dict[str, np.ndarray]:
+        """The quantized values, and the per-row scales for int8."""
+        codes = self.codes
+        if codes.scales is None:
+            return {"values": codes.values}
+        return {"values": codes.values, "scales": codes.scales}
+
+    def set_state(self, state: dict[str, np.ndarray]) -> None:
+        """Restore the quantized copy saved by :meth:`get_state`.
+
+        Raises:
+            ValueError: If the saved dtype differs from the configured one.
+        """
+        values = state["values"]
+        if values.dtype != np.dtype(self.dtype):
+            raise ValueError(f"Saved {values.dtype} codes do not match dtype {self.dtype}")
+        self._values = values
+        self._scales = state.get("scales") if self._scales is not None else None
+        self._size = len(values)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score the quantized rows, then re-score the shortlist exactly."""
+        return self.search_batch(query[np.newaxis], top_k, mask, size)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        size: int | None = None,
+        block_elements: int = 1 << 25,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Score a block of queries against the quantized rows at once.
+
+        Args:
+            queries: Query matrix of shape ``(Q, D)``.
+            top_k: Maximum number of rows to return per query.
+            mask: Optional boolean row mask shared by all queries.
+            size: Only the first ``size`` rows are searched.
+            block_elements: Upper bound on the size of each ``(N, q)``
+                score block, to bound temporary memory.
+
+        Returns:
+            One ``(rows, scores)`` tuple per query.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        codes = self._codes(self._size if size is None else min(size, self._size))
+        live = mask[: len(codes)] if mask is not None else None
+        eligible = None
+        if live is not None:
+            eligible = np.flatnonzero(live)
+            if len(eligible) <= self.gather_ratio * len(codes):
+                codes, live = codes.rows(eligible), None
+            else:
+                eligible = None
+
+        shortlist = max(self.rescore_k, top_k)
+        block_rows = max(1, block_elements // max(len(codes), 1))
+        results: list[tuple[np.ndarray, np.ndarray]] = []
+        for start in range(0, len(queries), block_rows):
+            block = queries[start : start + block_rows]
+            scores = codes.dot(block.T).T
+            if live is not None:
+                scores[:, ~live] = -np.inf
+
+            best = select_top_k_rows(scores, shortlist)
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            if eligible is not None:
+                best = eligible[best]
+            for query, rows, row_scores in zip(block, best, best_scores, strict=True):
+                finite = np.isfinite(row_scores)
+                results.append(self._rescore(query, rows[finite], row_scores[finite], top_k))
+        return results
+
+    def _rescore(
+        self, query: np.ndarray, rows: np.ndarray, approx: np.ndarray, top_k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Re-rank shortlisted rows by their full-precision scores."""
+        if self.rescore_k <= 0 or len(rows) == 0:
+            return rows[:top_k], approx[:top_k]
+        exact = np.asarray(self.matrix.data[rows], dtype=np.float32) @ query
+        best = select_top_k(exact, top_k)
+        return rows[best], exact[best]
@@ -0,0 +1,530 @@
+"""Immutable on-disk vector segments opened with ``np.memmap``.
+
+A segment is a directory written once and never modified, apart from its
+tombstone file and its saved search index::
+
+    vectors.npy    (N, D) float32 or float16 vectors (normalized for cosine)
+    offsets.npy    (N + 1,) int64 byte offsets into payloads.bin
+    payloads.bin   concatenated UTF-8 JSON records ``{"id": ..., "payload": ...}``
+    ids.json       the vector ids in row order
+    fields.json    the indexed payload fields of every row
+    deleted.npy    int64 rows deleted after the segment was sealed (optional)
+    index.npz      state of the ANN index built over the rows (optional)
+
+Opening a segment only maps the files, so it costs O(1) in the number of
+vectors; pages are read on demand and shared through the OS page cache by
+every process that maps the same files. The id lookup and payload index are
+built from the two small JSON sidecars, by :meth:`Segment.warm` or on first
+use, without decoding the payload records, and a saved index is restored
+instead of being rebuilt.
+
+Segments can also live purely in memory (a sealed memtable that has not
+been written yet, or any segment of a store without a persist directory).
+"""
+
+import json
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ragmcp.vector_store.filters import PayloadIndex
+from ragmcp.vector_store.index import VectorIndex, select_top_k, select_top_k_rows
+from ragmcp.vector_store.matrix import VectorMatrix
+
+SEGMENT_DTYPES = ("float32", "float16")
+
+IDS_FILE = "ids.json"
+FIELDS_FILE = "fields.json"
+INDEX_FILE = "index.npz"
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars in payloads."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Payload value of type {type(value).__name__} is not JSON serializable")
+
+
+def _save_atomic(path: Path, array: np.ndarray) -> None:
+    """Write an ``.npy`` file via a temporary file and an atomic rename."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def _write_json(path: Path, value: Any) -> None:
+    """Write a JSON sidecar file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, default=_json_default)
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON sidecar file, or return None if it does not exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_segment(
+    path: str | Path,
+    vectors: np.ndarray,
+    ids: list[Any],
+    payloads: list[dict],
+    dtype: str = "float32",
+    indexed_fields: list[str] | None = None,
+) -> "Segment":
+    """Write vectors, ids and payloads as a new immutable segment.
+
+    The files are written to a temporary directory that is renamed into
+    place, so a crash never leaves a half-written segment behind.
+
+    Args:
+        path: Segment directory to create.
+        vectors: Array of shape ``(N, D)``.
+        ids: Vector ids, one per row.
+        payloads: Payload dictionaries, one per row (JSON serializable).
+        dtype: On-disk vector dtype, "float32" or "float16".
+        indexed_fields: Payload fields to pre-filter on when searching.
+
+    Returns:
+        The opened segment.
+
+    Raises:
+        ValueError: If dtype is unsupported or the inputs differ in length.
+    """
+    if dtype not in SEGMENT_DTYPES:
+        raise ValueError(f"Unknown segment dtype: {dtype}. Supported: {list(SEGMENT_DTYPES)}")
+    if not len(vectors) == len(ids) == len(payloads):
+        raise ValueError(f"Got {len(vectors)} vectors, {len(ids)} ids and {len(payloads)} payloads")
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    np.save(tmp / "vectors.npy", np.asarray(vectors, dtype=dtype))
+
+    records = [
+        json.dumps(
+            {"id": vector_id, "payload": payload}, ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+        for vector_id, payload in zip(ids, payloads, strict=True)
+    ]
+    offsets = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum([len(record) for record in records], out=offsets[1:])
+    np.save(tmp / "offsets.npy", offsets)
+    with open(tmp / "payloads.bin", "wb") as f:
+        f.write(b"".join(records))
+
+    fields = list(indexed_fields or [])
+    _write_json(tmp / IDS_FILE, ids)
+    _write_json(
+        tmp / FIELDS_FILE,
+        {
+            "fields": fields,
+            "values": [
+                {field: payload[field] for field in fields if field in payload}
+                for payload in payloads
+            ],
+        },
+    )
+
+    os.replace(tmp, path)
+    return Segment(path, indexed_fields)
+
+
+class Segment:
+    """Immutable set of vectors with ids, payloads and tombstones.
+
+    Without an attached :attr:`index`, searching is an exact scan processed
+    in blocks, so float16 segments are widened to float32 one block at a
+    time. An ANN index built over the segment rows can be attached with
+    :meth:`attach_index` and saved with the segment by :meth:`save_index`.
+    """
+
+    def __init__(self, path: str | Path, indexed_fields: list[str] | None = None):
+        """Map a segment directory.
+
+        Args:
+            path: Segment directory written by :func:`write_segment`.
+            indexed_fields: Payload fields to pre-filter on when searching.
+        """
+        self.path: Path | None = Path(path)
+        self.vectors: np.ndarray = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self._offsets: np.ndarray = np.load(self.path / "offsets.npy", mmap_mode="r")
+        self._records: np.ndarray
+        if self._offsets[-1] > 0:
+            self._records = np.memmap(self.path / "payloads.bin", dtype=np.uint8, mode="r")
+        else:
+            self._records = np.empty(0, dtype=np.uint8)
+        self._memory_records: list[tuple[Any, dict]] | None = None
+        self._init_state(indexed_fields)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        vectors: np.ndarray,
+        ids: list[Any],
+        payloads: list[dict],
+        indexed_fields: list[str] | None = None,
+        index: VectorIndex | None = None,
+    ) -> "Segment":
+        """Create an in-memory segment without touching the disk.
+
+        Args:
+            vectors: Array of shape ``(N, D)``; it must not be modified later.
+            ids: Vector ids, one per row.
+            payloads: Payload dictionaries, one per row.
+            indexed_fields: Payload fields to pre-filter on when searching.
+            index: Optional ANN index already built over ``vectors``.
+
+        Returns:
+            The in-memory segment.
+        """
+        segment = cls.__new__(cls)
+        segment.path = None
+        segment.vectors = vectors
+        segment._memory_records = list(zip(ids, payloads, strict=True))
+        segment._init_state(indexed_fields)
+        segment.index = index
+        return segment
+
+    def _init_state(self, indexed_fields: list[str] | None) -> None:
+        """Load saved tombstones and reset lazy lookups and the attached index."""
+        self._alive: np.ndarray | None = None
+        self._dead_count = 0
+        deleted_path = self.path / "deleted.npy" if self.path is not None else None
+        if deleted_path is not None and deleted_path.exists():
+            deleted = np.load(deleted_path)
+            self._alive = np.ones(len(self.vectors), dtype=bool)
+            self._alive[deleted] = False
+            self._dead_count = len(deleted)
+        # Deleted rows whose tombstones are not written to deleted.npy yet
+        self._unsaved: set[int] = set()
+        self._indexed_fields = list(indexed_fields or [])
+        self._id_to_row: dict[Any, int] | None = None
+        self._payload_index: PayloadIndex | None = None
+        self.index: VectorIndex | None = None
+
+    def __len__(self) -> int:
+        """Number of rows, including deleted ones."""
+        return len(self.vectors)
+
+    @property
+    def live_count(self) -> int:
+        """Number of rows that have not been deleted."""
+        return len(self.vectors) - self._dead_count
+
+    @property
+    def dimension(self) -> int:
+        """Vector dimension."""
+        return int(self.vectors.shape[1])
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Vector dtype."""
+        return self.vectors.dtype
+
+    @property
+    def is_persisted(self) -> bool:
+        """Whether the segment is backed by files on disk."""
+        return self.path is not None
+
+    @property
+    def dead_ratio(self) -> float:
+        """Fraction of rows whose deletion has been saved, and may be dropped."""
+        return (self._dead_count - len(self._unsaved)) / len(self) if len(self) else 0.0
+
+    @property
+    def has_unsaved_deletes(self) -> bool:
+        """Whether some tombstones are only held in memory."""
+        return bool(self._unsaved)
+
+    def alive_snapshot(self, saved: bool = False) -> np.ndarray | None:
+        """Copy of the liveness mask (None when no row is deleted).
+
+        Args:
+            saved: Count rows whose tombstones are not saved yet as alive.
+        """
+        if self._alive is None:
+            return None
+        alive = self._alive.copy()
+        if saved and self._unsaved:
+            alive[list(self._unsaved)] = True
+        return alive
+
+    def unsaved_snapshot(self) -> np.ndarray:
+        """Mask of the rows whose tombstones are not saved yet."""
+        unsaved = np.zeros(len(self), dtype=bool)
+        unsaved[list(self._unsaved)] = True
+        return unsaved
+
+    def attach_index(self, index: VectorIndex) -> None:
+        """Search through ``index``, whose rows must match the segment rows.
+
+        The index is re-pointed at this segment's vectors, so an index built
+        over an identical copy (e.g. the sealed memtable) can be reused.
+        """
+        index.matrix = VectorMatrix.from_array(self.vectors)
+        self.index = index
+
+    def save_index(self) -> None:
+        """Write the attached index next to the segment files.
+
+        Does nothing for in-memory segments and indexes without saved state.
+        """
+        if self.path is None or self.index is None:
+            return
+        state = self.index.get_state()
+        if state is None:
+            return
+        arrays: dict[str, Any] = {"kind": np.array(type(self.index).__name__), **state}
+        path = self.path / INDEX_FILE
+        tmp = path.with_name(INDEX_FILE + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    def load_index(self, create: Callable[[VectorMatrix], VectorIndex]) -> bool:
+        """Attach the index saved by :meth:`save_index`, if it is of the right kind.
+
+        Args:
+            create: Factory of an empty index over a matrix; the saved state
+                    is loaded into it.
+
+        Returns:
+            Whether an index was restored; False when none was saved or the
+            saved one does not match the index ``create`` makes.
+        """
+        if self.path is None or not (self.path / INDEX_FILE).exists():
+            return False
+        index = create(VectorMatrix.from_array(self.vectors))
+        with np.load(self.path / INDEX_FILE) as saved:
+            if str(saved["kind"]) != type(index).__name__:
+                return False
+            try:
+                index.set_state({name: saved[name] for name in saved.files if name != "kind"})
+            except ValueError:
+                return False
+        self.index = index
+        return True
+
+    def record(self, row: int) -> tuple[Any, dict]:
+        """Decode the id and payload stored for a row."""
+        if self._memory_records is not None:
+            return self._memory_records[row]
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        record = json.loads(self._records[start:end].tobytes())
+        return record["id"], record["payload"]
+
+    def payload(self, row: int) -> dict:
+        """Decode the payload stored for a row."""
+        return self.record(row)[1]
+
+    def find(self, vector_id: Any) -> int | None:
+        """Return the live row holding ``vector_id``, if any.
+
+        The id map is built on first use unless :meth:`warm` built it.
+        """
+        id_to_row = self._id_to_row
+        if id_to_row is None:
+            id_to_row = self._id_to_row = self._load_id_map()
+        row = id_to_row.get(vector_id)
+        if row is None or (self._alive is not None and not self._alive[row]):
+            return None
+        return row
+
+    def warm(self) -> None:
+        """Build the id map and payload index ahead of the first write or query.
+
+        Both cover every row, deleted ones included, so they can be built
+        without the store lock while deletes continue.
+        """
+        if self._id_to_row is None:
+            self._id_to_row = self._load_id_map()
+        if self._payload_index is None and self._indexed_fields:
+            self._payload_index = self._load_payload_index()
+
+    def _load_id_map(self) -> dict[Any, int]:
+        """Map every id to its row, from the ids sidecar when there is one."""
+        ids = None
+        if self._memory_records is not None:
+            ids = [vector_id for vector_id, _ in self._memory_records]
+        elif self.path is not None:
+            ids = _read_json(self.path / IDS_FILE)
+        if ids is None:
+            ids = [self.record(row)[0] for row in range(len(self))]
+        return {vector_id: row for row, vector_id in enumerate(ids)}
+
+    def _load_payload_index(self) -> PayloadIndex:
+        """Index the filterable fields, from the fields sidecar when it has them."""
+        saved = None
+        if self._memory_records is None and self.path is not None:
+            saved = _read_json(self.path / FIELDS_FILE)
+        if saved is not None and set(self._indexed_fields) <= set(saved["fields"]):
+            payloads = saved["values"]
+        else:
+            payloads = [self.payload(row) for row in range(len(self))]
+        payload_index = PayloadIndex(self._indexed_fields)
+        payload_index.add(list(range(len(self))), payloads)
+        return payload_index
+
+    def delete(self, rows: list[int], save: bool = True) -> None:
+        """Tombstone rows and persist the tombstones.
+
+        Args:
+            rows: Live rows to delete.
+            save: Write the tombstones now; otherwise they only hide the
+                  rows in memory until :meth:`save_deletes`.
+        """
+        if not rows:
+            return
+        if self._alive is None:
+            self._alive = np.ones(len(self), dtype=bool)
+
+        self._alive[rows] = False
+        self._dead_count = len(self) - int(self._alive.sum())
+        if self.path is None:
+            return
+        if save:
+            self._write_deletes()
+        else:
+            self._unsaved.update(rows)
+
+    def save_deletes(self, keep: Callable[[Any], bool] | None = None) -> None:
+        """Write tombstones that :meth:`delete` held in memory.
+
+        Args:
+            keep: Called with the id of every unsaved row; rows for which it
+                  returns True stay unsaved (default: save all).
+        """
+        if not self._unsaved:
+            return
+        unsaved = set() if keep is None else {r for r in self._unsaved if keep(self.record(r)[0])}
+        if len(unsaved) != len(self._unsaved):
+            self._unsaved = unsaved
+            self._write_deletes()
+
+    def _write_deletes(self) -> None:
+        """Replace deleted.npy with the saved tombstones."""
+        assert self.path is not None and self._alive is not None
+        dead = ~self._alive
+        dead[list(self._unsaved)] = False
+        _save_atomic(self.path / "deleted.npy", np.flatnonzero(dead))
+
+    def mask(self, filter: dict | None = None) -> tuple[np.ndarray | None, dict | None]:
+        """Row mask for a query: liveness combined with the indexed filter.
+
+        Args:
+            filter: Optional metadata filter.
+
+        Returns:
+            Tuple ``(mask, residual)`` as in :meth:`PayloadIndex.resolve`.
+        """
+        mask = self._alive
+        residual = None
+        if filter:
+            payload_index = self._payload_index
+            if payload_index is None:
+                payload_index = self._payload_index = self._load_payload_index()
+            filter_mask, residual = payload_index.resolve(filter, len(self))
+            if filter_mask is not None:
+                mask = filter_mask if mask is None else filter_mask & mask
+        return mask, residual
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Search for one query; see :meth:`search_batch`."""
+        index = self.index
+        if index is not None:
+            return index.search(query, top_k, mask)
+        return self.search_batch(query[np.newaxis], top_k, mask)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        mask: np.ndarray | None = None,
+        block_rows: int = 65536,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Search the segment for several queries.
+
+        Uses the attached index when there is one. Otherwise every block of
+        rows is scored exactly while keeping a running top-k per query; when
+        the mask is selective only the eligible rows are read.
+
+        Args:
+            queries: Query matrix of shape ``(Q, D)``.
+            top_k: Maximum number of rows to return per query.
+            mask: Optional boolean row mask shared by all queries.
+            block_rows: Rows scored per block.
+
+        Returns:
+            One ``(rows, scores)`` tuple per query.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        index = self.index
+        if index is not None:
+            return index.search_batch(queries, top_k, mask)
+        if top_k <= 0 or len(self) == 0:
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            return [empty for _ in range(len(queries))]
+
+        if mask is not None:
+            eligible = np.flatnonzero(mask)
+            if len(eligible) <= len(self) // 4:
+                scores = np.asarray(self.vectors[eligible], dtype=np.float32) @ queries.T
+                results = []
+                for column in scores.T:
+                    best = select_top_k(column, top_k)
+                    results.append((eligible[best], column[best]))
+                return results
+
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self), block_rows):
+            block = np.asarray(self.vectors[start : start + block_rows], dtype=np.float32)
+            scores = queries @ block.T
+            if mask is not None:
+                scores[:, ~mask[start : start + len(block)]] = -np.inf
+
+            rows = np.concatenate(
+                [best_rows, np.broadcast_to(np.arange(start, start + len(block)), scores.shape)],
+                axis=1,
+            )
+            scores = np.concatenate([best_scores, scores], axis=1)
+            keep = select_top_k_rows(scores, top_k)
+            best_rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores = np.take_along_axis(scores, keep, axis=1)
+
+        results = []
+        for rows, scores in zip(best_rows, best_scores, strict=True):
+            finite = np.isfinite(scores)
+            results.append((rows[finite], scores[finite]))
+        return results
+
+    def build_results(self, rows: np.ndarray, scores: np.ndarray) -> list[dict]:
+        """Turn segment rows and scores into result dictionaries."""
+        results = []
+        for row, score in zip(rows.tolist(), scores.tolist(), strict=True):
+            vector_id, payload = self.record(row)
+            results.append(
+                {
+                    "id": vector_id,
+                    "score": float(score),
+                    "payload": payload,
+                    "vector": np.asarray(self.vectors[row], dtype=np.float32),
+                }
+            )
+        return results
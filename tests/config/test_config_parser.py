@@ -177,3 +177,30 @@ class TestConfigObject:
             assert hasattr(config, "observability")
         finally:
             os.unlink(temp_path)
+
+
+class TestRetrievalConfig:
+    """Test validation of hybrid retrieval settings."""
+
+    BASE = {
+        "llm": {"provider": "azure", "model": "gpt-4o"},
+        "embedding": {"provider": "azure", "model": "text-embedding-3-large"},
+        "vector_store": {"backend": "chroma"},
+    }
+
+    def test_hybrid_settings_default_to_dense_only_rrf(self):
+        """Missing sparse_backend and fusion_algorithm should get defaults."""
+        config = Config({**self.BASE, "retrieval": {}})
+
+        assert config.retrieval["sparse_backend"] == "none"
+        assert config.retrieval["fusion_algorithm"] == "rrf"
+
+    def test_invalid_sparse_backend_raises_error(self):
+        """Unknown sparse_backend should raise ConfigError."""
+        with pytest.raises(ConfigError, match="sparse backend"):
+            Config({**self.BASE, "retrieval": {"sparse_backend": "splade"}})
+
+    def test_invalid_fusion_algorithm_raises_error(self):
+        """Unknown fusion_algorithm should raise ConfigError."""
+        with pytest.raises(ConfigError, match="fusion algorithm"):
+            Config({**self.BASE, "retrieval": {"fusion_algorithm": "max"}})
@@ -0,0 +1,122 @@
+"""Tests for BatchingEmbeddingClient."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding import BatchingEmbeddingClient, EmbeddingClient
+from ragmcp.factory.embedding_factory import EmbeddingFactory
+
+
+class RecordingEmbedding(EmbeddingClient):
+    """Embeds a text as [len(text)] and records upstream batch sizes."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def embed(self, texts):
+        self.batches.append(len(texts))
+        time.sleep(self.delay)
+        if self.fail_on in texts:
+            raise ConnectionError("upstream unavailable")
+        return [np.array([float(len(t))]) for t in texts]
+
+
+def _run_threads(client, requests):
+    results = [None] * len(requests)
+
+    def worker(i):
+        results[i] = client.embed(requests[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestBatchingEmbeddingClient:
+    """Test coalescing, scattering and failure handling."""
+
+    def test_concurrent_callers_share_upstream_batches(self):
+        """Small concurrent calls should be coalesced into few upstream calls."""
+        upstream = RecordingEmbedding()
+        client = BatchingEmbeddingClient(upstream, {"batch_size": 100, "max_wait_ms": 200})
+        requests = [["x" * (i + 1), "y" * (i + 2)] for i in range(20)]
+
+        results = _run_threads(client, requests)
+        client.close()
+
+        for texts, vectors in zip(requests, results, strict=True):
+            assert [v[0] for v in vectors] == [len(t) for t in texts]
+        assert sum(upstream.batches) == 40
+        assert len(upstream.batches) < 20
+
+    def test_large_request_is_split_by_batch_size(self):
+        """A request larger than batch_size should span several batches in order."""
+        upstream = RecordingEmbedding()
+        client = BatchingEmbeddingClient(upstream, {"batch_size": 4, "max_wait_ms": 0})
+        texts = ["a" * n for n in range(1, 11)]
+
+        vectors = client.embed(texts)
+        client.close()
+
+        assert [v[0] for v in vectors] == list(range(1, 11))
+        assert upstream.batches == [4, 4, 2]
+
+    def test_lone_caller_waits_at_most_max_wait(self):
+        """A single small call should be dispatched after max_wait_ms."""
+        client = BatchingEmbeddingClient(RecordingEmbedding(), {"max_wait_ms": 20})
+
+        start = time.monotonic()
+        client.embed(["alone"])
+        elapsed = time.monotonic() - start
+        client.close()
+
+        assert elapsed < 1.0
+
+    def test_upstream_error_reaches_callers_in_the_batch(self):
+        """Every caller in a failed batch should receive the exception."""
+        client = BatchingEmbeddingClient(
+            RecordingEmbedding(fail_on="bad"), {"batch_size": 10, "max_wait_ms": 0}
+        )
+
+        with pytest.raises(ConnectionError, match="unavailable"):
+            client.embed(["ok", "bad"])
+        assert client.embed(["ok"])[0][0] == 2.0
+        client.close()
+
+    async def test_aembed_awaits_without_blocking_the_loop(self):
+        """Coroutines should be batched together via aembed()."""
+        upstream = RecordingEmbedding()
+        client = BatchingEmbeddingClient(upstream, {"max_wait_ms": 50})
+
+        results = await asyncio.gather(*(client.aembed([f"text{i}"]) for i in range(10)))
+        client.close()
+
+        assert [r[0][0] for r in results] == [5.0] * 10
+        assert upstream.batches == [10]
+
+    def test_closed_client_rejects_calls(self):
+        """embed() after close() should raise ValueError."""
+        client = BatchingEmbeddingClient(RecordingEmbedding())
+        client.close()
+
+        with pytest.raises(ValueError, match="closed"):
+            client.embed(["late"])
+
+    def test_factory_wraps_client_when_batching_enabled(self):
+        """EmbeddingFactory should use the embedding batch_size for the batcher."""
+        embedder = EmbeddingFactory.get_embedding(
+            {"provider": "openai", "batch_size": 64, "batching": {"enabled": True}}
+        )
+
+        assert isinstance(embedder, BatchingEmbeddingClient)
+        assert embedder.batch_size == 64
+        embedder.close()
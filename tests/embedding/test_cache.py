@@ -0,0 +1,137 @@
+"""Tests for CachedEmbeddingClient."""
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding import CachedEmbeddingClient, EmbeddingClient
+from ragmcp.factory.embedding_factory import EmbeddingFactory
+
+
+class CountingEmbedding(EmbeddingClient):
+    """Deterministic embedding client recording every upstream batch."""
+
+    def __init__(self, model="test-model"):
+        self.model = model
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [np.array([len(t), t.count("a"), 1.0]) / np.sqrt(len(t) ** 2 + 2) for t in texts]
+
+
+class TestCachedEmbeddingClient:
+    """Test cache tiers and batching of misses."""
+
+    def test_only_misses_are_sent_upstream(self):
+        """A repeated call should send only new texts, in one batch."""
+        upstream = CountingEmbedding()
+        client = CachedEmbeddingClient(upstream)
+
+        first = client.embed(["alpha", "beta"])
+        second = client.embed(["beta", "gamma", "alpha", "gamma"])
+
+        assert upstream.calls == [["alpha", "beta"], ["gamma"]]
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[1], second[3])
+        assert client.stats == {"memory_hits": 2, "disk_hits": 0, "misses": 3}
+
+    def test_fully_cached_call_skips_upstream(self):
+        """A call with only cached texts should not reach the wrapped client."""
+        upstream = CountingEmbedding()
+        client = CachedEmbeddingClient(upstream)
+        client.embed(["alpha"])
+
+        client.embed(["alpha", "alpha"])
+
+        assert upstream.calls == [["alpha"]]
+
+    def test_cached_vectors_are_read_only(self):
+        """Cached vectors should be float32 and protected from mutation."""
+        client = CachedEmbeddingClient(CountingEmbedding())
+
+        vector = client.embed(["alpha"])[0]
+
+        assert vector.dtype == np.float32
+        with pytest.raises(ValueError):
+            vector[0] = 0.0
+
+    def test_lru_tier_evicts_least_recently_used(self):
+        """The in-memory tier should hold at most max_entries vectors."""
+        upstream = CountingEmbedding()
+        client = CachedEmbeddingClient(upstream, {"max_entries": 2})
+        client.embed(["a", "b"])
+        client.embed(["a"])
+        client.embed(["c"])
+
+        client.embed(["a", "b"])
+
+        assert upstream.calls[-1] == ["b"]
+
+    def test_persistent_tier_survives_restart(self, tmp_path):
+        """Vectors written to SQLite should be served after reopening."""
+        path = tmp_path / "cache" / "embeddings.sqlite"
+        first = CachedEmbeddingClient(CountingEmbedding(), {"path": str(path)})
+        expected = first.embed(["alpha", "beta"])
+        first.close()
+
+        upstream = CountingEmbedding()
+        reopened = CachedEmbeddingClient(upstream, {"path": str(path)})
+        vectors = reopened.embed(["beta", "alpha", "gamma"])
+
+        assert upstream.calls == [["gamma"]]
+        np.testing.assert_array_equal(vectors[0], expected[1])
+        assert reopened.stats["disk_hits"] == 2
+
+    def test_key_includes_model_and_dimension(self, tmp_path):
+        """A different model or dimension should not reuse cached vectors."""
+        path = str(tmp_path / "embeddings.sqlite")
+        CachedEmbeddingClient(CountingEmbedding("m1"), {"path": path}).embed(["alpha"])
+
+        other_model = CountingEmbedding("m2")
+        CachedEmbeddingClient(other_model, {"path": path}).embed(["alpha"])
+        other_dimension = CountingEmbedding("m1")
+        CachedEmbeddingClient(other_dimension, {"path": path, "dimension": 256}).embed(["alpha"])
+
+        assert other_model.calls == [["alpha"]]
+        assert other_dimension.calls == [["alpha"]]
+
+    def test_factory_wraps_client_when_cache_enabled(self):
+        """EmbeddingFactory should return a cached client when cache.enabled is set."""
+        embedder = EmbeddingFactory.get_embedding(
+            {"provider": "openai", "model": "m", "dimension": 1536, "cache": {"enabled": True}}
+        )
+
+        assert isinstance(embedder, CachedEmbeddingClient)
+        assert (embedder.model, embedder.dimension) == ("m", 1536)
+
+    def test_model_is_required(self):
+        """Without a configured or client model the cache key would be ambiguous."""
+        with pytest.raises(ValueError, match="requires a model"):
+            CachedEmbeddingClient(CountingEmbedding(model=""))
+
+    def test_model_defaults_to_wrapped_client(self):
+        """The cache key should use the wrapped client's model when none is configured."""
+        client = CachedEmbeddingClient(CountingEmbedding("m1"))
+
+        assert (client.model, client.dimension) == ("m1", 0)
+
+    def test_factory_keys_batched_client_by_provider_model(self):
+        """The provider's model should reach the cache key through the batching wrapper."""
+        embedder = EmbeddingFactory.get_embedding(
+            {"provider": "openai", "batching": {"enabled": True}, "cache": {"enabled": True}}
+        )
+
+        assert embedder.model == "text-embedding-3-small"
+        embedder.client.close()
+
+    async def test_aembed_sends_only_misses_to_async_upstream(self, tmp_path):
+        """aembed() should share both tiers with embed()."""
+        upstream = CountingEmbedding()
+        client = CachedEmbeddingClient(upstream, {"path": str(tmp_path / "e.sqlite")})
+        client.embed(["alpha"])
+
+        vectors = await client.aembed(["alpha", "beta"])
+
+        assert upstream.calls == [["alpha"], ["beta"]]
+        np.testing.assert_array_equal(vectors[0], client.embed(["alpha"])[0])
+        assert client.stats["misses"] == 2
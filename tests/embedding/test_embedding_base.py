@@ -56,3 +56,18 @@ class TestEmbeddingClientAbstractClass:
 
         # L2 norm should be approximately 1.0
         assert np.abs(np.linalg.norm(vectors[0]) - 1.0) < 1e-6
+
+
+class TestEmbeddingClientAsync:
+    """Test the async embedding interface."""
+
+    async def test_aembed_defaults_to_embed(self):
+        """aembed() should return the vectors produced by embed()."""
+
+        class MockEmbeddingClient(EmbeddingClient):
+            def embed(self, texts: list[str]) -> list[np.ndarray]:
+                return [np.array([float(len(t))]) for t in texts]
+
+        vectors = await MockEmbeddingClient().aembed(["ab", "abcd"])
+
+        assert [v[0] for v in vectors] == [2.0, 4.0]
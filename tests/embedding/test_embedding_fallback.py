@@ -0,0 +1,43 @@
+"""Tests for FallbackEmbeddingClient."""
+
+import numpy as np
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.embedding.fallback import FallbackEmbeddingClient
+
+
+class FakeEmbedding(EmbeddingClient):
+    """Embedding client returning constant vectors or raising."""
+
+    def __init__(self, value: float, error: Exception | None = None):
+        self.value = value
+        self.error = error
+        self.model = "test-model"
+
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        if self.error is not None:
+            raise self.error
+        return [np.full(4, self.value, dtype=np.float32) for _ in texts]
+
+
+class TestFallbackEmbeddingClient:
+    """Test provider failover of FallbackEmbeddingClient."""
+
+    def test_fails_over_on_transient_error(self):
+        """A network failure should be served by the next provider."""
+        client = FallbackEmbeddingClient(
+            [FakeEmbedding(1.0, ConnectionError()), FakeEmbedding(2.0)]
+        )
+
+        vectors = client.embed(["a", "b"])
+
+        assert [float(v[0]) for v in vectors] == [2.0, 2.0]
+        assert client.model == "test-model"
+
+    async def test_aembed_fails_over(self):
+        """aembed should fail over like embed."""
+        client = FallbackEmbeddingClient([FakeEmbedding(1.0, TimeoutError()), FakeEmbedding(3.0)])
+
+        vectors = await client.aembed(["a"])
+
+        assert float(vectors[0][0]) == 3.0
@@ -0,0 +1,55 @@
+"""Tests for SingleFlightEmbeddingClient."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ragmcp.embedding import EmbeddingClient, SingleFlightEmbeddingClient
+from ragmcp.factory.embedding_factory import EmbeddingFactory
+
+
+class BlockingEmbedding(EmbeddingClient):
+    """Embedding client blocking until released and counting calls."""
+
+    model = "blocking"
+    dimension = 2
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def embed(self, texts):
+        self.calls.append(texts)
+        self.release.wait(5)
+        return [np.ones(2) * len(text) for text in texts]
+
+
+class TestSingleFlightEmbeddingClient:
+    """Test deduplication of concurrent embed calls."""
+
+    def test_concurrent_identical_texts_share_one_call(self):
+        """Threads embedding the same query should make one upstream call."""
+        upstream = BlockingEmbedding()
+        client = SingleFlightEmbeddingClient(upstream)
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(client.embed, [q]) for q in ["query", "query", "other"]]
+            while client.flight.stats()["shared"] < 1 or len(upstream.calls) < 2:
+                threading.Event().wait(0.005)
+            upstream.release.set()
+            results = [f.result(5) for f in futures]
+
+        assert sorted(map(tuple, upstream.calls)) == [("other",), ("query",)]
+        assert results[0][0] is results[1][0]
+        assert results[0] is not results[1]
+        assert client.model == "blocking" and client.dimension == 2
+
+    def test_factory_wraps_outermost_when_enabled(self):
+        """single_flight.enabled should wrap the cached/batched client."""
+        client = EmbeddingFactory.get_embedding(
+            {"provider": "openai", "single_flight": {"enabled": True}}
+        )
+
+        assert isinstance(client, SingleFlightEmbeddingClient)
+        assert len(client.embed(["a"])[0]) == 1536
@@ -0,0 +1,120 @@
+"""Tests for compact embedding matrices."""
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding import EmbeddingClient, EmbeddingMatrix, quantize
+from ragmcp.factory.embedding_factory import EmbeddingFactory
+
+
+@pytest.fixture
+def vectors():
+    """Unit-length float32 vectors."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((50, 32)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestQuantize:
+    """Test quantize() and EmbeddingMatrix."""
+
+    @pytest.mark.parametrize(
+        ("dtype", "tolerance"), [("float32", 0), ("float16", 1e-3), ("int8", 1e-2)]
+    )
+    def test_round_trip_error_is_bounded(self, vectors, dtype, tolerance):
+        """Dequantized vectors should stay close to the originals."""
+        matrix = quantize(vectors, dtype)
+
+        assert matrix.dtype == np.dtype(dtype)
+        assert matrix.values.shape == vectors.shape
+        assert np.max(np.abs(matrix.dequantize() - vectors)) <= tolerance
+
+    def test_int8_is_about_four_times_smaller(self, vectors):
+        """int8 rows should cost D bytes plus one float32 scale."""
+        matrix = quantize(vectors, "int8")
+
+        assert matrix.nbytes == vectors.shape[0] * (vectors.shape[1] + 4)
+        assert matrix.scales is not None and matrix.scales.dtype == np.float32
+
+    def test_zero_vectors_survive_int8(self):
+        """A zero row should quantize to zeros instead of NaNs."""
+        matrix = quantize(np.zeros((2, 4)), "int8")
+
+        assert np.all(matrix.dequantize() == 0)
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_dot_matches_full_precision(self, vectors, dtype):
+        """Blocked scores on the compact form should approximate float32 scores."""
+        matrix = quantize(vectors, dtype)
+        queries = vectors[:3].T
+
+        scores = matrix.dot(queries, block_rows=7)
+
+        assert scores.shape == (50, 3)
+        np.testing.assert_allclose(scores, vectors @ queries, atol=0.05)
+        np.testing.assert_allclose(matrix.dot(vectors[0]), scores[:, 0], atol=1e-5)
+
+    def test_rows_keep_compact_form(self, vectors):
+        """Selecting rows should keep the values and scales together."""
+        matrix = quantize(vectors, "int8")
+
+        subset = matrix.rows(np.array([3, 1]))
+
+        assert subset.dtype == np.int8
+        np.testing.assert_array_equal(subset.dequantize(), matrix.dequantize()[[3, 1]])
+
+    def test_asarray_dequantizes(self, vectors):
+        """np.asarray should see a float32 (N, D) array."""
+        array = np.asarray(quantize(vectors, "float16"))
+
+        assert array.dtype == np.float32
+        assert array.shape == vectors.shape
+
+    def test_unknown_dtype_raises(self, vectors):
+        """An unsupported dtype should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown embedding dtype"):
+            quantize(vectors, "int4")
+
+    def test_int8_requires_scales(self):
+        """int8 values without scales should raise ValueError."""
+        with pytest.raises(ValueError, match="scales"):
+            EmbeddingMatrix(np.zeros((2, 4), dtype=np.int8))
+
+
+class TestEmbedMatrix:
+    """Test EmbeddingClient.embed_matrix."""
+
+    def test_default_stacks_embed_output(self):
+        """The base implementation should quantize the embed() vectors."""
+
+        class ListEmbeddingClient(EmbeddingClient):
+            def embed(self, texts: list[str]) -> list[np.ndarray]:
+                return [np.full(4, float(len(text))) for text in texts]
+
+        matrix = ListEmbeddingClient().embed_matrix(["a", "bb"], dtype="float16")
+
+        assert matrix.dtype == np.float16
+        np.testing.assert_array_equal(matrix.dequantize()[:, 0], [1.0, 2.0])
+
+    async def test_async_variant(self):
+        """aembed_matrix should build on aembed()."""
+
+        class ListEmbeddingClient(EmbeddingClient):
+            def embed(self, texts: list[str]) -> list[np.ndarray]:
+                return [np.ones(4) for _ in texts]
+
+        matrix = await ListEmbeddingClient().aembed_matrix(["a", "b", "c"], dtype="int8")
+
+        assert len(matrix) == 3
+        assert matrix.dimension == 4
+
+    def test_mock_embedding_is_contiguous_float32(self):
+        """The mock provider should produce float32 rows of one matrix."""
+        embedder = EmbeddingFactory.get_embedding({"provider": "openai"})
+
+        vectors = embedder.embed(["a", "b"])
+        matrix = embedder.embed_matrix(["a", "b"], dtype="int8")
+
+        assert vectors[0].dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+        np.testing.assert_allclose(matrix.dequantize(), np.stack(vectors), atol=1e-3)
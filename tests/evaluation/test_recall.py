@@ -0,0 +1,25 @@
+"""Tests for retrieval recall metrics."""
+
+import pytest
+
+from ragmcp.evaluation import recall_at_k
+
+
+class TestRecallAtK:
+    """Test recall@k computation."""
+
+    def test_perfect_recall(self):
+        """Identical rankings should give recall 1.0."""
+        assert recall_at_k([1, 2, 3], [1, 2, 3], k=3) == 1.0
+
+    def test_partial_recall_ignores_order(self):
+        """Recall should count overlap within the cut-off, regardless of order."""
+        assert recall_at_k([3, 9, 1, 2], [1, 2, 3, 4], k=4) == pytest.approx(0.75)
+
+    def test_only_top_k_is_considered(self):
+        """Items beyond rank k should not count."""
+        assert recall_at_k([9, 8, 1], [1, 2], k=2) == 0.0
+
+    def test_empty_ground_truth_gives_full_recall(self):
+        """No relevant ids means nothing can be missed."""
+        assert recall_at_k([1, 2], [], k=5) == 1.0
@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.embedding.fallback import FallbackEmbeddingClient
 from ragmcp.factory.embedding_factory import EmbeddingFactory
 
 
@@ -52,3 +53,31 @@ class TestEmbeddingFactory:
 
         assert len(vectors) == 1
         assert isinstance(vectors[0], np.ndarray)
+
+
+class TestEmbeddingFactoryFallback:
+    """Test fallback wiring of EmbeddingFactory."""
+
+    def test_fallback_config_returns_fallback_client(self):
+        """A fallback list should wrap the providers in a FallbackEmbeddingClient."""
+        config = {
+            "provider": "openai",
+            "model": "text-embedding-3-small",
+            "fallback": [{"provider": "openai"}],
+        }
+
+        embedder = EmbeddingFactory.get_embedding(config)
+
+        assert isinstance(embedder, FallbackEmbeddingClient)
+        assert len(embedder.clients) == 2
+
+    def test_fallback_with_different_dimension_raises(self):
+        """Fallback providers must produce vectors of the same dimension."""
+        config = {
+            "provider": "openai",
+            "dimension": 1536,
+            "fallback": [{"provider": "openai", "dimension": 3072}],
+        }
+
+        with pytest.raises(ValueError, match="dimension"):
+            EmbeddingFactory.get_embedding(config)
@@ -1,9 +1,19 @@
 """Tests for LLMFactory."""
 
+import asyncio
+from unittest.mock import patch
+
 import pytest
 
-from ragmcp.factory.llm_factory import LLMFactory
+from ragmcp.factory.llm_factory import OPENAI_BASE_URL, LLMFactory
+from ragmcp.llm.azure_openai import AzureOpenAILLM
 from ragmcp.llm.base import LLMClient
+from ragmcp.llm.deepseek_llm import DeepSeekLLM
+from ragmcp.llm.fallback import FallbackLLM
+from ragmcp.llm.ollama_llm import OllamaLLM
+from ragmcp.llm.openai_llm import OpenAILLM
+from ragmcp.llm.zhipu_llm import ZhipuLLM
+from ragmcp.transport import HTTPTransport, get_http_transport
 
 
 class TestLLMFactory:
@@ -19,9 +29,7 @@ class TestLLMFactory:
 
         llm = LLMFactory.get_llm(config)
 
-        assert isinstance(llm, LLMClient)
-        # Should have some indication it's Azure (via type or metadata)
-        assert type(llm).__name__ == "MockAzureOpenAILLM"
+        assert isinstance(llm, AzureOpenAILLM)
 
     def test_openai_config_returns_openai_llm(self):
         """OpenAI config should return an OpenAI LLM instance."""
@@ -33,8 +41,21 @@ class TestLLMFactory:
 
         llm = LLMFactory.get_llm(config)
 
+        assert isinstance(llm, OpenAILLM)
+        assert llm._model == "gpt-4"
+
+    @pytest.mark.parametrize("provider, cls", [("deepseek", DeepSeekLLM), ("zhipu", ZhipuLLM)])
+    def test_other_providers_return_real_clients(self, provider, cls):
+        """DeepSeek and Zhipu configs should return their provider clients."""
+        llm = LLMFactory.get_llm({"provider": provider, "api_key": "test-key"})
+
+        assert isinstance(llm, cls)
         assert isinstance(llm, LLMClient)
-        assert type(llm).__name__ == "MockOpenAILLM"
+
+    def test_azure_without_api_base_raises(self):
+        """An Azure config without an endpoint should raise ValueError."""
+        with pytest.raises(ValueError, match="api_base"):
+            LLMFactory.get_llm({"provider": "azure", "api_key": "test-key"})
 
     def test_unknown_provider_raises_error(self):
         """Unknown provider should raise ValueError."""
@@ -53,3 +74,71 @@ class TestLLMFactory:
         # Should raise error for missing provider
         with pytest.raises(ValueError, match="provider"):
             LLMFactory.get_llm(config)
+
+
+class TestLLMFactoryFallback:
+    """Test fallback wiring of LLMFactory."""
+
+    def test_fallback_config_returns_fallback_llm(self):
+        """A fallback list should wrap the providers in a FallbackLLM."""
+        config = {
+            "provider": "azure",
+            "model": "gpt-4o",
+            "api_key": "test-key",
+            "api_base": "https://test.openai.azure.com",
+            "circuit_breaker": {"failure_threshold": 3},
+            "fallback": [{"provider": "openai", "model": "gpt-4o", "api_key": "test-key"}],
+        }
+
+        llm = LLMFactory.get_llm(config)
+
+        assert isinstance(llm, FallbackLLM)
+        assert [type(c) for c in llm.clients] == [AzureOpenAILLM, OpenAILLM]
+        assert [b.name for b in llm.breakers] == ["llm:azure:gpt-4o", "llm:openai:gpt-4o"]
+
+    def test_unknown_fallback_provider_raises(self):
+        """An unknown fallback provider should raise ValueError."""
+        config = {"provider": "openai", "api_key": "test-key", "fallback": [{"provider": "nope"}]}
+
+        with pytest.raises(ValueError, match="Unknown LLM provider"):
+            LLMFactory.get_llm(config)
+
+
+class TestLLMFactoryTransport:
+    """Test pooled transport injection of LLMFactory."""
+
+    def test_ollama_clients_share_a_pool(self):
+        """Ollama clients for the same host should share one pooled client."""
+        config = {"provider": "ollama", "model": "llama2", "base_url": "http://localhost:11434"}
+
+        first = LLMFactory.get_llm(config)
+        second = LLMFactory.get_llm({**config, "model": "mistral"})
+
+        assert isinstance(first, OllamaLLM)
+        assert first._client is second._client
+        assert first._client is get_http_transport().client("http://localhost:11434")
+
+    def test_openai_clients_share_a_pool(self):
+        """OpenAI SDK clients should be built on the pooled client of their origin."""
+        first = LLMFactory.get_llm({"provider": "openai", "api_key": "test-key"})
+        second = LLMFactory.get_llm({"provider": "openai", "api_key": "other-key"})
+
+        pooled = get_http_transport().client(OPENAI_BASE_URL)
+        assert first.client._client is pooled
+        assert second.client._client is pooled
+
+    def test_async_client_is_built_on_first_async_use(self):
+        """The pooled async client should be created by the loop that uses it."""
+        transport = HTTPTransport()
+        with patch("ragmcp.factory.llm_factory.get_http_transport", return_value=transport):
+            llm = LLMFactory.get_llm({"provider": "deepseek", "api_key": "test-key"})
+
+        assert transport._async_clients == {}
+
+        async def build():
+            return llm.async_client
+
+        async_client = asyncio.run(build())
+
+        assert async_client._client is transport.async_client(DeepSeekLLM.DEFAULT_BASE_URL)
+        transport.close()
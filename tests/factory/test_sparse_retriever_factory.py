@@ -0,0 +1,29 @@
+"""Tests for SparseRetrieverFactory."""
+
+import pytest
+
+from ragmcp.factory import SparseRetrieverFactory
+from ragmcp.retrieval import BM25Retriever
+
+
+class TestSparseRetrieverFactory:
+    """Test SparseRetrieverFactory creates correct SparseRetriever instances."""
+
+    def test_bm25_config_returns_bm25_retriever(self):
+        """bm25 backend should return a BM25Retriever with the given parameters."""
+        retriever = SparseRetrieverFactory.get_sparse_retriever(
+            {"backend": "bm25", "k1": 1.5, "b": 0.5}
+        )
+
+        assert isinstance(retriever, BM25Retriever)
+        assert (retriever.k1, retriever.b) == (1.5, 0.5)
+
+    def test_unknown_backend_raises_error(self):
+        """Unknown backend should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown SparseRetriever backend"):
+            SparseRetrieverFactory.get_sparse_retriever({"backend": "splade"})
+
+    def test_missing_backend_raises_error(self):
+        """Missing backend should raise ValueError."""
+        with pytest.raises(ValueError, match="backend"):
+            SparseRetrieverFactory.get_sparse_retriever({})
@@ -66,3 +66,36 @@ class TestVectorStoreFactory:
         # Test query
         results = store.query(np.array([1.0, 2.0, 3.0]), top_k=1)
         assert len(results) >= 0
+
+    def test_local_config_returns_local_store(self):
+        """Local config should return an in-process LocalVectorStore."""
+        config = {"backend": "local", "dimension": 3}
+
+        store = VectorStoreFactory.get_vector_store(config)
+
+        assert isinstance(store, VectorStore)
+        assert type(store).__name__ == "LocalVectorStore"
+
+        store.insert([np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])], [{"id": 1}, {"id": 2}])
+        results = store.query(np.array([0.0, 1.0, 0.0]), top_k=1)
+        assert results[0]["payload"] == {"id": 2}
+
+    def test_local_config_reads_nested_local_block(self):
+        """Settings under the nested ``local`` block should configure the store."""
+        config = {
+            "backend": "local",
+            "dimension": 3,
+            "local": {
+                "index_type": "hnsw",
+                "memtable_size": 100,
+                "indexed_fields": ["source"],
+                "hnsw": {"M": 8},
+            },
+        }
+
+        store = VectorStoreFactory.get_vector_store(config)
+
+        assert store.index_type == "hnsw"
+        assert type(store._index).__name__ == "HNSWIndex"
+        assert store._memtable_size == 100
+        assert store._indexed_fields == ["source"]
@@ -0,0 +1,215 @@
+"""Tests for the async chat interfaces of LLM providers."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import httpx
+import pytest
+
+from ragmcp.llm import (
+    AzureOpenAILLM,
+    ClaudeLLM,
+    DeepSeekLLM,
+    LLMClient,
+    Message,
+    OllamaLLM,
+    OpenAILLM,
+    Response,
+    ZhipuLLM,
+)
+
+OPENAI_COMPATIBLE = [
+    (OpenAILLM, "ragmcp.llm.openai_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+    (
+        AzureOpenAILLM,
+        "ragmcp.llm.azure_openai",
+        "AzureOpenAIClient",
+        "AsyncAzureOpenAIClient",
+        {
+            "api_base": "https://test.openai.azure.com",
+            "api_version": "2024-02-15-preview",
+            "deployment_name": "gpt-4",
+        },
+    ),
+    (DeepSeekLLM, "ragmcp.llm.deepseek_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+    (ZhipuLLM, "ragmcp.llm.zhipu_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+]
+
+
+class TestDefaultAchat:
+    """Test the thread-offload default of LLMClient.achat()."""
+
+    async def test_sync_only_client_runs_in_worker_thread(self):
+        """achat() should call chat() off the event loop thread."""
+        loop_thread = threading.get_ident()
+
+        class SyncLLM(LLMClient):
+            def chat(self, messages, temperature=None):
+                self.thread = threading.get_ident()
+                return Response(content=f"{messages[0].content}:{temperature}")
+
+        client = SyncLLM()
+        response = await client.achat([Message(role="user", content="hi")], temperature=0.2)
+
+        assert response.content == "hi:0.2"
+        assert client.thread != loop_thread
+
+
+class TestOpenAICompatibleAchat:
+    """Test achat() of providers built on the OpenAI SDK."""
+
+    @pytest.mark.parametrize("cls, module, sync_name, async_name, kwargs", OPENAI_COMPATIBLE)
+    async def test_achat_uses_async_client(self, cls, module, sync_name, async_name, kwargs):
+        """achat() should await the async SDK client with the sync request format."""
+        async_http_client = Mock(spec=httpx.AsyncClient)
+        with (
+            patch(f"{module}.{sync_name}"),
+            patch(f"{module}.{async_name}") as mock_async_class,
+        ):
+            completion = MagicMock()
+            completion.choices[0].message.content = "async answer"
+            create = AsyncMock(return_value=completion)
+            mock_async_class.return_value.chat.completions.create = create
+
+            client = cls(
+                api_key="test-key",
+                http_client=Mock(),
+                async_http_client=async_http_client,
+                **kwargs,
+            )
+            response = await client.achat(
+                [Message(role="user", content="Hello")], temperature=0.1, stop=["\n"]
+            )
+
+            assert response == Response(content="async answer")
+            assert mock_async_class.call_args.kwargs["api_key"] == "test-key"
+            assert mock_async_class.call_args.kwargs["http_client"] is async_http_client
+            request = create.call_args.kwargs
+            assert request["messages"] == [{"role": "user", "content": "Hello"}]
+            assert request["temperature"] == 0.1
+            assert request["stop"] == ["\n"]
+
+    async def test_async_http_client_factory_is_called_on_first_use(self):
+        """A callable async_http_client should only be resolved by the first achat()."""
+        async_http_client = Mock(spec=httpx.AsyncClient)
+        factory = Mock(return_value=async_http_client)
+        with (
+            patch("ragmcp.llm.openai_llm.OpenAIClient"),
+            patch("ragmcp.llm.openai_llm.AsyncOpenAIClient") as mock_async_class,
+        ):
+            completion = MagicMock()
+            completion.choices[0].message.content = "ok"
+            mock_async_class.return_value.chat.completions.create = AsyncMock(
+                return_value=completion
+            )
+            client = OpenAILLM(api_key="test-key", async_http_client=factory)
+            factory.assert_not_called()
+
+            await client.achat([Message(role="user", content="q")])
+            await client.achat([Message(role="user", content="q")])
+
+            factory.assert_called_once_with()
+            assert mock_async_class.call_args.kwargs["http_client"] is async_http_client
+
+    async def test_async_client_is_created_once(self):
+        """Concurrent achat() calls should share one lazily created async client."""
+        with (
+            patch("ragmcp.llm.openai_llm.OpenAIClient"),
+            patch("ragmcp.llm.openai_llm.AsyncOpenAIClient") as mock_async_class,
+        ):
+            completion = MagicMock()
+            completion.choices[0].message.content = "ok"
+            mock_async_class.return_value.chat.completions.create = AsyncMock(
+                return_value=completion
+            )
+            client = OpenAILLM(api_key="test-key")
+
+            await asyncio.gather(
+                *(client.achat([Message(role="user", content="q")]) for _ in range(5))
+            )
+
+            mock_async_class.assert_called_once()
+
+
+class TestClaudeAchat:
+    """Test ClaudeLLM.achat()."""
+
+    async def test_achat_uses_async_anthropic_client(self):
+        """achat() should send the system prompt separately via AsyncAnthropic."""
+        with (
+            patch("ragmcp.llm.claude_llm.Anthropic"),
+            patch("ragmcp.llm.claude_llm.AsyncAnthropic") as mock_async_class,
+        ):
+            completion = MagicMock()
+            completion.content = [MagicMock(text="claude answer")]
+            create = AsyncMock(return_value=completion)
+            mock_async_class.return_value.messages.create = create
+
+            client = ClaudeLLM(api_key="test-key", max_tokens=100)
+            response = await client.achat(
+                [
+                    Message(role="system", content="Be brief."),
+                    Message(role="user", content="Hello"),
+                ]
+            )
+
+            assert response.content == "claude answer"
+            request = create.call_args.kwargs
+            assert request["system"] == "Be brief."
+            assert request["messages"] == [{"role": "user", "content": "Hello"}]
+            assert request["max_tokens"] == 100
+
+
+class TestOllamaAchat:
+    """Test OllamaLLM.achat()."""
+
+    async def test_achat_posts_with_async_http_client(self):
+        """achat() should post the same body as chat() through httpx.AsyncClient."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"message": {"content": "local answer"}}
+
+        with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
+            mock_client = MagicMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.aclose = AsyncMock()
+            mock_httpx.AsyncClient.return_value = mock_client
+
+            client = OllamaLLM(model="llama2", max_tokens=50)
+            response = await client.achat([Message(role="user", content="Hello")])
+            await client.aclose()
+
+            assert response.content == "local answer"
+            url, kwargs = mock_client.post.call_args[0][0], mock_client.post.call_args[1]
+            assert url == "http://localhost:11434/api/chat"
+            assert kwargs["json"]["options"]["num_predict"] == 50
+            assert kwargs["json"]["stream"] is False
+            mock_client.aclose.assert_awaited_once()
+
+    async def test_achat_forwards_stop_sequences(self):
+        """Keyword overrides accepted by the base signature should reach the request body."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"message": {"content": "ok"}}
+
+        with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
+            mock_httpx.AsyncClient.return_value.post = AsyncMock(return_value=mock_response)
+            client = OllamaLLM(model="llama2")
+            await client.achat([Message(role="user", content="Hello")], stop=["\n\n"])
+
+            body = mock_httpx.AsyncClient.return_value.post.call_args[1]["json"]
+            assert body["options"]["stop"] == ["\n\n"]
+
+    async def test_achat_error_is_propagated(self):
+        """Ollama API errors should surface from achat()."""
+        mock_response = Mock()
+        mock_response.status_code = 500
+        mock_response.json.return_value = {"error": "model not found"}
+
+        with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
+            mock_httpx.AsyncClient.return_value.post = AsyncMock(return_value=mock_response)
+            client = OllamaLLM(model="missing")
+
+            with pytest.raises(Exception, match="model not found"):
+                await client.achat([Message(role="user", content="Hello")])
@@ -0,0 +1,72 @@
+"""Tests for FallbackLLM."""
+
+import pytest
+
+from ragmcp.llm.base import LLMClient, Message, Response
+from ragmcp.llm.fallback import FallbackLLM
+from ragmcp.middleware.resilience import CircuitBreaker
+
+
+class FakeLLM(LLMClient):
+    """LLM returning a fixed answer or raising a fixed error."""
+
+    def __init__(self, name: str, error: Exception | None = None):
+        self.name = name
+        self.error = error
+        self.calls = 0
+
+    def chat(self, messages: list[Message], **kwargs) -> Response:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return Response(content=self.name)
+
+
+class TestFallbackLLM:
+    """Test provider failover of FallbackLLM."""
+
+    def test_primary_is_used_when_healthy(self):
+        """The first provider should serve requests while it works."""
+        primary, secondary = FakeLLM("primary"), FakeLLM("secondary")
+        llm = FallbackLLM([primary, secondary])
+
+        assert llm.chat([Message("user", "hi")]).content == "primary"
+        assert secondary.calls == 0
+
+    def test_fails_over_and_opens_circuit(self):
+        """Repeated transient failures should open the primary's circuit."""
+        primary = FakeLLM("primary", ConnectionError("down"))
+        secondary = FakeLLM("secondary")
+        breakers = [
+            CircuitBreaker("p", failure_threshold=2, recovery_timeout=60),
+            CircuitBreaker("s"),
+        ]
+        llm = FallbackLLM([primary, secondary], breakers)
+
+        for _ in range(4):
+            assert llm.chat([Message("user", "hi")]).content == "secondary"
+
+        assert primary.calls == 2
+        assert breakers[0].state == CircuitBreaker.OPEN
+
+    def test_last_error_is_raised_when_all_fail(self):
+        """If every provider fails, the last error should propagate."""
+        llm = FallbackLLM([FakeLLM("a", ConnectionError("a")), FakeLLM("b", TimeoutError("b"))])
+
+        with pytest.raises(TimeoutError):
+            llm.chat([Message("user", "hi")])
+
+    async def test_achat_fails_over(self):
+        """achat should fail over like chat."""
+        llm = FallbackLLM([FakeLLM("a", ConnectionError()), FakeLLM("b")])
+
+        response = await llm.achat([Message("user", "hi")])
+
+        assert response.content == "b"
+
+    def test_mismatched_breakers_raise(self):
+        """The breaker list must match the client list."""
+        with pytest.raises(ValueError, match="circuit breakers"):
+            FallbackLLM([FakeLLM("a")], [])
+        with pytest.raises(ValueError, match="at least one"):
+            FallbackLLM([])
@@ -0,0 +1,77 @@
+"""Tests for SingleFlightLLM."""
+
+import asyncio
+
+from ragmcp.factory.llm_factory import LLMFactory
+from ragmcp.llm import LLMClient, Message, OpenAILLM, Response, SingleFlightLLM
+
+
+class SlowLLM(LLMClient):
+    """LLM counting calls and answering after a short delay."""
+
+    model = "slow"
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, **kwargs):
+        self.calls.append(kwargs)
+        return Response(content=messages[-1].content)
+
+    async def achat(self, messages, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        return Response(content=messages[-1].content)
+
+
+class TestSingleFlightLLM:
+    """Test deduplication of concurrent chat requests."""
+
+    async def test_identical_requests_share_one_call(self):
+        """Same messages and options should make one provider call."""
+        upstream = SlowLLM()
+        llm = SingleFlightLLM(upstream)
+        question = [Message(role="user", content="What is RRF?")]
+        spaced = [Message(role="user", content="What  is RRF? ")]
+
+        results = await asyncio.gather(
+            llm.achat(question, temperature=0),
+            llm.achat(question, temperature=0),
+            llm.achat(spaced, temperature=0),
+            llm.achat(question, temperature=1),
+        )
+
+        assert [r.content for r in results] == [
+            "What is RRF?",
+            "What is RRF?",
+            "What  is RRF? ",
+            "What is RRF?",
+        ]
+        assert upstream.calls == [{"temperature": 0}, {"temperature": 0}, {"temperature": 1}]
+
+    def test_model_is_read_from_the_provider(self):
+        """The wrapped provider's model name should be part of the key."""
+        llm = SingleFlightLLM(OpenAILLM(api_key="test-key", model="gpt-4o"))
+
+        assert llm.model == "gpt-4o"
+        assert llm.flight.name == "llm:gpt-4o"
+
+    def test_sequential_calls_are_not_cached(self):
+        """A finished call should not be reused."""
+        upstream = SlowLLM()
+        llm = SingleFlightLLM(upstream)
+        messages = [Message(role="user", content="hi")]
+
+        llm.chat(messages)
+        llm.chat(messages)
+
+        assert len(upstream.calls) == 2
+
+    def test_factory_wraps_when_enabled(self):
+        """single_flight.enabled should wrap the provider client."""
+        llm = LLMFactory.get_llm(
+            {"provider": "openai", "api_key": "test-key", "single_flight": {"enabled": True}}
+        )
+
+        assert isinstance(llm, SingleFlightLLM)
+        assert isinstance(llm.client, OpenAILLM)
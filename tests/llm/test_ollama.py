@@ -1,5 +1,7 @@
 """Tests for OllamaLLM provider."""
 
+import threading
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -29,7 +31,7 @@ class TestOllamaCommunicatesViaHTTP:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.return_value = mock_response
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="llama2", base_url="http://localhost:11434")
             messages = [Message(role="user", content="Hello")]
@@ -59,7 +61,7 @@ class TestOllamaCommunicatesViaHTTP:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.return_value = mock_response
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="llama2")
             client.chat([Message(role="user", content="Test")])
@@ -76,7 +78,7 @@ class TestOllamaCommunicatesViaHTTP:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.return_value = mock_response
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="codellama")
             client.chat([Message(role="user", content="Test")])
@@ -86,6 +88,35 @@ class TestOllamaCommunicatesViaHTTP:
             assert request_body["model"] == "codellama"
 
 
+class TestOllamaSharesOneClient:
+    """Test the lazily created HTTP client is shared across threads."""
+
+    def test_concurrent_first_calls_create_one_client(self):
+        """Racing first calls should not each build (and leak) their own client."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"message": {"content": "ok"}}
+
+        def slow_client():
+            time.sleep(0.05)
+            client = MagicMock()
+            client.post.return_value = mock_response
+            return client
+
+        with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
+            mock_httpx.Client.side_effect = slow_client
+            client = OllamaLLM(model="llama2")
+            messages = [Message(role="user", content="Hello")]
+
+            threads = [threading.Thread(target=client.chat, args=(messages,)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert mock_httpx.Client.call_count == 1
+
+
 class TestChatConvertsMessagesFormat:
     """Test chat() message format conversion."""
 
@@ -98,7 +129,7 @@ class TestChatConvertsMessagesFormat:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.return_value = mock_response
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="llama2")
 
@@ -129,7 +160,7 @@ class TestOllamaAPIErrorIsPropagated:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.return_value = mock_response
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="llama2")
 
@@ -141,7 +172,7 @@ class TestOllamaAPIErrorIsPropagated:
         with patch("ragmcp.llm.ollama_llm.httpx") as mock_httpx:
             mock_client = MagicMock()
             mock_client.post.side_effect = Exception("Connection refused")
-            mock_httpx.Client.return_value.__enter__.return_value = mock_client
+            mock_httpx.Client.return_value = mock_client
 
             client = OllamaLLM(model="llama2")
 
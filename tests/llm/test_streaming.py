@@ -0,0 +1,281 @@
+"""Tests for streaming chat across LLM providers."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from ragmcp.llm import (
+    AzureOpenAILLM,
+    ClaudeLLM,
+    DeepSeekLLM,
+    LLMClient,
+    Message,
+    OllamaLLM,
+    OpenAILLM,
+    Response,
+    StreamChunk,
+    Usage,
+    ZhipuLLM,
+    collect_stream,
+)
+from ragmcp.llm.fallback import FallbackLLM
+
+OPENAI_COMPATIBLE = [
+    (OpenAILLM, "ragmcp.llm.openai_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+    (
+        AzureOpenAILLM,
+        "ragmcp.llm.azure_openai",
+        "AzureOpenAIClient",
+        "AsyncAzureOpenAIClient",
+        {
+            "api_base": "https://test.openai.azure.com",
+            "api_version": "2024-02-15-preview",
+            "deployment_name": "gpt-4",
+        },
+    ),
+    (DeepSeekLLM, "ragmcp.llm.deepseek_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+    (ZhipuLLM, "ragmcp.llm.zhipu_llm", "OpenAIClient", "AsyncOpenAIClient", {}),
+]
+
+MESSAGES = [Message(role="user", content="Hello")]
+
+
+def openai_chunks():
+    """SDK-like chunks: two deltas, a finish chunk and a usage-only chunk."""
+
+    def chunk(content=None, finish_reason=None):
+        delta = SimpleNamespace(content=content)
+        choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+        return SimpleNamespace(choices=[choice], usage=None)
+
+    usage = SimpleNamespace(prompt_tokens=5, completion_tokens=2)
+    return [
+        chunk("Hel"),
+        chunk("lo"),
+        chunk(None, "stop"),
+        SimpleNamespace(choices=[], usage=usage),
+    ]
+
+
+async def aiter(items):
+    """Async iterator over a list."""
+    for item in items:
+        yield item
+
+
+class TestStreamBase:
+    """Test the default streaming implementation and helpers."""
+
+    class EchoLLM(LLMClient):
+        def chat(self, messages, **kwargs):
+            return Response(content=messages[-1].content, usage=Usage(3, 1))
+
+    def test_default_stream_yields_whole_response(self):
+        """stream() should fall back to one delta plus a usage chunk."""
+        chunks = list(self.EchoLLM().stream(MESSAGES))
+
+        assert chunks == [
+            StreamChunk(delta="Hello"),
+            StreamChunk(usage=Usage(3, 1), finish_reason="stop"),
+        ]
+
+    async def test_default_astream_uses_achat(self):
+        """astream() should fall back to achat()."""
+        chunks = [chunk async for chunk in self.EchoLLM().astream(MESSAGES)]
+
+        assert collect_stream(chunks) == Response(content="Hello", usage=Usage(3, 1))
+
+    def test_usage_total(self):
+        """total_tokens should add prompt and completion tokens."""
+        assert Usage(prompt_tokens=7, completion_tokens=3).total_tokens == 10
+
+
+class TestOpenAICompatibleStream:
+    """Test stream() of providers built on the OpenAI SDK."""
+
+    @pytest.mark.parametrize("cls, module, sync_name, async_name, kwargs", OPENAI_COMPATIBLE)
+    def test_stream_yields_deltas_and_usage(self, cls, module, sync_name, async_name, kwargs):
+        """stream() should request a stream and convert SDK chunks."""
+        with patch(f"{module}.{sync_name}") as mock_class:
+            create = mock_class.return_value.chat.completions.create
+            create.return_value = iter(openai_chunks())
+
+            client = cls(api_key="test-key", **kwargs)
+            chunks = list(client.stream(MESSAGES, temperature=0.3))
+
+        assert [c.delta for c in chunks] == ["Hel", "lo", ""]
+        assert chunks[-1].usage == Usage(prompt_tokens=5, completion_tokens=2)
+        assert chunks[-1].finish_reason == "stop"
+        assert create.call_args.kwargs["stream"] is True
+        assert create.call_args.kwargs["temperature"] == 0.3
+
+    @pytest.mark.parametrize("cls, module, sync_name, async_name, kwargs", OPENAI_COMPATIBLE)
+    async def test_astream_uses_async_client(self, cls, module, sync_name, async_name, kwargs):
+        """astream() should iterate the async SDK stream."""
+        with patch(f"{module}.{sync_name}"), patch(f"{module}.{async_name}") as mock_async:
+            mock_async.return_value.chat.completions.create = AsyncMock(
+                return_value=aiter(openai_chunks())
+            )
+
+            client = cls(api_key="test-key", **kwargs)
+            chunks = [chunk async for chunk in client.astream(MESSAGES)]
+
+        assert collect_stream(chunks).content == "Hello"
+
+    def test_chat_with_stream_flag_joins_deltas(self):
+        """chat(stream=True) should return the joined streamed response."""
+        with patch("ragmcp.llm.openai_llm.OpenAIClient") as mock_class:
+            mock_class.return_value.chat.completions.create.return_value = iter(openai_chunks())
+
+            response = OpenAILLM(api_key="test-key").chat(MESSAGES, stream=True)
+
+        assert response == Response(content="Hello", usage=Usage(5, 2))
+
+    def test_stream_is_lazy(self):
+        """No request should be sent before iteration starts."""
+        with patch("ragmcp.llm.openai_llm.OpenAIClient") as mock_class:
+            OpenAILLM(api_key="test-key").stream(MESSAGES)
+
+            mock_class.return_value.chat.completions.create.assert_not_called()
+
+
+class TestClaudeStream:
+    """Test stream() of ClaudeLLM."""
+
+    @staticmethod
+    def events():
+        return [
+            SimpleNamespace(
+                type="message_start",
+                message=SimpleNamespace(usage=SimpleNamespace(input_tokens=9, output_tokens=1)),
+            ),
+            SimpleNamespace(type="content_block_start"),
+            SimpleNamespace(
+                type="content_block_delta", delta=SimpleNamespace(type="text_delta", text="Hi")
+            ),
+            SimpleNamespace(
+                type="content_block_delta", delta=SimpleNamespace(type="text_delta", text="!")
+            ),
+            SimpleNamespace(
+                type="message_delta",
+                delta=SimpleNamespace(stop_reason="end_turn"),
+                usage=SimpleNamespace(output_tokens=4),
+            ),
+            SimpleNamespace(type="message_stop"),
+        ]
+
+    def test_stream_converts_events(self):
+        """Text deltas and usage should be read from Messages API events."""
+        with patch("ragmcp.llm.claude_llm.Anthropic") as mock_class:
+            create = mock_class.return_value.messages.create
+            create.return_value = iter(self.events())
+
+            chunks = list(ClaudeLLM(api_key="test-key", max_tokens=64).stream(MESSAGES))
+
+        assert [c.delta for c in chunks] == ["Hi", "!", ""]
+        assert chunks[-1].usage == Usage(prompt_tokens=9, completion_tokens=4)
+        assert chunks[-1].finish_reason == "end_turn"
+        assert create.call_args.kwargs["stream"] is True
+
+    async def test_astream_converts_events(self):
+        """astream() should read events from the async client."""
+        with (
+            patch("ragmcp.llm.claude_llm.Anthropic"),
+            patch("ragmcp.llm.claude_llm.AsyncAnthropic") as mock_async,
+        ):
+            mock_async.return_value.messages.create = AsyncMock(return_value=aiter(self.events()))
+
+            client = ClaudeLLM(api_key="test-key", max_tokens=64)
+            chunks = [chunk async for chunk in client.astream(MESSAGES)]
+
+        assert collect_stream(chunks).content == "Hi!"
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    """Mock Ollama server streaming NDJSON."""
+    body = json.loads(request.content)
+    assert body["stream"] is True
+    lines = [
+        {"message": {"role": "assistant", "content": "Hel"}, "done": False},
+        {"message": {"role": "assistant", "content": "lo"}, "done": False},
+        {"done": True, "done_reason": "stop", "prompt_eval_count": 6, "eval_count": 2},
+    ]
+    return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines))
+
+
+class TestOllamaStream:
+    """Test stream() of OllamaLLM against a mock transport."""
+
+    def test_stream_parses_ndjson(self):
+        """stream() should yield one delta per line and usage from the done line."""
+        http_client = httpx.Client(transport=httpx.MockTransport(ollama_handler))
+        client = OllamaLLM(model="llama2", http_client=http_client)
+
+        chunks = list(client.stream(MESSAGES))
+
+        assert [c.delta for c in chunks] == ["Hel", "lo", ""]
+        assert chunks[-1].usage == Usage(prompt_tokens=6, completion_tokens=2)
+
+    async def test_astream_parses_ndjson(self):
+        """astream() should read lines from the async client."""
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(ollama_handler))
+        client = OllamaLLM(model="llama2", async_http_client=http_client)
+
+        chunks = [chunk async for chunk in client.astream(MESSAGES)]
+
+        assert collect_stream(chunks) == Response(content="Hello", usage=Usage(6, 2))
+
+    def test_stream_error_status_raises(self):
+        """HTTP errors should raise with Ollama's error message."""
+        http_client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(404, json={"error": "model not found"})
+            )
+        )
+        client = OllamaLLM(model="missing", http_client=http_client)
+
+        with pytest.raises(Exception, match="model not found"):
+            list(client.stream(MESSAGES))
+
+
+class TestFallbackStream:
+    """Test streaming failover of FallbackLLM."""
+
+    class StreamingLLM(LLMClient):
+        def __init__(self, deltas, error=None):
+            self.deltas = deltas
+            self.error = error
+
+        def chat(self, messages, **kwargs):
+            return collect_stream(self.stream(messages))
+
+        def stream(self, messages, **kwargs):
+            for delta in self.deltas:
+                yield StreamChunk(delta=delta)
+            if self.error is not None:
+                raise self.error
+            yield StreamChunk(finish_reason="stop")
+
+    def test_fails_over_before_first_chunk(self):
+        """A provider failing before its first chunk should be skipped."""
+        llm = FallbackLLM([self.StreamingLLM([], ConnectionError()), self.StreamingLLM(["b", "c"])])
+
+        assert collect_stream(llm.stream(MESSAGES)).content == "bc"
+
+    def test_mid_stream_failure_propagates(self):
+        """A failure after the first chunk should not switch providers."""
+        llm = FallbackLLM([self.StreamingLLM(["a"], ConnectionError()), self.StreamingLLM(["b"])])
+
+        with pytest.raises(ConnectionError):
+            list(llm.stream(MESSAGES))
+
+    async def test_astream_fails_over(self):
+        """astream() should fail over like stream()."""
+        llm = FallbackLLM([self.StreamingLLM([], TimeoutError()), self.StreamingLLM(["x"])])
+
+        chunks = [chunk async for chunk in llm.astream(MESSAGES)]
+
+        assert collect_stream(chunks).content == "x"
@@ -1,5 +1,7 @@
 """Tests for log_call middleware decorator."""
 
+import asyncio
+import inspect
 import io
 import logging
 
@@ -175,6 +177,42 @@ class TestLogCallWithError:
             raise_error()
 
 
+class TestLogCallCoroutine:
+    """Test log_call decorator on async functions."""
+
+    async def test_awaited_result_and_duration_are_logged(self, caplog):
+        """The awaited result and the time spent awaiting should be logged."""
+
+        @log_call
+        async def slow_add(a, b):
+            await asyncio.sleep(0.05)
+            return a + b
+
+        assert inspect.iscoroutinefunction(slow_add)
+        with caplog.at_level(logging.INFO, logger="ragmcp.middleware"):
+            result = await slow_add(2, 3)
+
+        assert result == 5
+        output = caplog.records[-1].getMessage()
+        assert "slow_add output: 5" in output
+        assert float(output.rsplit("duration: ", 1)[1].rstrip("ms")) >= 50
+
+    async def test_awaited_exception_is_logged(self, caplog):
+        """An exception raised while awaiting should be logged and re-raised."""
+
+        @log_call
+        async def failing():
+            await asyncio.sleep(0)
+            raise ValueError("async error")
+
+        with caplog.at_level(logging.INFO, logger="ragmcp.middleware"):
+            with pytest.raises(ValueError, match="async error"):
+                await failing()
+
+        assert caplog.records[-1].levelno == logging.ERROR
+        assert "ValueError: async error" in caplog.records[-1].getMessage()
+
+
 class TestLogCallConfiguration:
     """Test log_call decorator configuration options."""
 
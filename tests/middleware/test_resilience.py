@@ -0,0 +1,366 @@
+"""Tests for adaptive retry, retry budgets and circuit breakers."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ragmcp.middleware import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    acall_with_failover,
+    call_with_failover,
+    get_circuit_breaker,
+    is_retryable,
+    retry,
+    retry_after,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for an httpx response."""
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class APIStatusError(Exception):
+    """Stand-in for an SDK status error carrying its HTTP response."""
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+        self.status_code = status_code
+
+
+class RateLimitError(Exception):
+    """Stand-in for an SDK rate limit error without a status attribute."""
+
+
+class TestErrorClassification:
+    """Test is_retryable and retry_after."""
+
+    @pytest.mark.parametrize("code", [408, 429, 500, 502, 503, 504])
+    def test_transient_statuses_are_retryable(self, code):
+        """Throttling and server errors should be retryable."""
+        assert is_retryable(APIStatusError(code))
+
+    @pytest.mark.parametrize("code", [400, 401, 403, 404, 422])
+    def test_client_errors_are_not_retryable(self, code):
+        """Client errors should not be retried."""
+        assert not is_retryable(APIStatusError(code))
+
+    def test_network_and_sdk_errors_are_retryable(self):
+        """Built-in network errors and SDK error names should be retryable."""
+        assert is_retryable(ConnectionError())
+        assert is_retryable(TimeoutError())
+        assert is_retryable(RateLimitError())
+        assert not is_retryable(ValueError())
+        assert not is_retryable(CircuitOpenError())
+
+    def test_retry_after_header_in_seconds(self):
+        """A numeric Retry-After header should be read as seconds."""
+        assert retry_after(APIStatusError(429, {"retry-after": "2"})) == 2.0
+
+    def test_retry_after_ms_header_takes_precedence(self):
+        """retry-after-ms should be preferred for sub-second precision."""
+        error = APIStatusError(429, {"retry-after-ms": "250", "retry-after": "1"})
+
+        assert retry_after(error) == 0.25
+
+    def test_retry_after_http_date(self):
+        """An HTTP-date Retry-After should be converted to a delay."""
+        future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 10))
+
+        assert 8 < retry_after(APIStatusError(503, {"retry-after": future})) <= 10
+
+    def test_missing_retry_after(self):
+        """Errors without a hint should return None."""
+        assert retry_after(APIStatusError(500)) is None
+        assert retry_after(ConnectionError()) is None
+
+
+class TestAdaptiveRetry:
+    """Test the jitter, Retry-After and budget options of retry."""
+
+    def test_retry_if_retries_sdk_errors(self):
+        """retry_if=is_retryable should retry 429s but not 400s."""
+        calls = []
+
+        @retry(max_attempts=3, backoff_factor=0, retry_if=is_retryable)
+        def call(code):
+            calls.append(code)
+            if len(calls) < 2:
+                raise APIStatusError(code)
+            return "ok"
+
+        assert call(429) == "ok"
+        calls.clear()
+        with pytest.raises(APIStatusError):
+            call(400)
+        assert len(calls) == 1
+
+    def test_jittered_delays_stay_within_bounds(self):
+        """Decorrelated jitter should draw delays in [base, min(max_delay, 3 * previous)]."""
+
+        @retry(max_attempts=6, backoff_factor=0.1, jitter=True, max_delay=0.5)
+        def always_fails():
+            raise ConnectionError()
+
+        with patch("ragmcp.middleware.time.sleep") as sleep:
+            with pytest.raises(ConnectionError):
+                always_fails()
+
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert len(delays) == 5
+        previous = 0.1
+        for delay in delays:
+            assert 0.1 <= delay <= min(0.5, previous * 3)
+            previous = delay
+
+    def test_retry_after_extends_the_delay(self):
+        """A Retry-After hint longer than the backoff should be honoured."""
+        attempts = []
+
+        @retry(max_attempts=2, backoff_factor=0.01, retry_if=is_retryable)
+        def throttled():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise APIStatusError(429, {"retry-after": "3"})
+            return "ok"
+
+        with patch("ragmcp.middleware.time.sleep") as sleep:
+            assert throttled() == "ok"
+        sleep.assert_called_once_with(3.0)
+
+    def test_retry_after_beyond_max_delay_is_raised(self):
+        """A hint longer than max_delay should stop retrying immediately."""
+        attempts = []
+
+        @retry(max_attempts=3, backoff_factor=0, retry_if=is_retryable, max_delay=1.0)
+        def throttled():
+            attempts.append(1)
+            raise APIStatusError(429, {"retry-after": "60"})
+
+        with pytest.raises(APIStatusError):
+            throttled()
+        assert len(attempts) == 1
+
+    def test_exhausted_budget_stops_retries(self):
+        """Retries should stop once the shared budget is spent."""
+        budget = RetryBudget(ratio=0.0, min_per_second=0.0, capacity=1.0)
+        attempts = []
+
+        @retry(max_attempts=5, backoff_factor=0, budget=budget)
+        def always_fails():
+            attempts.append(1)
+            raise ConnectionError()
+
+        with pytest.raises(ConnectionError):
+            always_fails()
+        assert len(attempts) == 2
+
+        attempts.clear()
+        with pytest.raises(ConnectionError):
+            always_fails()
+        assert len(attempts) == 1
+
+    def test_budget_is_earned_by_calls(self):
+        """Each call should deposit ratio retry tokens."""
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0, capacity=1.0)
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+        budget.record_call()
+        budget.record_call()
+
+        assert budget.try_spend()
+
+    async def test_async_functions_are_retried(self):
+        """Coroutine functions should be retried with asyncio.sleep."""
+        attempts = []
+
+        @retry(max_attempts=3, backoff_factor=0)
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise TimeoutError()
+            return "ok"
+
+        assert await flaky() == "ok"
+        assert len(attempts) == 3
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures should open the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    def test_success_resets_failure_count(self):
+        """A success should reset the consecutive failure count."""
+        breaker = CircuitBreaker("test", failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_limited_probes(self):
+        """After the recovery timeout only half_open_max_calls probes should pass."""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """A failed probe should open the circuit again."""
+        breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_released_probe_can_be_retried(self):
+        """A released probe slot should let the next caller probe."""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow_request()
+
+        breaker.release_probe()
+
+        assert breaker.allow_request()
+
+    def test_retry_fails_fast_when_circuit_opens(self):
+        """retry should stop calling once its breaker opens."""
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+        attempts = []
+
+        @retry(max_attempts=5, backoff_factor=0, circuit_breaker=breaker)
+        def always_fails():
+            attempts.append(1)
+            raise ConnectionError()
+
+        with pytest.raises(CircuitOpenError):
+            always_fails()
+        assert len(attempts) == 2
+
+        with pytest.raises(CircuitOpenError):
+            always_fails()
+        assert len(attempts) == 2
+
+    def test_named_breakers_are_shared(self):
+        """get_circuit_breaker should return one breaker per name."""
+        breaker = get_circuit_breaker("resilience-test", failure_threshold=3)
+
+        assert get_circuit_breaker("resilience-test") is breaker
+        assert breaker.failure_threshold == 3
+
+
+class TestFailover:
+    """Test call_with_failover."""
+
+    def test_transient_failure_moves_to_next_provider(self):
+        """A retryable error should fall through to the next provider."""
+        first, second = CircuitBreaker("a"), CircuitBreaker("b")
+
+        def fail():
+            raise APIStatusError(503)
+
+        assert call_with_failover([(first, fail), (second, lambda: "b")]) == "b"
+
+    def test_open_providers_are_skipped(self):
+        """Providers with an open circuit should not be called."""
+        first = CircuitBreaker("a", failure_threshold=1, recovery_timeout=60)
+        first.record_failure()
+
+        def must_not_run():
+            raise AssertionError("called an open provider")
+
+        assert call_with_failover([(first, must_not_run), (CircuitBreaker("b"), lambda: 2)]) == 2
+
+    def test_client_errors_are_not_failed_over(self):
+        """A non-retryable error should be raised without trying other providers."""
+
+        def bad_request():
+            raise APIStatusError(400)
+
+        def must_not_run():
+            raise AssertionError("failed over a client error")
+
+        with pytest.raises(APIStatusError):
+            call_with_failover(
+                [(CircuitBreaker("a"), bad_request), (CircuitBreaker("b"), must_not_run)]
+            )
+
+    def test_all_open_raises_circuit_open(self):
+        """If every circuit is open, CircuitOpenError should be raised."""
+        breaker = CircuitBreaker("a", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            call_with_failover([(breaker, lambda: 1)])
+
+    async def test_cancelled_probe_releases_its_slot(self):
+        """Cancelling a half-open probe should not wedge the breaker."""
+        breaker = CircuitBreaker("a", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        task = asyncio.create_task(acall_with_failover([(breaker, hang)]))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+
+    async def test_cancelled_retry_probe_releases_its_slot(self):
+        """retry should also free the probe slot of a cancelled call."""
+        breaker = CircuitBreaker("a", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        started = asyncio.Event()
+
+        @retry(max_attempts=2, backoff_factor=0, circuit_breaker=breaker)
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        task = asyncio.create_task(hang())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert breaker.allow_request()
@@ -0,0 +1,217 @@
+"""Tests for single-flight deduplication."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from ragmcp.llm.base import Message
+from ragmcp.middleware import SingleFlight, fingerprint, get_single_flight, single_flight
+from ragmcp.middleware.singleflight import normalize_text
+
+
+def _wait_for_waiters(flight: SingleFlight, count: int) -> None:
+    """Block until ``count`` callers have joined an in-flight call."""
+    while flight.stats()["shared"] < count:
+        threading.Event().wait(0.005)
+
+
+class TestFingerprint:
+    """Test request fingerprints."""
+
+    def test_strings_are_hashed_exactly(self):
+        """Payloads differing only in whitespace should not match."""
+        assert fingerprint("what is BM25?", 5) == fingerprint("what is BM25?", 5)
+        assert fingerprint("  what is\tBM25? ", 5) != fingerprint("what is BM25?", 5)
+        assert fingerprint([Message(role="user", content="a  b")]) != fingerprint(
+            [Message(role="user", content="a b")]
+        )
+
+    def test_normalize_text_folds_spacing_and_unicode_form(self):
+        """Queries differing only in spacing or normalization form should normalize alike."""
+        assert normalize_text("  what is\tBM25? ") == "what is BM25?"
+        assert normalize_text("cafe\u0301") == normalize_text("caf\u00e9")
+
+    def test_options_and_dataclasses_are_part_of_the_key(self):
+        """Different options, messages or top_k should not match."""
+        messages = [Message(role="user", content="hi")]
+
+        assert fingerprint(messages, {"temperature": 0}) == fingerprint(
+            [Message(role="user", content="hi")], {"temperature": 0}
+        )
+        assert fingerprint(messages, {"temperature": 0}) != fingerprint(
+            messages, {"temperature": 1}
+        )
+        assert fingerprint("q", 5) != fingerprint("q", 10)
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+
+    def test_arrays_by_content_and_objects_by_identity(self):
+        """Arrays should hash by content; other objects by instance."""
+        first, second = object(), object()
+
+        assert fingerprint(np.arange(3)) == fingerprint(np.arange(3))
+        assert fingerprint(np.arange(3)) != fingerprint(np.arange(3, dtype=np.float32))
+        assert fingerprint(first) == fingerprint(first)
+        assert fingerprint(first) != fingerprint(second)
+
+
+class TestSingleFlight:
+    """Test sharing in-flight calls between threads and tasks."""
+
+    def test_concurrent_threads_share_one_call(self):
+        """Only the leader should run; every caller gets its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(flight.do, "key", compute) for _ in range(4)]
+            _wait_for_waiters(flight, 3)
+            release.set()
+            results = [f.result(5) for f in futures]
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats() == {"executed": 1, "shared": 3}
+        assert flight.in_flight == 0
+
+    def test_errors_are_shared_and_not_remembered(self):
+        """Waiters should receive the leader's error; later calls run again."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(flight.do, "key", fail) for _ in range(2)]
+            _wait_for_waiters(flight, 1)
+            release.set()
+            for future in futures:
+                with pytest.raises(ValueError, match="boom"):
+                    future.result(5)
+
+        assert flight.do("key", lambda: "fresh") == "fresh"
+
+    async def test_tasks_and_threads_share_one_call(self):
+        """An async leader should serve both task and thread waiters."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flight.ado("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", compute))
+        thread_result = asyncio.get_running_loop().run_in_executor(
+            None, flight.do, "key", lambda: -1
+        )
+        while flight.stats()["shared"] < 2:
+            await asyncio.sleep(0.005)
+        release.set()
+
+        assert await leader == 42
+        assert await follower == 42
+        assert await thread_result == 42
+        assert len(calls) == 1
+
+    async def test_cancelled_leader_hands_over_to_a_waiter(self):
+        """Cancelling the leader should make a waiter run the call itself."""
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        leader = asyncio.create_task(flight.ado("key", slow))
+        await started.wait()
+        waiter = asyncio.create_task(flight.ado("key", slow))
+        while flight.stats()["shared"] < 1:
+            await asyncio.sleep(0.005)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        started.clear()
+        await started.wait()
+        assert flight.in_flight == 1
+        waiter.cancel()
+
+    async def test_cancelling_a_waiter_leaves_the_leader_running(self):
+        """A cancelled waiter should not cancel the shared call."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.ado("key", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.ado("key", compute))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await leader == "done"
+
+
+class TestSingleFlightDecorator:
+    """Test the single_flight decorator."""
+
+    def test_sync_function(self):
+        """Identical concurrent calls should share one execution."""
+        release = threading.Event()
+        calls = []
+
+        @single_flight("test:decorator:sync")
+        def search(query, top_k=5):
+            calls.append(query)
+            release.wait(5)
+            return [query, top_k]
+
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(search, q) for q in ["a b", "a b", "a b"]]
+            _wait_for_waiters(get_single_flight("test:decorator:sync"), 2)
+            release.set()
+            results = [f.result(5) for f in futures]
+
+        assert len(calls) == 1
+        assert results == [["a b", 5]] * 3
+
+    async def test_coroutine_function_with_custom_key(self):
+        """A key function should decide which calls are identical."""
+        calls = []
+
+        @single_flight(key=lambda query, request_id: query)
+        async def answer(query, request_id):
+            calls.append(request_id)
+            await asyncio.sleep(0.01)
+            return query.upper()
+
+        results = await asyncio.gather(answer("q", 1), answer("q", 2), answer("other", 3))
+
+        assert results == ["Q", "Q", "OTHER"]
+        assert sorted(calls) == [1, 3]
+
+    def test_generator_functions_are_rejected(self):
+        """Streams cannot be shared, so generators should raise ValueError."""
+        with pytest.raises(ValueError, match="generator"):
+
+            @single_flight()
+            def stream():
+                yield 1
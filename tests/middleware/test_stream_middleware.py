@@ -0,0 +1,225 @@
+"""Tests for retry, rate limiting and logging around streamed calls."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from ragmcp.middleware import log_call, rate_limit, retry, token_bucket
+
+
+class RecordingHandler(logging.Handler):
+    """Handler keeping every record it receives."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def recorder():
+    """Attach a RecordingHandler to a dedicated logger."""
+    handler = RecordingHandler()
+    test_logger = logging.getLogger("test.stream")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+    yield handler
+    test_logger.removeHandler(handler)
+
+
+class TestRetryStream:
+    """Test retry around generator functions."""
+
+    def test_retries_failure_before_first_item(self):
+        """A stream failing before its first item should be reopened."""
+        attempts = []
+
+        @retry(max_attempts=3, backoff_factor=0)
+        def tokens():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError()
+            yield "a"
+            yield "b"
+
+        assert list(tokens()) == ["a", "b"]
+        assert len(attempts) == 3
+
+    def test_does_not_retry_after_first_item(self):
+        """A mid-stream failure should propagate without reopening the stream."""
+        attempts = []
+
+        @retry(max_attempts=3, backoff_factor=0)
+        def tokens():
+            attempts.append(1)
+            yield "a"
+            raise ConnectionError()
+
+        received = []
+        with pytest.raises(ConnectionError):
+            for token in tokens():
+                received.append(token)
+        assert received == ["a"]
+        assert len(attempts) == 1
+
+    def test_wrapper_is_lazy(self):
+        """Calling a decorated stream should not start it."""
+        started = []
+
+        @retry(max_attempts=2, backoff_factor=0)
+        def tokens():
+            started.append(1)
+            yield "a"
+
+        stream = tokens()
+        assert started == []
+        assert next(stream) == "a"
+
+    async def test_async_stream_is_retried_before_first_item(self):
+        """Async generators should be retried like sync ones."""
+        attempts = []
+
+        @retry(max_attempts=2, backoff_factor=0)
+        async def tokens():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise TimeoutError()
+            yield "x"
+
+        assert [t async for t in tokens()] == ["x"]
+        assert len(attempts) == 2
+
+
+class TestRateLimitStream:
+    """Test rate limiting of generator functions."""
+
+    def test_rate_limit_waits_when_iteration_starts(self):
+        """The slot should be taken per stream, when it is iterated."""
+
+        @rate_limit(max_requests=1, time_window=0.1)
+        def tokens():
+            yield "a"
+
+        assert list(tokens()) == ["a"]
+        start = time.monotonic()
+        assert list(tokens()) == ["a"]
+        assert time.monotonic() - start >= 0.08
+
+    async def test_rate_limit_async_stream_does_not_block_loop(self):
+        """Async generators should wait without blocking the event loop."""
+
+        @rate_limit(max_requests=1, time_window=0.2)
+        async def tokens():
+            yield "a"
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        assert [t async for t in tokens()] == ["a"]
+        background = asyncio.create_task(ticker())
+        start = time.monotonic()
+        stream = tokens()
+        assert [t async for t in stream] == ["a"]
+        background.cancel()
+
+        assert time.monotonic() - start >= 0.15
+        assert ticks >= 5
+
+    async def test_rate_limit_coroutine(self):
+        """Coroutine functions should be awaited after an async wait."""
+
+        @rate_limit(max_requests=1, time_window=0.1)
+        async def call():
+            return "ok"
+
+        assert await call() == "ok"
+        start = time.monotonic()
+        assert await call() == "ok"
+        assert time.monotonic() - start >= 0.08
+
+    async def test_token_bucket_async_stream(self):
+        """token_bucket should draw quota for async generators."""
+
+        @token_bucket("stream-test", requests_per_minute=6000)
+        async def tokens():
+            yield "a"
+            yield "b"
+
+        assert [t async for t in tokens()] == ["a", "b"]
+
+
+class TestLogCallStream:
+    """Test log_call around generator functions."""
+
+    def test_logs_once_with_item_count(self, recorder):
+        """A stream should be logged at its end, without consuming items."""
+
+        @log_call(logger_name="test.stream", structured=True)
+        def tokens(n):
+            yield from range(n)
+
+        assert list(tokens(3)) == [0, 1, 2]
+
+        (record,) = recorder.records
+        assert record.fields["items"] == 3
+        assert record.fields["status"] == "ok"
+        assert record.fields["first_item_ms"] is not None
+
+    def test_text_mode_reports_time_to_first_item(self, recorder):
+        """Text records should mention the first-item latency."""
+
+        @log_call(logger_name="test.stream")
+        def tokens():
+            yield "a"
+
+        list(tokens())
+
+        assert "first item" in recorder.records[-1].getMessage()
+
+    def test_stream_error_is_logged(self, recorder):
+        """Errors raised mid-stream should be logged and re-raised."""
+
+        @log_call(logger_name="test.stream", structured=True, sample_rate=0.0)
+        def tokens():
+            yield "a"
+            raise ValueError("broken")
+
+        with pytest.raises(ValueError):
+            list(tokens())
+
+        (record,) = recorder.records
+        assert record.fields["status"] == "error"
+        assert record.fields["items"] == 1
+
+    def test_early_close_is_logged(self, recorder):
+        """Closing a stream early should still log it."""
+
+        @log_call(logger_name="test.stream", structured=True)
+        def tokens():
+            yield from range(10)
+
+        stream = tokens()
+        next(stream)
+        stream.close()
+
+        assert recorder.records[-1].fields["items"] == 1
+
+    async def test_async_stream_is_logged(self, recorder):
+        """Async generators should be logged at their end."""
+
+        @log_call(logger_name="test.stream", structured=True)
+        async def tokens():
+            yield "a"
+            yield "b"
+
+        assert [t async for t in tokens()] == ["a", "b"]
+        assert recorder.records[-1].fields["items"] == 2
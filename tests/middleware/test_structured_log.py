@@ -0,0 +1,183 @@
+"""Tests for structured, sampled log_call records and the queued sink."""
+
+import json
+import logging
+import sys
+
+import numpy as np
+import pytest
+
+from ragmcp.middleware import (
+    JsonFormatter,
+    configure_logging,
+    log_call,
+    shutdown_logging,
+    summarize,
+)
+
+
+class RecordingHandler(logging.Handler):
+    """Handler keeping every record it receives."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def recorder():
+    """Attach a RecordingHandler to a dedicated logger."""
+    handler = RecordingHandler()
+    test_logger = logging.getLogger("test.structured")
+    test_logger.addHandler(handler)
+    test_logger.setLevel(logging.INFO)
+    yield handler
+    test_logger.removeHandler(handler)
+
+
+class TestSummarize:
+    """Test payload summaries."""
+
+    def test_arrays_are_reduced_to_shape(self):
+        """Arrays and lists of arrays should not be expanded."""
+        vectors = [np.zeros(3072, dtype=np.float32) for _ in range(4)]
+
+        summary = summarize(vectors)
+
+        assert summary == {
+            "type": "list",
+            "len": 4,
+            "first": {"type": "ndarray", "shape": [3072], "dtype": "float32"},
+        }
+
+    def test_long_strings_are_hashed(self):
+        """Long strings should be replaced by their length and a hash."""
+        summary = summarize("x" * 1000)
+
+        assert summary["len"] == 1000
+        assert summary == summarize("x" * 1000)
+        assert summary["hash"] != summarize("y" * 1000)["hash"]
+
+    def test_small_values_are_kept(self):
+        """Scalars, short strings and small containers should be kept as is."""
+        assert summarize((1, "a", None, {"k": 2.5})) == [1, "a", None, {"k": 2.5}]
+
+    def test_summary_is_json_serializable(self):
+        """Summaries of arbitrary objects should serialize to JSON."""
+        json.dumps(summarize([object(), {"n": np.arange(3)}, set(range(100))]))
+
+
+class TestStructuredLogCall:
+    """Test log_call in structured mode."""
+
+    def test_record_carries_summarized_fields(self, recorder):
+        """A structured record should summarize args and result."""
+
+        @log_call(logger_name="test.structured", structured=True)
+        def embed(texts):
+            return [np.ones(8) for _ in texts]
+
+        embed(["a", "b"])
+
+        (record,) = recorder.records
+        assert record.fields["function"].endswith("embed")
+        assert record.fields["status"] == "ok"
+        assert record.fields["args"] == [["a", "b"]]
+        assert record.fields["result"]["len"] == 2
+        assert record.fields["duration_ms"] >= 0
+
+    def test_disabled_level_skips_formatting(self, recorder):
+        """Nothing should be summarized or repr'd when the level is disabled."""
+
+        class Exploding:
+            def __repr__(self):
+                raise AssertionError("repr called")
+
+        @log_call(logging.DEBUG, logger_name="test.structured")
+        def call(value):
+            return value
+
+        call(Exploding())
+
+        assert recorder.records == []
+
+    def test_sampling_drops_successes_but_keeps_errors(self, recorder):
+        """sample_rate=0 should record only failed calls."""
+
+        @log_call(logger_name="test.structured", structured=True, sample_rate=0.0)
+        def maybe_fail(fail):
+            if fail:
+                raise ValueError("boom")
+            return "ok"
+
+        for _ in range(10):
+            maybe_fail(False)
+        with pytest.raises(ValueError):
+            maybe_fail(True)
+
+        assert [r.fields["status"] for r in recorder.records] == ["error"]
+
+    def test_invalid_sample_rate_raises(self):
+        """A sample rate outside [0, 1] should raise ValueError."""
+        with pytest.raises(ValueError, match="sample_rate"):
+            log_call(sample_rate=2.0)
+
+
+class TestConfigureLogging:
+    """Test the queued JSON sink."""
+
+    def test_json_records_are_written_by_the_sink_thread(self, tmp_path):
+        """configure_logging should write JSON lines to the configured file."""
+        path = tmp_path / "logs" / "ragmcp.log"
+
+        @log_call(logger_name="test.sink")
+        def add(a, b):
+            return a + b
+
+        @log_call(logger_name="test.sink")
+        def never():
+            return None
+
+        configure_logging(
+            {
+                "level": "INFO",
+                "format": "json",
+                "file": str(path),
+                "sampling": {never.__qualname__: 0.0},
+            },
+            logger_name="test.sink",
+        )
+        try:
+            add(2, 3)
+            never()
+        finally:
+            shutdown_logging("test.sink")
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["function"].endswith("add")
+        assert lines[0]["args"] == [2, 3]
+        assert lines[0]["result"] == 5
+        assert lines[0]["level"] == "INFO"
+
+    def test_invalid_sampling_rate_raises(self):
+        """Sampling rates outside [0, 1] should be rejected."""
+        with pytest.raises(ValueError, match="Sampling rate"):
+            configure_logging({"sampling": {"f": 1.5}}, logger_name="test.sink")
+
+    def test_json_formatter_includes_exception(self):
+        """JsonFormatter should include the traceback of an exception record."""
+        try:
+            raise RuntimeError("bad")
+        except RuntimeError:
+            record = logging.getLogger("x").makeRecord(
+                "x", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+            )
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload["message"] == "failed"
+        assert "RuntimeError: bad" in payload["exception"]
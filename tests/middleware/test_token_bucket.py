@@ -0,0 +1,179 @@
+"""Tests for token-bucket rate limiting."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ragmcp.middleware import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+    rate_limit,
+    token_bucket,
+)
+
+
+class TestTokenBucket:
+    """Test refill, weighted acquisition and stats."""
+
+    def test_burst_up_to_capacity_then_waits_for_refill(self):
+        """Tokens beyond capacity should wait cost / rate seconds."""
+        bucket = TokenBucket(rate=100.0, capacity=5)
+
+        assert [bucket.acquire() for _ in range(5)] == [0.0] * 5
+        start = time.monotonic()
+        waited = bucket.acquire(cost=3)
+        elapsed = time.monotonic() - start
+
+        assert waited == pytest.approx(0.03, abs=0.01)
+        assert elapsed >= 0.02
+
+    def test_try_acquire_and_timeout_take_nothing_when_refused(self):
+        """Refused acquisitions should leave the balance untouched."""
+        bucket = TokenBucket(rate=1.0, capacity=2)
+
+        assert bucket.try_acquire(2)
+        assert not bucket.try_acquire(1)
+        with pytest.raises(TimeoutError):
+            bucket.acquire(1, timeout=0.1)
+        assert bucket.available == pytest.approx(0.0, abs=0.05)
+
+    def test_stats_report_waits(self):
+        """Stats should count calls, tokens and time spent waiting."""
+        bucket = TokenBucket(rate=200.0, capacity=1)
+        bucket.acquire()
+        bucket.acquire()
+
+        stats = bucket.stats
+
+        assert stats["acquired"] == 2
+        assert stats["tokens"] == 2.0
+        assert stats["waited"] == 1
+        assert stats["max_wait"] == pytest.approx(0.005, abs=0.003)
+
+    def test_waiters_do_not_hold_the_lock(self):
+        """A thread waiting for tokens should not block other buckets or try_acquire."""
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        bucket.acquire()
+        waiter = threading.Thread(target=bucket.acquire)
+        waiter.start()
+        time.sleep(0.01)
+
+        start = time.monotonic()
+        assert not bucket.try_acquire()
+        assert time.monotonic() - start < 0.05
+        waiter.join()
+
+    async def test_aacquire_awaits_without_blocking_the_loop(self):
+        """Concurrent coroutines should be spaced by the refill rate."""
+        bucket = TokenBucket(rate=100.0, capacity=1)
+        ticks = []
+
+        async def tick():
+            await bucket.aacquire()
+            ticks.append(time.monotonic())
+
+        start = time.monotonic()
+        await asyncio.gather(*(tick() for _ in range(4)), asyncio.sleep(0))
+
+        assert time.monotonic() - start >= 0.025
+        assert ticks == sorted(ticks)
+
+    def test_invalid_parameters_raise_error(self):
+        """Non-positive rate or capacity and negative cost should raise ValueError."""
+        with pytest.raises(ValueError, match="rate"):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError, match="capacity"):
+            TokenBucket(rate=1, capacity=0)
+        with pytest.raises(ValueError, match="cost"):
+            TokenBucket(rate=1).acquire(-1)
+
+
+class TestRateLimiter:
+    """Test request and token quotas."""
+
+    def test_waits_for_the_tighter_quota(self):
+        """A large token cost should wait even when requests are available."""
+        limiter = RateLimiter("test", requests_per_minute=6000, tokens_per_minute=600)
+
+        assert limiter.acquire(tokens=600) == 0.0
+        waited = limiter.acquire(tokens=1)
+
+        assert waited == pytest.approx(0.1, abs=0.02)
+        assert limiter.stats["requests"]["acquired"] == 2
+        assert limiter.stats["tokens"]["waited"] == 1
+
+    def test_named_limiters_are_shared(self):
+        """get_rate_limiter should return the same instance for a name."""
+        first = get_rate_limiter("shared-test", requests_per_minute=60)
+
+        assert get_rate_limiter("shared-test", requests_per_minute=60) is first
+        with pytest.raises(ValueError, match="already exists"):
+            get_rate_limiter("shared-test", requests_per_minute=120)
+
+
+class TestTokenBucketDecorator:
+    """Test the token_bucket decorator."""
+
+    def test_functions_with_the_same_name_share_a_quota(self):
+        """Two decorated functions should draw from one limiter."""
+
+        @token_bucket("decorator-test", requests_per_minute=60)
+        def first():
+            return 1
+
+        @token_bucket("decorator-test", requests_per_minute=60)
+        def second():
+            return 2
+
+        assert first() + second() == 3
+        assert get_rate_limiter("decorator-test", 60).stats["requests"]["acquired"] == 2
+
+    async def test_async_function_with_token_cost(self):
+        """Coroutine functions should be awaited and charged their estimated cost."""
+
+        @token_bucket(
+            "decorator-async-test",
+            tokens_per_minute=60_000,
+            cost=lambda text: estimate_tokens(text),
+        )
+        async def call(text):
+            return text.upper()
+
+        assert await call("abcdefgh") == "ABCDEFGH"
+        limiter = get_rate_limiter("decorator-async-test", tokens_per_minute=60_000)
+        assert limiter.stats["tokens"]["tokens"] == 2.0
+
+
+class TestEstimateTokens:
+    """Test the token estimate used for quota accounting."""
+
+    def test_ascii_and_cjk_text(self):
+        """ASCII should count about four characters per token, CJK one each."""
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("检索增强") == 4
+        assert estimate_tokens("") == 1
+
+
+class TestSharedSlidingWindow:
+    """Test the name option of rate_limit."""
+
+    def test_named_windows_are_shared(self):
+        """Functions decorated with the same name should share one window."""
+
+        @rate_limit(max_requests=1, time_window=0.05, name="window-test")
+        def first():
+            pass
+
+        @rate_limit(max_requests=1, time_window=0.05, name="window-test")
+        def second():
+            pass
+
+        first()
+        start = time.monotonic()
+        second()
+
+        assert time.monotonic() - start >= 0.04
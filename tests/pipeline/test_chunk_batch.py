@@ -0,0 +1,216 @@
+"""Tests for columnar chunk batches."""
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.embedding.quantization import quantize
+from ragmcp.pipeline import (
+    Chunk,
+    ChunkBatch,
+    ChunkView,
+    Document,
+    IngestionPipeline,
+    Loader,
+    Splitter,
+    Transform,
+)
+from ragmcp.vector_store import LocalVectorStore, VectorStore
+
+
+class LengthEmbedding(EmbeddingClient):
+    """Embeds text by its length; records the texts of every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [np.array([len(t), 1.0], dtype=np.float32) for t in texts]
+
+
+class WordSplitter(Splitter):
+    def split(self, document):
+        return [Chunk(text=word, metadata={}) for word in document.text.split()]
+
+
+class DictLoader(Loader):
+    def __init__(self, files):
+        self.files = files
+
+    def load(self, file_path):
+        return Document(text=self.files[file_path], metadata={})
+
+
+class RejectingTransform(Transform):
+    """Upper-cases chunks and rejects the word "bad"."""
+
+    def transform(self, chunk):
+        if chunk.text == "bad":
+            raise ValueError("rejected")
+        return Chunk(text=chunk.text.upper(), metadata=chunk.metadata)
+
+
+def _batch(texts, source="a.md"):
+    return ChunkBatch.from_chunks([Chunk(text=t, metadata={}) for t in texts], source)
+
+
+class TestChunkBatch:
+    """Test construction and column operations."""
+
+    def test_from_chunks_builds_columns(self):
+        """Ids, indices and hashes should be filled per chunk."""
+        batch = ChunkBatch.from_chunks(
+            [Chunk(text="a", metadata={}), Chunk(text="b", metadata={"chunk_id": "custom"})],
+            source="doc.md",
+            first_index=5,
+        )
+
+        assert len(batch) == 2
+        assert batch.ids.tolist() == [b"doc.md#5", b"custom"]
+        assert batch.chunk_indices.tolist() == [5, 6]
+        assert batch.sources == ["doc.md", "doc.md"]
+        assert batch.hashes.dtype == np.dtype("S16")
+        assert batch.start_offsets.tolist() == [-1, -1]
+
+    def test_views_keep_their_offsets(self):
+        """Offsets of ChunkViews should fill the offset columns."""
+        document = Document(text="hello world", metadata={"source": "h.md"})
+        views = ChunkView.from_spans(document, [(0, 5), (6, 11)])
+
+        batch = ChunkBatch.from_chunks(views)
+
+        assert batch.texts == ["hello", "world"]
+        assert batch.start_offsets.tolist() == [0, 6]
+        assert batch.end_offsets.tolist() == [5, 11]
+        assert batch.id_strings() == ["h.md#0", "h.md#1"]
+
+    def test_equal_texts_share_a_hash(self):
+        """Content hashes should depend only on the text."""
+        batch = _batch(["x", "y", "x"])
+
+        first, inverse = batch.unique_texts()
+
+        assert batch.hashes[0] == batch.hashes[2] != batch.hashes[1]
+        assert len(first) == 2
+        assert [batch.texts[first[i]] for i in inverse] == ["x", "y", "x"]
+
+    def test_take_concat_and_split(self):
+        """Selections and concatenation should keep the columns aligned."""
+        batch = _batch(["a", "b", "c", "d"])
+
+        picked = batch.take(np.array([True, False, True, False]))
+        joined = ChunkBatch.concat([picked, batch.take(slice(3, 4))])
+
+        assert picked.texts == ["a", "c"]
+        assert joined.id_strings() == ["a.md#0", "a.md#2", "a.md#3"]
+        assert [len(part) for part in batch.split(3)] == [3, 1]
+
+    def test_embeddings_follow_selection(self):
+        """Attached embeddings should be selected and concatenated with the rows."""
+        batch = _batch(["a", "b", "c"]).with_embeddings(
+            quantize(np.arange(6, dtype=np.float32).reshape(3, 2), "int8")
+        )
+
+        joined = ChunkBatch.concat([batch.take([2]), batch.take([0])])
+
+        np.testing.assert_allclose(np.asarray(joined.embeddings), [[4, 5], [0, 1]], atol=0.05)
+
+    def test_mismatched_columns_raise(self):
+        """Embeddings with the wrong row count should raise ValueError."""
+        with pytest.raises(ValueError, match="embeddings"):
+            _batch(["a", "b"]).with_embeddings(quantize(np.ones((3, 2), dtype=np.float32)))
+
+    def test_payloads(self):
+        """Payloads should hold the id, text, metadata and source."""
+        batch = ChunkBatch.from_chunks([Chunk(text="a", metadata={"page": 2})], "doc.md")
+
+        assert batch.payloads("pk") == [
+            {"pk": "doc.md#0", "text": "a", "page": 2, "source": "doc.md", "chunk_id": "doc.md#0"}
+        ]
+
+
+class TestBatchEntryPoints:
+    """Test the batch-native defaults of the pipeline interfaces."""
+
+    def test_iter_split_batches_numbers_across_batches(self):
+        """Chunk indices should continue from one batch to the next."""
+        document = Document(text="a b c d e", metadata={"source": "w.md"})
+
+        batches = list(WordSplitter().iter_split_batches(document, 2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[2].id_strings() == ["w.md#4"]
+        assert WordSplitter().split_batch(document).texts == ["a", "b", "c", "d", "e"]
+
+    def test_transform_batch_applies_transform_per_row(self):
+        """The default should transform every row and keep the ids."""
+        batch = RejectingTransform().transform_batch(_batch(["x", "y"]))
+
+        assert batch.texts == ["X", "Y"]
+        assert batch.id_strings() == ["a.md#0", "a.md#1"]
+        assert batch.hashes[0] == _batch(["X"]).hashes[0]
+
+    def test_embed_batch_embeds_duplicates_once(self):
+        """Repeated texts should be embedded once and keep row order."""
+        client = LengthEmbedding()
+
+        batch = client.embed_batch(_batch(["aa", "b", "aa"]))
+
+        assert sorted(client.calls[0]) == ["aa", "b"]
+        assert np.asarray(batch.embeddings)[:, 0].tolist() == [2, 1, 2]
+
+    def test_upsert_batch(self):
+        """Embedded batches should be upserted with their payloads."""
+        store = LocalVectorStore({})
+        batch = LengthEmbedding().embed_batch(_batch(["aa", "b"]))
+
+        assert store.upsert_batch(batch) == 2
+        assert store.query(np.array([1.0, 1.0]), 1)[0]["id"] == "a.md#1"
+
+    def test_default_upsert_batch_passes_a_list_of_vectors(self):
+        """The base implementation should honour upsert()'s list-of-vectors contract."""
+
+        class ListStore(VectorStore):
+            def insert(self, vectors, payloads):
+                return 0
+
+            def query(self, query_vector, top_k, filter=None):
+                return []
+
+            def delete(self, ids):
+                return 0
+
+            def upsert(self, vectors, payloads):
+                self.vectors = vectors
+                return len(vectors)
+
+        store = ListStore()
+        batch = LengthEmbedding().embed_batch(_batch(["aa", "b"]))
+
+        assert store.upsert_batch(batch) == 2
+        assert isinstance(store.vectors, list)
+        assert [v.tolist() for v in store.vectors] == [[2.0, 1.0], [1.0, 1.0]]
+
+    def test_upsert_batch_requires_embeddings(self):
+        """Upserting a batch without embeddings should raise ValueError."""
+        with pytest.raises(ValueError, match="no embeddings"):
+            LocalVectorStore({}).upsert_batch(_batch(["a"]))
+
+    def test_pipeline_skips_only_failing_chunks(self):
+        """A transform failure should drop its chunk, not the whole batch."""
+        store = LocalVectorStore({})
+        pipeline = IngestionPipeline(
+            DictLoader({"a.md": "good bad fine"}),
+            WordSplitter(),
+            LengthEmbedding(),
+            store,
+            [RejectingTransform()],
+            config={"batch_wait_ms": 1},
+        )
+
+        stats = pipeline.run(["a.md"])
+
+        assert (stats.chunks, stats.upserted) == (2, 2)
+        assert stats.failed == [("a.md#1", "rejected")]
+        assert len(store) == 2
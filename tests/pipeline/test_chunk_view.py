@@ -0,0 +1,158 @@
+"""Tests for offset-based chunk views."""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.pipeline import Chunk, ChunkView, Document, IngestionPipeline, Loader, Splitter
+from ragmcp.vector_store import LocalVectorStore
+
+
+def _windows(length, size, overlap):
+    step = size - overlap
+    return [(start, min(start + size, length)) for start in range(0, length, step)]
+
+
+class WindowSplitter(Splitter):
+    """Fixed-size overlapping windows returned as views."""
+
+    def split(self, document):
+        return list(self.iter_split(document))
+
+    def iter_split(self, document):
+        yield from ChunkView.from_spans(document, _windows(len(document.text), 10, 2))
+
+
+class StaticLoader(Loader):
+    def load(self, file_path):
+        return Document(text="abcdefghijklmnopqrstuvwxyz", metadata={"title": file_path})
+
+
+class CountEmbedding(EmbeddingClient):
+    def embed(self, texts):
+        return [np.array([len(t), 1.0], dtype=np.float32) for t in texts]
+
+
+@pytest.fixture
+def document():
+    return Document(
+        text="The quick brown fox jumps over the lazy dog.", metadata={"source": "a.md"}
+    )
+
+
+class TestChunkView:
+    """Test text slicing and shared metadata."""
+
+    def test_text_is_sliced_from_document(self, document):
+        """The text should be the document range."""
+        view = ChunkView(document, 4, 9, chunk_index=1)
+
+        assert view.text == "quick"
+        assert len(view) == 5
+
+    def test_metadata_includes_position_and_document_metadata(self, document):
+        """Metadata should expose the position and the document's entries."""
+        view = ChunkView(document, 4, 9, chunk_index=1)
+
+        assert dict(view.metadata) == {
+            "source": "a.md",
+            "chunk_index": 1,
+            "start_offset": 4,
+            "end_offset": 9,
+        }
+
+    def test_metadata_is_shared_not_copied(self, document):
+        """Views should reference the document's metadata dict."""
+        first, second = ChunkView.from_spans(document, [(0, 3), (4, 9)])
+
+        assert first.metadata.maps[-1] is document.metadata
+        assert second.metadata.maps[-1] is document.metadata
+
+    def test_writes_stay_on_the_chunk(self, document):
+        """Setting a chunk entry should not leak into the document or siblings."""
+        first, second = ChunkView.from_spans(document, [(0, 3), (4, 9)])
+
+        first.metadata["chunk_id"] = "a.md#0"
+        first.metadata.setdefault("source", "other")
+
+        assert first.metadata["chunk_id"] == "a.md#0"
+        assert first.metadata["source"] == "a.md"
+        assert "chunk_id" not in second.metadata
+        assert "chunk_id" not in document.metadata
+
+    def test_from_spans_numbers_chunks(self, document):
+        """Views should be numbered in span order."""
+        views = list(ChunkView.from_spans(document, [(0, 3), (4, 9), (10, 15)]))
+
+        assert [view.chunk_index for view in views] == [0, 1, 2]
+        assert [view.text for view in views] == ["The", "quick", "brown"]
+
+    def test_materialize_returns_a_chunk(self, document):
+        """A materialized view should be a standalone Chunk."""
+        view = ChunkView(document, 4, 9)
+        view.metadata["extra"] = True
+
+        chunk = view.materialize()
+
+        assert isinstance(chunk, Chunk)
+        assert chunk.text == "quick"
+        assert chunk.metadata["extra"] is True
+        assert type(chunk.metadata) is dict
+
+    def test_invalid_range_raises(self, document):
+        """An out-of-bounds range should raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid chunk range"):
+            ChunkView(document, 5, 1000)
+
+    def test_uses_slots(self, document):
+        """Views should not carry a per-instance dict."""
+        assert not hasattr(ChunkView(document, 0, 1), "__dict__")
+
+    def test_views_use_less_memory_than_chunks(self):
+        """Overlapping views should cost far less than copied chunks."""
+        document = Document(text="x" * 1_000_000, metadata={"source": "big.md"})
+        spans = _windows(len(document.text), 1000, 200)
+
+        def measure(build):
+            tracemalloc.start()
+            items = build()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(items) == len(spans)
+            return size
+
+        views = measure(lambda: list(ChunkView.from_spans(document, spans)))
+        chunks = measure(
+            lambda: [
+                Chunk(text=document.text[s:e], metadata={**document.metadata, "chunk_index": i})
+                for i, (s, e) in enumerate(spans)
+            ]
+        )
+
+        assert views * 10 < chunks
+
+
+class TestPipelineWithChunkViews:
+    """Test ingesting view chunks."""
+
+    def test_views_are_ingested(self):
+        """Views should flow through the pipeline with their offsets in the payload."""
+        store = LocalVectorStore({})
+        pipeline = IngestionPipeline(
+            StaticLoader(),
+            WindowSplitter(),
+            CountEmbedding(),
+            store,
+            config={"batch_wait_ms": 1},
+        )
+
+        stats = pipeline.run(["a.md"])
+        results = store.query(np.array([10.0, 1.0], dtype=np.float32), top_k=10)
+
+        assert stats.upserted == 4
+        payloads = {r["payload"]["id"]: r["payload"] for r in results}
+        assert payloads["a.md#1"]["text"] == "ijklmnopqr"
+        assert payloads["a.md#1"]["start_offset"] == 8
+        assert payloads["a.md#1"]["title"] == "a.md"
@@ -0,0 +1,287 @@
+"""Tests for the ingestion history."""
+
+import os
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.pipeline import (
+    Chunk,
+    Document,
+    FileState,
+    IngestionHistory,
+    IngestionPipeline,
+    Loader,
+    Splitter,
+    calculate_file_hash,
+)
+from ragmcp.pipeline import history as history_module
+from ragmcp.vector_store import LocalVectorStore
+
+
+class TextLoader(Loader):
+    """Reads files as text; counts loads."""
+
+    def __init__(self):
+        self.loaded = []
+
+    def load(self, file_path):
+        self.loaded.append(file_path)
+        with open(file_path, encoding="utf-8") as f:
+            text = f.read()
+        if text.startswith("broken"):
+            raise ValueError("cannot parse")
+        return Document(text=text, metadata={})
+
+
+class WholeSplitter(Splitter):
+    def split(self, document):
+        return [Chunk(text=document.text, metadata=dict(document.metadata))]
+
+
+class ConstantEmbedding(EmbeddingClient):
+    def embed(self, texts):
+        return [np.ones(2, dtype=np.float32) for _ in texts]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Three small files on disk."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"document number {i}", encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def count_hashes(monkeypatch):
+    """Record the files hashed by the history."""
+    hashed = []
+    original = history_module.calculate_file_hash
+
+    def counting(path, *args):
+        hashed.append(path)
+        return original(path, *args)
+
+    monkeypatch.setattr(history_module, "calculate_file_hash", counting)
+    return hashed
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestCalculateFileHash:
+    """Test content hashing."""
+
+    def test_returns_sha256_hex(self, corpus):
+        """The hash should be a 64-character hex string."""
+        digest = calculate_file_hash(corpus[0])
+
+        assert len(digest) == 64
+        int(digest, 16)
+
+    def test_same_content_same_hash(self, tmp_path):
+        """Files with equal content should hash equally whatever their names."""
+        (tmp_path / "a.txt").write_bytes(b"same")
+        (tmp_path / "b.txt").write_bytes(b"same")
+
+        assert calculate_file_hash(str(tmp_path / "a.txt")) == calculate_file_hash(
+            str(tmp_path / "b.txt")
+        )
+
+    def test_mmap_and_buffered_reads_agree(self, tmp_path):
+        """Hashing through mmap should match small buffered reads."""
+        path = tmp_path / "big.bin"
+        path.write_bytes(np.random.default_rng(0).bytes(100_000))
+
+        mapped = calculate_file_hash(str(path), mmap_threshold=1)
+        buffered = calculate_file_hash(str(path), buffer_size=4096, mmap_threshold=1 << 30)
+
+        assert mapped == buffered
+
+
+class TestIngestionHistory:
+    """Test records and change detection."""
+
+    def test_should_skip(self):
+        """Only hashes recorded as successful should be skipped."""
+        history = IngestionHistory()
+        history.record(FileState("a.md", 1, 1, "aa"))
+        history.record(FileState("b.md", 1, 1, "bb"), "failed", "boom")
+
+        assert history.should_skip("aa")
+        assert not history.should_skip("bb")
+        assert not history.should_skip("cc")
+        assert history.get("b.md")["error"] == "boom"
+
+    def test_new_files_are_changed_and_hashed(self, corpus, count_hashes):
+        """Unrecorded files should be hashed and reported as changed."""
+        result = IngestionHistory().scan(corpus)
+
+        assert [state.path for state in result.changed] == corpus
+        assert all(len(state.sha256) == 64 for state in result.changed)
+        assert sorted(count_hashes) == sorted(corpus)
+
+    def test_unchanged_stat_skips_hashing(self, corpus, count_hashes):
+        """Files with their recorded size and mtime should not be read."""
+        history = IngestionHistory()
+        history.record_many(history.scan(corpus).changed)
+        count_hashes.clear()
+
+        result = history.scan(corpus)
+
+        assert result.changed == []
+        assert result.unchanged == corpus
+        assert count_hashes == []
+
+    def test_touched_file_is_rehashed_once(self, corpus, count_hashes):
+        """A new mtime with the same content should be unchanged and remembered."""
+        history = IngestionHistory()
+        history.record_many(history.scan(corpus).changed)
+        _bump_mtime(corpus[0])
+        count_hashes.clear()
+
+        assert sorted(history.scan(corpus).unchanged) == corpus
+        assert count_hashes == [corpus[0]]
+
+        count_hashes.clear()
+        history.scan(corpus)
+        assert count_hashes == []
+
+    def test_modified_file_is_changed(self, corpus):
+        """New content should be reported as changed."""
+        history = IngestionHistory()
+        history.record_many(history.scan(corpus).changed)
+        with open(corpus[1], "a", encoding="utf-8") as f:
+            f.write(" edited")
+
+        result = history.scan(corpus)
+
+        assert [state.path for state in result.changed] == [corpus[1]]
+
+    def test_copy_is_recorded_as_duplicate(self, corpus, tmp_path):
+        """A new path with already ingested content should be skipped."""
+        history = IngestionHistory()
+        history.record_many(history.scan(corpus).changed)
+        copy = tmp_path / "copy.md"
+        copy.write_bytes(open(corpus[0], "rb").read())
+
+        result = history.scan([str(copy)])
+
+        assert result.unchanged == [str(copy)]
+        assert history.get(str(copy))["status"] == "duplicate"
+
+    def test_missing_files_are_reported(self, tmp_path):
+        """Files that cannot be stat-ed should be listed as missing."""
+        result = IngestionHistory().scan([str(tmp_path / "nope.md")])
+
+        assert [path for path, _ in result.missing] == [str(tmp_path / "nope.md")]
+
+    def test_database_is_persistent_and_uses_wal(self, corpus, tmp_path):
+        """Records should survive reopening a WAL-mode database file."""
+        path = tmp_path / "db" / "history.db"
+        history = IngestionHistory({"path": str(path), "hash_workers": 2})
+        history.record_many(history.scan(corpus).changed)
+        assert history.journal_mode == "wal"
+        history.close()
+
+        reopened = IngestionHistory({"path": str(path)})
+
+        assert len(reopened) == 3
+        assert reopened.scan(corpus).unchanged == corpus
+
+    def test_invalid_config_raises(self):
+        """A non-positive hash_workers should raise ValueError."""
+        with pytest.raises(ValueError, match="hash_workers"):
+            IngestionHistory({"hash_workers": 0})
+
+
+class TestPipelineWithHistory:
+    """Test skipping ingested files in the pipeline."""
+
+    def _pipeline(self, loader, history):
+        return IngestionPipeline(
+            loader,
+            WholeSplitter(),
+            ConstantEmbedding(),
+            LocalVectorStore({}),
+            config={"batch_wait_ms": 1},
+            history=history,
+        )
+
+    def test_second_run_skips_unchanged_files(self, corpus):
+        """A rerun over the same files should load nothing."""
+        history = IngestionHistory()
+        loader = TextLoader()
+        first = self._pipeline(loader, history).run(corpus)
+        loader.loaded.clear()
+
+        second = self._pipeline(loader, history).run(corpus)
+
+        assert (first.documents, first.skipped) == (3, 0)
+        assert (second.documents, second.skipped) == (0, 3)
+        assert loader.loaded == []
+
+    def test_failed_files_are_retried(self, corpus):
+        """A file that failed should be recorded as failed and loaded again."""
+        with open(corpus[2], "w", encoding="utf-8") as f:
+            f.write("broken file")
+        history = IngestionHistory()
+        loader = TextLoader()
+        self._pipeline(loader, history).run(corpus)
+        loader.loaded.clear()
+
+        stats = self._pipeline(loader, history).run(corpus)
+
+        assert history.get(corpus[2])["status"] == "failed"
+        assert loader.loaded == [corpus[2]]
+        assert stats.skipped == 2
+
+    def test_failures_are_keyed_by_scanned_path(self, corpus):
+        """A chunk failure should mark the file failed when the loader renames its source."""
+
+        class RenamingLoader(TextLoader):
+            def load(self, file_path):
+                document = super().load(file_path)
+                document.metadata["source"] = os.path.basename(file_path)
+                return document
+
+        class FailingSplitter(WholeSplitter):
+            def split(self, document):
+                if document.metadata["source"] == "doc1.md":
+                    raise ValueError("cannot split")
+                return super().split(document)
+
+        history = IngestionHistory()
+        pipeline = IngestionPipeline(
+            RenamingLoader(),
+            FailingSplitter(),
+            ConstantEmbedding(),
+            LocalVectorStore({}),
+            config={"batch_wait_ms": 1},
+            history=history,
+        )
+
+        pipeline.run(corpus)
+
+        assert history.get(corpus[1])["status"] == "failed"
+        assert history.get(corpus[0])["status"] != "failed"
+
+    def test_history_from_config(self, tmp_path):
+        """The history config section should create the database."""
+        path = tmp_path / "history.db"
+        pipeline = IngestionPipeline(
+            TextLoader(),
+            WholeSplitter(),
+            ConstantEmbedding(),
+            LocalVectorStore({}),
+            config={"history": {"enabled": True, "path": str(path)}},
+        )
+
+        assert pipeline.history is not None
+        assert path.exists()
@@ -0,0 +1,263 @@
+"""Tests for the streaming ingestion pipeline."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.pipeline import Chunk, Document, IngestionPipeline, Loader, Splitter, Transform
+from ragmcp.retrieval import BM25Retriever
+from ragmcp.vector_store import LocalVectorStore
+
+
+class DictLoader(Loader):
+    """Loads documents from an in-memory mapping of path to text."""
+
+    def __init__(self, files):
+        self.files = files
+
+    def load(self, file_path):
+        if file_path not in self.files:
+            raise FileNotFoundError(file_path)
+        return Document(text=self.files[file_path], metadata={})
+
+
+class SentenceSplitter(Splitter):
+    """Splits on periods, yielding chunks lazily."""
+
+    def split(self, document):
+        return list(self.iter_split(document))
+
+    def iter_split(self, document):
+        for sentence in document.text.split("."):
+            if sentence.strip():
+                yield Chunk(text=sentence.strip(), metadata=dict(document.metadata))
+
+
+class UpperTransform(Transform):
+    def transform(self, chunk):
+        return Chunk(text=chunk.text.upper(), metadata=chunk.metadata)
+
+
+class LengthEmbedding(EmbeddingClient):
+    """Embeds text by its length; records batch sizes."""
+
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def embed(self, texts):
+        with self.lock:
+            self.batches.append(len(texts))
+        if self.delay:
+            threading.Event().wait(self.delay)
+        return [np.array([len(t), 1.0], dtype=np.float32) for t in texts]
+
+
+class RecordingStore(LocalVectorStore):
+    """Local store recording upsert batch sizes."""
+
+    def __init__(self):
+        super().__init__({})
+        self.batches = []
+
+    def upsert(self, vectors, payloads):
+        self.batches.append(len(payloads))
+        return super().upsert(vectors, payloads)
+
+
+CONFIG = {"queue_size": 4, "embed_batch_size": 3, "upsert_batch_size": 5, "batch_wait_ms": 5}
+
+
+class TestIngestionPipeline:
+    """Test wiring, batching, error handling and backpressure."""
+
+    def test_ingests_chunks_end_to_end(self):
+        """Every chunk should be transformed, embedded and upserted with its payload."""
+        files = {"a.md": "First. Second. Third.", "b.md": "Only one."}
+        store = RecordingStore()
+        embedder = LengthEmbedding()
+        pipeline = IngestionPipeline(
+            DictLoader(files), SentenceSplitter(), embedder, store, [UpperTransform()], CONFIG
+        )
+
+        stats = pipeline.run(iter(files))
+
+        assert (stats.documents, stats.chunks, stats.upserted) == (2, 4, 4)
+        assert stats.failed == []
+        assert len(store) == 4
+        result = store.query(np.array([6.0, 1.0]), 1)[0]
+        assert result["payload"]["text"] == "SECOND"
+        assert result["payload"]["source"] == "a.md"
+        assert result["id"] == "a.md#1"
+        assert max(embedder.batches) <= 3
+        assert max(store.batches) <= 5 + 2
+
+    def test_reingesting_replaces_chunks(self):
+        """Chunk ids derived from the source should make re-runs idempotent."""
+        files = {"a.md": "One. Two."}
+        store = LocalVectorStore({})
+        pipeline = IngestionPipeline(
+            DictLoader(files), SentenceSplitter(), LengthEmbedding(), store, config=CONFIG
+        )
+
+        pipeline.run(["a.md"])
+        pipeline.run(["a.md"])
+
+        assert len(store) == 2
+
+    def test_reingesting_a_shorter_file_drops_stale_chunks(self):
+        """Chunks past the new end of a re-ingested file should be deleted."""
+        files = {"a.md": "One. Two. Three.", "b.md": "Other."}
+        store = LocalVectorStore({"indexed_fields": ["source"]})
+        pipeline = IngestionPipeline(
+            DictLoader(files), SentenceSplitter(), LengthEmbedding(), store, config=CONFIG
+        )
+        pipeline.run(["a.md", "b.md"])
+
+        files["a.md"] = "Uno."
+        pipeline.run(["a.md"])
+
+        texts = sorted(r["payload"]["text"] for r in store.query(np.array([1.0, 1.0]), 10))
+        assert texts == ["Other", "Uno"]
+
+    def test_reingesting_replaces_chunks_in_sparse_retriever(self):
+        """The keyword index should drop a re-ingested file's stale chunks too."""
+        files = {"a.md": "Alpha one. Alpha two. Alpha three.", "b.md": "Alpha other."}
+        sparse = BM25Retriever()
+        pipeline = IngestionPipeline(
+            DictLoader(files),
+            SentenceSplitter(),
+            LengthEmbedding(),
+            LocalVectorStore({}),
+            config=CONFIG,
+            sparse_retriever=sparse,
+        )
+        pipeline.run(["a.md", "b.md"])
+
+        files["a.md"] = "Alpha uno."
+        pipeline.run(["a.md"])
+
+        assert len(sparse) == 2
+        texts = sorted(r.chunk.text for r in sparse.search("alpha", top_k=10))
+        assert texts == ["Alpha other", "Alpha uno"]
+
+    def test_failing_files_are_skipped(self):
+        """A file that cannot be loaded should be recorded and skipped."""
+        files = {"good.md": "Fine."}
+        pipeline = IngestionPipeline(
+            DictLoader(files),
+            SentenceSplitter(),
+            LengthEmbedding(),
+            LocalVectorStore({}),
+            config=CONFIG,
+        )
+
+        stats = pipeline.run(["missing.md", "good.md"])
+
+        assert stats.upserted == 1
+        assert stats.failed[0][0] == "missing.md"
+
+    def test_embedding_errors_stop_the_run(self):
+        """An embedding failure should abort every stage and be re-raised."""
+
+        class FailingEmbedding(EmbeddingClient):
+            def embed(self, texts):
+                raise RuntimeError("provider down")
+
+        files = {f"{i}.md": "A. B. C." for i in range(1000)}
+        pipeline = IngestionPipeline(
+            DictLoader(files),
+            SentenceSplitter(),
+            FailingEmbedding(),
+            LocalVectorStore({}),
+            config=CONFIG,
+        )
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            pipeline.run(iter(files))
+
+    def test_paths_are_consumed_with_backpressure(self):
+        """A slow embedder should bound how far ahead the loader reads."""
+        files = {f"{i}.md": f"Alpha {i}. Beta {i}." for i in range(300)}
+        consumed = []
+        store = RecordingStore()
+
+        def paths():
+            for path in files:
+                consumed.append(path)
+                yield path
+
+        lead = []
+        embedder = LengthEmbedding(delay=0.002)
+        original = embedder.embed
+
+        def embed(texts):
+            lead.append(len(consumed) * 2 - sum(embedder.batches))
+            return original(texts)
+
+        embedder.embed = embed
+        pipeline = IngestionPipeline(
+            DictLoader(files), SentenceSplitter(), embedder, store, config=CONFIG
+        )
+
+        stats = pipeline.run(paths())
+
+        assert stats.upserted == 600
+        # Queues of 4 items between five stages plus in-flight work bound the lead.
+        assert max(lead) < 80
+
+    def test_invalid_config_raises(self):
+        """Non-positive sizes should raise ValueError."""
+        with pytest.raises(ValueError, match="embed_batch_size"):
+            IngestionPipeline(
+                DictLoader({}),
+                SentenceSplitter(),
+                LengthEmbedding(),
+                LocalVectorStore({}),
+                config={"embed_batch_size": 0},
+            )
+
+
+class TestSplitterIterSplit:
+    """Test the default Splitter.iter_split."""
+
+    def test_default_iterates_over_split(self):
+        """Splitters implementing only split() should still stream."""
+
+        class ListSplitter(Splitter):
+            def split(self, document):
+                return [Chunk(text=document.text, metadata={})]
+
+        chunks = list(ListSplitter().iter_split(Document(text="x", metadata={})))
+
+        assert [c.text for c in chunks] == ["x"]
+
+
+class PicklableLoader(Loader):
+    """Module-level loader usable in worker processes."""
+
+    def load(self, file_path):
+        return Document(text="First sentence. Second sentence.", metadata={})
+
+
+class TestIngestionWithProcessWorkers:
+    """Test loading through a ParallelLoader inside the pipeline."""
+
+    def test_process_workers_feed_the_pipeline(self):
+        """Documents loaded in worker processes should be ingested."""
+        store = LocalVectorStore({})
+        pipeline = IngestionPipeline(
+            PicklableLoader(),
+            SentenceSplitter(),
+            LengthEmbedding(),
+            store,
+            config={**CONFIG, "process_workers": 2},
+        )
+
+        stats = pipeline.run(f"{i}.md" for i in range(5))
+
+        assert (stats.documents, stats.upserted) == (5, 10)
+        assert len(store) == 10
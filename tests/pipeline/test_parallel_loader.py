@@ -0,0 +1,115 @@
+"""Tests for process-pool document loading."""
+
+import os
+import time
+
+import pytest
+
+from ragmcp.pipeline import Document, Loader, PagedLoader, ParallelLoader, WorkerCrashedError
+
+
+class NameLoader(Loader):
+    """Loader whose behaviour depends on the file name."""
+
+    def load(self, file_path):
+        if file_path.startswith("crash"):
+            os._exit(1)
+        if file_path.startswith("slow"):
+            time.sleep(30)
+        if file_path.startswith("bad"):
+            raise ValueError(f"malformed {file_path}")
+        return Document(text=f"text of {file_path}", metadata={"pid": os.getpid()})
+
+
+class PageLoader(PagedLoader):
+    """Paged loader producing one line per page."""
+
+    def page_count(self, file_path):
+        return 10
+
+    def load_pages(self, file_path, start, end):
+        return Document(
+            text="\n".join(f"page {page}" for page in range(start, end)),
+            metadata={"title": file_path},
+        )
+
+
+def _load_all(loader, paths, **config):
+    errors = []
+    documents = list(
+        ParallelLoader(loader, {"max_workers": 2, **config}).iter_load(
+            paths, on_error=lambda path, error: errors.append((path, error))
+        )
+    )
+    return documents, errors
+
+
+class TestParallelLoader:
+    """Test fan-out, isolation and page splitting."""
+
+    def test_loads_every_file_in_worker_processes(self):
+        """Every file should be loaded outside the calling process."""
+        paths = [f"doc{i}.pdf" for i in range(6)]
+
+        documents, errors = _load_all(NameLoader(), iter(paths))
+
+        assert errors == []
+        assert sorted(d.metadata["source"] for d in documents) == sorted(paths)
+        assert all(d.metadata["pid"] != os.getpid() for d in documents)
+
+    def test_errors_are_reported_and_skipped(self):
+        """A file raising an error should not affect the others."""
+        documents, errors = _load_all(NameLoader(), ["a.pdf", "bad.pdf", "b.pdf"])
+
+        assert sorted(d.metadata["source"] for d in documents) == ["a.pdf", "b.pdf"]
+        assert errors[0][0] == "bad.pdf"
+        assert isinstance(errors[0][1], ValueError)
+
+    def test_slow_files_time_out(self):
+        """A file exceeding the timeout should be stopped and reported."""
+        started = time.monotonic()
+
+        documents, errors = _load_all(
+            NameLoader(), ["slow.pdf", "a.pdf", "b.pdf", "c.pdf"], timeout=1.0
+        )
+
+        assert time.monotonic() - started < 15
+        assert sorted(d.metadata["source"] for d in documents) == ["a.pdf", "b.pdf", "c.pdf"]
+        assert [path for path, _ in errors] == ["slow.pdf"]
+        assert isinstance(errors[0][1], TimeoutError)
+
+    def test_worker_crash_only_fails_the_culprit(self):
+        """A file killing its worker should be isolated from the files beside it."""
+        paths = ["a.pdf", "crash.pdf", "b.pdf", "c.pdf", "d.pdf"]
+
+        documents, errors = _load_all(NameLoader(), paths)
+
+        assert sorted(d.metadata["source"] for d in documents) == [
+            "a.pdf",
+            "b.pdf",
+            "c.pdf",
+            "d.pdf",
+        ]
+        assert [path for path, _ in errors] == ["crash.pdf"]
+        assert isinstance(errors[0][1], WorkerCrashedError)
+
+    def test_large_paged_files_are_split_and_joined(self):
+        """Page ranges should be loaded in parallel and joined in page order."""
+        documents, errors = _load_all(
+            PageLoader(), ["big.pdf"], split_pages_over=4, pages_per_task=3
+        )
+
+        assert errors == []
+        assert len(documents) == 1
+        assert documents[0].text.split("\n\n") == [
+            "page 0\npage 1\npage 2",
+            "page 3\npage 4\npage 5",
+            "page 6\npage 7\npage 8",
+            "page 9",
+        ]
+        assert documents[0].metadata == {"title": "big.pdf", "source": "big.pdf"}
+
+    def test_invalid_config_raises(self):
+        """A non-positive timeout should raise ValueError."""
+        with pytest.raises(ValueError, match="timeout"):
+            ParallelLoader(NameLoader(), {"timeout": 0})
@@ -65,3 +65,19 @@ class TestRankedChunk:
         assert ranked.chunk == chunk_dict
         assert ranked.chunk["source"] == "doc.pdf"
         assert ranked.score == 0.85
+
+
+class TestRerankerAsync:
+    """Test the async rerank interface."""
+
+    async def test_arerank_defaults_to_rerank(self):
+        """arerank() should return the result of rerank() with the same arguments."""
+
+        class LengthReranker(Reranker):
+            def rerank(self, query, chunks, top_k=None):
+                ranked = sorted(chunks, key=len, reverse=True)
+                return [RankedChunk(chunk=c, score=float(len(c))) for c in ranked][:top_k]
+
+        results = await LengthReranker().arerank("q", ["a", "ccc", "bb"], top_k=2)
+
+        assert [r.chunk for r in results] == ["ccc", "bb"]
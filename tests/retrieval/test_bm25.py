@@ -0,0 +1,195 @@
+"""Tests for the BM25 sparse retriever."""
+
+import math
+
+import numpy as np
+import pytest
+
+from ragmcp.pipeline.base import Chunk
+from ragmcp.rerank.base import RankedChunk
+from ragmcp.retrieval import BM25Retriever, SparseRetriever, tokenize
+from ragmcp.retrieval.bm25 import BLOCK_SIZE, PostingList
+
+
+def _brute_force(texts, query, k1=1.2, b=0.75):
+    docs = [tokenize(text) for text in texts]
+    average = sum(len(d) for d in docs) / len(docs)
+    terms = list(dict.fromkeys(tokenize(query)))
+    idf = {}
+    for term in terms:
+        df = sum(term in d for d in docs)
+        idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in terms:
+            tf = doc.count(term)
+            score += idf[term] * (k1 + 1) * tf / (tf + k1 * (1 - b + b * len(doc) / average))
+        scores.append(score)
+    return scores
+
+
+class TestTokenize:
+    """Test the CJK/Latin tokenizer."""
+
+    def test_latin_words_are_casefolded(self):
+        """Latin text should split into lowercase alphanumeric words."""
+        assert tokenize("Hello, World! RAG_v2 ＡＢＣ") == ["hello", "world", "rag", "v2", "abc"]
+
+    def test_cjk_runs_become_bigrams(self):
+        """CJK runs should produce overlapping bigrams; single chars stay unigrams."""
+        assert tokenize("检索增强 A 库") == ["检索", "索增", "增强", "a", "库"]
+        assert tokenize("RAG检索") == ["rag", "检索"]
+
+
+class TestPostingList:
+    """Test delta-encoded postings."""
+
+    def test_decode_and_lookup_across_blocks(self):
+        """lookup() should find frequencies using only the needed blocks."""
+        postings = PostingList()
+        docs = list(range(0, 3 * BLOCK_SIZE * 5, 5))
+        for doc in docs:
+            postings.append(doc, doc % 7 + 1)
+
+        decoded, tfs = postings.decode()
+        probe = np.array([0, 5, 6, 640, 1915, 5000])
+
+        assert decoded.tolist() == docs
+        assert tfs.tolist() == [doc % 7 + 1 for doc in docs]
+        assert postings.lookup(probe).tolist() == [1, 6, 0, 4, 5, 0]
+
+    def test_arrays_widen_for_large_values(self):
+        """Gaps and frequencies that overflow a byte should widen the array."""
+        postings = PostingList()
+        postings.append(3, 1)
+        postings.append(70000, 300)
+
+        assert postings.deltas.typecode == "I"
+        assert postings.tfs.typecode == "H"
+        assert postings.decode()[0].tolist() == [3, 70000]
+
+
+class TestBM25Retriever:
+    """Test BM25 indexing and search."""
+
+    TEXTS = [
+        "Retrieval augmented generation combines search and generation.",
+        "BM25 is a ranking function used by search engines.",
+        "Dense retrieval uses embeddings; sparse retrieval uses BM25.",
+        "检索增强生成结合了检索和生成。",
+        "向量检索使用嵌入，稀疏检索使用BM25。",
+        "Completely unrelated text about cooking pasta.",
+    ]
+
+    def _retriever(self):
+        retriever = BM25Retriever()
+        retriever.add([Chunk(text=t, metadata={"i": i}) for i, t in enumerate(self.TEXTS)])
+        return retriever
+
+    def test_is_sparse_retriever(self):
+        """BM25Retriever should implement the SparseRetriever interface."""
+        assert isinstance(BM25Retriever(), SparseRetriever)
+
+    @pytest.mark.parametrize("query", ["BM25 search", "sparse retrieval", "检索生成", "pasta"])
+    def test_scores_match_reference_formula(self, query):
+        """Scores and ranking should equal a direct BM25 computation."""
+        retriever = self._retriever()
+        expected = _brute_force(self.TEXTS, query)
+
+        results = retriever.search(query, top_k=3)
+
+        assert all(isinstance(r, RankedChunk) for r in results)
+        ranked = sorted(range(len(expected)), key=lambda i: -expected[i])
+        assert [r.chunk.metadata["i"] for r in results] == [i for i in ranked if expected[i] > 0][
+            :3
+        ]
+        for result in results:
+            assert result.score == pytest.approx(expected[result.chunk.metadata["i"]], rel=1e-5)
+
+    def test_no_matching_terms_returns_empty(self):
+        """Queries without indexed terms should return nothing."""
+        retriever = self._retriever()
+
+        assert retriever.search("quantum chromodynamics", top_k=5) == []
+        assert retriever.search("BM25", top_k=0) == []
+        assert BM25Retriever().search("BM25", top_k=5) == []
+
+    def test_max_score_matches_exhaustive_ranking(self):
+        """Early termination should not change the top-k on a large corpus."""
+        rng = np.random.default_rng(0)
+        vocabulary = [f"w{i}" for i in range(300)]
+        weights = 1.0 / np.arange(1, 301)
+        weights /= weights.sum()
+        texts = [" ".join(rng.choice(vocabulary, size=20, p=weights)) for _ in range(3000)]
+        retriever = BM25Retriever()
+        retriever.add([Chunk(text=t, metadata={"i": i}) for i, t in enumerate(texts)])
+
+        for query in ["w0 w1 w250", "w3 w40 w41 w299", "w7"]:
+            expected = np.sort(_brute_force(texts, query))[::-1][:10]
+            scores = [r.score for r in retriever.search(query, top_k=10)]
+            np.testing.assert_allclose(scores, expected, rtol=1e-5)
+
+    def test_incremental_add_updates_statistics(self):
+        """Adding chunks later should update idf and length norms."""
+        retriever = BM25Retriever()
+        retriever.add([Chunk(text="alpha beta", metadata={})])
+        first = retriever.search("alpha", top_k=1)[0].score
+        retriever.add([Chunk(text="alpha gamma delta", metadata={})])
+
+        assert len(retriever) == 2
+        assert retriever.search("alpha", top_k=1)[0].score < first
+
+    def test_delete_purges_chunks_from_scores(self):
+        """Deleted chunks should vanish and scores should match the remaining corpus."""
+        retriever = BM25Retriever()
+        retriever.add(
+            [
+                Chunk(text=t, metadata={"i": i, "chunk_id": f"c{i}"})
+                for i, t in enumerate(self.TEXTS)
+            ]
+        )
+
+        assert retriever.delete(["c1", "c2", "missing"]) == 2
+        assert len(retriever) == len(self.TEXTS) - 2
+
+        remaining = [t for i, t in enumerate(self.TEXTS) if i not in (1, 2)]
+        expected = sorted(_brute_force(remaining, "BM25 search retrieval"), reverse=True)
+        results = retriever.search("BM25 search retrieval", top_k=10)
+        assert all(r.chunk.metadata["i"] not in (1, 2) for r in results)
+        np.testing.assert_allclose(
+            [r.score for r in results], [e for e in expected if e > 0], rtol=1e-5
+        )
+
+    def test_adding_an_existing_chunk_id_replaces_it(self):
+        """Re-adding a chunk id should keep only the latest text."""
+        retriever = BM25Retriever()
+        retriever.add([Chunk(text="alpha beta", metadata={"chunk_id": "a#0"})])
+        retriever.add([Chunk(text="gamma", metadata={"chunk_id": "a#0"})])
+
+        assert len(retriever) == 1
+        assert retriever.search("alpha", top_k=5) == []
+        assert [r.chunk.text for r in retriever.search("gamma", top_k=5)] == ["gamma"]
+
+    def test_delete_by_filter_matches_metadata(self):
+        """delete_by_filter() should remove every chunk of a source."""
+        retriever = BM25Retriever()
+        retriever.add(
+            [
+                Chunk(text="alpha", metadata={"source": "a.md", "chunk_id": "a.md#0"}),
+                Chunk(text="alpha beta", metadata={"source": "a.md", "chunk_id": "a.md#1"}),
+                Chunk(text="alpha gamma", metadata={"source": "b.md", "chunk_id": "b.md#0"}),
+            ]
+        )
+
+        assert retriever.delete_by_filter({"source": "a.md"}) == 2
+        assert [r.chunk.metadata["source"] for r in retriever.search("alpha", top_k=5)] == ["b.md"]
+        with pytest.raises(ValueError, match="non-empty"):
+            retriever.delete_by_filter({})
+
+    def test_invalid_parameters_raise_error(self):
+        """Out-of-range k1 or b should raise ValueError."""
+        with pytest.raises(ValueError, match="k1"):
+            BM25Retriever({"k1": 0})
+        with pytest.raises(ValueError, match="b must"):
+            BM25Retriever({"b": 1.5})
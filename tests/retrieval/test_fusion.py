@@ -0,0 +1,62 @@
+"""Tests for rank fusion."""
+
+import pytest
+
+from ragmcp.rerank.base import RankedChunk
+from ragmcp.retrieval import reciprocal_rank_fusion, weighted_sum_fusion
+
+
+def _ranking(*pairs):
+    return [RankedChunk(chunk=chunk, score=score) for chunk, score in pairs]
+
+
+def _key(chunk):
+    return chunk
+
+
+class TestReciprocalRankFusion:
+    """Test reciprocal rank fusion."""
+
+    def test_chunks_in_both_rankings_rise_to_the_top(self):
+        """Scores should be summed 1 / (k + rank) contributions."""
+        dense = _ranking(("a", 0.9), ("b", 0.8), ("c", 0.1))
+        sparse = _ranking(("c", 12.0), ("d", 3.0), ("b", 1.0))
+
+        fused = reciprocal_rank_fusion([dense, sparse], _key, k=60)
+
+        assert [r.chunk for r in fused] == ["c", "b", "a", "d"]
+        assert fused[0].score == pytest.approx(1 / 63 + 1 / 61)
+
+    def test_weights_scale_route_contributions(self):
+        """A heavier route should win ties in rank."""
+        fused = reciprocal_rank_fusion(
+            [_ranking(("a", 1.0)), _ranking(("b", 1.0))], _key, weights=[1.0, 2.0]
+        )
+
+        assert [r.chunk for r in fused] == ["b", "a"]
+
+    def test_weight_count_must_match(self):
+        """A weight list of the wrong length should raise ValueError."""
+        with pytest.raises(ValueError, match="weights"):
+            reciprocal_rank_fusion([_ranking(("a", 1.0))], _key, weights=[1.0, 1.0])
+
+
+class TestWeightedSumFusion:
+    """Test weighted-sum fusion of normalized scores."""
+
+    def test_scores_are_min_max_normalized_per_route(self):
+        """Routes with different score scales should contribute comparably."""
+        dense = _ranking(("a", 0.9), ("b", 0.7), ("c", 0.5))
+        sparse = _ranking(("c", 20.0), ("b", 15.0), ("a", 0.0))
+
+        fused = weighted_sum_fusion([dense, sparse], _key, weights=[0.5, 0.5])
+
+        scores = {r.chunk: r.score for r in fused}
+        assert scores == pytest.approx({"a": 0.5, "b": 0.625, "c": 0.5})
+        assert fused[0].chunk == "b"
+
+    def test_equal_scores_normalize_to_one(self):
+        """A single result or constant scores should map to 1.0."""
+        fused = weighted_sum_fusion([_ranking(("a", 3.0)), []], _key)
+
+        assert fused == [RankedChunk(chunk="a", score=1.0)]
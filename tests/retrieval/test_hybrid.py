@@ -0,0 +1,194 @@
+"""Tests for HybridRetriever."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding.base import EmbeddingClient
+from ragmcp.factory.reranker_factory import RerankerFactory
+from ragmcp.pipeline.base import Chunk
+from ragmcp.rerank.base import RankedChunk, Reranker
+from ragmcp.retrieval import BM25Retriever, HybridRetriever
+from ragmcp.vector_store import LocalVectorStore
+
+TEXTS = [
+    "BM25 ranks documents by keyword overlap.",
+    "Dense embeddings capture semantic similarity.",
+    "Reciprocal rank fusion merges ranked lists.",
+    "Cooking pasta requires boiling water.",
+]
+
+
+class KeywordEmbedding(EmbeddingClient):
+    """Embeds text as normalized counts of a few marker words."""
+
+    WORDS = ["bm25", "dense", "fusion", "pasta"]
+
+    def embed(self, texts):
+        vectors = []
+        for text in texts:
+            lowered = text.lower()
+            vector = np.array([lowered.count(w) for w in self.WORDS], dtype=np.float32) + 0.01
+            vectors.append(vector / np.linalg.norm(vector))
+        return vectors
+
+
+class BlockingRetriever(BM25Retriever):
+    """BM25 retriever whose search blocks until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def search(self, query, top_k):
+        self.release.wait(5)
+        return super().search(query, top_k)
+
+
+def _routes(sparse=None):
+    chunks = [Chunk(text=t, metadata={"chunk_id": i}) for i, t in enumerate(TEXTS)]
+    embedding = KeywordEmbedding()
+    store = LocalVectorStore({})
+    store.insert(embedding.embed(TEXTS), [{"text": c.text, **c.metadata} for c in chunks])
+    if sparse is None:
+        sparse = BM25Retriever()
+    sparse.add(chunks)
+    return embedding, store, sparse
+
+
+class TestHybridRetriever:
+    """Test parallel routes, fusion and reranking."""
+
+    def test_fuses_dense_and_sparse_results_by_chunk_id(self):
+        """A chunk found by both routes should appear once, ranked first."""
+        retriever = HybridRetriever({"top_k": 3}, *_routes())
+
+        results = retriever.search("BM25 keyword")
+        retriever.close()
+
+        ids = [r.chunk.metadata["chunk_id"] for r in results]
+        assert ids[0] == 0
+        assert len(ids) == len(set(ids)) == 3
+        assert results[0].chunk.text == TEXTS[0]
+
+    def test_weighted_sum_fusion(self):
+        """weighted_sum should fuse normalized route scores."""
+        retriever = HybridRetriever({"fusion_algorithm": "weighted_sum", "top_k": 2}, *_routes())
+
+        results = retriever.search("fusion")
+        retriever.close()
+
+        assert results[0].chunk.metadata["chunk_id"] == 2
+        assert results[0].score == pytest.approx(2.0)
+
+    def test_slow_route_degrades_to_single_route(self):
+        """A route exceeding its timeout should be dropped from fusion."""
+        sparse = BlockingRetriever()
+        retriever = HybridRetriever({"sparse_timeout": 0.05}, *_routes(sparse))
+
+        results = retriever.search("pasta")
+        sparse.release.set()
+        retriever.close()
+
+        assert results[0].chunk.metadata["chunk_id"] == 3
+        assert results[0].score == pytest.approx(1 / 61)
+
+    def test_stuck_route_does_not_starve_later_queries(self):
+        """Abandoned calls should saturate only their own route's pool."""
+        sparse = BlockingRetriever()
+        retriever = HybridRetriever(
+            {"sparse_timeout": 0.05, "dense_timeout": 1.0, "max_workers": 2}, *_routes(sparse)
+        )
+
+        for _ in range(5):
+            started = time.monotonic()
+            results = retriever.search("pasta")
+            assert time.monotonic() - started < 0.5
+            assert results[0].chunk.metadata["chunk_id"] == 3
+        assert retriever._executors["sparse"]._work_queue.qsize() == 0
+        sparse.release.set()
+        retriever.close()
+
+    def test_failing_route_is_skipped_and_all_failures_raise(self):
+        """A failing route should be skipped; if every route fails the error surfaces."""
+
+        class BrokenRetriever(BM25Retriever):
+            def search(self, query, top_k):
+                raise ConnectionError("index unavailable")
+
+        embedding, store, _ = _routes()
+        hybrid = HybridRetriever({}, embedding, store, BrokenRetriever())
+        assert hybrid.search("dense")[0].chunk.metadata["chunk_id"] == 1
+        hybrid.close()
+
+        sparse_only = HybridRetriever({}, sparse_retriever=BrokenRetriever())
+        with pytest.raises(ConnectionError, match="unavailable"):
+            sparse_only.search("dense")
+        sparse_only.close()
+
+    def test_candidates_are_handed_to_the_reranker(self, monkeypatch):
+        """Fused candidates should be reranked by the configured backend."""
+        seen = {}
+
+        class ReverseReranker(Reranker):
+            def rerank(self, query, chunks, top_k=None):
+                seen["chunks"] = chunks
+                return [RankedChunk(chunk=c, score=float(i)) for i, c in enumerate(chunks)][::-1][
+                    :top_k
+                ]
+
+        def get_reranker(config):
+            seen["config"] = config
+            return ReverseReranker()
+
+        monkeypatch.setattr(RerankerFactory, "get_reranker", staticmethod(get_reranker))
+        retriever = HybridRetriever(
+            {"top_k": 4, "rerank_backend": "cross_encoder", "rerank_top_k": 2}, *_routes()
+        )
+
+        results = retriever.search("BM25")
+        retriever.close()
+
+        assert seen["config"]["backend"] == "cross_encoder"
+        assert len(seen["chunks"]) == 4
+        assert [r.chunk for r in results] == seen["chunks"][::-1][:2]
+
+    def test_invalid_configuration_raises_error(self):
+        """Missing routes or an unknown fusion algorithm should raise ValueError."""
+        embedding, store, sparse = _routes()
+
+        with pytest.raises(ValueError, match="dense or a sparse route"):
+            HybridRetriever({})
+        with pytest.raises(ValueError, match="both embedding_client and vector_store"):
+            HybridRetriever({}, embedding_client=embedding, sparse_retriever=sparse)
+        with pytest.raises(ValueError, match="fusion_algorithm"):
+            HybridRetriever({"fusion_algorithm": "max"}, sparse_retriever=sparse)
+
+    def test_single_flight_shares_identical_concurrent_searches(self):
+        """Concurrent searches differing only in spacing should run once."""
+        sparse = BlockingRetriever()
+        calls = []
+        search = sparse.search
+        sparse.search = lambda query, top_k: calls.append(query) or search(query, top_k)
+        retriever = HybridRetriever(
+            {"single_flight": True, "sparse_timeout": None}, sparse_retriever=_routes(sparse)[2]
+        )
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda q=q: results.append(retriever.search(q)))
+            for q in ["BM25 keyword", "  BM25   keyword "]
+        ]
+        for thread in threads:
+            thread.start()
+        while retriever._flight.stats()["shared"] < 1:
+            threading.Event().wait(0.01)
+        sparse.release.set()
+        for thread in threads:
+            thread.join(5)
+        retriever.close()
+
+        assert len(calls) == 1
+        assert results[0] == results[1] and results[0] is not results[1]
@@ -0,0 +1,156 @@
+"""Tests for the pooled HTTP transport."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from ragmcp.transport import HTTPTransport, get_http_transport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler recording the client port of every request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.ports.append(self.client_address[1])
+        body = b'{"message": {"content": "pong"}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP/1.1 server supporting keep-alive."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    httpd.ports = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHTTPTransport:
+    """Test connection reuse and statistics."""
+
+    def test_requests_reuse_one_connection(self, server):
+        """Sequential requests to one origin should share a keep-alive connection."""
+        transport = HTTPTransport()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            for _ in range(5):
+                transport.client(base_url).post(f"{base_url}/api/chat", json={})
+            stats = transport.stats()
+        finally:
+            transport.close()
+
+        assert len(set(server.ports)) == 1
+        origin = f"http://127.0.0.1:{server.server_port}"
+        assert stats[origin]["requests"] == 5
+        assert stats[origin]["connections"] == 1
+        assert stats[origin]["idle"] == 1
+
+    def test_one_client_per_origin(self):
+        """URLs of the same origin should map to the same client."""
+        transport = HTTPTransport()
+        try:
+            first = transport.client("http://localhost:11434")
+            assert transport.client("http://LOCALHOST:11434/v1") is first
+            assert transport.client("http://localhost:8080") is not first
+            assert transport.client("https://api.example.com") is transport.client(
+                "https://api.example.com:443/v1"
+            )
+        finally:
+            transport.close()
+
+    def test_limits_are_applied(self):
+        """Configured limits and timeouts should be used by the clients."""
+        transport = HTTPTransport(
+            {"max_connections": 8, "max_keepalive_connections": 4, "timeout": 12}
+        )
+
+        assert transport.limits.max_connections == 8
+        assert transport.limits.max_keepalive_connections == 4
+        assert transport.client("http://localhost").timeout.read == 12
+        transport.close()
+
+    def test_invalid_config_raises(self):
+        """Non-positive limits should raise ValueError."""
+        with pytest.raises(ValueError, match="max_connections"):
+            HTTPTransport({"max_connections": 0})
+
+    def test_http2_without_h2_falls_back(self, monkeypatch):
+        """Requesting HTTP/2 without the h2 package should fall back to HTTP/1.1."""
+        monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+
+        assert HTTPTransport({"http2": True}).http2 is False
+
+    async def test_async_client_is_pooled(self, server):
+        """The async client should also reuse connections."""
+        transport = HTTPTransport()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            client = transport.async_client(base_url)
+            for _ in range(3):
+                response = await client.post(f"{base_url}/api/chat", json={})
+                assert response.status_code == 200
+            assert transport.async_client(base_url) is client
+        finally:
+            await transport.aclose()
+
+        assert len(set(server.ports)) == 1
+
+    def test_named_transports_are_shared(self):
+        """get_http_transport should return one transport per name."""
+        transport = get_http_transport("transport-test", {"max_connections": 3})
+
+        assert get_http_transport("transport-test") is transport
+        assert transport.max_connections == 3
+        assert isinstance(transport.client("http://localhost"), httpx.Client)
+        transport.close()
+
+    def test_closed_transport_raises(self):
+        """A closed transport should refuse new clients and drop its pools."""
+        transport = HTTPTransport()
+        transport.client("http://localhost:1")
+        transport.close()
+
+        with pytest.raises(ValueError, match="closed"):
+            transport.client("http://localhost:1")
+        with pytest.raises(ValueError, match="closed"):
+            transport.async_client("http://localhost:1")
+        assert transport.stats()["http://localhost:1"]["connections"] == 0
+
+    def test_closed_named_transport_is_replaced(self):
+        """get_http_transport should not return a closed transport."""
+        transport = get_http_transport("transport-closed-test")
+        transport.close()
+
+        replacement = get_http_transport("transport-closed-test")
+
+        assert replacement is not transport
+        assert not replacement.closed
+        replacement.close()
+
+    def test_conflicting_config_is_logged(self, caplog):
+        """A second config for an existing name should be reported."""
+        transport = get_http_transport("transport-config-test", {"max_connections": 3})
+
+        with caplog.at_level("WARNING"):
+            again = get_http_transport("transport-config-test", {"max_connections": 9})
+
+        assert again is transport
+        assert again.max_connections == 3
+        assert "ignoring" in caplog.text
+        transport.close()
@@ -0,0 +1,195 @@
+"""Tests for the segmented (LSM-style) write path of LocalVectorStore."""
+
+import json
+import time
+
+import numpy as np
+
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.hnsw import HNSWIndex
+
+
+def _random_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def _insert_in_batches(store, vectors, batch_size):
+    for start in range(0, len(vectors), batch_size):
+        ids = range(start, min(start + batch_size, len(vectors)))
+        store.insert(vectors[start : start + batch_size], [{"id": i} for i in ids])
+
+
+def _expected_ids(vectors, query, top_k, excluded=()):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = np.argsort(-(normalized @ (query / np.linalg.norm(query))))
+    return [int(i) for i in order if int(i) not in excluded][:top_k]
+
+
+def _wait_until(condition, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for background maintenance"
+        time.sleep(0.01)
+
+
+class TestMemtableSealing:
+    """Test sealing the memtable into segments and fan-out queries."""
+
+    def test_memtable_seals_at_configured_size(self):
+        """Reaching memtable_size should move rows into a sealed segment."""
+        vectors = _random_vectors(120, 8)
+        store = LocalVectorStore({"memtable_size": 50, "background_compaction": False})
+
+        _insert_in_batches(store, vectors, 25)
+
+        assert [len(segment) for segment in store.segments] == [50, 50]
+        assert len(store) == 120
+        for query in vectors[:5]:
+            assert [r["id"] for r in store.query(query, 10)] == _expected_ids(vectors, query, 10)
+
+    def test_sealed_memtable_keeps_its_index(self):
+        """A memtable without tombstones should hand its ANN index to the segment."""
+        store = LocalVectorStore(
+            {
+                "index_type": "hnsw",
+                "hnsw": {"M": 8, "seed": 1},
+                "memtable_size": 40,
+                "background_compaction": False,
+            }
+        )
+
+        _insert_in_batches(store, _random_vectors(40, 8), 40)
+
+        assert isinstance(store.segments[0].index, HNSWIndex)
+
+    def test_upsert_and_delete_reach_sealed_rows(self):
+        """Sealed rows should be tombstoned by delete and replaced by upsert."""
+        vectors = _random_vectors(60, 8)
+        store = LocalVectorStore({"memtable_size": 30, "background_compaction": False})
+        _insert_in_batches(store, vectors, 30)
+
+        assert store.delete([1, 2]) == 2
+        store.upsert([vectors[0]], [{"id": 3, "moved": True}])
+
+        results = store.query(vectors[0], top_k=3)
+        assert len(store) == 58
+        assert {r["id"] for r in results} >= {0, 3}
+        assert not {1, 2} & {r["id"] for r in store.query(vectors[1], top_k=60)}
+
+
+class TestSegmentCompaction:
+    """Test merging and rewriting segments."""
+
+    def test_merges_smallest_segments_above_max_segments(self):
+        """compact_segments() should merge down to max_segments."""
+        vectors = _random_vectors(100, 8)
+        store = LocalVectorStore(
+            {"memtable_size": 10, "max_segments": 3, "background_compaction": False}
+        )
+        _insert_in_batches(store, vectors, 10)
+        store.delete([5, 50])
+
+        store.compact_segments()
+
+        assert len(store.segments) <= 3
+        assert len(store) == 98
+        query = vectors[50]
+        assert [r["id"] for r in store.query(query, 10)] == _expected_ids(
+            vectors, query, 10, excluded={5, 50}
+        )
+
+    def test_tombstone_heavy_segment_is_rewritten(self):
+        """Segments whose dead fraction exceeds the threshold should shrink."""
+        store = LocalVectorStore(
+            {"memtable_size": 20, "compaction_threshold": 0.5, "background_compaction": False}
+        )
+        _insert_in_batches(store, _random_vectors(20, 4), 20)
+        store.delete(list(range(15)))
+
+        store.compact_segments()
+
+        assert [len(segment) for segment in store.segments] == [5]
+        assert sorted(r["id"] for r in store.query(np.ones(4), top_k=20)) == list(range(15, 20))
+
+    def test_deletes_during_a_merge_are_replayed(self, monkeypatch):
+        """A delete racing with a merge should not resurrect the row."""
+        vectors = _random_vectors(40, 8)
+        store = LocalVectorStore(
+            {"memtable_size": 10, "max_segments": 1, "background_compaction": False}
+        )
+        _insert_in_batches(store, vectors, 10)
+
+        swap = store._swap_segments
+
+        def delete_then_swap(*args):
+            store.delete([7])
+            swap(*args)
+
+        monkeypatch.setattr(store, "_swap_segments", delete_then_swap)
+        store.compact_segments()
+
+        assert len(store.segments) == 1
+        assert len(store) == 39
+        assert 7 not in [r["id"] for r in store.query(vectors[7], top_k=40)]
+
+    def test_persisted_merge_replaces_segment_files(self, tmp_path):
+        """Merged segments should replace their inputs on disk and in the manifest."""
+        directory = tmp_path / "store"
+        vectors = _random_vectors(60, 8)
+        config = {
+            "persist_directory": str(directory),
+            "memtable_size": 20,
+            "max_segments": 1,
+            "background_compaction": False,
+        }
+        store = LocalVectorStore(config)
+        _insert_in_batches(store, vectors, 20)
+        store.flush()
+
+        store.compact_segments()
+
+        manifest = json.loads((directory / "manifest.json").read_text())
+        assert len(manifest["segments"]) == 1
+        assert sorted(p.name for p in (directory / "segments").iterdir()) == manifest["segments"]
+        reopened = LocalVectorStore(config)
+        query = vectors[33]
+        assert [r["id"] for r in reopened.query(query, 5)] == _expected_ids(vectors, query, 5)
+
+
+class TestBackgroundCompaction:
+    """Test the background maintenance thread."""
+
+    def test_background_thread_merges_while_ingesting(self):
+        """Segments should be merged in the background during ingestion."""
+        vectors = _random_vectors(200, 8)
+        store = LocalVectorStore({"memtable_size": 20, "max_segments": 2})
+
+        _insert_in_batches(store, vectors, 20)
+        _wait_until(lambda: len(store.segments) <= 2)
+        store.close()
+
+        assert len(store) == 200
+        query = vectors[123]
+        assert [r["id"] for r in store.query(query, 10)] == _expected_ids(vectors, query, 10)
+
+    def test_reopened_segments_get_an_index_in_the_background(self, tmp_path):
+        """Large segments mapped at startup should get an ANN index lazily."""
+        config = {
+            "persist_directory": str(tmp_path / "store"),
+            "index_type": "hnsw",
+            "hnsw": {"M": 8, "seed": 3},
+            "segment_index_min_rows": 50,
+        }
+        vectors = _random_vectors(120, 8)
+        store = LocalVectorStore(config)
+        store.insert(vectors, [{"id": i} for i in range(120)])
+        store.flush()
+        store.close()
+
+        reopened = LocalVectorStore(config)
+        assert len(reopened) == 120
+        _wait_until(lambda: reopened.segments[0].index is not None)
+        reopened.close()
+
+        assert reopened.query(vectors[9], top_k=1)[0]["id"] == 9
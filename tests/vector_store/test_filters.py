@@ -0,0 +1,212 @@
+"""Tests for metadata filters and pre-filtered queries."""
+
+import numpy as np
+import pytest
+
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.filters import PayloadIndex, match_filter, validate_filter
+from ragmcp.vector_store.index import FlatIndex
+from ragmcp.vector_store.matrix import VectorMatrix
+
+PAYLOADS = [
+    {"id": 0, "source": "a.pdf", "page": 1, "lang": "en"},
+    {"id": 1, "source": "a.pdf", "page": 2, "lang": "zh"},
+    {"id": 2, "source": "b.pdf", "page": 1, "lang": "en"},
+    {"id": 3, "source": "c.md", "lang": "en"},
+]
+
+
+def _matching(filter):
+    return [p["id"] for p in PAYLOADS if match_filter(p, filter)]
+
+
+def _store(n=200, dim=8, **config):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    payloads = [
+        {"id": i, "source": f"doc{i % 10}.pdf", "page": i % 7, "lang": ["en", "zh"][i % 2]}
+        for i in range(n)
+    ]
+    store = LocalVectorStore({"indexed_fields": ["source", "page"], **config})
+    store.insert(vectors, payloads)
+    return store, vectors, payloads
+
+
+class TestMatchFilter:
+    """Test evaluation of filter expressions against payloads."""
+
+    def test_equality_and_comparison_operators(self):
+        """Literal, $eq, $ne and range operators should match as expected."""
+        assert _matching({"source": "a.pdf"}) == [0, 1]
+        assert _matching({"source": {"$eq": "b.pdf"}}) == [2]
+        assert _matching({"source": {"$ne": "a.pdf"}}) == [2, 3]
+        assert _matching({"page": {"$gte": 1, "$lt": 2}}) == [0, 2]
+        assert _matching({"page": {"$gt": 1}}) == [1]
+
+    def test_membership_and_logical_operators(self):
+        """$in, $nin, $and and $or should compose."""
+        assert _matching({"source": {"$in": ["b.pdf", "c.md"]}}) == [2, 3]
+        assert _matching({"page": {"$nin": [1]}}) == [1, 3]
+        assert _matching({"$and": [{"source": "a.pdf"}, {"lang": "zh"}]}) == [1]
+        assert _matching({"$or": [{"page": 2}, {"source": "c.md"}]}) == [1, 3]
+
+    def test_missing_field_only_matches_negations(self):
+        """A payload without the field should only satisfy $ne/$nin."""
+        assert 3 not in _matching({"page": {"$lte": 10}})
+        assert 3 in _matching({"page": {"$ne": 1}})
+
+    def test_validate_rejects_unknown_operators(self):
+        """Unknown operators and malformed clauses should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown filter operator"):
+            validate_filter({"page": {"$regex": "x"}})
+        with pytest.raises(ValueError, match="Unknown filter operator"):
+            validate_filter({"$not": [{"page": 1}]})
+        with pytest.raises(ValueError, match="list"):
+            validate_filter({"page": {"$in": 1}})
+
+
+class TestPayloadIndex:
+    """Test resolution of filters into bitmaps and residual filters."""
+
+    def test_indexed_clauses_become_a_bitmap(self):
+        """Clauses on indexed fields should be answered without residual."""
+        index = PayloadIndex(["source", "page"])
+        index.add(list(range(4)), PAYLOADS)
+
+        mask, residual = index.resolve({"source": "a.pdf", "page": {"$gte": 2}}, 4)
+
+        assert residual is None
+        assert np.flatnonzero(mask).tolist() == [1]
+
+    def test_unindexed_clauses_are_left_as_residual(self):
+        """Clauses on other fields and negations should be post-filtered."""
+        index = PayloadIndex(["source"])
+        index.add(list(range(4)), PAYLOADS)
+
+        mask, residual = index.resolve({"source": {"$in": ["a.pdf", "b.pdf"]}, "lang": "en"}, 4)
+        assert np.flatnonzero(mask).tolist() == [0, 1, 2]
+        assert residual == {"lang": "en"}
+
+        mask, residual = index.resolve({"source": {"$ne": "a.pdf"}}, 4)
+        assert mask is None
+        assert residual == {"source": {"$ne": "a.pdf"}}
+
+    def test_unhashable_values_disable_the_field_index(self):
+        """A field holding lists should fall back to post-filtering."""
+        index = PayloadIndex(["tags"])
+        index.add([0, 1], [{"tags": "x"}, {"tags": ["x", "y"]}])
+
+        assert index.fields == []
+        assert index.resolve({"tags": "x"}, 2) == (None, {"tags": "x"})
+
+
+class TestFlatIndexGather:
+    """Test that selective masks only score the eligible rows."""
+
+    def test_selective_mask_matches_full_scan(self):
+        """Gathered scoring should return the same rows as a masked full scan."""
+        rng = np.random.default_rng(1)
+        matrix = VectorMatrix(8)
+        index = FlatIndex(matrix, "ip")
+        index.add(matrix.append(rng.standard_normal((400, 8))))
+        query = rng.standard_normal(8).astype(np.float32)
+        mask = np.zeros(400, dtype=bool)
+        mask[::50] = True
+
+        rows, scores = index.search(query, 5, mask)
+        [(batch_rows, _)] = index.search_batch(query[np.newaxis], 5, mask)
+
+        expected = np.flatnonzero(mask)[np.argsort(-(matrix.data[mask] @ query))][:5]
+        assert rows.tolist() == expected.tolist() == batch_rows.tolist()
+        np.testing.assert_allclose(scores, matrix.data[rows] @ query, rtol=1e-6)
+
+
+class TestFilteredQuery:
+    """Test filtered queries on LocalVectorStore."""
+
+    def _expected(self, vectors, payloads, query, filter, top_k):
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        order = np.argsort(-(normalized @ query))
+        return [int(i) for i in order if match_filter(payloads[i], filter)][:top_k]
+
+    @pytest.mark.parametrize(
+        "filter",
+        [
+            {"source": "doc3.pdf"},
+            {"page": {"$in": [1, 2]}, "source": {"$in": ["doc1.pdf", "doc2.pdf"]}},
+            {"$or": [{"source": "doc4.pdf"}, {"page": 0}]},
+            {"lang": "zh"},
+            {"source": "doc5.pdf", "lang": "en"},
+            {"page": {"$ne": 3}},
+        ],
+    )
+    def test_filtered_query_matches_brute_force(self, filter):
+        """Pre- and post-filtered results should equal filtering the exact ranking."""
+        store, vectors, payloads = _store()
+        query = vectors[17] / np.linalg.norm(vectors[17])
+
+        results = store.query(query, top_k=5, filter=filter)
+
+        assert [r["id"] for r in results] == self._expected(vectors, payloads, query, filter, 5)
+        assert all(match_filter(r["payload"], filter) for r in results)
+
+    def test_filter_excludes_deleted_and_replaced_rows(self):
+        """Filtered queries should respect tombstones and upserted payloads."""
+        store, vectors, _ = _store(compaction_threshold=1.0)
+        store.delete([3])
+        store.upsert([vectors[13]], [{"id": 13, "source": "moved.pdf", "page": 0}])
+
+        ids = [r["id"] for r in store.query(vectors[3], top_k=50, filter={"source": "doc3.pdf"})]
+        moved = store.query(vectors[13], top_k=5, filter={"source": "moved.pdf"})
+
+        assert 3 not in ids and 13 not in ids
+        assert len(ids) == 18
+        assert [r["id"] for r in moved] == [13]
+
+    def test_filter_survives_compaction(self):
+        """The payload index should be rebuilt when the store compacts."""
+        store, vectors, _ = _store()
+        store.delete(list(range(0, 200, 2)))
+        store.compact()
+
+        results = store.query(vectors[0], top_k=50, filter={"source": "doc3.pdf"})
+
+        assert sorted(r["id"] for r in results) == list(range(3, 200, 10))
+
+    def test_post_filter_widens_until_exhausted(self):
+        """A rare unindexed value should still be found by widening the fetch."""
+        store, vectors, _ = _store()
+        store.upsert([-vectors[0]], [{"id": "rare", "lang": "fr"}])
+
+        results = store.query(vectors[0], top_k=3, filter={"lang": "fr"})
+
+        assert [r["id"] for r in results] == ["rare"]
+
+    def test_query_batch_with_filter(self):
+        """query_batch() should apply the filter to every query."""
+        store, vectors, _ = _store()
+        filter = {"source": "doc2.pdf", "lang": "en"}
+
+        batched = store.query_batch(vectors[:3], top_k=4, filter=filter)
+
+        for query, results in zip(vectors[:3], batched, strict=True):
+            expected = store.query(query, top_k=4, filter=filter)
+            assert [r["id"] for r in results] == [r["id"] for r in expected]
+            assert all(r["payload"]["lang"] == "en" for r in results)
+
+    def test_hnsw_store_with_selective_filter(self):
+        """HNSW stores should answer selective filters exactly."""
+        store, vectors, payloads = _store(index_type="hnsw", hnsw={"M": 8, "seed": 1})
+        query = vectors[5] / np.linalg.norm(vectors[5])
+        filter = {"source": "doc5.pdf", "page": {"$lte": 3}}
+
+        results = store.query(query, top_k=3, filter=filter)
+
+        assert [r["id"] for r in results] == self._expected(vectors, payloads, query, filter, 3)
+
+    def test_invalid_filter_raises_error(self):
+        """Malformed filters should raise ValueError."""
+        store, vectors, _ = _store()
+
+        with pytest.raises(ValueError, match="Unknown filter operator"):
+            store.query(vectors[0], top_k=1, filter={"page": {"$like": 1}})
@@ -0,0 +1,195 @@
+"""Tests for the HNSW index and its use in LocalVectorStore."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.hnsw import HNSWIndex
+from ragmcp.vector_store.index import FlatIndex, normalize
+from ragmcp.vector_store.matrix import VectorMatrix
+
+HNSW_CONFIG = {"M": 8, "ef_construction": 64, "ef_search": 64, "seed": 7}
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(42)
+    vectors = normalize(rng.standard_normal((1000, 16)).astype(np.float32))
+    queries = normalize(rng.standard_normal((20, 16)).astype(np.float32))
+    return vectors, queries
+
+
+def _build(vectors, index_cls, **kwargs):
+    matrix = VectorMatrix(vectors.shape[1])
+    index = index_cls(matrix, "cosine", **kwargs)
+    index.add(matrix.append(vectors))
+    return index
+
+
+class TestHNSWIndex:
+    """Test HNSW search quality and tombstone handling."""
+
+    def test_recall_against_exact_search(self, dataset):
+        """HNSW top-10 should mostly agree with exact brute-force search."""
+        vectors, queries = dataset
+        hnsw = _build(vectors, HNSWIndex, **HNSW_CONFIG)
+        flat = _build(vectors, FlatIndex)
+
+        recall = np.mean(
+            [len(set(hnsw.search(q, 10)[0]) & set(flat.search(q, 10)[0])) / 10 for q in queries]
+        )
+
+        assert recall >= 0.9
+
+    def test_results_are_sorted_by_score(self, dataset):
+        """Returned rows should be ordered by descending similarity."""
+        vectors, queries = dataset
+        hnsw = _build(vectors, HNSWIndex, **HNSW_CONFIG)
+
+        rows, scores = hnsw.search(queries[0], 10)
+
+        assert len(rows) == 10
+        assert np.all(np.diff(scores) <= 0)
+        np.testing.assert_allclose(scores, vectors[rows] @ queries[0], rtol=1e-5)
+
+    def test_masked_rows_are_never_returned(self, dataset):
+        """Rows excluded by the mask (tombstones) should not be returned."""
+        vectors, queries = dataset
+        hnsw = _build(vectors, HNSWIndex, **HNSW_CONFIG)
+        mask = np.ones(len(vectors), dtype=bool)
+        mask[::2] = False
+
+        rows, _ = hnsw.search(queries[0], 10, mask)
+
+        assert len(rows) == 10
+        assert all(row % 2 == 1 for row in rows)
+
+    def test_selective_mask_uses_exact_search(self, dataset):
+        """A highly selective mask should still return the exact best rows."""
+        vectors, queries = dataset
+        hnsw = _build(vectors, HNSWIndex, **HNSW_CONFIG)
+        mask = np.zeros(len(vectors), dtype=bool)
+        mask[[3, 500, 999]] = True
+
+        rows, _ = hnsw.search(queries[1], 10, mask)
+
+        expected = np.array([3, 500, 999])[np.argsort(-(vectors[[3, 500, 999]] @ queries[1]))]
+        assert rows.tolist() == expected.tolist()
+
+    def test_concurrent_inserts_and_searches(self, dataset):
+        """Searches racing inserts should only see rows below their size."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(vectors.shape[1])
+        hnsw = HNSWIndex(matrix, "cosine", **HNSW_CONFIG)
+        hnsw.add(matrix.append(vectors[:200]))
+        errors = []
+
+        def insert():
+            for start in range(200, 1000, 50):
+                hnsw.add(matrix.append(vectors[start : start + 50]))
+
+        def search():
+            try:
+                for query in queries:
+                    rows, _ = hnsw.search(query, 10, size=200)
+                    assert len(rows) == 10 and rows.max() < 200
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=insert)]
+        threads += [threading.Thread(target=search) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(hnsw) == 1000
+
+    def test_unbounded_searches_during_inserts_return_valid_rows(self, dataset):
+        """Searches without a size bound should never trip over half-inserted rows."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(vectors.shape[1])
+        hnsw = HNSWIndex(matrix, "cosine", **HNSW_CONFIG)
+        hnsw.add(matrix.append(vectors[:50]))
+        errors = []
+        inserting = threading.Event()
+        inserting.set()
+
+        def insert():
+            for start in range(50, 400, 10):
+                hnsw.add(matrix.append(vectors[start : start + 10]))
+            inserting.clear()
+
+        def search():
+            try:
+                while inserting.is_set():
+                    for query in queries:
+                        rows, scores = hnsw.search(query, 10)
+                        assert len(rows) == 10
+                        np.testing.assert_allclose(scores, vectors[rows] @ query, rtol=1e-5)
+            except Exception as e:
+                errors.append(e)
+                inserting.clear()
+
+        threads = [threading.Thread(target=insert)]
+        threads += [threading.Thread(target=search) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    def test_search_does_not_wait_for_writers(self, dataset):
+        """A search should complete while a writer holds the insert lock."""
+        vectors, queries = dataset
+        hnsw = _build(vectors[:200], HNSWIndex, **HNSW_CONFIG)
+        results = []
+
+        with hnsw._lock:
+            thread = threading.Thread(target=lambda: results.append(hnsw.search(queries[0], 5)))
+            thread.start()
+            thread.join(timeout=5)
+            finished = not thread.is_alive()
+
+        thread.join()
+        assert finished
+        assert len(results[0][0]) == 5
+
+    def test_invalid_parameters_raise_error(self):
+        """Invalid M should raise ValueError."""
+        with pytest.raises(ValueError, match="M"):
+            HNSWIndex(VectorMatrix(4), M=1)
+
+
+class TestLocalStoreWithHNSW:
+    """Test LocalVectorStore configured with index_type=hnsw."""
+
+    def test_store_uses_hnsw_index(self, dataset):
+        """index_type=hnsw should build an HNSW index with the given params."""
+        store = LocalVectorStore({"index_type": "HNSW", "hnsw": HNSW_CONFIG})
+        vectors, _ = dataset
+        store.insert(vectors[:10], [{"id": i} for i in range(10)])
+
+        assert isinstance(store.index, HNSWIndex)
+        assert store.index.M == 8
+
+    def test_upsert_and_delete_are_incremental(self, dataset):
+        """Upserted ids should move and deleted ids should disappear."""
+        vectors, queries = dataset
+        store = LocalVectorStore(
+            {"index_type": "hnsw", "hnsw": HNSW_CONFIG, "compaction_threshold": 1.0}
+        )
+        store.insert(vectors[:200], [{"id": i} for i in range(200)])
+
+        store.upsert([queries[0]], [{"id": 5, "moved": True}])
+        top = store.query(queries[0], top_k=1)[0]
+        assert top["id"] == 5
+        assert top["payload"]["moved"] is True
+
+        store.delete([5])
+        assert 5 not in [r["id"] for r in store.query(queries[0], top_k=10)]
+        assert len(store) == 199
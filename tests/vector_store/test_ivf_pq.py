@@ -0,0 +1,149 @@
+"""Tests for the IVF-PQ index and its use in LocalVectorStore."""
+
+import numpy as np
+import pytest
+
+from ragmcp.evaluation import evaluate_vector_store_recall
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.index import normalize
+from ragmcp.vector_store.ivf_pq import IVFPQIndex, train_kmeans
+from ragmcp.vector_store.matrix import VectorMatrix
+
+IVF_PQ_CONFIG = {"nlist": 16, "m": 8, "nprobe": 4, "rerank_k": 50, "training_size": 1000, "seed": 3}
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Vectors with low intrinsic dimension, like real embeddings."""
+    rng = np.random.default_rng(0)
+    basis = rng.standard_normal((8, 64))
+    vectors = normalize((rng.standard_normal((2000, 8)) @ basis).astype(np.float32))
+    queries = normalize((rng.standard_normal((20, 8)) @ basis).astype(np.float32))
+    return vectors, queries
+
+
+class TestTrainKMeans:
+    """Test the k-means trainer used for coarse and PQ codebooks."""
+
+    def test_finds_separated_clusters(self):
+        """Centroids should land on well separated cluster centres."""
+        rng = np.random.default_rng(1)
+        centres = np.array([[10.0, 0.0], [0.0, 10.0], [-10.0, -10.0]])
+        data = np.concatenate([c + 0.1 * rng.standard_normal((50, 2)) for c in centres])
+
+        centroids = train_kmeans(data, 3, rng=rng)
+
+        for centre in centres:
+            assert np.min(np.linalg.norm(centroids - centre, axis=1)) < 0.5
+
+
+class TestIVFPQIndex:
+    """Test IVF-PQ training, compression and search."""
+
+    def test_untrained_index_answers_exactly(self, dataset):
+        """Before training, search should fall back to exact scoring."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = IVFPQIndex(matrix, **IVF_PQ_CONFIG | {"training_size": 10_000})
+        index.add(matrix.append(vectors[:100]))
+
+        rows, _ = index.search(queries[0], 5)
+
+        assert not index.is_trained
+        assert rows.tolist() == np.argsort(-(vectors[:100] @ queries[0]))[:5].tolist()
+
+    def test_trains_once_training_size_is_reached_and_compresses(self, dataset):
+        """Reaching training_size should flag training; train() encodes every row."""
+        vectors, _ = dataset
+        matrix = VectorMatrix(64)
+        index = IVFPQIndex(matrix, **IVF_PQ_CONFIG)
+        index.add(matrix.append(vectors[:999]))
+        assert not index.needs_training
+        index.add(matrix.append(vectors[999:]))
+
+        assert index.needs_training and not index.is_trained
+        index.train()
+
+        assert index.is_trained and not index.needs_training
+        assert index.compression_ratio >= 16
+        assert index.code_nbytes < vectors.nbytes / 16
+
+    def test_rows_added_during_training_are_encoded(self, dataset, monkeypatch):
+        """Inserts racing the k-means fit should be indexed with the new codebooks."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = IVFPQIndex(matrix, **IVF_PQ_CONFIG)
+        index.add(matrix.append(vectors[:1500]))
+        fit = index._fit
+
+        def fit_while_adding(sample):
+            index.add(matrix.append(vectors[1500:]))
+            return fit(sample)
+
+        monkeypatch.setattr(index, "_fit", fit_while_adding)
+        index.train()
+
+        assert index.is_trained
+        assert sorted(row for members in index._list_members for row in members) == list(
+            range(len(vectors))
+        )
+        rows, _ = index.search(queries[0], 5)
+        assert len(rows) == 5
+
+    def test_masked_rows_are_never_returned(self, dataset):
+        """Rows excluded by the mask should not be returned."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = IVFPQIndex(matrix, **IVF_PQ_CONFIG)
+        index.add(matrix.append(vectors))
+        mask = np.ones(len(vectors), dtype=bool)
+        mask[::2] = False
+
+        rows, scores = index.search(queries[0], 10, mask)
+
+        assert len(rows) > 0
+        assert all(row % 2 == 1 for row in rows)
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_m_must_divide_dimension(self):
+        """An m that does not divide the dimension should raise ValueError."""
+        with pytest.raises(ValueError, match="divide"):
+            IVFPQIndex(VectorMatrix(10), m=3)
+
+
+class TestLocalStoreWithIVFPQ:
+    """Test LocalVectorStore configured with index_type=ivf_pq."""
+
+    def test_recall_is_measurable_against_exact_store(self, dataset):
+        """Recall@10 against a flat store should be high with re-scoring."""
+        vectors, queries = dataset
+        payloads = [{"id": i} for i in range(len(vectors))]
+        store = LocalVectorStore({"index_type": "ivf_pq", "ivf_pq": IVF_PQ_CONFIG})
+        reference = LocalVectorStore({})
+        store.insert(vectors, payloads)
+        reference.insert(vectors, payloads)
+        store.compact_segments()
+
+        metrics = evaluate_vector_store_recall(store, reference, queries, k=10)
+
+        assert isinstance(store.index, IVFPQIndex)
+        assert store.index.is_trained
+        assert metrics["recall@10"] >= 0.8
+        assert metrics["latency_ms"] > 0
+
+    def test_training_runs_off_the_write_path(self, dataset):
+        """insert() should not train; segment maintenance should."""
+        vectors, queries = dataset
+        store = LocalVectorStore(
+            {"index_type": "ivf_pq", "ivf_pq": IVF_PQ_CONFIG, "background_compaction": False}
+        )
+        store.insert(vectors, [{"id": i} for i in range(len(vectors))])
+
+        assert store.index.needs_training
+        exact = [r["id"] for r in store.query(queries[0], 5)]
+        assert exact == np.argsort(-(vectors @ queries[0]))[:5].tolist()
+
+        store.compact_segments()
+
+        assert store.index.is_trained
+        assert [r["id"] for r in store.query(queries[0], 5)][0] == exact[0]
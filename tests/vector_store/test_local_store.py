@@ -0,0 +1,250 @@
+"""Tests for LocalVectorStore."""
+
+import numpy as np
+import pytest
+
+from ragmcp.vector_store import LocalVectorStore, VectorStore
+from ragmcp.vector_store.index import FlatIndex, select_top_k, select_top_k_rows
+from ragmcp.vector_store.matrix import VectorMatrix
+
+
+def _random_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32)
+
+
+class TestVectorMatrix:
+    """Test the growable matrix used for vector storage."""
+
+    def test_append_grows_capacity_and_keeps_rows(self):
+        """Appending past capacity should reallocate without losing rows."""
+        matrix = VectorMatrix(dimension=4, initial_capacity=2)
+        first = matrix.append(np.ones((2, 4)))
+        second = matrix.append(np.full((3, 4), 2.0))
+
+        assert first.tolist() == [0, 1]
+        assert second.tolist() == [2, 3, 4]
+        assert len(matrix) == 5
+        assert matrix.capacity >= 5
+        assert matrix.data.dtype == np.float32
+        assert np.all(matrix.data[:2] == 1.0)
+        assert np.all(matrix.data[2:] == 2.0)
+
+    def test_append_rejects_wrong_dimension(self):
+        """Vectors with a different dimension should be rejected."""
+        matrix = VectorMatrix(dimension=4)
+
+        with pytest.raises(ValueError, match="dimension"):
+            matrix.append(np.ones((1, 3)))
+
+
+class TestSelectTopK:
+    """Test argpartition-based top-k selection."""
+
+    def test_returns_indices_sorted_by_score(self):
+        """select_top_k should return the best k indices, best first."""
+        scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+
+        assert select_top_k(scores, 3).tolist() == [1, 3, 2]
+        assert select_top_k(scores, 10).tolist() == [1, 3, 2, 4, 0]
+        assert select_top_k(scores, 0).tolist() == []
+
+    def test_row_wise_selection_matches_single_row(self):
+        """select_top_k_rows should agree with select_top_k on every row."""
+        scores = np.random.default_rng(3).standard_normal((4, 50))
+
+        best = select_top_k_rows(scores, 5)
+
+        assert best.shape == (4, 5)
+        for row, expected in zip(scores, best, strict=True):
+            assert select_top_k(row, 5).tolist() == expected.tolist()
+
+
+class TestFlatIndexBatch:
+    """Test the block-wise batched flat search."""
+
+    def test_search_batch_matches_single_queries_across_blocks(self):
+        """Small blocks should give the same answers as one-by-one search."""
+        vectors = _random_vectors(300, 8)
+        queries = _random_vectors(7, 8, seed=1)
+        matrix = VectorMatrix(8)
+        index = FlatIndex(matrix, "ip")
+        index.add(matrix.append(vectors))
+        mask = np.ones(300, dtype=bool)
+        mask[:100] = False
+
+        batched = index.search_batch(queries, 4, mask, block_elements=600)
+
+        for query, (rows, scores) in zip(queries, batched, strict=True):
+            expected_rows, expected_scores = index.search(query, 4, mask)
+            assert rows.tolist() == expected_rows.tolist()
+            np.testing.assert_allclose(scores, expected_scores, rtol=1e-6)
+
+
+class TestLocalVectorStore:
+    """Test LocalVectorStore insert/query/delete/upsert behaviour."""
+
+    def test_local_store_is_vector_store(self):
+        """LocalVectorStore should implement the VectorStore interface."""
+        assert isinstance(LocalVectorStore({}), VectorStore)
+
+    def test_query_returns_exact_nearest_neighbours(self):
+        """query() should rank vectors by cosine similarity to the query."""
+        vectors = _random_vectors(500, 16)
+        store = LocalVectorStore({"initial_capacity": 8})
+        store.insert(list(vectors), [{"id": f"c{i}"} for i in range(500)])
+
+        query = vectors[42] + 0.01
+        results = store.query(query, top_k=5)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        assert [r["id"] for r in results] == [f"c{i}" for i in expected]
+        assert results[0]["id"] == "c42"
+        assert results[0]["score"] == pytest.approx(1.0, abs=1e-3)
+        assert results[0]["payload"] == {"id": "c42"}
+        assert results[0]["vector"].shape == (16,)
+
+    def test_query_on_empty_store_returns_empty_list(self):
+        """Querying an empty store should return no results."""
+        store = LocalVectorStore({"dimension": 4})
+
+        assert store.query(np.ones(4), top_k=3) == []
+
+    def test_query_rejects_wrong_dimension(self):
+        """A query with the wrong dimension should raise ValueError."""
+        store = LocalVectorStore({"dimension": 4})
+        store.insert([np.ones(4)], [{"id": 1}])
+
+        with pytest.raises(ValueError, match="dimension"):
+            store.query(np.ones(3), top_k=1)
+
+    def test_insert_rejects_duplicate_ids(self):
+        """insert() should refuse ids that already exist."""
+        store = LocalVectorStore({})
+        store.insert([np.ones(4)], [{"id": 1}])
+
+        with pytest.raises(ValueError, match="upsert"):
+            store.insert([np.ones(4)], [{"id": 1}])
+
+    def test_insert_assigns_ids_when_missing(self):
+        """Payloads without an id should receive distinct integer ids."""
+        store = LocalVectorStore({})
+        store.insert(list(_random_vectors(3, 4)), [{}, {}, {}])
+
+        ids = {r["id"] for r in store.query(np.ones(4), top_k=3)}
+        assert ids == {0, 1, 2}
+
+    def test_delete_removes_vectors_from_results(self):
+        """Deleted vectors should no longer be returned."""
+        vectors = _random_vectors(10, 8)
+        store = LocalVectorStore({"compaction_threshold": 1.0})
+        store.insert(list(vectors), [{"id": i} for i in range(10)])
+
+        deleted = store.delete([3, 3, 99])
+        results = store.query(vectors[3], top_k=10)
+
+        assert deleted == 1
+        assert len(store) == 9
+        assert 3 not in [r["id"] for r in results]
+        assert len(results) == 9
+
+    def test_upsert_is_idempotent(self):
+        """Upserting the same id should replace rather than duplicate it."""
+        store = LocalVectorStore({"dimension": 2})
+        store.upsert([np.array([1.0, 0.0])], [{"id": "a", "v": 1}])
+        store.upsert([np.array([0.0, 1.0])], [{"id": "a", "v": 2}])
+
+        results = store.query(np.array([0.0, 1.0]), top_k=5)
+
+        assert len(store) == 1
+        assert len(results) == 1
+        assert results[0]["payload"]["v"] == 2
+        assert results[0]["score"] == pytest.approx(1.0)
+
+    def test_delete_by_filter_covers_memtable_and_segments(self):
+        """delete_by_filter should delete matching rows wherever they live."""
+        vectors = _random_vectors(12, 4)
+        store = LocalVectorStore({"indexed_fields": ["source"], "background_compaction": False})
+        payloads = [{"id": i, "source": f"s{i % 2}", "page": i} for i in range(12)]
+        store.insert(vectors[:6], payloads[:6])
+        store._seal()
+        store.insert(vectors[6:], payloads[6:])
+
+        deleted = store.delete_by_filter({"source": "s0", "page": {"$gte": 4}})
+
+        assert deleted == 4
+        assert sorted(r["id"] for r in store.query(vectors[0], 12)) == [0, 1, 2, 3, 5, 7, 9, 11]
+        with pytest.raises(ValueError, match="non-empty"):
+            store.delete_by_filter({})
+
+    def test_compaction_reclaims_dead_rows(self):
+        """compact() should drop tombstoned rows and keep results intact."""
+        vectors = _random_vectors(20, 8)
+        store = LocalVectorStore({"compaction_threshold": 1.0})
+        store.insert(list(vectors), [{"id": i} for i in range(20)])
+        store.delete(list(range(0, 20, 2)))
+
+        before = [r["id"] for r in store.query(vectors[5], top_k=5)]
+        store.compact()
+        after = [r["id"] for r in store.query(vectors[5], top_k=5)]
+
+        assert before == after
+        assert len(store) == 10
+
+    def test_query_batch_matches_query(self):
+        """query_batch() should return the same results as repeated query()."""
+        vectors = _random_vectors(200, 8)
+        store = LocalVectorStore({})
+        store.insert(vectors, [{"id": i} for i in range(200)])
+        store.delete([0, 1, 2])
+        queries = _random_vectors(5, 8, seed=2)
+
+        batched = store.query_batch(queries, top_k=3)
+
+        assert len(batched) == 5
+        for query, results in zip(queries, batched, strict=True):
+            assert [r["id"] for r in results] == [r["id"] for r in store.query(query, 3)]
+
+    @pytest.mark.parametrize("index_type", LocalVectorStore.VALID_INDEX_TYPES)
+    def test_rows_inserted_during_a_query_are_not_searched(self, index_type):
+        """A write racing a query must not change the rows the query reads."""
+        vectors = _random_vectors(120, 8)
+        store = LocalVectorStore(
+            {
+                "index_type": index_type,
+                "initial_capacity": 100,
+                "compaction_threshold": 1.0,
+                "ivf_pq": {"nlist": 4, "m": 2, "training_size": 50, "seed": 0},
+                "matryoshka": {"prefix_dim": 4},
+            }
+        )
+        store.insert(vectors[:100], [{"id": i} for i in range(100)])
+        store.delete([0])
+        next_row = iter(range(100, 120, 5))
+        snapshot = store._snapshot
+
+        def racing_snapshot(*args):
+            taken = snapshot(*args)
+            start = next(next_row)
+            store.insert(vectors[start : start + 5], [{"id": i} for i in range(start, start + 5)])
+            return taken
+
+        store._snapshot = racing_snapshot
+        single = store.query(vectors[101], top_k=5)
+        batched = store.query_batch(vectors[105:107], top_k=5)
+
+        for results in [single, *batched]:
+            assert results
+            assert all(0 < r["id"] < 100 for r in results)
+
+    def test_query_batch_on_empty_store(self):
+        """An empty store should return one empty list per query."""
+        store = LocalVectorStore({"dimension": 4})
+
+        assert store.query_batch(np.ones((2, 4)), top_k=3) == [[], []]
+
+    def test_unknown_metric_raises_error(self):
+        """An unsupported metric_type should raise ValueError."""
+        with pytest.raises(ValueError, match="metric_type"):
+            LocalVectorStore({"metric_type": "hamming"})
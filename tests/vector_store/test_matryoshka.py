@@ -0,0 +1,97 @@
+"""Tests for the two-stage Matryoshka prefix index."""
+
+import numpy as np
+import pytest
+
+from ragmcp.evaluation import evaluate_vector_store_recall
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.index import normalize
+from ragmcp.vector_store.matrix import VectorMatrix
+from ragmcp.vector_store.matryoshka import MatryoshkaIndex
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Vectors whose energy decays along the dimensions, like Matryoshka embeddings."""
+    rng = np.random.default_rng(0)
+    weights = np.exp(-np.arange(128) / 24.0)
+    vectors = normalize((rng.standard_normal((2000, 128)) * weights).astype(np.float32))
+    queries = normalize((rng.standard_normal((20, 128)) * weights).astype(np.float32))
+    return vectors, queries
+
+
+class TestMatryoshkaIndex:
+    """Test prefix scanning and full-dimension re-scoring."""
+
+    def test_shadow_holds_normalized_prefixes(self, dataset):
+        """The shadow matrix should keep unit-length leading dimensions."""
+        vectors, _ = dataset
+        matrix = VectorMatrix(128)
+        index = MatryoshkaIndex(matrix, prefix_dim=32)
+        index.add(matrix.append(vectors[:10]))
+
+        assert index.shadow.data.shape == (10, 32)
+        np.testing.assert_allclose(np.linalg.norm(index.shadow.data, axis=1), 1.0, rtol=1e-5)
+        assert index.scan_ratio == 0.25
+
+    def test_scores_are_full_dimension(self, dataset):
+        """Returned scores should be exact full-dimension scores, best first."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(128)
+        index = MatryoshkaIndex(matrix, prefix_dim=32, rescore_k=200)
+        index.add(matrix.append(vectors))
+
+        rows, scores = index.search(queries[0], 10)
+
+        np.testing.assert_allclose(scores, vectors[rows] @ queries[0], rtol=1e-6)
+        assert np.all(np.diff(scores) <= 0)
+
+    def test_shortlist_covering_everything_is_exact(self, dataset):
+        """A shortlist as large as the data should give the exact top-k."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(128)
+        index = MatryoshkaIndex(matrix, prefix_dim=8, rescore_k=len(vectors))
+        index.add(matrix.append(vectors))
+
+        for (rows, _), query in zip(index.search_batch(queries[:3], 5), queries, strict=False):
+            assert rows.tolist() == np.argsort(-(vectors @ query))[:5].tolist()
+
+    def test_masked_rows_are_never_returned(self, dataset):
+        """Rows excluded by the mask should not be returned."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(128)
+        index = MatryoshkaIndex(matrix, prefix_dim=32)
+        index.add(matrix.append(vectors))
+        mask = np.ones(len(vectors), dtype=bool)
+        mask[::2] = False
+
+        rows, _ = index.search(queries[0], 10, mask)
+
+        assert len(rows) == 10
+        assert all(row % 2 == 1 for row in rows)
+
+    def test_invalid_prefix_dim_raises(self):
+        """A non-positive prefix_dim should raise ValueError."""
+        with pytest.raises(ValueError, match="prefix_dim"):
+            MatryoshkaIndex(VectorMatrix(8), prefix_dim=0)
+
+
+class TestLocalStoreWithMatryoshka:
+    """Test LocalVectorStore configured with index_type=matryoshka."""
+
+    def test_recall_is_measurable_against_exact_store(self, dataset):
+        """Recall@10 against a flat store should be high with re-scoring."""
+        vectors, queries = dataset
+        payloads = [{"id": i} for i in range(len(vectors))]
+        store = LocalVectorStore(
+            {"index_type": "matryoshka", "matryoshka": {"prefix_dim": 32, "rescore_k": 100}}
+        )
+        reference = LocalVectorStore({})
+        store.insert(vectors, payloads)
+        reference.insert(vectors, payloads)
+
+        metrics = evaluate_vector_store_recall(store, reference, queries, k=10)
+
+        assert isinstance(store.index, MatryoshkaIndex)
+        assert metrics["recall@10"] >= 0.9
+        assert metrics["latency_ms"] > 0
@@ -0,0 +1,145 @@
+"""Tests for the scalar-quantized index and its use in LocalVectorStore."""
+
+import numpy as np
+import pytest
+
+from ragmcp.embedding import quantize
+from ragmcp.evaluation import evaluate_vector_store_recall
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.index import normalize
+from ragmcp.vector_store.matrix import VectorMatrix
+from ragmcp.vector_store.quantized import ScalarQuantizedIndex
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """Unit-length vectors and queries."""
+    rng = np.random.default_rng(0)
+    vectors = normalize(rng.standard_normal((2000, 64)).astype(np.float32))
+    queries = normalize(rng.standard_normal((20, 64)).astype(np.float32))
+    return vectors, queries
+
+
+class TestScalarQuantizedIndex:
+    """Test quantized scoring and exact re-scoring."""
+
+    @pytest.mark.parametrize("dtype", ["int8", "float16"])
+    def test_rescored_results_match_exact_search(self, dataset, dtype):
+        """With a generous shortlist the top-k and scores should be exact."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = ScalarQuantizedIndex(matrix, dtype=dtype, rescore_k=50)
+        index.add(matrix.append(vectors))
+
+        for query in queries[:5]:
+            rows, scores = index.search(query, 10)
+            exact = vectors @ query
+            assert rows.tolist() == np.argsort(-exact)[:10].tolist()
+            np.testing.assert_allclose(scores, exact[rows], rtol=1e-6)
+
+    def test_int8_copy_is_about_four_times_smaller(self, dataset):
+        """The quantized copy should cost D + 4 bytes per row."""
+        vectors, _ = dataset
+        matrix = VectorMatrix(64)
+        index = ScalarQuantizedIndex(matrix)
+        index.add(matrix.append(vectors))
+
+        assert index.code_nbytes == len(vectors) * (64 + 4)
+        assert index.compression_ratio > 3.5
+
+    def test_without_rescoring_returns_quantized_scores(self, dataset):
+        """rescore_k=0 should return the approximate scores as they are."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = ScalarQuantizedIndex(matrix, rescore_k=0)
+        index.add(matrix.append(vectors))
+
+        rows, scores = index.search(queries[0], 5)
+
+        approx = quantize(vectors, "int8").dot(queries[0])
+        np.testing.assert_allclose(scores, approx[rows], rtol=1e-5)
+
+    @pytest.mark.parametrize("stride", [2, 10])
+    def test_masked_rows_are_never_returned(self, dataset, stride):
+        """Dense and selective masks should both exclude rows."""
+        vectors, queries = dataset
+        matrix = VectorMatrix(64)
+        index = ScalarQuantizedIndex(matrix)
+        index.add(matrix.append(vectors))
+        mask = np.zeros(len(vectors), dtype=bool)
+        mask[::stride] = True
+
+        results = index.search_batch(queries[:3], 10, mask)
+
+        for rows, scores in results:
+            assert len(rows) == 10
+            assert all(row % stride == 0 for row in rows)
+            assert np.all(np.diff(scores) <= 0)
+
+    def test_unknown_dtype_raises(self):
+        """An unsupported dtype should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown dtype"):
+            ScalarQuantizedIndex(VectorMatrix(8), dtype="float32")
+
+
+class TestLocalStoreWithSQ:
+    """Test LocalVectorStore configured with index_type=sq."""
+
+    def test_recall_against_exact_store(self, dataset):
+        """Recall@10 against a flat store should be near perfect."""
+        vectors, queries = dataset
+        payloads = [{"id": i} for i in range(len(vectors))]
+        store = LocalVectorStore({"index_type": "sq", "sq": {"rescore_k": 50}})
+        reference = LocalVectorStore({})
+        store.insert(vectors, payloads)
+        reference.insert(vectors, payloads)
+
+        metrics = evaluate_vector_store_recall(store, reference, queries, k=10)
+
+        assert isinstance(store.index, ScalarQuantizedIndex)
+        assert metrics["recall@10"] >= 0.95
+
+    def test_accepts_embedding_matrix(self, dataset):
+        """An EmbeddingMatrix should be insertable without conversion."""
+        vectors, _ = dataset
+        store = LocalVectorStore({"index_type": "sq"})
+
+        store.insert(quantize(vectors[:100], "int8"), [{"id": i} for i in range(100)])
+
+        assert len(store) == 100
+        assert store.query(vectors[7], 1)[0]["id"] == 7
+
+    def test_compact_embeddings_are_stored_without_requantizing(self, dataset):
+        """int8 values of an EmbeddingMatrix should reach the index unchanged."""
+        vectors, _ = dataset
+        codes = quantize(3.0 * vectors[:100], "int8")
+        store = LocalVectorStore({"index_type": "sq", "dimension": 64})
+        stored = []
+        store.index.add = lambda rows: stored.append(rows)
+
+        store.upsert(codes, [{"id": i % 90} for i in range(100)])
+
+        kept = store.index.codes
+        assert stored == []
+        np.testing.assert_array_equal(kept.values, codes.values[10:])
+        np.testing.assert_allclose(np.asarray(kept), normalize(np.asarray(codes)[10:]), atol=1e-6)
+
+    def test_persisted_segments_use_quantized_index(self, dataset, tmp_path):
+        """Large flushed segments should get their own quantized index."""
+        vectors, queries = dataset
+        store = LocalVectorStore(
+            {
+                "index_type": "sq",
+                "persist_directory": str(tmp_path),
+                "segment_index_min_rows": 100,
+                "background_compaction": False,
+            }
+        )
+        store.insert(vectors, [{"id": i} for i in range(len(vectors))])
+        store.flush()
+        store.compact_segments()
+
+        results = store.query(queries[0], 5)
+
+        assert isinstance(store.segments[0].index, ScalarQuantizedIndex)
+        assert [r["id"] for r in results] == np.argsort(-(vectors @ queries[0]))[:5].tolist()
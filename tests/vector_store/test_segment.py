@@ -0,0 +1,287 @@
+"""Tests for memory-mapped segments and persistence in LocalVectorStore."""
+
+import numpy as np
+import pytest
+
+from ragmcp.vector_store import LocalVectorStore
+from ragmcp.vector_store.segment import Segment, write_segment
+
+
+def _random_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def _persistent_store(tmp_path, **config):
+    return LocalVectorStore({"persist_directory": str(tmp_path / "store"), **config})
+
+
+class TestSegment:
+    """Test writing, mapping and searching a single segment."""
+
+    def test_roundtrip_is_memory_mapped(self, tmp_path):
+        """A written segment should reopen as a memmap with its payloads."""
+        vectors = _random_vectors(5, 4)
+        write_segment(
+            tmp_path / "seg", vectors, ["a", 1, "c", "d", "e"], [{"k": i} for i in range(5)]
+        )
+
+        segment = Segment(tmp_path / "seg")
+
+        assert isinstance(segment.vectors, np.memmap)
+        assert len(segment) == 5
+        assert segment.dimension == 4
+        assert segment.record(1) == (1, {"k": 1})
+        assert segment.find("c") == 2
+        np.testing.assert_array_equal(segment.vectors, vectors)
+
+    def test_float16_segment_halves_size(self, tmp_path):
+        """float16 segments should store half-size vectors with close scores."""
+        vectors = _random_vectors(300, 16)
+        write_segment(tmp_path / "seg", vectors, list(range(300)), [{}] * 300, dtype="float16")
+        segment = Segment(tmp_path / "seg")
+        query = vectors[7]
+
+        rows, scores = segment.search(query, 3)
+
+        assert segment.dtype == np.float16
+        assert segment.vectors.nbytes == vectors.nbytes // 2
+        assert rows[0] == np.argmax(vectors @ query)
+        np.testing.assert_allclose(scores, (vectors @ query)[rows], rtol=1e-2)
+
+    def test_blocked_search_matches_exact_search(self, tmp_path):
+        """Block-wise scanning should return the exact top-k under a mask."""
+        vectors = _random_vectors(500, 8)
+        queries = _random_vectors(3, 8, seed=1)
+        write_segment(tmp_path / "seg", vectors, list(range(500)), [{}] * 500)
+        segment = Segment(tmp_path / "seg")
+        mask = np.ones(500, dtype=bool)
+        mask[::3] = False
+
+        results = segment.search_batch(queries, 5, mask, block_rows=64)
+
+        for query, (rows, _) in zip(queries, results, strict=True):
+            scores = np.where(mask, vectors @ query, -np.inf)
+            assert rows.tolist() == np.argsort(-scores)[:5].tolist()
+
+    def test_deletes_are_persisted(self, tmp_path):
+        """Tombstones should survive reopening the segment."""
+        write_segment(tmp_path / "seg", _random_vectors(4, 4), [0, 1, 2, 3], [{}] * 4)
+        Segment(tmp_path / "seg").delete([1, 3])
+
+        segment = Segment(tmp_path / "seg")
+
+        assert segment.live_count == 2
+        assert segment.find(1) is None
+        assert segment.find(2) == 2
+
+    def test_lookups_are_built_without_decoding_payloads(self, tmp_path, monkeypatch):
+        """Id and filter lookups should come from the sidecars, not the records."""
+        vectors = _random_vectors(6, 4)
+        payloads = [{"source": f"s{i % 2}", "text": "x" * 100} for i in range(6)]
+        write_segment(
+            tmp_path / "seg",
+            vectors,
+            [f"c{i}" for i in range(6)],
+            payloads,
+            indexed_fields=["source"],
+        )
+        segment = Segment(tmp_path / "seg", indexed_fields=["source"])
+        segment.delete([4])
+
+        def no_decoding(row):
+            raise AssertionError("payload record decoded")
+
+        monkeypatch.setattr(segment, "record", no_decoding)
+        segment.warm()
+        mask, residual = segment.mask({"source": "s0"})
+
+        assert segment.find("c3") == 3
+        assert segment.find("c4") is None
+        assert residual is None
+        assert np.flatnonzero(mask).tolist() == [0, 2]
+
+    def test_unknown_dtype_raises_error(self, tmp_path):
+        """Unsupported on-disk dtypes should raise ValueError."""
+        with pytest.raises(ValueError, match="dtype"):
+            write_segment(tmp_path / "seg", _random_vectors(1, 4), [0], [{}], dtype="int8")
+
+
+class TestPersistentLocalStore:
+    """Test flushing and reopening a LocalVectorStore."""
+
+    def test_flush_and_reopen(self, tmp_path):
+        """A new store over the same directory should serve flushed vectors."""
+        vectors = _random_vectors(100, 8)
+        store = _persistent_store(tmp_path)
+        store.insert(vectors, [{"id": f"c{i}", "page": i} for i in range(100)])
+
+        assert store.flush() == 100
+        reopened = _persistent_store(tmp_path)
+        results = reopened.query(vectors[42], top_k=3)
+
+        assert len(reopened) == 100
+        assert reopened.dimension == 8
+        assert results[0]["id"] == "c42"
+        assert results[0]["payload"] == {"id": "c42", "page": 42}
+        assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_query_merges_segments_and_tail(self, tmp_path):
+        """Results should be the exact top-k over segments and memory."""
+        vectors = _random_vectors(300, 8)
+        store = _persistent_store(tmp_path)
+        for start in (0, 100):
+            store.insert(
+                vectors[start : start + 100], [{"id": i} for i in range(start, start + 100)]
+            )
+            store.flush()
+        store.insert(vectors[200:], [{"id": i} for i in range(200, 300)])
+        queries = _random_vectors(4, 8, seed=3)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        for query, batched in zip(queries, store.query_batch(queries, top_k=10), strict=True):
+            expected = np.argsort(-(normalized @ query))[:10].tolist()
+            assert [r["id"] for r in store.query(query, top_k=10)] == expected
+            assert [r["id"] for r in batched] == expected
+
+    def test_delete_and_upsert_of_flushed_ids(self, tmp_path):
+        """Deleting or replacing sealed ids should persist across reopen."""
+        vectors = _random_vectors(20, 4)
+        store = _persistent_store(tmp_path)
+        store.insert(vectors, [{"id": i} for i in range(20)])
+        store.flush()
+
+        assert store.delete([3, 4, 99]) == 2
+        store.upsert([vectors[5]], [{"id": 5, "v": 2}])
+        with pytest.raises(ValueError, match="upsert"):
+            store.insert([vectors[6]], [{"id": 6}])
+        store.flush()
+
+        reopened = _persistent_store(tmp_path)
+        ids = [r["id"] for r in reopened.query(vectors[5], top_k=20)]
+        assert len(reopened) == 18
+        assert sorted(ids) == [i for i in range(20) if i not in (3, 4)]
+        assert reopened.query(vectors[5], top_k=1)[0]["payload"] == {"id": 5, "v": 2}
+
+    def test_upsert_of_flushed_row_survives_restart_without_flush(self, tmp_path):
+        """Closing before the replacement is flushed should keep the flushed row."""
+        vectors = _random_vectors(3000, 4)
+        store = _persistent_store(tmp_path)
+        store.insert(vectors, [{"id": f"c{i}", "v": 1} for i in range(3000)])
+        store.flush()
+
+        store.upsert([vectors[0]], [{"id": "c0", "v": 2}])
+        store.close()
+        reopened = _persistent_store(tmp_path)
+
+        assert len(reopened) == 3000
+        assert reopened.query(vectors[0], top_k=1)[0]["payload"] == {"id": "c0", "v": 1}
+
+        reopened.upsert([vectors[0]], [{"id": "c0", "v": 3}])
+        reopened.flush()
+        reopened.close()
+        flushed = _persistent_store(tmp_path)
+
+        assert len(flushed) == 3000
+        assert flushed.query(vectors[0], top_k=1)[0]["payload"] == {"id": "c0", "v": 3}
+        assert sum(r["id"] == "c0" for r in flushed.query(vectors[0], top_k=3000)) == 1
+
+    def test_unsaved_upsert_tombstones_survive_a_merge(self, tmp_path):
+        """Merging a segment should not drop rows whose replacement is unflushed."""
+        vectors = _random_vectors(40, 4)
+        store = _persistent_store(tmp_path, max_segments=1, background_compaction=False)
+        for start in (0, 20):
+            store.insert(vectors[start : start + 20], [{"id": i} for i in range(start, start + 20)])
+            store.flush()
+
+        store.upsert([vectors[3], vectors[25]], [{"id": 3, "v": 2}, {"id": 25, "v": 2}])
+        store.delete([25])
+        store.compact_segments()
+        store.close()
+        reopened = _persistent_store(tmp_path)
+
+        assert len(reopened.segments) == 1
+        assert len(reopened) == 39
+        assert reopened.query(vectors[3], top_k=1)[0]["payload"] == {"id": 3}
+        assert 25 not in [r["id"] for r in reopened.query(vectors[25], top_k=40)]
+
+    def test_filters_apply_to_segments(self, tmp_path):
+        """Indexed and post-filtered clauses should also filter segment rows."""
+        vectors = _random_vectors(60, 4)
+        store = _persistent_store(tmp_path, indexed_fields=["source"])
+        store.insert(vectors, [{"id": i, "source": f"s{i % 3}", "lang": i % 2} for i in range(60)])
+        store.flush()
+
+        results = store.query(vectors[0], top_k=50, filter={"source": "s0", "lang": 1})
+
+        assert sorted(r["id"] for r in results) == [i for i in range(60) if i % 6 == 3]
+
+    def test_manifest_mismatch_raises_error(self, tmp_path):
+        """Reopening with a different metric or dimension should fail loudly."""
+        store = _persistent_store(tmp_path)
+        store.insert(_random_vectors(2, 4), [{}, {}])
+        store.flush()
+
+        with pytest.raises(ValueError, match="metric_type"):
+            _persistent_store(tmp_path, metric_type="ip")
+        with pytest.raises(ValueError, match="dimension"):
+            _persistent_store(tmp_path, dimension=8)
+
+    def test_flush_requires_persist_directory(self):
+        """flush() on an in-memory store should raise ValueError."""
+        with pytest.raises(ValueError, match="persist_directory"):
+            LocalVectorStore({}).flush()
+
+
+class TestSegmentIndexPersistence:
+    """Test saving segment indexes and restoring them on reopen."""
+
+    CONFIGS = {
+        "hnsw": {"hnsw": {"M": 8, "seed": 3}},
+        "ivf_pq": {"ivf_pq": {"nlist": 4, "m": 2, "training_size": 100, "seed": 3}},
+        "sq": {"sq": {"rescore_k": 0}},
+        "matryoshka": {"matryoshka": {"prefix_dim": 4}},
+    }
+
+    @pytest.mark.parametrize("index_type", list(CONFIGS))
+    def test_reopen_restores_index_instead_of_rebuilding(self, tmp_path, monkeypatch, index_type):
+        """A reopened store should load the saved index and answer identically."""
+        config = {
+            "index_type": index_type,
+            "segment_index_min_rows": 50,
+            "background_compaction": False,
+            **self.CONFIGS[index_type],
+        }
+        vectors = _random_vectors(200, 8)
+        store = _persistent_store(tmp_path, **config)
+        store.insert(vectors, [{"id": i} for i in range(200)])
+        store.flush()
+        index = store.segments[0].index
+        queries = _random_vectors(5, 8, seed=4)
+        expected = [[r["id"] for r in results] for results in store.query_batch(queries, 10)]
+
+        def no_rebuild(self, segment):
+            raise AssertionError("segment index rebuilt")
+
+        monkeypatch.setattr(LocalVectorStore, "_build_segment_index", no_rebuild)
+        reopened = _persistent_store(tmp_path, **config)
+        reopened.compact_segments()
+
+        assert type(reopened.segments[0].index) is type(index)
+        assert [
+            [r["id"] for r in results] for results in reopened.query_batch(queries, 10)
+        ] == expected
+
+    def test_index_of_another_type_is_rebuilt(self, tmp_path):
+        """A saved index that does not match index_type should be ignored."""
+        config = {"segment_index_min_rows": 50, "background_compaction": False}
+        vectors = _random_vectors(100, 8)
+        store = _persistent_store(tmp_path, index_type="hnsw", **config)
+        store.insert(vectors, [{"id": i} for i in range(100)])
+        store.flush()
+
+        reopened = _persistent_store(tmp_path, index_type="sq", **config)
+        reopened.compact_segments()
+
+        assert type(reopened.segments[0].index).__name__ == "ScalarQuantizedIndex"
+        assert reopened.query(vectors[7], top_k=1)[0]["id"] == 7
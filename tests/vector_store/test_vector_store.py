@@ -130,3 +130,47 @@ class TestVectorStoreMethods:
         payloads = [{"id": 1}]
         upserted = store.upsert(vectors, payloads)
         assert upserted == 1
+
+
+class TestVectorStoreQueryBatch:
+    """Test the default query_batch() implementation."""
+
+    def test_default_query_batch_calls_query_per_row(self):
+        """query_batch() should return one result list per query row."""
+
+        class MockVectorStore(VectorStore):
+            def insert(self, vectors, payloads):
+                return 0
+
+            def query(self, query_vector, top_k):
+                return [{"score": float(query_vector[0]), "payload": {}}][:top_k]
+
+            def delete(self, ids):
+                return 0
+
+            def upsert(self, vectors, payloads):
+                return 0
+
+        store = MockVectorStore()
+        results = store.query_batch(np.array([[1.0, 0.0], [2.0, 0.0]]), top_k=1)
+
+        assert [r[0]["score"] for r in results] == [1.0, 2.0]
+
+    def test_query_batch_rejects_single_vector(self):
+        """query_batch() should require a two-dimensional query matrix."""
+
+        class MockVectorStore(VectorStore):
+            def insert(self, vectors, payloads):
+                return 0
+
+            def query(self, query_vector, top_k):
+                return []
+
+            def delete(self, ids):
+                return 0
+
+            def upsert(self, vectors, payloads):
+                return 0
+
+        with pytest.raises(ValueError, match="shape"):
+            MockVectorStore().query_batch(np.array([1.0, 2.0]), top_k=1)